@@ -118,7 +118,7 @@ class CompletionProvider:
         Returns:
             AgentResponse with content and/or tool calls.
         """
-        import httpx
+        from codex.core.http_client import get_http_client
 
         body: dict[str, Any] = {
             "model": self.model,
@@ -135,14 +135,14 @@ class CompletionProvider:
             headers["Authorization"] = f"Bearer {self.api_key}"
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                resp = await client.post(
-                    f"{self.api_base}/chat/completions",
-                    headers=headers,
-                    json=body,
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await get_http_client().post(
+                f"{self.api_base}/chat/completions",
+                headers=headers,
+                json=body,
+                timeout=120.0,
+            )
+            resp.raise_for_status()
+            data = resp.json()
         except Exception as e:
             logger.error(f"Completion error: {e}")
             return AgentResponse(
@@ -1,8 +1,13 @@
 """Authentication utilities."""
 
+import asyncio
 import hashlib
+import hmac
+import math
 import os
 import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from enum import StrEnum
 
@@ -13,6 +18,9 @@ from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from codex.core.principals import get_principal
+from codex.core.rate_limit import SlidingWindowLimiter
+from codex.core.token_usage import token_usage
 from codex.db.database import get_system_session
 from codex.db.models import PersonalAccessToken, RefreshToken, User
 
@@ -22,6 +30,19 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+PASSWORD_HASH_ALGORITHM = "pbkdf2_sha256"
+LEGACY_PASSWORD_HASH_ITERATIONS = 100000
+# Raising this rehashes each user's password on their next successful login
+PASSWORD_HASH_ITERATIONS = int(os.getenv("CODEX_PASSWORD_HASH_ITERATIONS", str(LEGACY_PASSWORD_HASH_ITERATIONS)))
+PASSWORD_HASH_WORKERS = int(os.getenv("CODEX_PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("CODEX_PASSWORD_HASH_QUEUE_LIMIT", "32"))
+
+# Login attempts per client address per minute, and failed logins per username
+# per LOGIN_FAILURE_WINDOW seconds, before further attempts get a 429
+LOGIN_RATE_LIMIT_PER_IP = int(os.getenv("CODEX_LOGIN_RATE_LIMIT_PER_IP", "60"))
+LOGIN_FAILURE_LIMIT = int(os.getenv("CODEX_LOGIN_FAILURE_LIMIT", "10"))
+LOGIN_FAILURE_WINDOW = int(os.getenv("CODEX_LOGIN_FAILURE_WINDOW", "300"))
+
 PAT_PREFIX = "cdx_"
 REFRESH_TOKEN_PREFIX = "cdxr_"
 
@@ -68,29 +89,121 @@ def assert_secret_key_is_safe() -> None:
         )
 
 
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+def _parse_password_hash(hashed_password: str) -> tuple[int, bytes, str]:
+    """Split a stored hash into (iterations, salt, hex digest).
+
+    Current hashes are ``pbkdf2_sha256$<iterations>$<salt>$<hash>``; hashes
+    written before parameters were stored are ``<salt>$<hash>`` at 100,000
+    iterations.
+    """
+    parts = hashed_password.split("$")
+    if len(parts) == 2:
+        salt, stored_hash = parts
+        return LEGACY_PASSWORD_HASH_ITERATIONS, bytes.fromhex(salt), stored_hash
+    algorithm, iterations, salt, stored_hash = parts
+    if algorithm != PASSWORD_HASH_ALGORITHM:
+        raise ValueError(f"Unsupported password hash algorithm: {algorithm}")
+    return int(iterations), bytes.fromhex(salt), stored_hash
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash using PBKDF2."""
+    """Verify a password against a hash using PBKDF2.
+
+    CPU-bound; async code should use `verify_password_async`.
+    """
     try:
-        # Split the stored hash into salt and hash
-        salt, stored_hash = hashed_password.split("$")
-        # Hash the plain password with the same salt
-        password_hash = hashlib.pbkdf2_hmac("sha256", plain_password.encode("utf-8"), bytes.fromhex(salt), 100000)
-        return password_hash.hex() == stored_hash
-    except (
-        ValueError,
-        AttributeError,
-    ):
+        iterations, salt, stored_hash = _parse_password_hash(hashed_password)
+    except (ValueError, AttributeError):
         return False
+    return hmac.compare_digest(_pbkdf2(plain_password, salt, iterations).hex(), stored_hash)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using PBKDF2 with a random salt."""
-    # Generate a random salt
+    """Hash a password using PBKDF2 with a random salt, storing the parameters alongside.
+
+    CPU-bound; async code should use `get_password_hash_async`.
+    """
     salt = secrets.token_bytes(32)
-    # Hash the password with PBKDF2
-    password_hash = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100000)  # Number of iterations
-    # Return salt and hash separated by $
-    return f"{salt.hex()}${password_hash.hex()}"
+    password_hash = _pbkdf2(password, salt, PASSWORD_HASH_ITERATIONS)
+    return f"{PASSWORD_HASH_ALGORITHM}${PASSWORD_HASH_ITERATIONS}${salt.hex()}${password_hash.hex()}"
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True if a stored hash uses different parameters than new hashes would."""
+    try:
+        iterations, _, _ = _parse_password_hash(hashed_password)
+    except (ValueError, AttributeError):
+        return True
+    return hashed_password.count("$") != 3 or iterations != PASSWORD_HASH_ITERATIONS
+
+
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="codex-password")
+_password_jobs = 0
+_password_jobs_lock = threading.Lock()
+
+
+async def _run_password_job(fn, *args):
+    """Run a hashing function on the bounded password executor.
+
+    The executor caps how many cores hashing can use; the job limit stops a
+    login storm from queueing unbounded work behind it.
+    """
+    global _password_jobs
+    with _password_jobs_lock:
+        if _password_jobs >= PASSWORD_HASH_QUEUE_LIMIT:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in requests in progress. Try again shortly.",
+                headers={"Retry-After": "1"},
+            )
+        _password_jobs += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, fn, *args)
+    finally:
+        with _password_jobs_lock:
+            _password_jobs -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` off the event loop."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """`get_password_hash` off the event loop."""
+    return await _run_password_job(get_password_hash, password)
+
+
+login_ip_limiter = SlidingWindowLimiter(LOGIN_RATE_LIMIT_PER_IP, 60)
+login_failure_limiter = SlidingWindowLimiter(LOGIN_FAILURE_LIMIT, LOGIN_FAILURE_WINDOW)
+
+
+def check_login_rate(request: Request, username: str) -> None:
+    """Count a login attempt, rejecting it with a 429 if the client or account is over its limit.
+
+    Runs before the password is hashed, so rejected attempts cost no CPU.
+    """
+    client = request.client.host if request.client else "unknown"
+    retry_after = max(login_ip_limiter.retry_after(client), login_failure_limiter.retry_after(username.lower()))
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Try again later.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    login_ip_limiter.hit(client)
+
+
+def record_login_result(username: str, success: bool) -> None:
+    """Track failed logins per account; a successful login clears them."""
+    if success:
+        login_failure_limiter.reset(username.lower())
+    else:
+        login_failure_limiter.hit(username.lower())
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -220,10 +333,8 @@ async def _authenticate_via_pat(token: str, session: AsyncSession) -> tuple[User
     if pat.expires_at and pat.expires_at < datetime.now(UTC):
         return None, None
 
-    # Update last_used_at
-    pat.last_used_at = datetime.now(UTC)
-    session.add(pat)
-    await session.commit()
+    # Buffered and written in bulk, so token-authenticated reads stay write-free
+    token_usage.record(pat)
 
     # Load user
     user_result = await session.execute(select(User).where(User.id == pat.user_id))
@@ -242,7 +353,8 @@ async def get_user_from_token(token: str, session: AsyncSession) -> User | None:
 
     # Check if this is a personal access token (starts with cdx_)
     if token.startswith(PAT_PREFIX):
-        return await _authenticate_via_pat(token, session)
+        user, _ = await _authenticate_via_pat(token, session)
+        return user
 
     # Otherwise treat as JWT
     try:
@@ -254,7 +366,7 @@ async def get_user_from_token(token: str, session: AsyncSession) -> User | None:
     if username is None:
         return None
 
-    return await get_user_by_username(username, session)
+    return await get_principal(username, session)
 
 
 async def get_current_user(
@@ -297,7 +409,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = await get_user_by_username(username, session)
+    user = await get_principal(username, session)
     if user is None:
         raise credentials_exception
 
@@ -0,0 +1,85 @@
+"""Keyset (cursor) pagination over `(created_at, id)`.
+
+List routes order by `(created_at, id)` and, instead of skipping `offset`
+rows, resume strictly after the last row of the previous page. With a
+composite index on the filter columns plus `(created_at, id)`, every page
+costs the same as the first. `id` breaks ties between rows written in the
+same instant (e.g. a bulk notification fanout).
+
+Response bodies stay plain lists; when more rows remain, the opaque cursor
+for the next page is returned in the `X-Next-Cursor` header and passed back
+as the `cursor` query parameter.
+"""
+
+import base64
+import binascii
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, literal, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Upper bound for a route's `limit` query parameter
+MAX_PAGE_SIZE = 500
+
+RowT = TypeVar("RowT")
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a row's sort key as an opaque, URL-safe cursor."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor from `encode_cursor`, raising 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def paginate(
+    stmt: Select,
+    created_at_column: Any,
+    id_column: Any,
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+) -> Select:
+    """Order `stmt` by `(created_at, id)`, resume after `cursor`, and fetch one row past `limit`.
+
+    The extra row tells `page_rows` whether another page exists.
+    """
+    if cursor is not None:
+        created_at, row_id = decode_cursor(cursor)
+        key = tuple_(created_at_column, id_column)
+        bound = tuple_(literal(created_at, created_at_column.type), literal(row_id, id_column.type))
+        stmt = stmt.where(key < bound if descending else key > bound)
+    if descending:
+        stmt = stmt.order_by(created_at_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(created_at_column, id_column)
+    return stmt.limit(limit + 1)
+
+
+def page_rows(
+    rows: Sequence[RowT],
+    limit: int,
+    response: Response,
+    key: Callable[[RowT], tuple[datetime, int]],
+) -> list[RowT]:
+    """Trim the look-ahead row from a `paginate` result and set the next-page cursor header.
+
+    `key` returns a row's `(created_at, id)`.
+    """
+    rows = list(rows)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
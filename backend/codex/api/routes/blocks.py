@@ -4,13 +4,14 @@ Provides CRUD operations for blocks and pages, supporting Notion-like
 infinite block recursion backed by filesystem folders and files.
 """
 
+import asyncio
 import logging
 import mimetypes
 import shutil
-from typing import Any
+from pathlib import Path
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
@@ -19,9 +20,11 @@ from codex.api.auth import PermissionScope, get_current_active_user, require_sco
 from codex.api.routes.helpers import get_notebook_path_nested
 from codex.api.schemas import (
     BlockAtCommitResponse,
+    BlockBatchResponse,
     BlockChildrenResponse,
     BlockDeleteResponse,
     BlockHistoryResponse,
+    BlockMovesResponse,
     BlockReorderResponse,
     BlockResolveLinkResponse,
     BlockResponse,
@@ -34,8 +37,10 @@ from codex.api.schemas import (
     ZipImportResponse,
 )
 from codex.core.blocks import (
+    BlockOperationError,
     _block_dict,
     _parse_json,
+    apply_block_operations,
     create_block,
     create_page,
     delete_block,
@@ -46,15 +51,18 @@ from codex.core.blocks import (
     get_root_blocks,
     import_folder_as_pages,
     move_block,
+    move_blocks_within_page,
     read_page_metadata,
+    rebalance_order_keys,
     reorder_blocks,
-    serve_block_file,
     update_block_content,
     update_block_properties,
     upload_to_block,
 )
+from codex.core.file_serving import serve_block, serve_local_file
 from codex.core.import_worker import process_zip_import
 from codex.core.md_import import import_markdown_to_page
+from codex.core.order_keys import needs_rebalance
 from codex.core.permissions import PermissionLevel
 from codex.core.websocket import notify_file_change
 from codex.db.database import get_notebook_session, get_system_session
@@ -110,6 +118,44 @@ class ReorderBlocksRequest(BaseModel):
     block_ids: list[str]
 
 
+class BlockMove(BaseModel):
+    """A single sibling move: place a block after or before another (neither = end)."""
+
+    block_id: str
+    after_block_id: str | None = None
+    before_block_id: str | None = None
+
+
+class MoveBlocksRequest(BaseModel):
+    """Request to move several children of a page in one operation."""
+
+    moves: list[BlockMove]
+
+
+class BlockOperation(BaseModel):
+    """One operation in a batch. Fields mirror the single-block endpoints."""
+
+    op: Literal["create", "update", "move", "delete", "reorder"]
+    ref: str | None = None  # Client reference for a created block, usable as a block ID later in the batch
+    block_id: str | None = None
+    parent_block_id: str | None = None
+    new_parent_block_id: str | None = None
+    block_type: str | None = None
+    content: str | None = None
+    content_format: str | None = None
+    position: int | None = None
+    title: str | None = None
+    description: str | None = None
+    properties: dict[str, Any] | None = None
+    block_ids: list[str] | None = None
+
+
+class BlockBatchRequest(BaseModel):
+    """Request to apply several block operations at once."""
+
+    operations: list[BlockOperation]
+
+
 class UpdateBlockPropertiesRequest(BaseModel):
     """Request to update block properties."""
 
@@ -153,6 +199,29 @@ def _block_to_dict(block: Block) -> dict[str, Any]:
     return _block_dict(block)
 
 
+# References to in-flight rebalance tasks so they aren't garbage collected
+_rebalance_tasks: set[asyncio.Task] = set()
+
+
+def _rebalance_sync(notebook_path: Path, notebook_id: int, page_block_id: str) -> None:
+    nb_session = get_notebook_session(str(notebook_path))
+    try:
+        rebalance_order_keys(notebook_path, notebook_id, page_block_id, nb_session)
+    except Exception:
+        logger.exception("Failed to rebalance order keys for page %s", page_block_id)
+    finally:
+        nb_session.close()
+
+
+def _schedule_rebalance(notebook_path: Path, notebook_id: int, page_block_id: str | None, *keys: str | None) -> None:
+    """Respace a page's order keys in the background once any has grown too long."""
+    if not page_block_id or not any(needs_rebalance(key) for key in keys):
+        return
+    task = asyncio.create_task(asyncio.to_thread(_rebalance_sync, notebook_path, notebook_id, page_block_id))
+    _rebalance_tasks.add(task)
+    task.add_done_callback(_rebalance_tasks.discard)
+
+
 # Nested router (mounted under workspace/notebook)
 nested_router = APIRouter()
 
@@ -184,6 +253,7 @@ async def get_block_content_by_path(
     workspace_identifier: str,
     notebook_identifier: str,
     path: str,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_system_session),
 ):
@@ -192,32 +262,41 @@ async def get_block_content_by_path(
         workspace_identifier, notebook_identifier, current_user, session
     )
 
-    # Try direct path on disk first
-    file_path = notebook_path / path
-    if file_path.exists() and file_path.is_file():
-        # Security check
-        try:
-            if not file_path.resolve().is_relative_to(notebook_path.resolve()):
-                raise HTTPException(status_code=403, detail="Access denied")
-        except (OSError, ValueError):
-            raise HTTPException(status_code=400, detail="Invalid path")
-
-        media_type = mimetypes.guess_type(str(file_path))[0] or "application/octet-stream"
-        return FileResponse(path=str(file_path), media_type=media_type, filename=file_path.name)
-
-    # Try looking up by filename in DB
     nb_session = get_notebook_session(str(notebook_path))
     try:
         block = nb_session.exec(select(Block).where(Block.notebook_id == notebook.id, Block.path == path)).first()
+
+        # Try direct path on disk first
+        file_path = notebook_path / path
+        if file_path.exists() and file_path.is_file():
+            # Security check
+            try:
+                if not file_path.resolve().is_relative_to(notebook_path.resolve()):
+                    raise HTTPException(status_code=403, detail="Access denied")
+            except (OSError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid path")
+
+            media_type = mimetypes.guess_type(str(file_path))[0] or "application/octet-stream"
+            return serve_local_file(
+                request,
+                file_path,
+                media_type=media_type,
+                filename=file_path.name,
+                content_hash=block.hash if block else None,
+                expected_size=block.size if block else None,
+                expected_mtime=block.file_modified_at if block else None,
+            )
+
+        # Try looking up by filename in DB
         if not block and "/" not in path:
             block = nb_session.exec(
                 select(Block).where(Block.notebook_id == notebook.id, Block.filename == path)
             ).first()
 
         if block:
-            file_path_str, media_type = serve_block_file(notebook_path, block)
-            if file_path_str:
-                return FileResponse(path=file_path_str, media_type=media_type, filename=block.path.split("/")[-1])
+            response = serve_block(request, notebook_path, block)
+            if response:
+                return response
 
         raise HTTPException(status_code=404, detail=f"Content not found: {path}")
     finally:
@@ -388,8 +467,11 @@ async def create_new_block(
             block_type=request.block_type,
             workspace_id=workspace.id,
             actor_principal_id=current_user.id,
+            parent_block_id=request.parent_block_id,
         )
 
+        _schedule_rebalance(notebook_path, notebook.id, request.parent_block_id, result.get("order_key"))
+
         # Return created block plus all siblings so frontend doesn't need a refetch
         result["blocks"] = _get_children_with_content(notebook_path, notebook.id, request.parent_block_id, nb_session)
         return result
@@ -466,6 +548,63 @@ async def create_new_page(
         nb_session.close()
 
 
+@nested_router.post("/batch", response_model=BlockBatchResponse)
+async def apply_block_batch(
+    workspace_identifier: str,
+    notebook_identifier: str,
+    request: BlockBatchRequest,
+    current_user: User = Depends(require_scope(PermissionScope.WORKSPACE_WRITE)),
+    session: AsyncSession = Depends(get_system_session),
+):
+    """Apply an ordered list of create/update/move/delete/reorder operations.
+
+    The operations run in one notebook transaction with one manifest write
+    per page, and clients get a single change event per touched page instead
+    of one per operation. The batch is validated before anything is written,
+    so an unknown block ID or ``ref`` or a missing field changes nothing; the
+    error names the failing operation. An operation that fails while being
+    applied keeps the file changes of the operations before it (the
+    notebook's index is re-synced from disk to match).
+    """
+    notebook_path, notebook, workspace = await get_notebook_path_nested(
+        workspace_identifier, notebook_identifier, current_user, session, required_level=PermissionLevel.WRITE
+    )
+
+    nb_session = get_notebook_session(str(notebook_path))
+    try:
+        outcome = apply_block_operations(
+            notebook_path=notebook_path,
+            notebook_id=notebook.id,
+            operations=[operation.model_dump(exclude_none=True) for operation in request.operations],
+            nb_session=nb_session,
+        )
+
+        pages = nb_session.exec(
+            select(Block).where(Block.notebook_id == notebook.id, Block.path.in_(outcome["pages"]))
+        ).all()
+        for page in pages:
+            notify_file_change(
+                notebook_id=notebook.id,
+                event_type="modified",
+                path=page.path,
+                block_id=page.block_id,
+                block_type=page.block_type,
+                workspace_id=workspace.id,
+                actor_principal_id=current_user.id,
+            )
+
+        order_keys = [r.get("order_key") for r in outcome["results"]]
+        for page in pages:
+            _schedule_rebalance(notebook_path, notebook.id, page.block_id, *order_keys)
+
+        return outcome
+    except BlockOperationError as e:
+        status_code = 404 if isinstance(e.error, FileNotFoundError) else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
+    finally:
+        nb_session.close()
+
+
 @nested_router.put("/{block_id}", response_model=BlockResponse)
 async def update_block(
     workspace_identifier: str,
@@ -500,6 +639,7 @@ async def update_block(
             block_type=result.get("block_type"),
             workspace_id=workspace.id,
             actor_principal_id=current_user.id,
+            parent_block_id=result.get("parent_block_id"),
         )
 
         # Include updated siblings when type changed (view needs refresh)
@@ -556,8 +696,10 @@ async def move_block_endpoint(
             block_type=result.get("block_type"),
             workspace_id=workspace.id,
             actor_principal_id=current_user.id,
+            parent_block_id=request.new_parent_block_id,
         )
 
+        _schedule_rebalance(notebook_path, notebook.id, request.new_parent_block_id, result.get("order_key"))
         return result
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -567,6 +709,43 @@ async def move_block_endpoint(
         nb_session.close()
 
 
+@nested_router.patch("/{block_id}/children/order", response_model=BlockMovesResponse)
+async def move_children_endpoint(
+    workspace_identifier: str,
+    notebook_identifier: str,
+    block_id: str,
+    request: MoveBlocksRequest,
+    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_system_session),
+):
+    """Move several children of a page relative to their siblings.
+
+    Only the moved blocks get new order keys, so the response lists just
+    those blocks rather than the whole page.
+    """
+    notebook_path, notebook, workspace = await get_notebook_path_nested(
+        workspace_identifier, notebook_identifier, current_user, session, required_level=PermissionLevel.WRITE
+    )
+
+    nb_session = get_notebook_session(str(notebook_path))
+    try:
+        changed = move_blocks_within_page(
+            notebook_path=notebook_path,
+            notebook_id=notebook.id,
+            page_block_id=block_id,
+            moves=[move.model_dump() for move in request.moves],
+            nb_session=nb_session,
+        )
+        _schedule_rebalance(notebook_path, notebook.id, block_id, *(b["order_key"] for b in changed))
+        return {"parent_block_id": block_id, "blocks": changed}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        nb_session.close()
+
+
 @nested_router.patch("/{block_id}/reorder", response_model=BlockReorderResponse)
 async def reorder_blocks_endpoint(
     workspace_identifier: str,
@@ -583,13 +762,14 @@ async def reorder_blocks_endpoint(
 
     nb_session = get_notebook_session(str(notebook_path))
     try:
-        reorder_blocks(
+        reordered = reorder_blocks(
             notebook_path=notebook_path,
             notebook_id=notebook.id,
             page_block_id=block_id,
             block_ids_in_order=request.block_ids,
             nb_session=nb_session,
         )
+        _schedule_rebalance(notebook_path, notebook.id, block_id, *(b["order_key"] for b in reordered))
         # Return reordered children with content
         blocks = _get_children_with_content(notebook_path, notebook.id, block_id, nb_session)
         return {"parent_block_id": block_id, "blocks": blocks}
@@ -635,6 +815,7 @@ async def delete_block_endpoint(
             block_id=block_id,
             workspace_id=workspace.id,
             actor_principal_id=current_user.id,
+            parent_block_id=parent_block_id,
         )
 
         result: dict[str, Any] = {"message": "Block deleted successfully"}
@@ -763,10 +944,15 @@ async def get_block_content_endpoint(
     workspace_identifier: str,
     notebook_identifier: str,
     block_id: str,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_system_session),
 ):
-    """Serve binary content for a block (mirrors files/{id}/content)."""
+    """Serve binary content for a block (mirrors files/{id}/content).
+
+    Supports byte ranges and conditional requests (``If-None-Match`` against
+    the block's content hash, ``If-Modified-Since``).
+    """
     notebook_path, notebook, workspace = await get_notebook_path_nested(
         workspace_identifier, notebook_identifier, current_user, session
     )
@@ -776,20 +962,11 @@ async def get_block_content_endpoint(
         if not block:
             raise HTTPException(status_code=404, detail="Block not found")
 
-        file_path_str, media_type = serve_block_file(notebook_path, block)
-        if not file_path_str:
-            # Check S3 (fields now directly on Block)
-            if block.s3_key and block.s3_bucket:
-                from fastapi.responses import RedirectResponse
-
-                from codex.core.s3_storage import generate_presigned_url, is_s3_configured
-
-                if is_s3_configured():
-                    url = generate_presigned_url(block.s3_key, block.s3_version_id, block.s3_bucket)
-                    return RedirectResponse(url=url)
+        # Local files get ETag/Range handling; S3-backed content redirects to a presigned URL
+        response = serve_block(request, notebook_path, block)
+        if response is None:
             raise HTTPException(status_code=404, detail="Block content not found")
-
-        return FileResponse(path=file_path_str, media_type=media_type, filename=block.path.split("/")[-1])
+        return response
     finally:
         nb_session.close()
 
@@ -902,7 +1079,6 @@ async def upload_folder(
     session: AsyncSession = Depends(get_system_session),
 ):
     """Stream multiple files into a staging area and kick off a background import task."""
-    import asyncio
     import uuid
     from pathlib import PurePosixPath
 
@@ -1237,6 +1413,7 @@ async def update_block_properties_endpoint(
             properties=result.get("properties"),
             workspace_id=workspace.id,
             actor_principal_id=current_user.id,
+            parent_block_id=result.get("parent_block_id"),
         )
 
         return result
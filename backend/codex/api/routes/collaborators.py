@@ -6,7 +6,7 @@ described in docs/design/multi-user-multi-org.md §8 phase 1 ("invited collabora
 via the existing table").
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
@@ -14,7 +14,7 @@ from sqlmodel import select
 from codex.api.auth import get_current_active_user
 from codex.api.routes.workspaces import get_workspace_by_slug
 from codex.api.schemas import MessageResponse
-from codex.core.events import build_event, enqueue_fanout
+from codex.core.events import build_event, stage_fanout
 from codex.core.permissions import PermissionLevel
 from codex.core.websocket import connection_manager, principal_channel
 from codex.db.database import get_system_session
@@ -121,7 +121,6 @@ async def list_collaborators(
 async def invite_collaborator(
     workspace_identifier: str,
     body: CollaboratorInvite,
-    request: Request,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_system_session),
 ):
@@ -158,10 +157,10 @@ async def invite_collaborator(
         subject={"grantee_id": grantee.id, "permission_level": level},
     )
     session.add(event)
+    await stage_fanout(session, event)
 
     await session.commit()
     await session.refresh(permission)
-    await session.refresh(event)
 
     await connection_manager.broadcast(
         principal_channel(grantee.id),
@@ -173,7 +172,6 @@ async def invite_collaborator(
             "permission_level": level,
         },
     )
-    await enqueue_fanout(request, event.id)
 
     return CollaboratorResponse(
         user_id=grantee.id,
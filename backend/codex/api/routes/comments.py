@@ -10,12 +10,13 @@ import re
 from datetime import UTC, datetime
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from codex.api.auth import PermissionScope, get_current_active_user, require_scope
+from codex.api.pagination import MAX_PAGE_SIZE, page_rows, paginate
 from codex.api.routes.helpers import get_notebook_path_nested
 from codex.api.schemas import (
     CommentCountResponse,
@@ -26,7 +27,7 @@ from codex.api.schemas import (
     MessageResponse,
 )
 from codex.core.blocks import get_block
-from codex.core.events import build_event, enqueue_fanout
+from codex.core.events import build_event, stage_fanout
 from codex.core.permissions import PermissionLevel, effective_level, has_permission, require_level
 from codex.db.database import get_notebook_session, get_system_session
 from codex.db.models import Comment, CommentMention, User, Workspace, WorkspacePermission
@@ -148,16 +149,23 @@ async def list_comments(
     workspace_identifier: str,
     notebook_identifier: str,
     block_id: str,
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_system_session),
 ):
-    """List non-deleted comments on a block, oldest first. Requires read access."""
+    """List non-deleted comments on a block, oldest first. Requires read access.
+
+    Keyset-paginated: pass the previous page's `X-Next-Cursor` header back as
+    `cursor` to fetch the next page.
+    """
     notebook_path, notebook, workspace = await get_notebook_path_nested(
         workspace_identifier, notebook_identifier, current_user, session, required_level=PermissionLevel.READ
     )
     _assert_block_exists(notebook_path, notebook.id, block_id)
 
-    result = await session.execute(
+    stmt = (
         select(Comment, User.username)
         .join(User, User.id == Comment.author_id)
         .where(
@@ -166,9 +174,9 @@ async def list_comments(
             Comment.block_id == block_id,
             Comment.deleted_at.is_(None),
         )
-        .order_by(Comment.created_at)
     )
-    rows = result.all()
+    result = await session.execute(paginate(stmt, Comment.created_at, Comment.id, cursor, limit))
+    rows = page_rows(result.all(), limit, response, key=lambda row: (row[0].created_at, row[0].id))
 
     comment_ids = [comment.id for comment, _ in rows]
     mentions_by_comment: dict[int, list[CommentMention]] = {cid: [] for cid in comment_ids}
@@ -188,7 +196,6 @@ async def create_comment(
     notebook_identifier: str,
     block_id: str,
     payload: CommentCreate,
-    request: Request,
     current_user: User = Depends(require_scope(PermissionScope.COMMENTS_WRITE)),
     session: AsyncSession = Depends(get_system_session),
 ):
@@ -238,12 +245,10 @@ async def create_comment(
         },
     )
     session.add(event)
+    await stage_fanout(session, event)
 
     await session.commit()
     await session.refresh(comment)
-    await session.refresh(event)
-
-    await enqueue_fanout(request, event.id)
 
     return _serialize(comment, current_user.username, mentions)
 
@@ -307,7 +312,6 @@ async def delete_comment(
 @router.post("/{comment_id}/resolve", response_model=CommentResponse)
 async def resolve_comment(
     comment_id: int,
-    request: Request,
     current_user: User = Depends(require_scope(PermissionScope.COMMENTS_WRITE)),
     session: AsyncSession = Depends(get_system_session),
 ):
@@ -340,12 +344,10 @@ async def resolve_comment(
         },
     )
     session.add(event)
+    await stage_fanout(session, event)
 
     await session.commit()
     await session.refresh(comment)
-    await session.refresh(event)
-
-    await enqueue_fanout(request, event.id)
 
     author = await session.get(User, comment.author_id)
     mention_result = await session.execute(select(CommentMention).where(CommentMention.comment_id == comment.id))
@@ -1,15 +1,61 @@
-"""Shared helper functions for API routes."""
+"""Shared helper functions for API routes.
 
+Environment variables:
+    CODEX_NOTEBOOK_PATH_CACHE_TTL – seconds to remember that a notebook's
+                                    directory exists (default 10; 0 checks
+                                    the filesystem on every request)
+"""
+
+import os
+import threading
+import time
 from pathlib import Path
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from codex.api.routes.notebooks import get_notebook_by_slug
-from codex.api.routes.workspaces import get_workspace_by_slug
+from codex.api.routes.notebooks import resolve_notebook
 from codex.core.permissions import PermissionLevel
 from codex.db.models import Notebook, User, Workspace
 
+NOTEBOOK_PATH_CACHE_TTL: float = float(os.getenv("CODEX_NOTEBOOK_PATH_CACHE_TTL", "10"))
+
+# Expired entries are swept once the map grows past this many entries
+_NOTEBOOK_PATH_CACHE_SWEEP_SIZE = 4096
+
+# (workspace path, notebook path) -> (expires, resolved notebook directory)
+_notebook_paths: dict[tuple[str, str], tuple[float, Path]] = {}
+_notebook_paths_lock = threading.Lock()
+
+
+def notebook_directory(workspace: Workspace, notebook: Notebook) -> Path:
+    """Return the notebook's resolved directory, raising 404 if it is missing on disk.
+
+    Resolving the path and checking it exists costs several syscalls, so the
+    result is remembered for a few seconds. The key is the stored paths, so
+    moving a workspace or notebook never hits a stale entry.
+    """
+    key = (workspace.path, notebook.path)
+    now = time.monotonic()
+    with _notebook_paths_lock:
+        entry = _notebook_paths.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    notebook_path = Path(workspace.path).resolve() / notebook.path
+    if not notebook_path.exists():
+        with _notebook_paths_lock:
+            _notebook_paths.pop(key, None)
+        raise HTTPException(status_code=404, detail="Notebook path not found")
+
+    if NOTEBOOK_PATH_CACHE_TTL > 0:
+        with _notebook_paths_lock:
+            if len(_notebook_paths) > _NOTEBOOK_PATH_CACHE_SWEEP_SIZE:
+                for stale in [k for k, (expires, _) in _notebook_paths.items() if expires <= now]:
+                    del _notebook_paths[stale]
+            _notebook_paths[key] = (now + NOTEBOOK_PATH_CACHE_TTL, notebook_path)
+    return notebook_path
+
 
 async def get_notebook_path_nested(
     workspace_identifier: str,
@@ -20,6 +66,9 @@ async def get_notebook_path_nested(
 ) -> tuple[Path, Notebook, Workspace]:
     """Get and verify notebook path using workspace and notebook identifiers.
 
+    The workspace, notebook and the caller's permission come from a single
+    query (see `resolve_notebook`).
+
     Args:
         required_level: Minimum permission level required for this operation
 
@@ -30,15 +79,7 @@ async def get_notebook_path_nested(
         HTTPException if workspace or notebook not found, or the caller's permission
             level is below `required_level`
     """
-    workspace = await get_workspace_by_slug(
-        workspace_identifier, current_user, session, required_level=required_level
+    workspace, notebook = await resolve_notebook(
+        workspace_identifier, notebook_identifier, current_user, session, required_level=required_level
     )
-    notebook = await get_notebook_by_slug(notebook_identifier, workspace, session)
-
-    workspace_path = Path(workspace.path).resolve()
-    notebook_path = workspace_path / notebook.path
-
-    if not notebook_path.exists():
-        raise HTTPException(status_code=404, detail="Notebook path not found")
-
-    return notebook_path, notebook, workspace
+    return notebook_directory(workspace, notebook), notebook, workspace
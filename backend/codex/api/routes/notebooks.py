@@ -7,6 +7,7 @@ from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -19,11 +20,11 @@ from codex.api.schemas import (
     NotebookPluginConfigResponse,
     NotebookResponse,
 )
-from codex.core.permissions import PermissionLevel, require_level
+from codex.core.permissions import PermissionLevel, has_permission, level_from_rows, permission_cache, require_level
 from codex.core.watcher import NotebookWatcher, get_watcher_for_notebook, unregister_watcher
 from codex.core.workspace_sharing import is_shared_workspace
 from codex.db.database import get_system_session, init_notebook_db
-from codex.db.models import Notebook, NotebookPluginConfig, User, Workspace
+from codex.db.models import Notebook, NotebookPluginConfig, OrgMembership, User, Workspace, WorkspacePermission
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,55 @@ async def get_notebook_by_slug(notebook_slug: str, workspace: Workspace, session
     return notebook
 
 
+async def resolve_notebook(
+    workspace_identifier: str,
+    notebook_identifier: str,
+    current_user: User,
+    session: AsyncSession,
+    required_level: PermissionLevel = PermissionLevel.READ,
+) -> tuple[Workspace, Notebook]:
+    """Resolve a workspace slug and notebook slug, asserting the caller has `required_level`.
+
+    Equivalent to `get_workspace_by_slug` followed by `get_notebook_by_slug`,
+    but the workspace, notebook, the caller's org role and grants all come back
+    from one joined query. Only a failed lookup falls back to the separate
+    helpers, to report which part was missing.
+    """
+    generation = permission_cache.generation
+    result = await session.execute(
+        select(Workspace, Notebook, OrgMembership.role, WorkspacePermission.permission_level)
+        .join(Notebook, and_(Notebook.workspace_id == Workspace.id, Notebook.slug == notebook_identifier))
+        .outerjoin(
+            OrgMembership,
+            and_(OrgMembership.org_id == Workspace.org_id, OrgMembership.principal_id == current_user.id),
+        )
+        .outerjoin(
+            WorkspacePermission,
+            and_(WorkspacePermission.workspace_id == Workspace.id, WorkspacePermission.user_id == current_user.id),
+        )
+        .where(Workspace.slug == workspace_identifier)
+    )
+
+    # One row per (workspace, grant); slugs are only unique per owner/org
+    candidates: dict[int, tuple[Workspace, Notebook, str | None, list[str]]] = {}
+    for workspace, notebook, org_role, grant_level in result.all():
+        entry = candidates.setdefault(workspace.id, (workspace, notebook, org_role, []))
+        if grant_level is not None:
+            entry[3].append(grant_level)
+
+    for workspace, notebook, org_role, grant_levels in candidates.values():
+        level = level_from_rows(current_user, workspace, org_role, grant_levels, generation)
+        if level is None:
+            continue
+        if not has_permission(level, required_level):
+            raise HTTPException(status_code=403, detail="Insufficient permission for this operation")
+        return workspace, notebook
+
+    # Nothing accessible matched: raise the same error the two-step lookup would
+    workspace = await get_workspace_by_slug(workspace_identifier, current_user, session, required_level=required_level)
+    return workspace, await get_notebook_by_slug(notebook_identifier, workspace, session)
+
+
 async def slug_exists_for_workspace(session: AsyncSession, slug: str, workspace_id: int) -> bool:
     """Check if a notebook slug already exists within a workspace."""
     result = await session.execute(select(Notebook).where(Notebook.slug == slug, Notebook.workspace_id == workspace_id))
@@ -321,8 +371,7 @@ async def get_notebook_nested(
     session: AsyncSession = Depends(get_system_session),
 ):
     """Get a specific notebook by slug or ID."""
-    workspace = await get_workspace_by_slug(workspace_identifier, current_user, session)
-    notebook = await get_notebook_by_slug(notebook_identifier, workspace, session)
+    _, notebook = await resolve_notebook(workspace_identifier, notebook_identifier, current_user, session)
 
     return {
         "id": notebook.id,
@@ -343,8 +392,7 @@ async def get_notebook_indexing_status_nested(
     session: AsyncSession = Depends(get_system_session),
 ):
     """Get the indexing status for a notebook."""
-    workspace = await get_workspace_by_slug(workspace_identifier, current_user, session)
-    notebook = await get_notebook_by_slug(notebook_identifier, workspace, session)
+    _, notebook = await resolve_notebook(workspace_identifier, notebook_identifier, current_user, session)
 
     from codex.core.watcher import get_active_watchers
 
@@ -363,8 +411,7 @@ async def list_notebook_plugins_nested(
     session: AsyncSession = Depends(get_system_session),
 ):
     """List plugin configurations for a notebook."""
-    workspace = await get_workspace_by_slug(workspace_identifier, current_user, session)
-    notebook = await get_notebook_by_slug(notebook_identifier, workspace, session)
+    _, notebook = await resolve_notebook(workspace_identifier, notebook_identifier, current_user, session)
     return await _list_plugin_configs(notebook.id, session)
 
 
@@ -377,8 +424,7 @@ async def get_notebook_plugin_config_nested(
     session: AsyncSession = Depends(get_system_session),
 ):
     """Get plugin configuration for a notebook."""
-    workspace = await get_workspace_by_slug(workspace_identifier, current_user, session)
-    notebook = await get_notebook_by_slug(notebook_identifier, workspace, session)
+    _, notebook = await resolve_notebook(workspace_identifier, notebook_identifier, current_user, session)
     return await _get_plugin_config(notebook.id, plugin_id, session)
 
 
@@ -392,10 +438,9 @@ async def update_notebook_plugin_config_nested(
     session: AsyncSession = Depends(get_system_session),
 ):
     """Update plugin configuration for a notebook."""
-    workspace = await get_workspace_by_slug(
-        workspace_identifier, current_user, session, required_level=PermissionLevel.WRITE
+    _, notebook = await resolve_notebook(
+        workspace_identifier, notebook_identifier, current_user, session, required_level=PermissionLevel.WRITE
     )
-    notebook = await get_notebook_by_slug(notebook_identifier, workspace, session)
     return await _update_plugin_config(notebook.id, plugin_id, request_data, session)
 
 
@@ -407,10 +452,9 @@ async def delete_notebook_nested(
     session: AsyncSession = Depends(get_system_session),
 ):
     """Delete a notebook and all its contents from disk."""
-    workspace = await get_workspace_by_slug(
-        workspace_identifier, current_user, session, required_level=PermissionLevel.WRITE
+    workspace, notebook = await resolve_notebook(
+        workspace_identifier, notebook_identifier, current_user, session, required_level=PermissionLevel.WRITE
     )
-    notebook = await get_notebook_by_slug(notebook_identifier, workspace, session)
 
     # Save path before ORM objects are expired by commit
     notebook_dir = Path(workspace.path) / notebook.path
@@ -446,8 +490,7 @@ async def delete_notebook_plugin_config_nested(
     session: AsyncSession = Depends(get_system_session),
 ):
     """Delete plugin configuration for a notebook (revert to workspace defaults)."""
-    workspace = await get_workspace_by_slug(
-        workspace_identifier, current_user, session, required_level=PermissionLevel.WRITE
+    _, notebook = await resolve_notebook(
+        workspace_identifier, notebook_identifier, current_user, session, required_level=PermissionLevel.WRITE
     )
-    notebook = await get_notebook_by_slug(notebook_identifier, workspace, session)
     return await _delete_plugin_config(notebook.id, plugin_id, session)
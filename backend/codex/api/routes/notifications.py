@@ -9,15 +9,17 @@ workspace-watch (opt-in/mute) preference.
 
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
-from sqlalchemy import func
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from codex.api.auth import get_current_active_user
+from codex.api.pagination import MAX_PAGE_SIZE, page_rows, paginate
 from codex.api.routes.workspaces import get_workspace_by_slug
 from codex.api.schemas import MessageResponse
+from codex.core import notification_counters
 from codex.core.events import serialize_notification
 from codex.db.database import get_system_session
 from codex.db.models import Event, Notification, User, WorkspaceWatch
@@ -38,6 +40,7 @@ class NotificationResponse(BaseModel):
     workspace_id: int
     actor_id: int | None
     subject: dict
+    event_count: int = 1
     read_at: str | None = None
     created_at: str
 
@@ -67,24 +70,29 @@ def _serialize_notification(notification: Notification, event: Event) -> Notific
 
 @router.get("/", response_model=list[NotificationResponse])
 async def list_notifications(
+    response: Response,
     unread_only: bool = False,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_system_session),
 ):
-    """List the current user's notifications across all workspaces, newest first."""
+    """List the current user's notifications across all workspaces, newest first.
+
+    Keyset-paginated: pass the previous page's `X-Next-Cursor` header back as
+    `cursor` to fetch the next page.
+    """
     stmt = (
         select(Notification, Event)
         .join(Event, Event.id == Notification.event_id)
         .where(Notification.recipient_id == current_user.id)
-        .order_by(Notification.created_at.desc())
     )
     if unread_only:
         stmt = stmt.where(Notification.read_at.is_(None))
-    stmt = stmt.offset(offset).limit(limit)
+    stmt = paginate(stmt, Notification.created_at, Notification.id, cursor, limit, descending=True)
     result = await session.execute(stmt)
-    return [_serialize_notification(notification, event) for notification, event in result.all()]
+    rows = page_rows(result.all(), limit, response, key=lambda row: (row[0].created_at, row[0].id))
+    return [_serialize_notification(notification, event) for notification, event in rows]
 
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
@@ -92,14 +100,13 @@ async def get_unread_count(
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_system_session),
 ):
-    """Get the count of the current user's unread notifications."""
-    result = await session.execute(
-        select(func.count(Notification.id)).where(
-            Notification.recipient_id == current_user.id,
-            Notification.read_at.is_(None),
-        )
-    )
-    return UnreadCountResponse(unread_count=result.scalar_one())
+    """Get the count of the current user's unread notifications.
+
+    Served from the user's materialized counter (see
+    `codex.core.notification_counters`); connected clients also receive the
+    count over their WebSocket whenever it changes.
+    """
+    return UnreadCountResponse(unread_count=await notification_counters.get_unread_count(session, current_user.id))
 
 
 @router.post("/{notification_id}/read", response_model=NotificationResponse)
@@ -114,10 +121,16 @@ async def mark_notification_read(
         raise HTTPException(status_code=404, detail="Notification not found")
 
     if notification.read_at is None:
-        notification.read_at = datetime.now(UTC)
-        session.add(notification)
+        # Conditional update so a concurrent mark-read can't decrement the counter twice
+        result = await session.execute(
+            update(Notification)
+            .where(Notification.id == notification_id, Notification.read_at.is_(None))
+            .values(read_at=datetime.now(UTC))
+        )
+        counts = await notification_counters.adjust_unread_counts(session, {current_user.id: -result.rowcount})
         await session.commit()
         await session.refresh(notification)
+        await notification_counters.push_unread_counts(counts)
 
     event = await session.get(Event, notification.event_id)
     return _serialize_notification(notification, event)
@@ -129,19 +142,19 @@ async def mark_all_notifications_read(
     session: AsyncSession = Depends(get_system_session),
 ):
     """Mark all of the current user's unread notifications as read."""
-    now = datetime.now(UTC)
     result = await session.execute(
-        select(Notification).where(
+        update(Notification)
+        .where(
             Notification.recipient_id == current_user.id,
             Notification.read_at.is_(None),
         )
+        .values(read_at=datetime.now(UTC))
     )
-    notifications = result.scalars().all()
-    for notification in notifications:
-        notification.read_at = now
-        session.add(notification)
+    marked = result.rowcount
+    counts = await notification_counters.adjust_unread_counts(session, {current_user.id: -marked})
     await session.commit()
-    return {"message": f"Marked {len(notifications)} notification(s) as read"}
+    await notification_counters.push_unread_counts(counts)
+    return {"message": f"Marked {marked} notification(s) as read"}
 
 
 @watch_router.get("/", response_model=WorkspaceWatchResponse)
@@ -13,7 +13,7 @@ from codex.api.auth import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     create_access_token,
     get_current_active_user,
-    get_password_hash,
+    get_password_hash_async,
 )
 from codex.api.routes.workspaces import WorkspaceCreate, create_workspace
 from codex.core.oauth import (
@@ -154,7 +154,7 @@ async def google_login_callback(
         user = User(
             username=username,
             email=provider_email,
-            hashed_password=get_password_hash(random_password),
+            hashed_password=await get_password_hash_async(random_password),
             is_active=True,
         )
         session.add(user)
@@ -27,7 +27,7 @@ from codex.api.routes.workspaces import (
     slug_exists_in_db,
 )
 from codex.core.org_permissions import OrgRoleRank
-from codex.core.permissions import PermissionLevel, effective_level
+from codex.core.permissions import PermissionLevel, effective_levels
 from codex.db.database import DATA_DIRECTORY, get_system_session
 from codex.db.models import User, Workspace
 
@@ -59,11 +59,8 @@ async def list_org_workspaces(
     if OrgRoleRank.from_str(membership.role) >= OrgRoleRank.MEMBER:
         return list(workspaces)
 
-    visible = []
-    for workspace in workspaces:
-        if await effective_level(current_user, workspace, session) is not None:
-            visible.append(workspace)
-    return visible
+    levels = await effective_levels(current_user, workspaces, session)
+    return [workspace for workspace in workspaces if levels[workspace.id] is not None]
 
 
 @router.post("/")
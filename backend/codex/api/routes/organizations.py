@@ -25,6 +25,7 @@ from codex.core.org_permissions import (
     get_membership,
     require_org_membership,
 )
+from codex.core.permissions import invalidate_permissions
 from codex.db.database import get_system_session
 from codex.db.models import Organization, OrgMembership, OrgRole, User
 
@@ -224,6 +225,8 @@ async def delete_organization(
     await session.execute(delete(OrgMembership).where(OrgMembership.org_id == org.id))
     await session.delete(org)
     await session.commit()
+    # The bulk delete bypasses the ORM events that normally invalidate cached levels
+    invalidate_permissions()
 
     return {"message": "Organization deleted"}
 
@@ -11,7 +11,7 @@ admin audit log (`GET /audit-log`).
 from datetime import UTC, date, datetime
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -27,7 +27,7 @@ from codex.api.schemas import (
     OrphanRestoreRequest,
 )
 from codex.core.blocks import get_block
-from codex.core.events import build_event, enqueue_fanout
+from codex.core.events import build_event, stage_fanout
 from codex.core.orphaned_discussions import OrphanedThread, find_orphaned_threads, get_orphaned_thread
 from codex.core.permissions import PermissionLevel
 from codex.db.database import get_notebook_session, get_system_session
@@ -87,7 +87,6 @@ def _parse_date(value: str | None, *, end_of_day: bool = False) -> datetime | No
 
 
 async def _restore_thread(
-    request: Request,
     session: AsyncSession,
     workspace: Workspace,
     current_user: User,
@@ -133,9 +132,8 @@ async def _restore_thread(
         },
     )
     session.add(event)
+    await stage_fanout(session, event)
     await session.commit()
-    await session.refresh(event)
-    await enqueue_fanout(request, event.id)
 
     await session.refresh(thread.root)
     for reply in thread.replies:
@@ -285,7 +283,6 @@ async def restore_orphaned_discussion(
     workspace_identifier: str,
     thread_id: int,
     payload: OrphanRestoreRequest,
-    request: Request,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_system_session),
 ):
@@ -299,7 +296,7 @@ async def restore_orphaned_discussion(
     if thread is None:
         raise HTTPException(status_code=404, detail="Orphaned discussion not found")
 
-    thread = await _restore_thread(request, session, workspace, current_user, thread, payload.block_id)
+    thread = await _restore_thread(session, workspace, current_user, thread, payload.block_id)
     return await _serialize_thread(session, thread)
 
 
@@ -347,7 +344,6 @@ async def delete_orphaned_discussion(
 async def bulk_action_orphaned_discussions(
     workspace_identifier: str,
     payload: OrphanBulkActionRequest,
-    request: Request,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_system_session),
 ):
@@ -377,7 +373,7 @@ async def bulk_action_orphaned_discussions(
                 await _archive_thread(session, workspace, current_user, thread)
                 results.append(OrphanBulkActionResult(thread_id=thread_id, success=True, detail="Archived"))
             elif payload.action == "restore":
-                await _restore_thread(request, session, workspace, current_user, thread, payload.block_id)
+                await _restore_thread(session, workspace, current_user, thread, payload.block_id)
                 results.append(OrphanBulkActionResult(thread_id=thread_id, success=True, detail="Restored"))
             else:
                 await _delete_thread(session, workspace, current_user, thread)
@@ -16,7 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from codex.api.auth import get_current_active_user
-from codex.core.blocks import create_page
+from codex.core.blocks import create_page, next_sibling_order_key
 from codex.core.git_manager import GitManager
 from codex.core.metadata import MetadataParser
 from codex.core.watcher import get_content_type, get_watcher_for_notebook
@@ -305,7 +305,7 @@ async def post_snippet(
                 filename=os.path.basename(rel_path),
                 block_type="text",
                 content_format="markdown",
-                order_index=0.0,
+                order_key=next_sibling_order_key(notebook.id, parent_block_id, nb_session),
                 content_type=content_type,
                 size=file_stats.st_size,
                 hash=hashlib.sha256(full_content.encode()).hexdigest(),
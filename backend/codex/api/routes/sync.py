@@ -28,9 +28,9 @@ from sqlmodel import select
 from codex.api.auth import PermissionScope, User, get_current_active_user, require_scope
 from codex.api.routes.notebooks import get_notebook_by_slug
 from codex.api.routes.workspaces import get_workspace_by_slug
-from codex.core.events import build_event, enqueue_fanout
+from codex.core.events import build_event, stage_fanout
 from codex.core.permissions import PermissionLevel
-from codex.core.s3_indexer import is_safe_relative_path
+from codex.core.s3_indexer import is_safe_relative_path, notify_journal_change
 from codex.core.sync_credentials import (
     SYNC_CREDENTIAL_TTL,
     WRITE_OPERATIONS,
@@ -346,6 +346,7 @@ async def push_complete(
     )
 
     if created:
+        notify_journal_change(entry)
         await connection_manager.broadcast(
             workspace_channel(workspace.id),
             {
@@ -363,13 +364,12 @@ async def push_complete(
         )
 
     if created and entry.conflict:
-        await _notify_sync_conflict(request, session, workspace.id, notebook.id, entry, previous_actor_id)
+        await _notify_sync_conflict(session, workspace.id, notebook.id, entry, previous_actor_id)
 
     return entry
 
 
 async def _notify_sync_conflict(
-    request: Request,
     session: AsyncSession,
     workspace_id: int,
     notebook_id: int,
@@ -399,9 +399,8 @@ async def _notify_sync_conflict(
         },
     )
     session.add(event)
+    await stage_fanout(session, event)
     await session.commit()
-    await session.refresh(event)
-    await enqueue_fanout(request, event.id)
 
     await connection_manager.broadcast(
         workspace_channel(workspace_id),
@@ -2,16 +2,19 @@
 
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from arq.jobs import Job
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from codex.api.auth import get_current_active_user
+from codex.api.pagination import MAX_PAGE_SIZE, page_rows, paginate
 from codex.api.routes.workspaces import get_workspace_by_slug
 from codex.core.permissions import PermissionLevel, require_level
 from codex.db.database import get_system_session
 from codex.db.models import Task, User, Workspace
+from codex.worker.queues import enqueue_job, queue_for
 
 router = APIRouter()
 
@@ -48,20 +51,28 @@ async def _verify_workspace_access(
 @router.get("/")
 async def list_tasks(
     workspace_identifier: str,
+    response: Response,
     status: str | None = None,
     assigned_to: str | None = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_system_session),
 ) -> list[Task]:
-    """List all tasks for a workspace, with optional filtering."""
+    """List tasks for a workspace, oldest first, with optional filtering.
+
+    Keyset-paginated: returns at most `limit` tasks (default 100) per request,
+    so callers that need every task must pass the previous page's
+    `X-Next-Cursor` header back as `cursor` until the header is absent.
+    """
     workspace = await get_workspace_by_slug(workspace_identifier, current_user, session)
     stmt = select(Task).where(Task.workspace_id == workspace.id)
     if status is not None:
         stmt = stmt.where(Task.status == status)
     if assigned_to is not None:
         stmt = stmt.where(Task.assigned_to == assigned_to)
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    result = await session.execute(paginate(stmt, Task.created_at, Task.id, cursor, limit))
+    return page_rows(result.scalars().all(), limit, response, key=lambda task: (task.created_at, task.id))
 
 
 @router.get("/{task_id}")
@@ -175,7 +186,7 @@ async def enqueue_task(
     if arq_pool is None:
         raise HTTPException(status_code=503, detail="Task queue is not available (Redis not connected)")
 
-    job = await arq_pool.enqueue_job("run_job", task.id)
+    job = await enqueue_job(arq_pool, "run_job", task.id)
     task.job_id = job.job_id
     task.status = "pending"
     task.updated_at = datetime.now(UTC)
@@ -210,7 +221,7 @@ async def get_task_status(
     arq_pool = getattr(request.app.state, "arq_pool", None)
     if arq_pool is not None and task.job_id:
         try:
-            job = arq_pool.job(task.job_id)
+            job = Job(task.job_id, arq_pool, _queue_name=queue_for("run_job"))
             info = await job.info()
             if info:
                 response["job_status"] = info.status
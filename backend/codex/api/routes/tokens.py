@@ -8,7 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from codex.api.auth import ALLOWED_SCOPES, generate_pat, get_current_active_user, hash_token
-from codex.core.permissions import PermissionLevel, check_permission
+from codex.core.permissions import PermissionLevel, check_permission, effective_levels, has_permission
+from codex.core.token_usage import token_usage
 from codex.db.database import get_system_session
 from codex.db.models import PersonalAccessToken, User, Workspace, WorkspacePermission
 
@@ -122,7 +123,7 @@ async def list_tokens(
             scopes=t.scopes,
             workspace_id=t.workspace_id,
             notebook_id=t.notebook_id,
-            last_used_at=t.last_used_at,
+            last_used_at=token_usage.last_used(t),
             expires_at=t.expires_at,
             is_active=t.is_active,
             created_at=t.created_at,
@@ -180,9 +181,9 @@ async def _assert_can_manage_bot(bot: User, current_user: User, session: AsyncSe
     workspace_ids = [row[0] for row in grants.all()]
     if workspace_ids:
         workspaces_result = await session.execute(select(Workspace).where(Workspace.id.in_(workspace_ids)))
-        for workspace in workspaces_result.scalars().all():
-            if await check_permission(current_user, workspace, PermissionLevel.ADMIN, session):
-                return
+        levels = await effective_levels(current_user, workspaces_result.scalars().all(), session)
+        if any(has_permission(level, PermissionLevel.ADMIN) for level in levels.values()):
+            return
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permission to manage this bot")
 
 
@@ -304,7 +305,7 @@ async def list_bot_tokens(
             scopes=t.scopes,
             workspace_id=t.workspace_id,
             notebook_id=t.notebook_id,
-            last_used_at=t.last_used_at,
+            last_used_at=token_usage.last_used(t),
             expires_at=t.expires_at,
             is_active=t.is_active,
             created_at=t.created_at,
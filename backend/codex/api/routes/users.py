@@ -4,7 +4,7 @@ import logging
 import secrets
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,12 +13,15 @@ from sqlmodel import select
 from codex.api.auth import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_TOKEN_EXPIRE_DAYS,
+    check_login_rate,
     create_access_token,
     get_current_active_user,
-    get_password_hash,
+    get_password_hash_async,
     hash_token,
     issue_refresh_token,
-    verify_password,
+    password_needs_rehash,
+    record_login_result,
+    verify_password_async,
 )
 from codex.api.routes.utils import slugify
 from codex.api.routes.workspaces import WorkspaceCreate, create_workspace, get_workspace_by_slug
@@ -60,11 +63,14 @@ bots_router = APIRouter()
 
 @router.post("/token", response_model=TokenResponse)
 async def login(
+    request: Request,
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(get_system_session),
 ):
     """Login endpoint to get access token."""
+    check_login_rate(request, form_data.username)
+
     result = await session.execute(select(User).where(User.username == form_data.username))
     user = result.scalar_one_or_none()
 
@@ -76,13 +82,22 @@ async def login(
             detail="Bot accounts cannot log in. Authenticate with a personal access token instead.",
         )
 
-    if not user or not user.hashed_password or not verify_password(form_data.password, user.hashed_password):
+    authenticated = bool(
+        user and user.hashed_password and await verify_password_async(form_data.password, user.hashed_password)
+    )
+    record_login_result(form_data.username, authenticated)
+    if not authenticated:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Upgrade hashes made with older parameters while we have the plain password
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash_async(form_data.password)
+        session.add(user)
+
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(data={"sub": user.username}, expires_delta=access_token_expires)
     refresh_token = await issue_refresh_token(user, session)
@@ -129,7 +144,7 @@ async def register(user_data: UserCreate, session: AsyncSession = Depends(get_sy
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(username=user_data.username, email=user_data.email, hashed_password=hashed_password, is_active=True)
 
     session.add(new_user)
@@ -153,10 +168,10 @@ async def change_password(
     session: AsyncSession = Depends(get_system_session),
 ):
     """Change the current user's password."""
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await verify_password_async(body.current_password, current_user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect")
 
-    current_user.hashed_password = get_password_hash(body.new_password)
+    current_user.hashed_password = await get_password_hash_async(body.new_password)
     current_user.updated_at = datetime.now(UTC)
     session.add(current_user)
     await session.commit()
@@ -232,7 +247,7 @@ async def reset_password(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired reset token")
 
     # Update password and mark token as used
-    user.hashed_password = get_password_hash(body.new_password)
+    user.hashed_password = await get_password_hash_async(body.new_password)
     user.updated_at = datetime.now(UTC)
     reset_token.used_at = datetime.now(UTC)
     session.add(user)
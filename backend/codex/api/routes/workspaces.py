@@ -13,7 +13,7 @@ from sqlmodel import select
 from codex.api.auth import get_current_active_user
 from codex.api.routes.utils import slugify
 from codex.api.schemas import MessageResponse, WorkspacePluginConfigResponse
-from codex.core.permissions import PermissionLevel, effective_level, has_permission
+from codex.core.permissions import PermissionLevel, effective_level, effective_levels, has_permission
 from codex.core.watcher import get_watcher_for_notebook, unregister_watcher
 from codex.db.database import DATA_DIRECTORY, get_system_session
 from codex.db.models import (
@@ -207,10 +207,11 @@ async def get_workspace_by_slug(
     result = await session.execute(query)
     candidates = result.scalars().all()
 
+    levels = await effective_levels(current_user, candidates, session)
     workspace = None
     level = None
     for candidate in candidates:
-        level = await effective_level(current_user, candidate, session)
+        level = levels[candidate.id]
         if level is not None:
             workspace = candidate
             break
@@ -1,14 +1,23 @@
 """WebSocket routes for real-time file change notifications."""
 
 import asyncio
+import json
 import logging
+from typing import Any
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from sqlmodel import select
 
 from codex.api.auth import get_user_from_token
 from codex.core.permissions import PermissionLevel, effective_level
-from codex.core.websocket import connection_manager, principal_channel, workspace_channel
+from codex.core.websocket import (
+    ALL_TOPICS,
+    block_topic,
+    connection_manager,
+    notebook_topic,
+    principal_channel,
+    workspace_channel,
+)
 from codex.db.database import async_session_maker
 from codex.db.models import Notebook, User, Workspace
 
@@ -39,30 +48,117 @@ async def _deny(websocket: WebSocket) -> None:
     connection_manager.disconnect(websocket)
 
 
-async def _resolve_principal(websocket: WebSocket, token: str | None, session) -> User | None:
+async def _resolve_principal(websocket: WebSocket, token: str | None, session) -> tuple[User | None, Any]:
     """Resolve the connecting principal from a query-param token or a first auth message.
 
     Supports two handshake styles:
     - `?token=...` on the connection URL.
     - No token on the URL: the client's first message must be
       `{"type": "auth", "token": "..."}`.
+
+    Also returns the auth message's `resume` field, if any (see `_parse_resume`).
     """
     if token:
-        return await get_user_from_token(token, session)
+        return await get_user_from_token(token, session), None
 
     try:
         data = await asyncio.wait_for(websocket.receive_json(), timeout=AUTH_MESSAGE_TIMEOUT_SECONDS)
     except Exception:
-        return None
+        return None, None
 
     if not isinstance(data, dict) or data.get("type") != "auth":
+        return None, None
+
+    return await get_user_from_token(data.get("token") or "", session), data.get("resume")
+
+
+def _parse_resume(resume: Any) -> tuple[str | None, dict[str, int]] | None:
+    """Parse a resume request: `{"epoch": "...", "last_seq": {"<channel>": <seq>, ...}}`.
+
+    Accepts the dict itself or its JSON encoding (from the `resume` query param).
+    Returns None if there is nothing usable to resume from.
+    """
+    if isinstance(resume, str):
+        try:
+            resume = json.loads(resume)
+        except ValueError:
+            return None
+    if not isinstance(resume, dict) or not isinstance(resume.get("last_seq"), dict):
         return None
+    last_seqs = {
+        channel: seq
+        for channel, seq in resume["last_seq"].items()
+        if isinstance(seq, int) and not isinstance(seq, bool) and seq >= 0
+    }
+    epoch = resume.get("epoch")
+    return (epoch if isinstance(epoch, str) else None), last_seqs
+
+
+async def _resolve_topics(topics: list, workspace_id: int) -> tuple[list[str], list]:
+    """Normalize requested subscription topics, rejecting ones outside the workspace.
+
+    Accepts `notebook:{id}`, `page:{block_id}` / `block:{block_id}` and `*`.
+    Notebook topics must name a notebook in the socket's workspace. Block topics
+    need no lookup: they only filter that workspace's channel.
+    """
+    accepted: list[str] = []
+    rejected: list = []
+    notebook_ids: dict[int, str] = {}
+    for topic in topics:
+        kind, _, value = topic.partition(":") if isinstance(topic, str) else ("", "", "")
+        if topic == ALL_TOPICS:
+            accepted.append(ALL_TOPICS)
+        elif kind in ("page", "block") and value:
+            accepted.append(block_topic(value))
+        elif kind == "notebook" and value.isdigit():
+            notebook_ids[int(value)] = topic
+        else:
+            rejected.append(topic)
+
+    if notebook_ids:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Notebook.id).where(Notebook.id.in_(notebook_ids), Notebook.workspace_id == workspace_id)
+            )
+            allowed = set(result.scalars().all())
+        for notebook_id, topic in notebook_ids.items():
+            if notebook_id in allowed:
+                accepted.append(notebook_topic(notebook_id))
+            else:
+                rejected.append(topic)
+    return accepted, rejected
 
-    return await get_user_from_token(data.get("token") or "", session)
+
+async def _handle_client_message(websocket: WebSocket, data: str, channel: str, workspace_id: int) -> None:
+    """Handle a subscribe/unsubscribe request from the client."""
+    try:
+        message = json.loads(data)
+    except ValueError:
+        return
+    if not isinstance(message, dict) or not isinstance(message.get("topics"), list):
+        return
+
+    if message.get("type") == "subscribe":
+        accepted, rejected = await _resolve_topics(message["topics"], workspace_id)
+        for topic in accepted:
+            connection_manager.subscribe_topic(websocket, channel, topic)
+        reply = {"type": "subscribed", "topics": accepted, "rejected": rejected}
+    elif message.get("type") == "unsubscribe":
+        topics = [t for t in message["topics"] if isinstance(t, str)]
+        topics = [block_topic(t.removeprefix("page:")) if t.startswith("page:") else t for t in topics]
+        for topic in topics:
+            connection_manager.unsubscribe_topic(websocket, channel, topic)
+        reply = {"type": "unsubscribed", "topics": topics}
+    else:
+        return
+    reply["subscriptions"] = sorted(connection_manager.topics(websocket, channel))
+    await connection_manager.send(websocket, reply)
 
 
 @router.websocket("/notebooks/{notebook_id}")
-async def notebook_websocket(websocket: WebSocket, notebook_id: int, token: str | None = None):
+async def notebook_websocket(
+    websocket: WebSocket, notebook_id: int, token: str | None = None, resume: str | None = None
+):
     """WebSocket endpoint for receiving file change notifications for a notebook.
 
     Clients must authenticate at handshake time, either via a `token` query param or
@@ -79,12 +175,32 @@ async def notebook_websocket(websocket: WebSocket, notebook_id: int, token: str
         "old_path": "old/path/if/moved.md",  // only for moved events
         "timestamp": "2024-01-15T10:30:00Z"
     }
+
+    Bursts of changes to one notebook arrive as a single summary instead, with
+    `"event_type": "bulk"`, the number of changes in `count` and a sample of
+    `paths`; clients should refetch the notebook's tree.
+
+    The connection starts out subscribed to its own notebook's events only.
+    Clients can widen or narrow that with
+    `{"type": "subscribe" | "unsubscribe", "topics": [...]}`, where topics are
+    `notebook:{id}` (a notebook in the same workspace), `page:{block_id}` or
+    `block:{block_id}` (a block and its direct children), or `*` (the whole
+    workspace). The server answers with `subscribed`/`unsubscribed` and the
+    socket's current `subscriptions`.
+
+    Every broadcast carries its `channel` and a per-channel `seq`; `connected`
+    reports the sequence `epoch` and each channel's current `seq`. To pick up
+    where a dropped connection left off, reconnect with
+    `resume={"epoch": ..., "last_seq": {channel: seq}}` (JSON, as a query param
+    or in the auth message). Missed messages are replayed before any live ones,
+    followed by `resumed`; a channel whose history is gone gets
+    `{"type": "resync_required", "channel": ...}` and the client should refetch.
     """
     await connection_manager.connect(websocket)
 
     try:
         async with async_session_maker() as session:
-            user = await _resolve_principal(websocket, token, session)
+            user, auth_resume = await _resolve_principal(websocket, token, session)
             if user is None:
                 await _deny(websocket)
                 return
@@ -105,7 +221,13 @@ async def notebook_websocket(websocket: WebSocket, notebook_id: int, token: str
                 await _deny(websocket)
                 return
 
-        connection_manager.subscribe(websocket, workspace_channel(workspace.id))
+        resume_request = _parse_resume(resume if resume is not None else auth_resume)
+        if resume_request is not None:
+            connection_manager.hold(websocket)
+
+        channel = workspace_channel(workspace.id)
+        connection_manager.subscribe(websocket, channel)
+        connection_manager.subscribe_topic(websocket, channel, notebook_topic(notebook_id))
         connection_manager.subscribe(websocket, principal_channel(user.id))
     except Exception:
         # Any unexpected failure during auth/authorization (DB error, etc.) must still
@@ -116,21 +238,28 @@ async def notebook_websocket(websocket: WebSocket, notebook_id: int, token: str
 
     try:
         # Send initial connection confirmation
-        await websocket.send_json(
+        await connection_manager.send(
+            websocket,
             {
                 "type": "connected",
                 "notebook_id": notebook_id,
                 "message": "Connected to file change notifications",
-            }
+                "epoch": await connection_manager.backend.epoch(),
+                "channels": await connection_manager.channel_seqs(websocket),
+            },
         )
+        if resume_request is not None:
+            await connection_manager.resume(websocket, *resume_request)
 
         # Keep connection alive and handle any client messages
         while True:
-            # Wait for messages (ping/pong or disconnect)
+            # Wait for messages (ping/pong, subscriptions, or disconnect)
             data = await websocket.receive_text()
             # Handle ping messages
             if data == "ping":
-                await websocket.send_text("pong")
+                await connection_manager.send(websocket, "pong")
+            else:
+                await _handle_client_message(websocket, data, channel, workspace.id)
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for notebook {notebook_id} (user={user.id})")
@@ -308,8 +308,8 @@ class BlockResponse(BaseModel):
     block_type: str | None = None
     type: str | None = None  # Alias used by core create/update functions
     content_format: str | None = None
-    order_index: float | None = None
-    order: float | None = None  # Alias used by core create/move functions
+    order_index: float | None = None  # Legacy float ordering
+    order_key: str | None = None
     file: str | None = None  # Filename, used by core create functions
     title: str | None = None
     file_id: int | None = None
@@ -381,6 +381,27 @@ class BlockReorderResponse(BaseModel):
     blocks: list[BlockResponse]
 
 
+class BlockOrderKeyResponse(BaseModel):
+    """New order key assigned to a block."""
+
+    block_id: str
+    order_key: str
+
+
+class BlockMovesResponse(BaseModel):
+    """Response for a bulk sibling move."""
+
+    parent_block_id: str
+    blocks: list[BlockOrderKeyResponse]
+
+
+class BlockBatchResponse(BaseModel):
+    """Response for a batch of block operations."""
+
+    results: list[dict[str, Any]]
+    pages: list[str]
+
+
 class BlockResolveLinkResponse(BaseModel):
     """Response for block link resolution."""
 
@@ -393,6 +414,7 @@ class BlockResolveLinkResponse(BaseModel):
     block_type: str | None = None
     content_format: str | None = None
     order_index: float | None = None
+    order_key: str | None = None
     title: str | None = None
     file_id: int | None = None
     content_type: str | None = None
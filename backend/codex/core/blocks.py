@@ -13,16 +13,17 @@ import uuid
 from pathlib import Path
 from typing import Any
 
+from sqlalchemy import case, delete, event, func, update
 from sqlmodel import Session, select
 from ulid import ULID
 
-from codex.db.models import Block
+from codex.core.order_keys import key_between, keys_between, needs_rebalance, rekey_for_order
+from codex.core.page_manifest import PAGE_METADATA_FILE, page_manifests
+from codex.db.models import Block, BlockTag, SearchIndex
 from codex.db.models.base import utc_now
 
 logger = logging.getLogger(__name__)
 
-PAGE_METADATA_FILE = ".codex-page.json"
-
 
 def generate_unique_path(file_path: Path) -> Path:
     """Generate a unique file path by appending a numeric suffix if the file already exists."""
@@ -87,56 +88,96 @@ BLOCK_TYPE_TO_EXTENSION = {
 
 
 def read_page_metadata(folder_path: Path) -> dict[str, Any] | None:
-    """Read page metadata from .codex-page.json in the folder."""
-    metadata_file = folder_path / PAGE_METADATA_FILE
-    if not metadata_file.exists():
-        return None
-
-    try:
-        with open(metadata_file) as f:
-            return json.load(f)
-    except Exception as e:
-        logger.warning(f"Failed to read page metadata from {metadata_file}: {e}")
-        return None
+    """Read page metadata from .codex-page.json in the folder (cached)."""
+    return page_manifests.read(folder_path)
 
 
 def write_page_metadata(folder_path: Path, metadata: dict[str, Any]) -> None:
-    """Write page metadata to .codex-page.json in the folder."""
-    metadata_file = folder_path / PAGE_METADATA_FILE
-    with open(metadata_file, "w") as f:
-        json.dump(metadata, f, indent=2, default=str)
+    """Write page metadata to .codex-page.json in the folder (atomic, possibly coalesced)."""
+    page_manifests.write(folder_path, metadata)
 
 
 def is_page_folder(folder_path: Path) -> bool:
     """Check if a folder is a page (has .codex-page.json)."""
-    return (folder_path / PAGE_METADATA_FILE).exists()
+    return page_manifests.exists(folder_path)
 
 
-def _next_order_index(metadata: dict[str, Any]) -> float:
-    """Get the next order index for a new block in a page."""
-    blocks = metadata.get("blocks", [])
-    if not blocks:
-        return 1.0
-    return max(b.get("order", 0) for b in blocks) + 1.0
+def _sorted_entries(metadata: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return a page's block entries sorted by order key.
 
+    Entries written before order keys existed only carry a float ``order``;
+    they are assigned keys in place (keeping their relative order) so the
+    next metadata write persists them.
+    """
+    blocks = metadata.setdefault("blocks", [])
+    if any(not b.get("order_key") for b in blocks):
+        blocks.sort(key=lambda b: (not b.get("order_key"), b.get("order_key") or "", b.get("order", 0)))
+        for entry, key in zip(blocks, rekey_for_order([b.get("order_key") for b in blocks]), strict=True):
+            entry["order_key"] = key
+            entry.pop("order", None)
+    return sorted(blocks, key=lambda b: b["order_key"])
 
-def _insert_order_index(metadata: dict[str, Any], position: int | None) -> float:
-    """Calculate order index for inserting at a specific position.
 
-    Uses fractional indexing: inserting between order 1.0 and 2.0 yields 1.5.
-    """
-    blocks = metadata.get("blocks", [])
-    if not blocks or position is None or position >= len(blocks):
-        return _next_order_index(metadata)
+def _next_order_key(metadata: dict[str, Any]) -> str:
+    """Get the order key for a block appended to the end of a page."""
+    entries = _sorted_entries(metadata)
+    return key_between(entries[-1]["order_key"] if entries else None, None)
 
-    sorted_blocks = sorted(blocks, key=lambda b: b.get("order", 0))
 
+def _insert_order_key(metadata: dict[str, Any], position: int | None, exclude: str | None = None) -> str:
+    """Calculate the order key for inserting at a specific position.
+
+    Only the inserted block gets a key; its siblings keep theirs.
+
+    Args:
+        metadata: Page metadata
+        position: 0-indexed position, None to append
+        exclude: Block ID to ignore (the block being moved)
+    """
+    keys = [b["order_key"] for b in _sorted_entries(metadata) if b.get("block_id") != exclude]
+    if position is None or position >= len(keys):
+        return key_between(keys[-1] if keys else None, None)
     if position <= 0:
-        return sorted_blocks[0].get("order", 1.0) / 2.0
+        return key_between(None, keys[0])
+    return key_between(keys[position - 1], keys[position])
+
+
+def next_sibling_order_key(notebook_id: int, parent_block_id: str | None, nb_session: Session) -> str:
+    """Get the order key for a block appended after its last sibling in the database.
 
-    before = sorted_blocks[position - 1].get("order", 0)
-    after = sorted_blocks[position].get("order", 0)
-    return (before + after) / 2.0
+    Used for blocks created outside a page's metadata (root-level pages,
+    files picked up by the watcher, snippets) so they never sort ahead of
+    their siblings with a NULL key.
+    """
+    last = nb_session.exec(
+        select(Block.order_key)
+        .where(
+            Block.notebook_id == notebook_id,
+            Block.parent_block_id == parent_block_id,
+            Block.order_key != None,  # noqa: E711
+        )
+        .order_by(Block.order_key.desc())
+        .limit(1)
+    ).first()
+    return key_between(last, None)
+
+
+def _bulk_update_order_keys(notebook_id: int, keys_by_id: dict[str, str], nb_session: Session) -> None:
+    """Write new order keys for several blocks with a single UPDATE."""
+    if not keys_by_id:
+        return
+    nb_session.exec(
+        update(Block)
+        .where(Block.notebook_id == notebook_id, Block.block_id.in_(keys_by_id))
+        .values(order_key=case(keys_by_id, value=Block.block_id), updated_at=utc_now())
+    )
+
+
+def _commit_or_flush(nb_session: Session, commit: bool) -> None:
+    if commit:
+        nb_session.commit()
+    else:
+        nb_session.flush()
 
 
 def _generate_block_filename(block_type: str, block_id: str) -> str:
@@ -236,7 +277,7 @@ def add_file_as_block(
         block_type = BLOCK_TYPE_FILE
 
     # Calculate order
-    order = _next_order_index(page_meta)
+    order_key = _next_order_key(page_meta)
     block_id = str(ULID())
 
     # Add to page metadata
@@ -245,7 +286,7 @@ def add_file_as_block(
             "block_id": block_id,
             "type": block_type,
             "file": filename,
-            "order": order,
+            "order_key": order_key,
         }
     )
     write_page_metadata(page_full_path, page_meta)
@@ -261,7 +302,7 @@ def add_file_as_block(
         path=file_path,
         block_type=block_type,
         content_format="binary",
-        order_index=order,
+        order_key=order_key,
         title=None,
         filename=os.path.basename(file_path),
         content_type=ct,
@@ -275,7 +316,7 @@ def add_file_as_block(
         "type": block_type,
         "file": filename,
         "path": file_path,
-        "order": order,
+        "order_key": order_key,
     }
 
 
@@ -287,6 +328,7 @@ def create_page(
     description: str | None = None,
     properties: dict[str, Any] | None = None,
     nb_session: Session | None = None,
+    commit: bool = True,
 ) -> dict[str, Any]:
     """Create a new page (folder with .codex-page.json).
 
@@ -298,6 +340,7 @@ def create_page(
         description: Optional description
         properties: Optional custom properties
         nb_session: Optional database session (caller manages lifecycle)
+        commit: Commit the session (False to only flush)
 
     Returns:
         The page metadata dict including block_id and path.
@@ -350,22 +393,25 @@ def create_page(
     if nb_session is not None:
         # Determine parent_block_id
         parent_block_id = None
+        order_key = None
         if parent_path:
             parent_meta = read_page_metadata(notebook_path / parent_path)
             if parent_meta:
                 parent_block_id = parent_meta.get("block_id")
 
                 # Also add this page as a child block in the parent's metadata
-                parent_order = _next_order_index(parent_meta)
+                order_key = _next_order_key(parent_meta)
                 parent_meta["blocks"].append(
                     {
                         "block_id": block_id,
                         "type": BLOCK_TYPE_PAGE,
                         "file": f"{safe_name}/",
-                        "order": parent_order,
+                        "order_key": order_key,
                     }
                 )
                 write_page_metadata(notebook_path / parent_path, parent_meta)
+        if order_key is None:
+            order_key = next_sibling_order_key(notebook_id, None, nb_session)
 
         block = Block(
             notebook_id=notebook_id,
@@ -374,13 +420,13 @@ def create_page(
             path=page_path,
             block_type=BLOCK_TYPE_PAGE,
             content_format="markdown",
-            order_index=0.0,  # Pages use their parent's order for them
+            order_key=order_key,
             title=title,
             description=description,
             properties=json.dumps(properties) if properties else None,
         )
         nb_session.add(block)
-        nb_session.commit()
+        _commit_or_flush(nb_session, commit)
 
         # Create an initial empty text block so the page isn't blank
         create_block(
@@ -390,6 +436,7 @@ def create_page(
             block_type=BLOCK_TYPE_TEXT,
             content="",
             nb_session=nb_session,
+            commit=commit,
         )
 
     return {
@@ -410,6 +457,7 @@ def create_block(
     position: int | None = None,
     content_format: str = "markdown",
     nb_session: Session | None = None,
+    commit: bool = True,
 ) -> dict[str, Any]:
     """Create a new block (file) within a page (folder).
 
@@ -422,6 +470,7 @@ def create_block(
         position: Optional position (0-indexed). None = append to end.
         content_format: Content format (markdown, json, binary)
         nb_session: Optional database session
+        commit: Commit the session (False to only flush)
 
     Returns:
         Block metadata dict.
@@ -442,8 +491,8 @@ def create_block(
     if page_meta is None:
         raise ValueError(f"Not a page folder (no {PAGE_METADATA_FILE}): {page_path}")
 
-    # Calculate order index
-    order = _insert_order_index(page_meta, position)
+    # Calculate order key
+    order_key = _insert_order_key(page_meta, position)
 
     # Generate block ID and filename
     block_id = str(ULID())
@@ -465,7 +514,7 @@ def create_block(
             "block_id": block_id,
             "type": block_type,
             "file": filename,
-            "order": order,
+            "order_key": order_key,
         }
     )
     write_page_metadata(page_full_path, page_meta)
@@ -485,20 +534,20 @@ def create_block(
             path=relative_path,
             block_type=block_type,
             content_format=content_format,
-            order_index=order,
+            order_key=order_key,
             title=None,
             content_type=ct,
             size=sz,
         )
         nb_session.add(block)
-        nb_session.commit()
+        _commit_or_flush(nb_session, commit)
 
     return {
         "block_id": block_id,
         "type": block_type,
         "file": filename,
         "path": relative_path,
-        "order": order,
+        "order_key": order_key,
         "content": content,
     }
 
@@ -510,6 +559,7 @@ def update_block_content(
     content: str,
     block_type: str | None = None,
     nb_session: Session | None = None,
+    commit: bool = True,
 ) -> dict[str, Any]:
     """Update the content of a block, optionally changing its type.
 
@@ -520,6 +570,7 @@ def update_block_content(
         content: New content
         block_type: Optional new block type
         nb_session: Database session
+        commit: Commit the session (False to only flush)
 
     Returns:
         Updated block metadata.
@@ -556,7 +607,7 @@ def update_block_content(
 
     block.updated_at = utc_now()
     nb_session.add(block)
-    nb_session.commit()
+    _commit_or_flush(nb_session, commit)
 
     return {
         "block_id": block.block_id,
@@ -573,6 +624,7 @@ def move_block(
     new_parent_block_id: str | None,
     position: int | None,
     nb_session: Session,
+    commit: bool = True,
 ) -> dict[str, Any]:
     """Move a block to a new parent page and/or position.
 
@@ -583,6 +635,7 @@ def move_block(
         new_parent_block_id: Target parent block ID (None for root level)
         position: Position within the new parent (None = append)
         nb_session: Database session
+        commit: Commit the session (False to only flush)
 
     Returns:
         Updated block metadata.
@@ -609,18 +662,28 @@ def move_block(
         # Moving to root - use notebook root
         new_parent_path = ""
 
+    if block.block_type == BLOCK_TYPE_PAGE and (
+        new_parent_path == block.path or new_parent_path.startswith(f"{block.path}/")
+    ):
+        raise ValueError("Cannot move a page into itself or one of its descendants")
+
     new_parent_full = notebook_path / new_parent_path if new_parent_path else notebook_path
-    new_parent_meta = read_page_metadata(new_parent_full)
+    same_parent = new_parent_full == old_parent_full
+    new_parent_meta = old_parent_meta if same_parent else read_page_metadata(new_parent_full)
 
     if not new_parent_meta:
         raise ValueError(f"Target is not a page folder: {new_parent_path}")
 
     filename = Path(block.path).name
 
+    # Calculate the new key before removing the block so positions refer to its siblings
+    order_key = _insert_order_key(new_parent_meta, position, exclude=block_id)
+
     # Remove from old parent metadata
     if old_parent_meta:
         old_parent_meta["blocks"] = [b for b in old_parent_meta.get("blocks", []) if b.get("block_id") != block_id]
-        write_page_metadata(old_parent_full, old_parent_meta)
+        if not same_parent:
+            write_page_metadata(old_parent_full, old_parent_meta)
 
     # Move file on disk if parent changed
     old_file = notebook_path / block.path
@@ -632,19 +695,20 @@ def move_block(
 
     if old_file != new_file:
         if block.block_type == BLOCK_TYPE_PAGE:
+            # Manifests inside the folder must be on disk before it moves
+            page_manifests.flush(old_file)
+            page_manifests.discard(old_file)
             shutil.move(str(old_file), str(new_file))
+            _move_subtree_rows(notebook_id, block.path, new_file_path, nb_session)
         else:
             old_file.rename(new_file)
 
-    # Calculate new order
-    order = _insert_order_index(new_parent_meta, position)
-
     # Add to new parent metadata
     entry = {
         "block_id": block_id,
         "type": block.block_type,
         "file": f"{filename}/" if block.block_type == BLOCK_TYPE_PAGE else filename,
-        "order": order,
+        "order_key": order_key,
     }
     new_parent_meta.setdefault("blocks", []).append(entry)
     write_page_metadata(new_parent_full, new_parent_meta)
@@ -654,16 +718,16 @@ def move_block(
 
     block.path = new_file_path
     block.parent_block_id = new_parent_block_id
-    block.order_index = order
+    block.order_key = order_key
     block.updated_at = utc_now()
     nb_session.add(block)
-    nb_session.commit()
+    _commit_or_flush(nb_session, commit)
 
     return {
         "block_id": block_id,
         "path": new_file_path,
         "parent_block_id": new_parent_block_id,
-        "order": order,
+        "order_key": order_key,
     }
 
 
@@ -673,6 +737,7 @@ def reorder_blocks(
     page_block_id: str,
     block_ids_in_order: list[str],
     nb_session: Session,
+    commit: bool = True,
 ) -> list[dict[str, Any]]:
     """Reorder blocks within a page.
 
@@ -682,6 +747,7 @@ def reorder_blocks(
         page_block_id: Block ID of the page to reorder
         block_ids_in_order: Block IDs in desired order
         nb_session: Database session
+        commit: Commit the session (False to only flush)
 
     Returns:
         List of reordered block entries.
@@ -698,47 +764,154 @@ def reorder_blocks(
     if not page_meta:
         raise ValueError(f"Not a page folder: {page_block.path}")
 
-    # Build a map of existing blocks by block_id
-    blocks_by_id = {b["block_id"]: b for b in page_meta.get("blocks", [])}
+    # Requested blocks first, then any others in their current order
+    entries = _sorted_entries(page_meta)
+    blocks_by_id = {b["block_id"]: b for b in entries}
+    requested = [blocks_by_id[bid] for bid in dict.fromkeys(block_ids_in_order) if bid in blocks_by_id]
+    requested_ids = {b["block_id"] for b in requested}
+    reordered = requested + [b for b in entries if b["block_id"] not in requested_ids]
 
-    # Reorder
-    reordered = []
-    from codex.db.models.base import utc_now
-
-    now = utc_now()
-    for i, bid in enumerate(block_ids_in_order):
-        if bid in blocks_by_id:
-            entry = blocks_by_id[bid]
-            entry["order"] = float(i + 1)
-            reordered.append(entry)
-
-            # Update DB
-            db_block = nb_session.exec(
-                select(Block).where(Block.notebook_id == notebook_id, Block.block_id == bid)
-            ).first()
-            if db_block:
-                db_block.order_index = float(i + 1)
-                db_block.updated_at = now
-                nb_session.add(db_block)
-
-    # Add any blocks not in the reorder list at the end
-    for bid, entry in blocks_by_id.items():
-        if bid not in block_ids_in_order:
-            entry["order"] = float(len(reordered) + 1)
-            reordered.append(entry)
+    # Only blocks that are out of place get new keys
+    changed: dict[str, str] = {}
+    for entry, key in zip(reordered, rekey_for_order([b["order_key"] for b in reordered]), strict=True):
+        if entry["order_key"] != key:
+            entry["order_key"] = key
+            changed[entry["block_id"]] = key
 
     page_meta["blocks"] = reordered
     write_page_metadata(page_full_path, page_meta)
-    nb_session.commit()
+    _bulk_update_order_keys(notebook_id, changed, nb_session)
+    _commit_or_flush(nb_session, commit)
 
     return reordered
 
 
+def move_blocks_within_page(
+    notebook_path: Path,
+    notebook_id: int,
+    page_block_id: str,
+    moves: list[dict[str, str | None]],
+    nb_session: Session,
+) -> list[dict[str, Any]]:
+    """Apply several sibling moves within a page in one pass.
+
+    Each move places a block directly after ``after_block_id`` or directly
+    before ``before_block_id`` (neither means the end of the page). Moves are
+    applied in order, and each one rewrites only the moved block's order
+    key, so the page metadata is written once and the database is updated
+    with a single statement regardless of page size.
+
+    Args:
+        notebook_path: Root path of the notebook
+        notebook_id: Notebook ID
+        page_block_id: Block ID of the page whose children are moved
+        moves: Dicts with ``block_id`` and optional ``after_block_id`` /
+            ``before_block_id``
+        nb_session: Database session
+
+    Returns:
+        ``{"block_id", "order_key"}`` for every block whose key changed.
+    """
+    page_block = nb_session.exec(
+        select(Block).where(Block.notebook_id == notebook_id, Block.block_id == page_block_id)
+    ).first()
+
+    if not page_block:
+        raise FileNotFoundError(f"Page block not found: {page_block_id}")
+
+    page_full_path = notebook_path / page_block.path
+    page_meta = read_page_metadata(page_full_path)
+    if not page_meta:
+        raise ValueError(f"Not a page folder: {page_block.path}")
+
+    ordered = _sorted_entries(page_meta)
+    changed: dict[str, str] = {}
+
+    for move in moves:
+        block_id = move.get("block_id")
+        after_id = move.get("after_block_id")
+        before_id = move.get("before_block_id")
+        if after_id and before_id:
+            raise ValueError("Specify only one of after_block_id and before_block_id")
+        if block_id in (after_id, before_id):
+            raise ValueError(f"Block cannot be positioned relative to itself: {block_id}")
+
+        positions = {b["block_id"]: i for i, b in enumerate(ordered)}
+        if block_id not in positions:
+            raise FileNotFoundError(f"Block {block_id} is not a child of page {page_block_id}")
+        entry = ordered.pop(positions[block_id])
+        positions = {b["block_id"]: i for i, b in enumerate(ordered)}
+
+        anchor = after_id or before_id
+        if anchor and anchor not in positions:
+            raise FileNotFoundError(f"Block {anchor} is not a child of page {page_block_id}")
+        if after_id:
+            index = positions[after_id] + 1
+        elif before_id:
+            index = positions[before_id]
+        else:
+            index = len(ordered)
+
+        lower = ordered[index - 1]["order_key"] if index > 0 else None
+        upper = ordered[index]["order_key"] if index < len(ordered) else None
+        entry["order_key"] = key_between(lower, upper)
+        changed[entry["block_id"]] = entry["order_key"]
+        ordered.insert(index, entry)
+
+    page_meta["blocks"] = ordered
+    write_page_metadata(page_full_path, page_meta)
+    _bulk_update_order_keys(notebook_id, changed, nb_session)
+    nb_session.commit()
+
+    return [{"block_id": bid, "order_key": key} for bid, key in changed.items()]
+
+
+def rebalance_order_keys(
+    notebook_path: Path,
+    notebook_id: int,
+    page_block_id: str,
+    nb_session: Session,
+) -> bool:
+    """Respace a page's order keys if repeated inserts have made any too long.
+
+    Returns:
+        True if the page was rebalanced.
+    """
+    page_block = nb_session.exec(
+        select(Block).where(Block.notebook_id == notebook_id, Block.block_id == page_block_id)
+    ).first()
+    if not page_block:
+        return False
+
+    page_full_path = notebook_path / page_block.path
+    page_meta = read_page_metadata(page_full_path)
+    if not page_meta:
+        return False
+
+    entries = _sorted_entries(page_meta)
+    if not any(needs_rebalance(b["order_key"]) for b in entries):
+        return False
+
+    changed: dict[str, str] = {}
+    for entry, key in zip(entries, keys_between(None, None, len(entries)), strict=True):
+        if entry["order_key"] != key:
+            entry["order_key"] = key
+            changed[entry["block_id"]] = key
+
+    page_meta["blocks"] = entries
+    write_page_metadata(page_full_path, page_meta)
+    _bulk_update_order_keys(notebook_id, changed, nb_session)
+    nb_session.commit()
+    logger.info("Rebalanced %d order keys in page %s", len(changed), page_block_id)
+    return True
+
+
 def delete_block(
     notebook_path: Path,
     notebook_id: int,
     block_id: str,
     nb_session: Session,
+    commit: bool = True,
 ) -> None:
     """Delete a block and its backing file.
 
@@ -749,6 +922,7 @@ def delete_block(
         notebook_id: Notebook ID
         block_id: Block UUID to delete
         nb_session: Database session
+        commit: Commit the session (False to only flush)
     """
     block = nb_session.exec(select(Block).where(Block.notebook_id == notebook_id, Block.block_id == block_id)).first()
 
@@ -766,21 +940,349 @@ def delete_block(
         write_page_metadata(parent_full, parent_meta)
 
     # Delete from filesystem
-    if block.block_type == BLOCK_TYPE_PAGE and file_path.is_dir():
-        # Recursively delete child blocks from DB first
-        child_blocks = nb_session.exec(
-            select(Block).where(Block.notebook_id == notebook_id, Block.parent_block_id == block_id)
-        ).all()
-        for child in child_blocks:
-            nb_session.delete(child)
-
+    removed_pages: list[str] = []
+    if block.block_type == BLOCK_TYPE_PAGE:
+        removed_pages = [block_id, *_delete_subtree_rows(notebook_id, block.path, nb_session)]
+        page_manifests.discard(file_path)
         shutil.rmtree(file_path, ignore_errors=True)
     elif file_path.exists():
         file_path.unlink()
 
     # Delete the block itself
+    _delete_block_links(Block.id == block.id, nb_session=nb_session)
     nb_session.delete(block)
-    nb_session.commit()
+    _remove_page_indexes_on_commit(nb_session, removed_pages)
+    _commit_or_flush(nb_session, commit)
+
+
+def _subtree_clause(notebook_id: int, path: str):
+    """Match every descendant of ``path`` with a range scan on the path index.
+
+    Paths use BINARY collation and ``"/"`` sorts immediately before ``"0"``,
+    so ``[path + "/", path + "0")`` is exactly the set of paths under ``path``.
+    """
+    return Block.notebook_id == notebook_id, Block.path >= f"{path}/", Block.path < f"{path}0"
+
+
+def _delete_block_links(*criteria, nb_session: Session) -> None:
+    """Delete tag links and search rows for the blocks matching ``criteria``."""
+    ids = select(Block.id).where(*criteria)
+    nb_session.exec(delete(BlockTag).where(BlockTag.block_id.in_(ids)))
+    nb_session.exec(delete(SearchIndex).where(SearchIndex.block_id.in_(ids)))
+
+
+def _delete_subtree_rows(notebook_id: int, path: str, nb_session: Session) -> list[str]:
+    """Delete all descendants of a page with prefix-based DELETE statements.
+
+    Returns:
+        Block IDs of the deleted descendant pages (for search index cleanup).
+    """
+    subtree = _subtree_clause(notebook_id, path)
+    page_ids = list(nb_session.exec(select(Block.block_id).where(*subtree, Block.block_type == BLOCK_TYPE_PAGE)).all())
+    _delete_block_links(*subtree, nb_session=nb_session)
+    nb_session.exec(delete(Block).where(*subtree))
+    return page_ids
+
+
+def _move_subtree_rows(notebook_id: int, old_path: str, new_path: str, nb_session: Session) -> None:
+    """Rewrite the paths of all descendants of a moved page in one UPDATE."""
+    cut = len(old_path) + 1
+    nb_session.exec(
+        update(Block)
+        .where(*_subtree_clause(notebook_id, old_path))
+        .values(
+            path=new_path + func.substr(Block.path, cut),
+            sidecar_path=case(
+                (
+                    func.substr(Block.sidecar_path, 1, cut) == f"{old_path}/",
+                    new_path + func.substr(Block.sidecar_path, cut),
+                ),
+                else_=Block.sidecar_path,
+            ),
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def _remove_page_indexes_on_commit(nb_session: Session, page_block_ids: list[str]) -> None:
+    """Drop FTS and embedding rows for deleted pages once the deletion commits.
+
+    The search tables are written through separate connections, so this has
+    to wait until the notebook transaction has released its lock.
+    """
+    if not page_block_ids:
+        return
+    engine = nb_session.get_bind()
+
+    def _after_commit(session: Session) -> None:
+        event.remove(session, "after_rollback", _after_rollback)
+        from codex.core.vectorizer import remove_page_indexes
+
+        remove_page_indexes(engine, page_block_ids)
+
+    def _after_rollback(session: Session) -> None:
+        event.remove(session, "after_commit", _after_commit)
+
+    event.listen(nb_session, "after_commit", _after_commit, once=True)
+    event.listen(nb_session, "after_rollback", _after_rollback, once=True)
+
+
+class BlockOperationError(Exception):
+    """An operation in a batch failed; ``index`` is its position in the batch."""
+
+    def __init__(self, index: int, error: Exception):
+        super().__init__(f"Operation {index}: {error}")
+        self.index = index
+        self.error = error
+
+
+def apply_block_operations(
+    notebook_path: Path,
+    notebook_id: int,
+    operations: list[dict[str, Any]],
+    nb_session: Session,
+) -> dict[str, Any]:
+    """Apply an ordered list of block operations as one unit.
+
+    Each operation is a dict with an ``op`` of ``create``, ``update``,
+    ``move``, ``delete`` or ``reorder`` and the same fields as the matching
+    single-block call. All of them run in one database transaction and one
+    manifest batch, so every touched page's metadata is written once. A
+    ``create`` may carry a client-chosen ``ref``; later operations can use it
+    anywhere a block ID is expected.
+
+    The whole batch is validated first (operation kinds, required fields,
+    and that every block ID or ``ref`` names an existing block or an earlier
+    ``create``), so a malformed batch changes nothing. File changes can't be
+    rolled back, so if an operation still fails while applying, the
+    transaction is rolled back and the touched pages are re-synced from
+    disk: the file changes of the operations before it are kept.
+
+    Returns:
+        ``{"results": [...], "pages": [...]}`` - one result per operation and
+        the paths of all touched pages.
+
+    Raises:
+        BlockOperationError: If an operation fails.
+    """
+    _validate_block_operations(notebook_id, operations, nb_session)
+
+    refs: dict[str, str] = {}
+    touched_pages: set[str] = set()
+    results: list[dict[str, Any]] = []
+
+    try:
+        with page_manifests.batch():
+            for index, operation in enumerate(operations):
+                try:
+                    result = _apply_block_operation(
+                        notebook_path, notebook_id, operation, refs, touched_pages, nb_session
+                    )
+                except (FileNotFoundError, ValueError) as e:
+                    raise BlockOperationError(index, e) from e
+                results.append(result)
+        nb_session.commit()
+    except Exception:
+        nb_session.rollback()
+        for page_path in sorted(touched_pages):
+            try:
+                sync_page_from_disk(notebook_path, page_path, notebook_id, nb_session)
+            except Exception:
+                logger.exception(f"Failed to resync page {page_path!r} after a failed batch")
+        raise
+
+    return {"results": results, "pages": sorted(touched_pages)}
+
+
+# Block-ID fields each operation kind must carry, and the ones it may carry
+_REQUIRED_OPERATION_IDS: dict[str, tuple[str, ...]] = {
+    "create": ("parent_block_id",),
+    "update": ("block_id",),
+    "move": ("block_id",),
+    "delete": ("block_id",),
+    "reorder": ("block_id",),
+}
+_OPTIONAL_OPERATION_IDS: dict[str, tuple[str, ...]] = {"move": ("new_parent_block_id",)}
+
+
+def _validate_block_operations(notebook_id: int, operations: list[dict[str, Any]], nb_session: Session) -> None:
+    """Check a batch before any of it is applied; see ``apply_block_operations``.
+
+    Raises:
+        BlockOperationError: Naming the first invalid operation.
+    """
+    referenced = {
+        value
+        for operation in operations
+        for field in (
+            *_REQUIRED_OPERATION_IDS.get(operation.get("op"), ()),
+            *_OPTIONAL_OPERATION_IDS.get(operation.get("op"), ()),
+        )
+        if (value := operation.get(field))
+    }
+    referenced.update(bid for operation in operations for bid in operation.get("block_ids") or [])
+    block_types = dict(
+        nb_session.exec(
+            select(Block.block_id, Block.block_type).where(
+                Block.notebook_id == notebook_id, Block.block_id.in_(referenced)
+            )
+        ).all()
+    )
+
+    ref_types: dict[str, str] = {}
+
+    def block_type_of(index: int, value: str) -> str:
+        if value in ref_types:
+            return ref_types[value]
+        if value in block_types:
+            return block_types[value]
+        raise BlockOperationError(index, FileNotFoundError(f"Block not found: {value}"))
+
+    for index, operation in enumerate(operations):
+        kind = operation.get("op")
+        if kind not in _REQUIRED_OPERATION_IDS:
+            raise BlockOperationError(index, ValueError(f"Unknown block operation: {kind!r}"))
+
+        for field in _REQUIRED_OPERATION_IDS[kind]:
+            if not operation.get(field):
+                raise BlockOperationError(index, ValueError(f"{kind} requires {field}"))
+            block_type_of(index, operation[field])
+        for field in _OPTIONAL_OPERATION_IDS.get(kind, ()):
+            if operation.get(field):
+                block_type_of(index, operation[field])
+        for bid in operation.get("block_ids") or []:
+            block_type_of(index, bid)
+
+        if kind == "create":
+            if block_type_of(index, operation["parent_block_id"]) != BLOCK_TYPE_PAGE:
+                raise BlockOperationError(index, ValueError("Parent must be a page block"))
+            if operation.get("ref"):
+                ref_types[operation["ref"]] = operation.get("block_type") or BLOCK_TYPE_TEXT
+        elif kind == "update" and operation.get("content") is None:
+            raise BlockOperationError(index, ValueError("update requires content"))
+
+
+def _apply_block_operation(
+    notebook_path: Path,
+    notebook_id: int,
+    operation: dict[str, Any],
+    refs: dict[str, str],
+    touched_pages: set[str],
+    nb_session: Session,
+) -> dict[str, Any]:
+    """Apply one batch operation without committing; see ``apply_block_operations``."""
+
+    def resolve(value: str | None) -> str | None:
+        return refs.get(value, value) if value else value
+
+    def require_block(value: str | None) -> Block:
+        block_id = resolve(value)
+        if not block_id:
+            raise ValueError("block_id is required")
+        block = get_block(notebook_id, block_id, nb_session)
+        if not block:
+            raise FileNotFoundError(f"Block not found: {block_id}")
+        return block
+
+    def parent_page_path(path: str) -> str:
+        parent = str(Path(path).parent)
+        return "" if parent == "." else parent
+
+    kind = operation.get("op")
+
+    if kind == "create":
+        parent = require_block(operation.get("parent_block_id"))
+        if parent.block_type != BLOCK_TYPE_PAGE:
+            raise ValueError("Parent must be a page block")
+        touched_pages.add(parent.path)
+        if operation.get("block_type") == BLOCK_TYPE_PAGE:
+            result = create_page(
+                notebook_path=notebook_path,
+                notebook_id=notebook_id,
+                parent_path=parent.path,
+                title=operation.get("title") or "Untitled",
+                description=operation.get("description"),
+                properties=operation.get("properties"),
+                nb_session=nb_session,
+                commit=False,
+            )
+            touched_pages.add(result["path"])
+        else:
+            result = create_block(
+                notebook_path=notebook_path,
+                notebook_id=notebook_id,
+                page_path=parent.path,
+                block_type=operation.get("block_type") or BLOCK_TYPE_TEXT,
+                content=operation.get("content") or "",
+                position=operation.get("position"),
+                content_format=operation.get("content_format") or "markdown",
+                nb_session=nb_session,
+                commit=False,
+            )
+            result.pop("content", None)
+        if operation.get("ref"):
+            refs[operation["ref"]] = result["block_id"]
+            result["ref"] = operation["ref"]
+
+    elif kind == "update":
+        block = require_block(operation.get("block_id"))
+        touched_pages.add(parent_page_path(block.path))
+        result = update_block_content(
+            notebook_path=notebook_path,
+            notebook_id=notebook_id,
+            block_id=block.block_id,
+            content=operation["content"],
+            block_type=operation.get("block_type"),
+            nb_session=nb_session,
+            commit=False,
+        )
+        result.pop("content", None)
+
+    elif kind == "move":
+        block = require_block(operation.get("block_id"))
+        touched_pages.add(parent_page_path(block.path))
+        new_parent_block_id = resolve(operation.get("new_parent_block_id"))
+        result = move_block(
+            notebook_path=notebook_path,
+            notebook_id=notebook_id,
+            block_id=block.block_id,
+            new_parent_block_id=new_parent_block_id,
+            position=operation.get("position"),
+            nb_session=nb_session,
+            commit=False,
+        )
+        touched_pages.add(parent_page_path(result["path"]))
+
+    elif kind == "delete":
+        block = require_block(operation.get("block_id"))
+        touched_pages.add(parent_page_path(block.path))
+        delete_block(
+            notebook_path=notebook_path,
+            notebook_id=notebook_id,
+            block_id=block.block_id,
+            nb_session=nb_session,
+            commit=False,
+        )
+        result = {"block_id": block.block_id, "path": block.path}
+
+    elif kind == "reorder":
+        page = require_block(operation.get("block_id"))
+        touched_pages.add(page.path)
+        entries = reorder_blocks(
+            notebook_path=notebook_path,
+            notebook_id=notebook_id,
+            page_block_id=page.block_id,
+            block_ids_in_order=[resolve(bid) for bid in operation.get("block_ids") or []],
+            nb_session=nb_session,
+            commit=False,
+        )
+        result = {"block_id": page.block_id, "path": page.path, "blocks": entries}
+
+    else:
+        raise ValueError(f"Unknown block operation: {kind!r}")
+
+    result["op"] = kind
+    return result
 
 
 def get_block(
@@ -798,13 +1300,16 @@ def get_block_children(
     nb_session: Session,
 ) -> list[Block]:
     """Get ordered children of a page block."""
-    children = nb_session.exec(
-        select(Block).where(
-            Block.notebook_id == notebook_id,
-            Block.parent_block_id == parent_block_id,
-        )
-    ).all()
-    return sorted(children, key=lambda b: b.order_index)
+    return list(
+        nb_session.exec(
+            select(Block)
+            .where(
+                Block.notebook_id == notebook_id,
+                Block.parent_block_id == parent_block_id,
+            )
+            .order_by(Block.order_key, Block.order_index, Block.id)
+        ).all()
+    )
 
 
 def get_root_blocks(
@@ -812,13 +1317,16 @@ def get_root_blocks(
     nb_session: Session,
 ) -> list[Block]:
     """Get root-level blocks (no parent)."""
-    blocks = nb_session.exec(
-        select(Block).where(
-            Block.notebook_id == notebook_id,
-            Block.parent_block_id == None,  # noqa: E711
-        )
-    ).all()
-    return sorted(blocks, key=lambda b: b.order_index)
+    return list(
+        nb_session.exec(
+            select(Block)
+            .where(
+                Block.notebook_id == notebook_id,
+                Block.parent_block_id == None,  # noqa: E711
+            )
+            .order_by(Block.order_key, Block.order_index, Block.id)
+        ).all()
+    )
 
 
 def sync_page_from_disk(
@@ -847,14 +1355,21 @@ def sync_page_from_disk(
     ).first()
 
     if not page_block:
-        # Determine parent
+        # Determine parent, keeping the position the parent's metadata gives this page
         parent_block_id = None
+        order_key = None
         if page_path:
             parent_folder = str(Path(page_path).parent)
             if parent_folder and parent_folder != ".":
                 parent_meta = read_page_metadata(notebook_path / parent_folder)
                 if parent_meta:
                     parent_block_id = parent_meta.get("block_id")
+                    order_key = next(
+                        (e["order_key"] for e in _sorted_entries(parent_meta) if e.get("block_id") == page_block_id),
+                        None,
+                    )
+        if order_key is None:
+            order_key = next_sibling_order_key(notebook_id, parent_block_id, nb_session)
 
         page_block = Block(
             notebook_id=notebook_id,
@@ -863,7 +1378,7 @@ def sync_page_from_disk(
             path=page_path or "",
             block_type=BLOCK_TYPE_PAGE,
             content_format="markdown",
-            order_index=0.0,
+            order_key=order_key,
             title=page_meta.get("title"),
         )
         nb_session.add(page_block)
@@ -882,7 +1397,7 @@ def sync_page_from_disk(
     }
 
     seen_block_ids = set()
-    for entry in page_meta.get("blocks", []):
+    for entry in _sorted_entries(page_meta):
         bid = entry.get("block_id")
         if not bid:
             continue
@@ -890,7 +1405,7 @@ def sync_page_from_disk(
 
         filename = entry.get("file", "")
         block_type = entry.get("type", BLOCK_TYPE_TEXT)
-        order = entry.get("order", 0.0)
+        order_key = entry["order_key"]
 
         # Build relative path
         if filename.endswith("/"):
@@ -903,7 +1418,7 @@ def sync_page_from_disk(
             child = existing_children[bid]
             child.path = rel_path
             child.block_type = block_type
-            child.order_index = order
+            child.order_key = order_key
             nb_session.add(child)
         else:
             # Create new
@@ -914,7 +1429,7 @@ def sync_page_from_disk(
                 path=rel_path,
                 block_type=block_type,
                 content_format="markdown",
-                order_index=order,
+                order_key=order_key,
             )
             nb_session.add(child)
 
@@ -964,9 +1479,9 @@ def get_block_tree(
         else:
             roots.append(node)
 
-    # Sort children by order_index recursively
+    # Sort children by order key recursively
     def _sort(nodes: list[dict[str, Any]]) -> None:
-        nodes.sort(key=lambda n: n.get("order_index", 0))
+        nodes.sort(key=lambda n: (n.get("order_key") or "", n.get("order_index", 0)))
         for n in nodes:
             if "children" in n:
                 _sort(n["children"])
@@ -986,6 +1501,7 @@ def _block_dict(block: Block) -> dict[str, Any]:
         "block_type": block.block_type,
         "content_format": block.content_format,
         "order_index": block.order_index,
+        "order_key": block.order_key,
         "title": block.title,
         "filename": block.filename,
         "content_type": block.content_type,
@@ -1314,19 +1830,19 @@ def upload_to_block(
 
     page_meta = None
     parent_bid = None
-    order = 0.0
+    order_key = None
     if page_block_id:
         parent_bid = page_block_id
         page_full = notebook_path / target_dir
         page_meta = read_page_metadata(page_full)
         if page_meta:
-            order = _next_order_index(page_meta)
+            order_key = _next_order_key(page_meta)
             page_meta.setdefault("blocks", []).append(
                 {
                     "block_id": block_id,
                     "type": block_type,
                     "file": os.path.basename(file_path),
-                    "order": order,
+                    "order_key": order_key,
                 }
             )
             write_page_metadata(page_full, page_meta)
@@ -1338,7 +1854,7 @@ def upload_to_block(
         path=file_path,
         block_type=block_type,
         content_format="binary",
-        order_index=order,
+        order_key=order_key,
         filename=os.path.basename(file_path),
         content_type=content_type,
         size=len(content),
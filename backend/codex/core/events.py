@@ -1,20 +1,17 @@
 """Event outbox helpers (issue #530).
 
-Routes append an `Event` row in the same DB transaction as the domain change
-it describes, then — once that transaction is committed — enqueue an ARQ job
-to fan it out into `Notification` rows off the request path. If the task queue
-is unavailable the event is still durably recorded; only the (best-effort)
-live fanout is skipped.
+Routes append an `Event` row, plus an outbox job to fan it out into
+`Notification` rows off the request path, in the same DB transaction as the
+domain change it describes. The outbox relay enqueues the fanout once the
+transaction commits; if the task queue is unavailable the job waits in the
+outbox until it is back.
 """
 
-import logging
-
-from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from codex.core.outbox import add_job
 from codex.db.models import Event, Notification
 
-logger = logging.getLogger(__name__)
-
 
 def build_event(workspace_id: int, actor_id: int | None, kind: str, subject: dict) -> Event:
     """Construct an `Event` row. Caller is responsible for `session.add` + commit."""
@@ -34,22 +31,19 @@ def serialize_notification(notification: Notification, event: Event) -> dict:
         "workspace_id": event.workspace_id,
         "actor_id": event.actor_id,
         "subject": event.subject,
+        "event_count": notification.event_count,
         "read_at": notification.read_at.isoformat() if notification.read_at else None,
         "created_at": notification.created_at.isoformat(),
     }
 
 
-async def enqueue_fanout(request: Request, event_id: int) -> None:
-    """Enqueue async notification fanout for a committed event.
+async def stage_fanout(session: AsyncSession, event: Event) -> None:
+    """Record the event's `fanout_event` job in the outbox, in the caller's transaction.
 
-    Must be called after the event's transaction has committed, so the worker
-    (a separate process) is guaranteed to see the row when it picks up the job.
+    The caller commits; the outbox relay then enqueues the job (see
+    `codex.core.outbox`), so the event and its fanout are committed together
+    and the request never waits on the task queue.
     """
-    arq_pool = getattr(request.app.state, "arq_pool", None)
-    if arq_pool is None:
-        logger.warning("Skipping notification fanout for event %s — task queue unavailable", event_id)
-        return
-    try:
-        await arq_pool.enqueue_job("fanout_event", event_id)
-    except Exception:
-        logger.exception("Failed to enqueue fanout job for event %s", event_id)
+    if event.id is None:
+        await session.flush()
+    add_job(session, "fanout_event", event.id)
@@ -0,0 +1,244 @@
+"""HTTP file serving for block content.
+
+Block content endpoints hand back either a local file or an S3 object. This
+module centralises how those responses are built so every endpoint gets the
+same caching behaviour:
+
+- ``Block.hash`` (SHA-256 of the content) is used as a strong ``ETag``.
+  Files whose on-disk size or mtime no longer matches the indexed block (the
+  watcher hasn't caught up yet) fall back to a weak mtime/size validator, and
+  are not cached as immutable.
+- ``If-None-Match`` / ``If-Modified-Since`` short-circuit to ``304 Not Modified``.
+- Byte ranges (``Range`` / ``If-Range``) and zero-copy ``pathsend`` are handled
+  by Starlette's ``FileResponse`` once the validators are in place.
+- ``.s3ref`` pointer files and S3-offloaded blocks redirect to a presigned URL.
+
+Environment variables:
+    CODEX_FILE_CACHE_MAX_AGE – seconds a client may reuse content without
+                               revalidating (default 0: always revalidate)
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
+from starlette.requests import Request
+from starlette.responses import FileResponse, RedirectResponse, Response
+
+from codex.core.blocks import serve_block_file
+from codex.core.s3_storage import (
+    POINTER_EXT,
+    PRESIGNED_URL_EXPIRY,
+    generate_presigned_url,
+    is_s3_configured,
+    read_pointer_file,
+)
+from codex.db.models import Block
+
+logger = logging.getLogger(__name__)
+
+FILE_CACHE_MAX_AGE: int = int(os.getenv("CODEX_FILE_CACHE_MAX_AGE", "0"))
+
+# Content addressed by its hash (``?v=<hash>``) never changes, so it can be
+# cached for as long as the browser likes.
+IMMUTABLE_MAX_AGE = 31536000
+
+# Indexed mtimes round-trip through a datetime, which keeps microseconds
+_MTIME_TOLERANCE = 0.001
+
+
+def strong_etag(content_hash: str) -> str:
+    """Build a strong ETag from a content hash."""
+    return f'"{content_hash}"'
+
+
+def weak_etag(stat_result: os.stat_result) -> str:
+    """Build a weak ETag from file mtime and size."""
+    base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+    return f'W/"{hashlib.md5(base.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    """Strip the weak prefix so tags can be compared with the weak comparison function."""
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Return True if an ``If-None-Match`` header matches the given ETag.
+
+    Uses weak comparison as required by RFC 9110 for ``If-None-Match``.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    target = _opaque_tag(etag)
+    return any(_opaque_tag(tag.strip()) == target for tag in if_none_match.split(","))
+
+
+def is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate conditional request headers against the current representation.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only
+    consulted when the client sent no entity tags.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= int(since.timestamp())
+
+    return False
+
+
+def hash_is_current(
+    stat_result: os.stat_result,
+    expected_size: int | None = None,
+    expected_mtime: datetime | None = None,
+) -> bool:
+    """Return True if the file on disk is still the one the indexed hash describes.
+
+    An edit can keep the file size, so the indexed mtime is compared as well;
+    an unknown size or mtime is not held against the hash.
+    """
+    if expected_size is not None and expected_size != stat_result.st_size:
+        return False
+    if expected_mtime is not None and abs(expected_mtime.timestamp() - stat_result.st_mtime) > _MTIME_TOLERANCE:
+        return False
+    return True
+
+
+def cache_control_for(request: Request, content_hash: str | None) -> str:
+    """Derive a ``Cache-Control`` value for a block's content.
+
+    Requests that pin the content hash in the ``v`` query parameter are
+    immutable; everything else is private and revalidated via the ETag.
+    """
+    if content_hash and request.query_params.get("v") == content_hash:
+        return f"private, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return f"private, max-age={FILE_CACHE_MAX_AGE}, must-revalidate"
+
+
+def serve_local_file(
+    request: Request,
+    file_path: Path,
+    media_type: str,
+    filename: str | None = None,
+    content_hash: str | None = None,
+    expected_size: int | None = None,
+    expected_mtime: datetime | None = None,
+) -> Response:
+    """Serve a local file with ETag, conditional and range support.
+
+    Args:
+        request: Incoming request (conditional and range headers are read from it)
+        file_path: Absolute path of the file to serve
+        media_type: MIME type for the response
+        filename: Download filename for ``Content-Disposition``
+        content_hash: SHA-256 of the content, used as a strong ETag
+        expected_size: Indexed size of the content; if it disagrees with the
+            file on disk the hash is considered stale and a weak ETag is used
+        expected_mtime: Indexed modification time of the content, checked
+            the same way as ``expected_size``
+
+    Returns:
+        A ``304`` response, or a ``FileResponse`` that handles ``Range``.
+    """
+    stat_result = file_path.stat()
+
+    if content_hash and not hash_is_current(stat_result, expected_size, expected_mtime):
+        content_hash = None
+    etag = strong_etag(content_hash) if content_hash else weak_etag(stat_result)
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": cache_control_for(request, content_hash),
+    }
+
+    if is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path=str(file_path),
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result,
+        headers=headers,
+    )
+
+
+def s3_redirect(s3_key: str, version_id: str | None = None, bucket: str | None = None) -> RedirectResponse:
+    """Redirect to a presigned S3 URL.
+
+    The redirect itself is cacheable for a little less than the presigned
+    URL's lifetime so repeated loads skip the API round trip.
+    """
+    url = generate_presigned_url(s3_key, version_id, bucket)
+    max_age = max(PRESIGNED_URL_EXPIRY - 60, 0)
+    return RedirectResponse(url=url, headers={"cache-control": f"private, max-age={max_age}"})
+
+
+def pointer_for(file_path: Path) -> dict | None:
+    """Return parsed S3 pointer metadata for a file, if a ``.s3ref`` pointer exists.
+
+    Accepts either the pointer file itself or the path of the binary it
+    stands in for.
+    """
+    pointer_path = file_path if str(file_path).endswith(POINTER_EXT) else Path(f"{file_path}{POINTER_EXT}")
+    if not pointer_path.is_file():
+        return None
+    return read_pointer_file(str(pointer_path))
+
+
+def serve_pointer(pointer: dict) -> RedirectResponse | None:
+    """Redirect to the S3 object described by a parsed pointer file."""
+    if not is_s3_configured():
+        return None
+    s3 = pointer.get("s3") or {}
+    if not s3.get("key"):
+        return None
+    return s3_redirect(s3["key"], s3.get("version_id"), s3.get("bucket"))
+
+
+def serve_block(request: Request, notebook_path: Path, block: Block) -> Response | None:
+    """Serve a block's content from disk or S3.
+
+    Local files are served directly; blocks whose binary lives in S3 (a
+    ``.s3ref`` pointer on disk, or S3 fields on the block) redirect to a
+    presigned URL.
+
+    Returns:
+        The response, or None if the content is unavailable.
+    """
+    file_path = notebook_path / block.path
+
+    if not block.path.endswith(POINTER_EXT):
+        file_path_str, media_type = serve_block_file(notebook_path, block)
+        if file_path_str:
+            return serve_local_file(
+                request,
+                Path(file_path_str),
+                media_type=media_type,
+                filename=file_path.name,
+                content_hash=block.hash,
+                expected_size=block.size,
+                expected_mtime=block.file_modified_at,
+            )
+
+    pointer = pointer_for(file_path)
+    if pointer:
+        response = serve_pointer(pointer)
+        if response:
+            return response
+
+    if block.s3_key and block.s3_bucket and is_s3_configured():
+        return s3_redirect(block.s3_key, block.s3_version_id, block.s3_bucket)
+
+    return None
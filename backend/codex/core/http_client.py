@@ -0,0 +1,135 @@
+"""Shared, long-lived HTTP clients for outbound calls.
+
+Webhook deliveries, integration calls, LLM completions and embedding
+requests used to build a new ``httpx`` client per call, paying DNS, TCP and
+TLS setup on every request. ``get_http_client()`` returns a pooled
+``httpx.AsyncClient`` that keeps connections alive between calls;
+``get_sync_http_client()`` is its thread-safe synchronous counterpart for
+code that runs in worker threads (e.g. the vectorizer).
+
+The API lifespan and the ARQ worker's on_startup/on_shutdown hooks call
+``http_clients.start()`` / ``http_clients.aclose()``. Clients are created
+lazily, so code paths that run outside either (scripts, tests) still work.
+
+An async client's connections belong to the event loop that opened them,
+so one async client is kept per running loop.
+
+Pass a per-request ``timeout=`` to override the default. Redirects are not
+followed unless a request asks with ``follow_redirects=True``. The clients
+are shared across agents, users and workspaces, so they never store
+cookies: a ``Set-Cookie`` from one call must not be replayed on another.
+
+httpx limits connections per client rather than per host, so
+CODEX_HTTP_MAX_CONNECTIONS bounds all outbound hosts together.
+
+HTTP/2 is used when the optional ``h2`` package is installed
+(``pip install httpx[http2]``) and CODEX_HTTP2 is not disabled.
+
+Environment variables:
+    CODEX_HTTP_MAX_CONNECTIONS  – maximum open connections per client (default 100)
+    CODEX_HTTP_MAX_KEEPALIVE    – idle connections kept for reuse (default 20)
+    CODEX_HTTP_KEEPALIVE_EXPIRY – seconds an idle connection is kept (default 30)
+    CODEX_HTTP_TIMEOUT          – default request timeout in seconds (default 30)
+    CODEX_HTTP2                 – "false" to disable HTTP/2 (default: on when h2
+                                  is installed)
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS: int = int(os.getenv("CODEX_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE: int = int(os.getenv("CODEX_HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("CODEX_HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT: float = float(os.getenv("CODEX_HTTP_TIMEOUT", "30"))
+HTTP2_ENABLED: bool = os.getenv("CODEX_HTTP2", "true").lower() not in {"0", "false", "no"} and (
+    importlib.util.find_spec("h2") is not None
+)
+
+
+def _no_cookies() -> CookieJar:
+    """A cookie jar that refuses to store anything (no domain is allowed)."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+class HTTPClientPool:
+    """Owns the process's shared HTTP clients."""
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        timeout: float = HTTP_TIMEOUT,
+        http2: bool = HTTP2_ENABLED,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_client: httpx.Client | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> httpx.AsyncClient:
+        """Return the shared async client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=self.limits, timeout=self.timeout, http2=self.http2, cookies=_no_cookies()
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def get_sync(self) -> httpx.Client:
+        """Return the shared synchronous client (safe to use from any thread)."""
+        with self._lock:
+            if self._sync_client is None or self._sync_client.is_closed:
+                self._sync_client = httpx.Client(
+                    limits=self.limits, timeout=self.timeout, http2=self.http2, cookies=_no_cookies()
+                )
+            return self._sync_client
+
+    async def start(self) -> None:
+        """Open the async client for this loop up front."""
+        self.get()
+        logger.info(f"Shared HTTP client ready (http2={self.http2}, max_connections={self.limits.max_connections})")
+
+    async def aclose(self) -> None:
+        """Close this loop's async client and the sync client."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+            sync_client, self._sync_client = self._sync_client, None
+        if client is not None:
+            await client.aclose()
+        if sync_client is not None:
+            sync_client.close()
+
+
+http_clients = HTTPClientPool()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process's shared async HTTP client."""
+    return http_clients.get()
+
+
+def get_sync_http_client() -> httpx.Client:
+    """Return the process's shared synchronous HTTP client."""
+    return http_clients.get_sync()
@@ -0,0 +1,142 @@
+"""Cross-process invalidation for in-process caches.
+
+Caches such as the permission level cache register a handler for a topic with
+``invalidation_bus.register``. ``invalidation_bus.publish`` runs the local
+handlers straight away and, with the redis backend, also publishes the payload
+so every other API process runs its handlers too. Publishing is synchronous
+and thread-safe, so it can be called from SQLAlchemy session events.
+
+Environment variables:
+    CODEX_CACHE_INVALIDATION – "memory" (default, single process) or "redis"
+    REDIS_URL                – Redis connection URL, shared with the ARQ worker
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION: str = os.getenv("CODEX_CACHE_INVALIDATION", "memory").lower()
+REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+INVALIDATION_CHANNEL = "codex:invalidate"
+
+# Seconds to wait before re-subscribing after the Redis connection drops
+REDIS_RECONNECT_DELAY = 1.0
+
+InvalidationHandler = Callable[[dict], None]
+
+
+class InvalidationBus:
+    """Fans cache invalidations out to this process and, optionally, its peers."""
+
+    def __init__(self, backend: str = CACHE_INVALIDATION, url: str = REDIS_URL, channel: str = INVALIDATION_CHANNEL):
+        self.backend = backend
+        self.url = url
+        self.channel = channel
+        self._handlers: dict[str, list[InvalidationHandler]] = {}
+        self._lock = threading.Lock()
+        # Messages we published come back through the subscription; skip them
+        self._origin = uuid.uuid4().hex
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._redis: Any = None
+        self._listener: asyncio.Task | None = None
+
+    def register(self, topic: str, handler: InvalidationHandler) -> None:
+        """Call `handler(payload)` whenever `topic` is invalidated, in any process."""
+        with self._lock:
+            self._handlers.setdefault(topic, []).append(handler)
+
+    def publish(self, topic: str, payload: dict | None = None) -> None:
+        """Invalidate `topic` here and, with the redis backend, in every other process."""
+        payload = payload or {}
+        self._dispatch(topic, payload)
+        loop = self._loop
+        if loop is None:
+            return
+        message = json.dumps({"origin": self._origin, "topic": topic, "payload": payload})
+        try:
+            loop.call_soon_threadsafe(lambda: loop.create_task(self._publish_remote(message)))
+        except RuntimeError:
+            pass  # Loop closed during shutdown
+
+    def _dispatch(self, topic: str, payload: dict) -> None:
+        with self._lock:
+            handlers = list(self._handlers.get(topic, ()))
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(f"Cache invalidation handler for {topic} failed: {e}", exc_info=True)
+
+    def _client(self) -> Any:
+        if self._redis is None:
+            from redis.asyncio import Redis
+
+            self._redis = Redis.from_url(self.url)
+        return self._redis
+
+    async def _publish_remote(self, message: str) -> None:
+        try:
+            await self._client().publish(self.channel, message)
+        except Exception as e:
+            logger.warning(f"Could not publish cache invalidation to Redis: {e}")
+
+    async def start(self) -> None:
+        """Start relaying invalidations between processes (redis backend only)."""
+        if self.backend != "redis" or self._listener is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"Relaying cache invalidations over Redis ({self.channel})")
+
+    async def stop(self) -> None:
+        self._loop = None
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._client().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                async for item in pubsub.listen():
+                    if item.get("type") == "message":
+                        self._receive(item["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Redis cache invalidation relay disconnected, retrying: {e}")
+                await asyncio.sleep(REDIS_RECONNECT_DELAY)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def _receive(self, data: bytes | str) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed cache invalidation message")
+            return
+        if not isinstance(message, dict) or message.get("origin") == self._origin:
+            return
+        self._dispatch(message.get("topic", ""), message.get("payload") or {})
+
+
+invalidation_bus = InvalidationBus()
@@ -23,6 +23,7 @@ from codex.core.blocks import (
     write_page_metadata,
 )
 from codex.core.metadata import MetadataParser
+from codex.core.order_keys import keys_between
 
 logger = logging.getLogger(__name__)
 
@@ -297,6 +298,7 @@ def import_markdown_to_page(
 
     # Write block files and build metadata
     block_entries = []
+    order_keys = keys_between(None, None, len(parsed_blocks))
     for i, block in enumerate(parsed_blocks):
         block_id = str(uuid.uuid4())
         filename = _block_filename(i, block)
@@ -311,7 +313,7 @@ def import_markdown_to_page(
                 "block_id": block_id,
                 "type": block["type"],
                 "file": filename,
-                "order": float(i + 1),
+                "order_key": order_keys[i],
             }
         )
 
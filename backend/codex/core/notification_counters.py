@@ -0,0 +1,133 @@
+"""Materialized per-user unread notification counts.
+
+The unread badge reads one `NotificationCounter` row rather than counting a
+user's unread `Notification` rows on every poll. Writers keep the counter in
+step inside their own transaction: `fanout_event` adds the notifications it
+inserted, and the mark-read routes subtract the rows they actually flipped.
+The periodic `reconcile_unread_counts` ARQ cron job recomputes counters from
+the notification rows and repairs any that have drifted.
+
+Once the writer's transaction commits, the new count is pushed to the user's
+`principal:{user_id}` WebSocket channel as an `unread_count` message, so open
+clients can update the badge without polling.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+
+from sqlalchemy import case, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from codex.db.database import dialect_insert
+from codex.db.models import Notification, NotificationCounter
+
+logger = logging.getLogger(__name__)
+
+
+async def adjust_unread_counts(session: AsyncSession, deltas: dict[int, int]) -> dict[int, int]:
+    """Add `deltas` (user id -> change) to each user's counter, creating missing rows.
+
+    Runs as a single upsert in the caller's transaction (the caller commits)
+    and returns the resulting counts. Counts never go below zero.
+    """
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return {}
+
+    insert = dialect_insert(session)
+    table = NotificationCounter.__table__
+    now = datetime.now(UTC)
+    stmt = insert(table).values(
+        [
+            {"user_id": user_id, "unread_count": max(delta, 0), "updated_at": now}
+            for user_id, delta in sorted(deltas.items())
+        ]
+    )
+    # `excluded` carries the clamped insert value, so apply the raw delta per user instead
+    delta_expr = case(deltas, value=table.c.user_id, else_=0)
+    new_count = table.c.unread_count + delta_expr
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"unread_count": case((new_count < 0, 0), else_=new_count), "updated_at": now},
+    ).returning(table.c.user_id, table.c.unread_count)
+    result = await session.execute(stmt)
+    return dict(result.all())
+
+
+async def get_unread_count(session: AsyncSession, user_id: int) -> int:
+    """Return the user's materialized unread count (0 if they have no counter yet)."""
+    result = await session.execute(
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+    )
+    return max(result.scalar_one_or_none() or 0, 0)
+
+
+async def reconcile_unread_counts(session: AsyncSession) -> dict[int, int]:
+    """Recompute drifted counters from the notification rows and commit.
+
+    Each drifted counter is rewritten by a statement that counts the user's
+    unread rows at write time, so a notification inserted between the drift
+    check and the repair is still included. Returns the corrected counts.
+    """
+    result = await session.execute(
+        select(Notification.recipient_id, func.count(Notification.id))
+        .where(Notification.read_at.is_(None))
+        .group_by(Notification.recipient_id)
+    )
+    actual = dict(result.all())
+    result = await session.execute(select(NotificationCounter.user_id, NotificationCounter.unread_count))
+    stored = dict(result.all())
+
+    drifted = sorted(
+        user_id for user_id in actual.keys() | stored.keys() if actual.get(user_id, 0) != stored.get(user_id, 0)
+    )
+    if not drifted:
+        return {}
+
+    table = NotificationCounter.__table__
+    now = datetime.now(UTC)
+    missing = [user_id for user_id in drifted if user_id not in stored]
+    if missing:
+        insert = dialect_insert(session)
+        await session.execute(
+            insert(table)
+            .values([{"user_id": user_id, "unread_count": 0, "updated_at": now} for user_id in missing])
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+
+    notifications = Notification.__table__
+    unread = (
+        select(func.count(notifications.c.id))
+        .where(notifications.c.recipient_id == table.c.user_id, notifications.c.read_at.is_(None))
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        update(table)
+        .where(table.c.user_id.in_(drifted))
+        .values(unread_count=unread, updated_at=now)
+        .returning(table.c.user_id, table.c.unread_count)
+    )
+    corrected = dict(result.all())
+    await session.commit()
+
+    logger.warning("Corrected unread notification counters for %d user(s)", len(corrected))
+    return corrected
+
+
+def unread_count_message(count: int) -> dict:
+    """The WebSocket message that carries a user's new unread count."""
+    return {"type": "unread_count", "unread_count": count}
+
+
+async def push_unread_counts(counts: dict[int, int]) -> None:
+    """Push new counts to each user's principal channel. Call after committing."""
+    from codex.core.websocket import connection_manager, principal_channel
+
+    await asyncio.gather(
+        *(
+            connection_manager.broadcast(principal_channel(user_id), unread_count_message(count))
+            for user_id, count in counts.items()
+        )
+    )
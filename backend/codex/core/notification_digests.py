@@ -0,0 +1,133 @@
+"""Coalescing of bursts of related notifications into digests.
+
+A chatty comment thread, or a bot writing hundreds of files, used to give
+every recipient one `Notification` row, one WebSocket push and (for an
+external bot) one webhook per event. Instead `fanout_event` folds an event
+into the recipient's *open digest* for the same group — same kind and the
+same target (e.g. the comment thread) — when that recipient already has an
+unread notification for the group created within the digest window.
+
+The event that opens a digest is delivered immediately, as before. Events
+folded into it only advance the row: `event_id` moves to the latest event
+(so the row shows the latest actor and subject) and `event_count` grows,
+without touching the unread counter. Every fold records the digest's
+`flush_notification_digest` job in the job outbox, in the same transaction
+and held until the window closes; the outbox keeps one job per digest. The
+job pushes the final digest once and, for an external bot, sends one digest
+webhook.
+
+Environment variables:
+    CODEX_NOTIFICATION_DIGEST_WINDOW – seconds a digest absorbs related events (default 60; 0 disables)
+"""
+
+import os
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from codex.db.models import Notification
+
+DIGEST_WINDOW: float = float(os.getenv("CODEX_NOTIFICATION_DIGEST_WINDOW", "60"))
+
+DigestTarget = Callable[[Any], Any]
+
+
+def _comment_thread(event: Any) -> Any:
+    return (event.subject or {}).get("thread_id")
+
+
+def _sync_notebook(event: Any) -> Any:
+    return (event.subject or {}).get("notebook_id")
+
+
+# Registry of digest targets by event kind — kinds not listed here are never coalesced.
+DIGEST_TARGETS: dict[str, DigestTarget] = {
+    "comment.created": _comment_thread,
+    "comment.mention": _comment_thread,
+    "comment.resolved": _comment_thread,
+    "sync.conflict": _sync_notebook,
+}
+
+
+def digest_keys(event: Any, recipient_ids: set[int]) -> dict[int, str]:
+    """Return each recipient's digest group key for `event` (recipients with none are omitted)."""
+    target_of = DIGEST_TARGETS.get(event.kind)
+    target = target_of(event) if target_of is not None and DIGEST_WINDOW > 0 else None
+    if target is None:
+        return {}
+
+    key = f"{event.kind}:{target}"
+    # Mentions of the recipient are grouped apart from the rest of the thread's
+    # mention traffic, so a mention digest only ever absorbs mentions of its
+    # recipient (the digest webhook to an external bot relies on this).
+    mentioned_ids = {int(uid) for uid in (event.subject or {}).get("mentioned_user_ids") or []}
+    return {
+        recipient_id: f"{key}:mentioned" if recipient_id in mentioned_ids else key for recipient_id in recipient_ids
+    }
+
+
+async def coalesce_notifications(
+    session: AsyncSession, event: Any, keys: dict[int, str]
+) -> tuple[list[Notification], set[int]]:
+    """Fold `event` into its recipients' open digests, in the caller's transaction.
+
+    Returns the digests advanced to this event (as transient `Notification`
+    objects) and the ids of every recipient with an open digest for it, which
+    need no new row. A digest that already carries this event or a later one
+    (a retried or out-of-order fanout) is left alone but still counts as
+    covering the recipient, so retries neither duplicate nor double-count.
+    """
+    if not keys:
+        return [], set()
+
+    cutoff = datetime.now(UTC) - timedelta(seconds=DIGEST_WINDOW)
+    result = await session.execute(
+        select(Notification.id, Notification.recipient_id, Notification.group_key, Notification.event_id)
+        .where(
+            Notification.recipient_id.in_(keys),
+            Notification.group_key.in_(set(keys.values())),
+            Notification.read_at.is_(None),
+            Notification.created_at >= cutoff,
+        )
+        .order_by(Notification.id)
+    )
+    open_digests = {
+        recipient_id: (notification_id, event_id)
+        for notification_id, recipient_id, group_key, event_id in result.all()
+        if keys[recipient_id] == group_key
+    }
+    behind = [notification_id for notification_id, event_id in open_digests.values() if event_id < event.id]
+    if not behind:
+        return [], set(open_digests)
+
+    table = Notification.__table__
+    result = await session.execute(
+        update(table)
+        .where(table.c.id.in_(behind), table.c.event_id < event.id)
+        .values(event_id=event.id, event_count=table.c.event_count + 1)
+        .returning(table.c.id, table.c.recipient_id, table.c.group_key, table.c.event_count, table.c.created_at)
+    )
+    merged = [
+        Notification(
+            id=notification_id,
+            event_id=event.id,
+            recipient_id=recipient_id,
+            group_key=group_key,
+            event_count=event_count,
+            created_at=created_at,
+        )
+        for notification_id, recipient_id, group_key, event_count, created_at in sorted(result.all())
+    ]
+    return merged, set(open_digests)
+
+
+def closes_at(notification: Notification) -> datetime:
+    """When the digest window of `notification` closes."""
+    created_at = notification.created_at
+    if created_at.tzinfo is None:  # SQLite returns naive UTC timestamps
+        created_at = created_at.replace(tzinfo=UTC)
+    return created_at + timedelta(seconds=DIGEST_WINDOW)
@@ -0,0 +1,255 @@
+"""Fractional (lexicographic) order keys for sibling blocks.
+
+Sibling order is stored as a short base-62 string per block. Keys compare
+with plain byte-wise string comparison, and a new key can always be generated
+strictly between any two existing keys, so moving one block only ever
+rewrites that block's key.
+
+Each key is an *integer part* followed by an optional *fractional part*:
+
+- The first character of the integer part encodes its length: ``a``-``z``
+  are non-negative integers of 2-27 characters, ``A``-``Z`` are negative.
+  Appending to the end of a page increments the integer part, which keeps
+  keys short even after thousands of appends.
+- The fractional part is only used when inserting between two keys that
+  share an integer part. It never ends in ``0`` so there is always room
+  for another key before it.
+
+Keys generated by repeatedly inserting at the same spot grow by roughly one
+character per six inserts; ``needs_rebalance`` flags keys that have grown
+past ``MAX_KEY_LENGTH`` so they can be respaced in the background.
+"""
+
+import bisect
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Keys longer than this are respaced by the background rebalancer.
+MAX_KEY_LENGTH = 32
+
+_SMALLEST_INTEGER = "A" + "0" * 26
+_ZERO = "a0"
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"Invalid order key head: {head!r}")
+
+
+def _integer_part(key: str) -> str:
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f"Invalid order key: {key!r}")
+    return key[:length]
+
+
+def validate_order_key(key: str) -> None:
+    """Raise ValueError if ``key`` is not a well-formed order key."""
+    if not key:
+        raise ValueError("Order key must not be empty")
+    if key == _SMALLEST_INTEGER:
+        raise ValueError(f"Invalid order key: {key!r}")
+    integer = _integer_part(key)
+    if any(c not in DIGITS for c in key[1:]):
+        raise ValueError(f"Invalid order key: {key!r}")
+    if key[len(integer) :].endswith("0"):
+        raise ValueError(f"Invalid order key: {key!r}")
+
+
+def _increment_integer(integer: str) -> str | None:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) + 1
+        if d < BASE:
+            digits[i] = DIGITS[d]
+            return head + "".join(digits)
+        digits[i] = "0"
+    if head == "Z":
+        return "a0"
+    if head == "z":
+        return None
+    new_head = chr(ord(head) + 1)
+    if new_head > "a":
+        digits.append("0")
+    else:
+        digits.pop()
+    return new_head + "".join(digits)
+
+
+def _decrement_integer(integer: str) -> str | None:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) - 1
+        if d >= 0:
+            digits[i] = DIGITS[d]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    new_head = chr(ord(head) - 1)
+    if new_head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return new_head + "".join(digits)
+
+
+def _midpoint(a: str, b: str | None) -> str:
+    """Return a fractional part strictly between ``a`` and ``b`` (``None`` = 1)."""
+    if b is not None:
+        # Skip the common prefix, treating a missing digit in ``a`` as "0"
+        n = 0
+        while (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def key_between(a: str | None, b: str | None) -> str:
+    """Generate an order key strictly between ``a`` and ``b``.
+
+    Either bound may be None, meaning "before everything" / "after everything".
+
+    Raises:
+        ValueError: If a bound is malformed or ``a >= b``.
+    """
+    if a is not None:
+        validate_order_key(a)
+    if b is not None:
+        validate_order_key(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"Order key {a!r} is not before {b!r}")
+
+    if a is None:
+        if b is None:
+            return _ZERO
+        int_b = _integer_part(b)
+        frac_b = b[len(int_b) :]
+        if int_b == _SMALLEST_INTEGER:
+            return int_b + _midpoint("", frac_b)
+        if int_b < b:
+            return int_b
+        decremented = _decrement_integer(int_b)
+        if decremented is None:
+            raise ValueError("Cannot generate an order key before the smallest key")
+        return decremented
+
+    int_a = _integer_part(a)
+    frac_a = a[len(int_a) :]
+
+    if b is None:
+        incremented = _increment_integer(int_a)
+        return int_a + _midpoint(frac_a, None) if incremented is None else incremented
+
+    int_b = _integer_part(b)
+    frac_b = b[len(int_b) :]
+    if int_a == int_b:
+        return int_a + _midpoint(frac_a, frac_b)
+    incremented = _increment_integer(int_a)
+    if incremented is None:
+        raise ValueError("Cannot generate an order key after the largest key")
+    if incremented < b:
+        return incremented
+    return int_a + _midpoint(frac_a, None)
+
+
+def keys_between(a: str | None, b: str | None, n: int) -> list[str]:
+    """Generate ``n`` increasing order keys strictly between ``a`` and ``b``.
+
+    Keys are spread evenly (bisecting the interval) so the result stays short.
+    """
+    if n <= 0:
+        return []
+    if n == 1:
+        return [key_between(a, b)]
+    if b is None:
+        keys = [key_between(a, None)]
+        for _ in range(n - 1):
+            keys.append(key_between(keys[-1], None))
+        return keys
+    if a is None:
+        keys = [key_between(None, b)]
+        for _ in range(n - 1):
+            keys.append(key_between(None, keys[-1]))
+        keys.reverse()
+        return keys
+    mid = n // 2
+    c = key_between(a, b)
+    return [*keys_between(a, c, mid), c, *keys_between(c, b, n - mid - 1)]
+
+
+def needs_rebalance(key: str | None) -> bool:
+    """Return True if an order key has grown long enough to warrant respacing."""
+    return key is not None and len(key) > MAX_KEY_LENGTH
+
+
+def rekey_for_order(keys: list[str | None]) -> list[str]:
+    """Assign keys to a list of siblings given in their desired order.
+
+    Existing keys that are already in increasing order (the longest such
+    subsequence) are kept; only the remaining positions get new keys, so a
+    single drag-and-drop in an N-item list rewrites exactly one key.
+
+    Args:
+        keys: Current key of each sibling, in the desired order (None for
+            siblings that have no key yet)
+
+    Returns:
+        A key for every position, strictly increasing.
+    """
+    keep = _longest_increasing_positions(keys)
+    result: list[str | None] = [keys[i] if i in keep else None for i in range(len(keys))]
+
+    i = 0
+    while i < len(result):
+        if result[i] is not None:
+            i += 1
+            continue
+        j = i
+        while j < len(result) and result[j] is None:
+            j += 1
+        lower = result[i - 1] if i > 0 else None
+        upper = result[j] if j < len(result) else None
+        result[i:j] = keys_between(lower, upper, j - i)
+        i = j
+    return result  # type: ignore[return-value]
+
+
+def _longest_increasing_positions(keys: list[str | None]) -> set[int]:
+    """Return the positions of a longest strictly increasing subsequence of keys."""
+    tails: list[str] = []  # smallest tail key of an increasing run of each length
+    tail_positions: list[int] = []
+    previous: list[int] = [-1] * len(keys)
+
+    for pos, key in enumerate(keys):
+        if key is None:
+            continue
+        length = bisect.bisect_left(tails, key)
+        if length == len(tails):
+            tails.append(key)
+            tail_positions.append(pos)
+        else:
+            tails[length] = key
+            tail_positions[length] = pos
+        previous[pos] = tail_positions[length - 1] if length > 0 else -1
+
+    positions: set[int] = set()
+    pos = tail_positions[-1] if tail_positions else -1
+    while pos != -1:
+        positions.add(pos)
+        pos = previous[pos]
+    return positions
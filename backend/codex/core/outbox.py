@@ -0,0 +1,279 @@
+"""Transactional outbox for background jobs.
+
+Routes used to commit their change and then enqueue the follow-up ARQ job
+(e.g. `fanout_event`) as a second step: a slow or unavailable Redis stalled
+the request, and a crash between the two steps lost the job. Instead a
+route calls `add_job`, which records an `OutboxJob` row in the same
+transaction as the change, and returns without touching Redis.
+
+`OutboxRelay` drains pending rows to ARQ in batches. Each row's `job_key`
+is passed as the ARQ job id, so a row that is sent twice (a relay crash
+after enqueueing but before marking it, or two API replicas racing) only
+runs once. `add_deferred_job` records a job that is held until a given
+time (its `next_attempt_at`), e.g. a flush at the end of a coalescing
+window. Committing a transaction that added outbox rows wakes the relay
+in that process, so jobs are still enqueued within milliseconds; the poll
+interval only bounds how long rows from elsewhere (or ones whose enqueue
+failed) wait. Dispatched rows are purged after the retention period.
+
+A row whose enqueue fails is retried with exponential backoff, so it can't
+hold up the rows behind it. After CODEX_OUTBOX_MAX_ATTEMPTS failures (e.g.
+a job function with no registered queue) the relay gives up on it: the row
+stays undispatched with its `last_error` for inspection and is purged with
+the dispatched ones.
+
+The relay needs Redis: while no ARQ pool is available, rows accumulate in
+the outbox (they are not purged) and are sent once Redis is reachable.
+
+Environment variables:
+    CODEX_OUTBOX_POLL_INTERVAL   – seconds between relay polls (default 1)
+    CODEX_OUTBOX_BATCH_SIZE      – rows enqueued per relay batch (default 100)
+    CODEX_OUTBOX_ENQUEUE_TIMEOUT – seconds to wait on one ARQ enqueue (default 5)
+    CODEX_OUTBOX_RETENTION       – seconds dispatched rows are kept (default 86400)
+    CODEX_OUTBOX_MAX_ATTEMPTS    – failed enqueues before a row is given up on (default 10)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, bindparam, delete, event, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from codex.db.models import OutboxJob
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_POLL_INTERVAL: float = float(os.getenv("CODEX_OUTBOX_POLL_INTERVAL", "1"))
+OUTBOX_BATCH_SIZE: int = int(os.getenv("CODEX_OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_ENQUEUE_TIMEOUT: float = float(os.getenv("CODEX_OUTBOX_ENQUEUE_TIMEOUT", "5"))
+OUTBOX_RETENTION: float = float(os.getenv("CODEX_OUTBOX_RETENTION", "86400"))
+OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("CODEX_OUTBOX_MAX_ATTEMPTS", "10"))
+
+# Seconds between purges of dispatched rows
+_PURGE_INTERVAL = 600.0
+
+# Retry backoff after a failed enqueue: doubles per attempt, up to the cap (seconds)
+_RETRY_BACKOFF = 1.0
+_RETRY_BACKOFF_MAX = 300.0
+
+
+def add_job(session: AsyncSession | Session, function: str, *args: Any, key: str | None = None) -> OutboxJob:
+    """Record an ARQ job to run once the caller's transaction commits.
+
+    `key` identifies the job for deduplication; it defaults to the function
+    name and arguments. The caller commits.
+    """
+    job = OutboxJob(function=function, args=list(args), job_key=key or ":".join([function, *map(str, args)]))
+    session.add(job)
+    return job
+
+
+async def add_deferred_job(
+    session: AsyncSession, run_at: datetime, function: str, *args: Any, key: str | None = None
+) -> None:
+    """Record an ARQ job to be enqueued no earlier than `run_at`, in the caller's transaction.
+
+    Unlike `add_job`, this is a no-op if a row with the same key already
+    exists (pending or dispatched), so it can be called every time the job
+    is needed and the job still runs once. The caller commits.
+    """
+    from codex.db.database import dialect_insert
+
+    insert = dialect_insert(session)
+    await session.execute(
+        insert(OutboxJob.__table__)
+        .values(
+            function=function,
+            args=list(args),
+            job_key=key or ":".join([function, *map(str, args)]),
+            attempts=0,
+            next_attempt_at=run_at,
+            created_at=datetime.now(UTC),
+        )
+        .on_conflict_do_nothing(index_elements=["job_key"])
+    )
+
+
+class OutboxRelay:
+    """Background task that moves pending outbox rows onto their ARQ queues."""
+
+    def __init__(
+        self,
+        interval: float = OUTBOX_POLL_INTERVAL,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        enqueue_timeout: float = OUTBOX_ENQUEUE_TIMEOUT,
+        retention: float = OUTBOX_RETENTION,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        retry_backoff: float = _RETRY_BACKOFF,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.enqueue_timeout = enqueue_timeout
+        self.retention = retention
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._get_pool: Callable[[], Any] = lambda: None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._last_purge = 0.0
+
+    async def _enqueue(self, pool: Any, job: OutboxJob) -> None:
+        from codex.worker.queues import enqueue_job
+
+        await asyncio.wait_for(
+            enqueue_job(pool, job.function, *job.args, _job_id=job.job_key), timeout=self.enqueue_timeout
+        )
+
+    async def drain(self, pool: Any = None) -> int:
+        """Enqueue one batch of pending rows. Returns the number dispatched."""
+        pool = pool if pool is not None else self._get_pool()
+        if pool is None:
+            return 0
+
+        from codex.db.database import async_session_maker
+
+        now = datetime.now(UTC)
+        async with async_session_maker() as session:
+            stmt = (
+                select(OutboxJob)
+                .where(
+                    OutboxJob.dispatched_at.is_(None),
+                    OutboxJob.attempts < self.max_attempts,
+                    or_(OutboxJob.next_attempt_at.is_(None), OutboxJob.next_attempt_at <= now),
+                )
+                .order_by(OutboxJob.id)
+            )
+            if session.get_bind().dialect.name == "postgresql":
+                # Let concurrent relays (other API replicas) take different rows
+                stmt = stmt.with_for_update(skip_locked=True)
+            result = await session.execute(stmt.limit(self.batch_size))
+            jobs = result.scalars().all()
+            if not jobs:
+                return 0
+
+            outcomes = await asyncio.gather(*(self._enqueue(pool, job) for job in jobs), return_exceptions=True)
+            sent = [job.id for job, outcome in zip(jobs, outcomes, strict=True) if outcome is None]
+            failed = [
+                {
+                    "job_id": job.id,
+                    "error": repr(outcome)[:500],
+                    "retry_at": now + timedelta(seconds=min(self.retry_backoff * 2**job.attempts, _RETRY_BACKOFF_MAX)),
+                }
+                for job, outcome in zip(jobs, outcomes, strict=True)
+                if outcome is not None
+            ]
+
+            table = OutboxJob.__table__
+            if sent:
+                await session.execute(update(table).where(table.c.id.in_(sent)).values(dispatched_at=datetime.now(UTC)))
+            if failed:
+                logger.warning("Could not enqueue %d outbox job(s): %s", len(failed), failed[0]["error"])
+                for job, outcome in zip(jobs, outcomes, strict=True):
+                    if outcome is not None and job.attempts + 1 >= self.max_attempts:
+                        logger.error(f"Giving up on outbox job {job.job_key} after {job.attempts + 1} attempts")
+                await session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("job_id"))
+                    .values(
+                        attempts=table.c.attempts + 1,
+                        last_error=bindparam("error"),
+                        next_attempt_at=bindparam("retry_at"),
+                    ),
+                    failed,
+                )
+            await session.commit()
+        return len(sent)
+
+    async def purge(self) -> int:
+        """Delete rows dispatched, or given up on, longer ago than the retention period."""
+        from codex.db.database import async_session_maker
+
+        cutoff = datetime.now(UTC) - timedelta(seconds=self.retention)
+        async with async_session_maker() as session:
+            result = await session.execute(
+                delete(OutboxJob).where(
+                    or_(
+                        OutboxJob.dispatched_at < cutoff,
+                        and_(OutboxJob.attempts >= self.max_attempts, OutboxJob.next_attempt_at < cutoff),
+                    )
+                )
+            )
+            await session.commit()
+        return result.rowcount
+
+    def wake(self) -> None:
+        """Ask the relay to drain now (safe to call from any thread)."""
+        if self._loop is not None and self._wake is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                # Keep going while batches come back full
+                while await self.drain() == self.batch_size:
+                    pass
+                if time.monotonic() - self._last_purge > _PURGE_INTERVAL:
+                    self._last_purge = time.monotonic()
+                    await self.purge()
+            except Exception as e:
+                logger.warning(f"Outbox relay pass failed: {e}")
+
+    def start(self, get_pool: Callable[[], Any]) -> None:
+        """Start relaying; `get_pool` returns the ARQ pool, or None while it is unavailable."""
+        if self._task is None:
+            self._get_pool = get_pool
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the relay after one last drain."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._loop = None
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.warning(f"Final outbox drain failed: {e}")
+
+
+outbox_relay = OutboxRelay()
+
+
+# Wake the relay when a transaction that added outbox rows commits
+_PENDING_OUTBOX = "codex_outbox_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_outbox_jobs(session: Session, flush_context) -> None:
+    if any(isinstance(obj, OutboxJob) for obj in session.new):
+        session.info[_PENDING_OUTBOX] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_outbox_relay(session: Session) -> None:
+    if session.info.pop(_PENDING_OUTBOX, False):
+        outbox_relay.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_outbox_jobs(session: Session) -> None:
+    session.info.pop(_PENDING_OUTBOX, None)
@@ -0,0 +1,244 @@
+"""In-memory cache and atomic writer for page manifests (.codex-page.json).
+
+Every block mutation reads, edits and rewrites its page's manifest. The
+``PageManifestManager`` keeps parsed manifests in memory (revalidated against
+the file's mtime and size so external edits are still picked up) and writes
+them atomically via a temp file and ``os.replace``.
+
+Writes can be coalesced per page:
+
+- Inside ``page_manifests.batch()`` writes are held until the outermost
+  batch exits, so a multi-step operation writes each page once.
+- Outside a batch, writes are held for ``CODEX_PAGE_MANIFEST_FLUSH_DELAY``
+  seconds and flushed together, collapsing bursts of edits to a page into
+  one write. Set it to 0 to write through instead.
+
+A delayed flush runs in a timer thread; if a write fails there (e.g. the
+disk is full) the error is logged and the manifest stays pending, so reads
+still see it and the next flush retries it.
+
+Reads always see pending (unflushed) changes. The hash of every flushed
+manifest is remembered so the watcher can recognise and skip the file
+events caused by our own writes.
+
+Environment variables:
+    CODEX_PAGE_MANIFEST_FLUSH_DELAY – seconds to hold manifest writes before
+                                      flushing (default 0.1; 0 writes through)
+    CODEX_PAGE_MANIFEST_CACHE_SIZE  – number of parsed manifests to keep
+                                      cached (default 1024)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PAGE_METADATA_FILE = ".codex-page.json"
+
+PAGE_MANIFEST_FLUSH_DELAY: float = float(os.getenv("CODEX_PAGE_MANIFEST_FLUSH_DELAY", "0.1"))
+PAGE_MANIFEST_CACHE_SIZE: int = int(os.getenv("CODEX_PAGE_MANIFEST_CACHE_SIZE", "1024"))
+
+
+@dataclass
+class _CachedManifest:
+    data: dict[str, Any]
+    mtime_ns: int
+    size: int
+
+
+def _serialize(metadata: dict[str, Any]) -> bytes:
+    return json.dumps(metadata, indent=2, default=str).encode()
+
+
+def _copy(value: Any) -> Any:
+    """Copy a manifest so callers can mutate it without touching the cache.
+
+    Manifests are plain JSON, so only dicts and lists need copying; this is
+    much cheaper than ``copy.deepcopy``.
+    """
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+class PageManifestManager:
+    """Caches parsed page manifests and coalesces writes to them."""
+
+    def __init__(self, flush_delay: float = PAGE_MANIFEST_FLUSH_DELAY, cache_size: int = PAGE_MANIFEST_CACHE_SIZE):
+        self.flush_delay = flush_delay
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._cache: OrderedDict[Path, _CachedManifest] = OrderedDict()
+        self._pending: dict[Path, dict[str, Any]] = {}
+        self._written_hashes: dict[Path, str] = {}
+        self._batch = threading.local()
+        self._timer: threading.Timer | None = None
+
+    @staticmethod
+    def _manifest_path(folder_path: Path) -> Path:
+        return Path(folder_path) / PAGE_METADATA_FILE
+
+    def read(self, folder_path: Path) -> dict[str, Any] | None:
+        """Return a page's manifest, or None if the folder is not a page."""
+        path = self._manifest_path(folder_path)
+        with self._lock:
+            if path in self._pending:
+                return _copy(self._pending[path])
+
+            try:
+                stat = path.stat()
+            except OSError:
+                self._cache.pop(path, None)
+                return None
+
+            cached = self._cache.get(path)
+            if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+                self._cache.move_to_end(path)
+                return _copy(cached.data)
+
+            try:
+                data = json.loads(path.read_bytes())
+            except Exception as e:
+                logger.warning(f"Failed to read page metadata from {path}: {e}")
+                return None
+
+            self._remember(path, data, stat)
+            return _copy(data)
+
+    def exists(self, folder_path: Path) -> bool:
+        """Return True if the folder has a manifest, flushed or pending."""
+        path = self._manifest_path(folder_path)
+        with self._lock:
+            return path in self._pending or path.exists()
+
+    def write(self, folder_path: Path, metadata: dict[str, Any]) -> None:
+        """Store a page's manifest, flushing now or after the coalescing window."""
+        path = self._manifest_path(folder_path)
+        with self._lock:
+            self._pending[path] = _copy(metadata)
+            if getattr(self._batch, "depth", 0):
+                return
+            if self.flush_delay <= 0:
+                self._flush_paths([path])
+            else:
+                self._schedule_flush()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Hold manifest writes made in this thread until the outermost batch exits."""
+        self._batch.depth = getattr(self._batch, "depth", 0) + 1
+        try:
+            yield
+        finally:
+            self._batch.depth -= 1
+            if self._batch.depth == 0:
+                with self._lock:
+                    if self.flush_delay <= 0:
+                        self._flush_paths(list(self._pending))
+                    elif self._pending:
+                        self._schedule_flush()
+
+    def flush(self, prefix: Path | None = None) -> None:
+        """Write pending manifests now (all, or only those under ``prefix``)."""
+        with self._lock:
+            paths = list(self._pending)
+            if prefix is not None:
+                paths = [p for p in paths if p.is_relative_to(prefix)]
+            self._flush_paths(paths)
+
+    def discard(self, prefix: Path) -> None:
+        """Forget cached and pending manifests under a folder that is being removed."""
+        with self._lock:
+            for store in (self._pending, self._cache, self._written_hashes):
+                for path in [p for p in store if p.is_relative_to(prefix)]:
+                    del store[path]
+
+    def is_own_write(self, manifest_path: str | Path) -> bool:
+        """Return True if a manifest on disk is exactly what we last wrote there.
+
+        Used by the watcher to ignore file events caused by our own writes.
+        """
+        path = Path(manifest_path)
+        with self._lock:
+            expected = self._written_hashes.get(path)
+        if expected is None:
+            return False
+        try:
+            actual = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return False
+        return actual == expected
+
+    def _schedule_flush(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self._flush_due)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_due(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._flush_paths(list(self._pending), retain_failed=True)
+
+    def _flush_paths(self, paths: list[Path], retain_failed: bool = False) -> None:
+        """Write pending manifests.
+
+        A failed write raises to the caller, unless ``retain_failed`` is set
+        (the timer thread has no caller): then it is logged and the manifest
+        is kept pending for the next flush.
+        """
+        for path in paths:
+            data = self._pending.pop(path, None)
+            if data is None:
+                continue
+            try:
+                self._write_atomic(path, data)
+            except FileNotFoundError:
+                # The page folder was removed before the write was flushed
+                logger.debug(f"Dropping manifest write for removed page {path.parent}")
+                self._cache.pop(path, None)
+            except Exception as e:
+                if not retain_failed:
+                    raise
+                logger.error(f"Failed to write page manifest {path}, keeping it pending: {e}")
+                self._pending.setdefault(path, data)
+
+    def _write_atomic(self, path: Path, data: dict[str, Any]) -> None:
+        content = _serialize(data)
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{PAGE_METADATA_FILE}.", suffix=".tmp")
+        try:
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._written_hashes[path] = hashlib.sha256(content).hexdigest()
+        self._remember(path, data, path.stat())
+
+    def _remember(self, path: Path, data: dict[str, Any], stat: os.stat_result) -> None:
+        self._cache[path] = _CachedManifest(data=data, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        self._cache.move_to_end(path)
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._written_hashes.pop(evicted, None)
+
+
+page_manifests = PageManifestManager()
@@ -10,16 +10,42 @@ Resolution order (design doc §2.3):
    `workspace.org_member_default_level`; guest -> no default (falls through to 3).
 3. Explicit `WorkspacePermission` grant for the user -> the granted level.
 4. The higher of (2) and (3), or None if neither applies.
+
+Resolved levels are cached per (user, workspace) for a short TTL. The cache
+key includes the workspace fields that feed the resolution (owner, org and
+org default level), so editing the workspace changes the key. Committed
+changes to `WorkspacePermission` or `OrgMembership` rows invalidate the
+affected entries, in this process and (with CODEX_CACHE_INVALIDATION=redis)
+in every other API process.
+
+Environment variables:
+    CODEX_PERMISSION_CACHE_TTL  – seconds to cache a resolved level (default 30;
+                                  0 disables the cache)
+    CODEX_PERMISSION_CACHE_SIZE – maximum cached (user, workspace) pairs
+                                  (default 10000)
 """
 
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from enum import IntEnum
 
 from fastapi import HTTPException
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from sqlmodel import select
 
-from codex.core.org_permissions import OrgRoleRank, get_membership
-from codex.db.models import User, Workspace, WorkspacePermission
+from codex.core.invalidation import invalidation_bus
+from codex.core.org_permissions import OrgRoleRank
+from codex.db.models import OrgMembership, User, Workspace, WorkspacePermission
+
+PERMISSION_CACHE_TTL: float = float(os.getenv("CODEX_PERMISSION_CACHE_TTL", "30"))
+PERMISSION_CACHE_SIZE: int = int(os.getenv("CODEX_PERMISSION_CACHE_SIZE", "10000"))
+
+PERMISSIONS_TOPIC = "permissions"
 
 
 class PermissionLevel(IntEnum):
@@ -39,6 +65,156 @@ class PermissionLevel(IntEnum):
             raise ValueError(f"Unknown permission level: {value!r}") from None
 
 
+_CacheKey = tuple[int, int, int, int | None, str]
+
+
+class PermissionCache:
+    """Short-TTL LRU cache of resolved (user, workspace) permission levels.
+
+    Every invalidation bumps a generation counter; a level resolved from data
+    read before an invalidation is not stored, so a concurrent change can't be
+    cached over.
+    """
+
+    def __init__(self, ttl: float = PERMISSION_CACHE_TTL, max_size: int = PERMISSION_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[_CacheKey, tuple[float, PermissionLevel | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    @staticmethod
+    def key(user_id: int, workspace: Workspace) -> _CacheKey:
+        return (user_id, workspace.id, workspace.owner_id, workspace.org_id, workspace.org_member_default_level)
+
+    def get(self, key: _CacheKey) -> tuple[bool, PermissionLevel | None]:
+        """Return (hit, level)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, level = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, level
+
+    def put(self, key: _CacheKey, level: PermissionLevel | None, generation: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, level)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int | None = None, workspace_id: int | None = None) -> None:
+        """Drop entries for a user, a workspace, one pair, or (no arguments) everything."""
+        with self._lock:
+            self.generation += 1
+            if user_id is None and workspace_id is None:
+                self._entries.clear()
+                return
+            for key in [
+                k
+                for k in self._entries
+                if (user_id is None or k[0] == user_id) and (workspace_id is None or k[1] == workspace_id)
+            ]:
+                del self._entries[key]
+
+
+permission_cache = PermissionCache()
+
+
+def invalidate_permissions(user_id: int | None = None, workspace_id: int | None = None) -> None:
+    """Invalidate cached levels in every process. No arguments clears everything."""
+    invalidation_bus.publish(PERMISSIONS_TOPIC, {"user_id": user_id, "workspace_id": workspace_id})
+
+
+invalidation_bus.register(
+    PERMISSIONS_TOPIC,
+    lambda payload: permission_cache.invalidate(payload.get("user_id"), payload.get("workspace_id")),
+)
+
+
+def _combine_levels(workspace: Workspace, org_role: str | None, grant_levels: list[str]) -> PermissionLevel | None:
+    """Apply the resolution order to a user's org role and explicit grants on a workspace."""
+    org_level: PermissionLevel | None = None
+    if workspace.org_id is not None and org_role is not None:
+        org_rank = OrgRoleRank.from_str(org_role)
+        if org_rank >= OrgRoleRank.ADMIN:
+            return PermissionLevel.ADMIN
+        if org_rank == OrgRoleRank.MEMBER:
+            org_level = PermissionLevel.from_str(workspace.org_member_default_level)
+        # Guest gets no default level; access requires an explicit grant.
+
+    grant_level = max((PermissionLevel.from_str(level) for level in grant_levels), default=None)
+
+    if org_level is None:
+        return grant_level
+    if grant_level is None:
+        return org_level
+    return max(org_level, grant_level)
+
+
+async def effective_levels(
+    user: User,
+    workspaces: Iterable[Workspace],
+    session: AsyncSession,
+) -> dict[int, PermissionLevel | None]:
+    """Resolve the user's effective level on many workspaces at once, keyed by workspace id.
+
+    Cached levels are reused; the rest are resolved with at most one org
+    membership query and one grant query in total.
+    """
+    levels: dict[int, PermissionLevel | None] = {}
+    missing: list[Workspace] = []
+    for workspace in workspaces:
+        if workspace.owner_id == user.id:
+            levels[workspace.id] = PermissionLevel.ADMIN
+            continue
+        hit, level = permission_cache.get(PermissionCache.key(user.id, workspace))
+        if hit:
+            levels[workspace.id] = level
+        else:
+            missing.append(workspace)
+
+    if not missing:
+        return levels
+
+    generation = permission_cache.generation
+
+    org_ids = {w.org_id for w in missing if w.org_id is not None}
+    roles: dict[int, str] = {}
+    if org_ids:
+        result = await session.execute(
+            select(OrgMembership.org_id, OrgMembership.role).where(
+                OrgMembership.org_id.in_(org_ids),
+                OrgMembership.principal_id == user.id,
+            )
+        )
+        roles = {org_id: role for org_id, role in result.all()}
+
+    result = await session.execute(
+        select(WorkspacePermission.workspace_id, WorkspacePermission.permission_level).where(
+            WorkspacePermission.workspace_id.in_({w.id for w in missing}),
+            WorkspacePermission.user_id == user.id,
+        )
+    )
+    grants: dict[int, list[str]] = {}
+    for workspace_id, level in result.all():
+        grants.setdefault(workspace_id, []).append(level)
+
+    for workspace in missing:
+        level = _combine_levels(workspace, roles.get(workspace.org_id), grants.get(workspace.id, []))
+        permission_cache.put(PermissionCache.key(user.id, workspace), level, generation)
+        levels[workspace.id] = level
+    return levels
+
+
 async def effective_level(
     user: User,
     workspace: Workspace,
@@ -48,34 +224,28 @@ async def effective_level(
 
     Returns None if the user has no access at all.
     """
-    if workspace.owner_id == user.id:
-        return PermissionLevel.ADMIN
+    levels = await effective_levels(user, [workspace], session)
+    return levels[workspace.id]
 
-    org_level: PermissionLevel | None = None
-    if workspace.org_id is not None:
-        membership = await get_membership(session, workspace.org_id, user.id)
-        if membership is not None:
-            org_rank = OrgRoleRank.from_str(membership.role)
-            if org_rank >= OrgRoleRank.ADMIN:
-                return PermissionLevel.ADMIN
-            if org_rank == OrgRoleRank.MEMBER:
-                org_level = PermissionLevel.from_str(workspace.org_member_default_level)
-            # Guest gets no default level; access requires an explicit grant below.
 
-    result = await session.execute(
-        select(WorkspacePermission).where(
-            WorkspacePermission.workspace_id == workspace.id,
-            WorkspacePermission.user_id == user.id,
-        )
-    )
-    grants = result.scalars().all()
-    grant_level = max((PermissionLevel.from_str(g.permission_level) for g in grants), default=None)
+def level_from_rows(
+    user: User,
+    workspace: Workspace,
+    org_role: str | None,
+    grant_levels: list[str],
+    generation: int,
+) -> PermissionLevel | None:
+    """Resolve a level from an org role and grants the caller already loaded.
 
-    if org_level is None:
-        return grant_level
-    if grant_level is None:
-        return org_level
-    return max(org_level, grant_level)
+    For callers that fetch membership and grants as part of a larger joined
+    query. `generation` is `permission_cache.generation` read before that
+    query, so the result is only cached if nothing was invalidated meanwhile.
+    """
+    if workspace.owner_id == user.id:
+        return PermissionLevel.ADMIN
+    level = _combine_levels(workspace, org_role, grant_levels)
+    permission_cache.put(PermissionCache.key(user.id, workspace), level, generation)
+    return level
 
 
 def has_permission(level: PermissionLevel | None, required: PermissionLevel) -> bool:
@@ -113,3 +283,25 @@ async def require_level(
         raise HTTPException(status_code=404, detail="Workspace not found")
     if not has_permission(level, required):
         raise HTTPException(status_code=403, detail="Insufficient permission for this operation")
+
+
+# Invalidate cached levels whenever grants or org memberships change. Changes are
+# collected at flush time and applied once the transaction commits; changes that
+# were rolled back just cause a harmless extra invalidation at the next commit.
+_PENDING_INVALIDATIONS = "codex_permission_invalidations"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_permission_changes(session: Session, flush_context) -> None:
+    changed: set[tuple[int | None, int | None]] = session.info.setdefault(_PENDING_INVALIDATIONS, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, WorkspacePermission):
+            changed.add((obj.user_id, obj.workspace_id))
+        elif isinstance(obj, OrgMembership):
+            changed.add((obj.principal_id, None))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_permission_changes(session: Session) -> None:
+    for user_id, workspace_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_permissions(user_id=user_id, workspace_id=workspace_id)
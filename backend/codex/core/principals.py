@@ -0,0 +1,136 @@
+"""Cached principal lookup for JWT authentication.
+
+A JWT only carries the username, so every JWT-authenticated request (and
+WebSocket handshake) used to load the ``User`` row again. Those rows almost
+never change, so ``get_principal`` keeps a snapshot of each user's columns
+for a short TTL and rebuilds a ``User`` from it without a query.
+
+Committed ORM changes to a ``User`` row (password change or reset,
+deactivation, kind or profile edits) invalidate the user's entry, in this
+process and (with CODEX_CACHE_INVALIDATION=redis) in every other API process.
+
+Environment variables:
+    CODEX_PRINCIPAL_CACHE_TTL  – seconds to cache a user (default 60; 0 disables
+                                 the cache)
+    CODEX_PRINCIPAL_CACHE_SIZE – maximum cached users (default 10000)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from sqlmodel import select
+
+from codex.core.invalidation import invalidation_bus
+from codex.db.models import User
+
+PRINCIPAL_CACHE_TTL: float = float(os.getenv("CODEX_PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE: int = int(os.getenv("CODEX_PRINCIPAL_CACHE_SIZE", "10000"))
+
+PRINCIPALS_TOPIC = "principals"
+
+_PENDING_INVALIDATIONS = "codex_principal_invalidations"
+
+
+class PrincipalCache:
+    """Short-TTL LRU cache of user column snapshots, keyed by username.
+
+    Like the permission cache, every invalidation bumps a generation counter
+    so a row read before an invalidation is never stored after it.
+    """
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL, max_size: int = PRINCIPAL_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def get(self, username: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return None
+            expires, snapshot = entry
+            if expires < time.monotonic():
+                del self._entries[username]
+                return None
+            self._entries.move_to_end(username)
+            return snapshot
+
+    def put(self, user: User, generation: int) -> None:
+        if self.ttl <= 0:
+            return
+        snapshot = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[user.username] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user.username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        """Drop a user's entry (looked up by id, since usernames can change), or everything."""
+        with self._lock:
+            self.generation += 1
+            if user_id is None:
+                self._entries.clear()
+                return
+            for username in [k for k, (_, snapshot) in self._entries.items() if snapshot["id"] == user_id]:
+                del self._entries[username]
+
+
+principal_cache = PrincipalCache()
+
+
+def invalidate_principal(user_id: int | None = None) -> None:
+    """Invalidate a cached user in every process. No argument clears everything."""
+    invalidation_bus.publish(PRINCIPALS_TOPIC, {"user_id": user_id})
+
+
+invalidation_bus.register(PRINCIPALS_TOPIC, lambda payload: principal_cache.invalidate(payload.get("user_id")))
+
+
+async def get_principal(username: str, session: AsyncSession) -> User | None:
+    """Return the user with this username, from the cache when possible.
+
+    A cached user is attached to `session` as a clean persistent instance,
+    exactly as if it had just been loaded, so routes can modify and commit it.
+    """
+    snapshot = principal_cache.get(username)
+    if snapshot is not None:
+        existing = session.identity_map.get(identity_key(User, snapshot["id"]))
+        if existing is not None:
+            return existing
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        session.add(user)
+        return user
+
+    generation = principal_cache.generation
+    result = await session.execute(select(User).where(User.username == username))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        principal_cache.put(user, generation)
+    return user
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session: Session, flush_context) -> None:
+    changed: set[int] = session.info.setdefault(_PENDING_INVALIDATIONS, set())
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_principal_changes(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_principal(user_id)
@@ -0,0 +1,61 @@
+"""In-process sliding-window rate limiting.
+
+Limits are per API process; with several replicas the effective limit is
+the per-process limit times the replica count.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class SlidingWindowLimiter:
+    """Allows at most `limit` hits per key within any `window` seconds.
+
+    Keys are kept in LRU order and capped at `max_keys`, so a flood of
+    distinct keys can't grow memory without bound. A limit of 0 disables
+    the limiter.
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int = 10000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._hits: OrderedDict[str, deque[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def retry_after(self, key: str) -> float:
+        """Return how many seconds until `key` may be hit again (0 if it may now)."""
+        if self.limit <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                return 0.0
+            while hits and hits[0] <= now - self.window:
+                hits.popleft()
+            if len(hits) < self.limit:
+                return 0.0
+            return hits[0] + self.window - now
+
+    def hit(self, key: str) -> None:
+        """Record a hit for `key`."""
+        if self.limit <= 0:
+            return
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                hits = self._hits[key] = deque(maxlen=self.limit)
+            hits.append(time.monotonic())
+            self._hits.move_to_end(key)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+
+    def reset(self, key: str | None = None) -> None:
+        """Forget hits for `key`, or for every key."""
+        with self._lock:
+            if key is None:
+                self._hits.clear()
+            else:
+                self._hits.pop(key, None)
@@ -13,45 +13,82 @@ Two entry points:
     apply_journal_entry(workspace, notebook, entry) - incremental, one `sync_journal`
         row (the change feed from issue #541) applied to the working copy
 
-`S3IndexerService` is the background poller wired into `main.py`'s lifespan:
+`S3IndexerService` is the background task wired into `main.py`'s lifespan:
 for every shared (org) workspace it does a cold-start full rebuild for
 notebooks with no local working copy yet, then applies new journal rows
-incrementally. Personal workspaces (`org_id is None`) are never touched --
-they keep the existing filesystem-watcher path (#542 acceptance criterion).
+incrementally, reading them for all shared notebooks in one query. Personal
+workspaces (`org_id is None`) are never touched -- they keep the existing
+filesystem-watcher path (#542 acceptance criterion).
+
+The service is push-driven: `sync.push-complete` calls
+`notify_journal_change` for each new row, which publishes on the
+invalidation bus (`codex.core.invalidation`) and wakes the indexer in this
+process and, with the redis backend, in every other API process. A wake
+only catches up the notebook it names; walking every shared notebook is a
+slow reconciliation fallback for rows whose announcement was lost. A
+notebook that keeps failing backs off on its own without holding up the rest.
 
 The incremental cursor is persisted to a local `.codex/sync_cursor` file (not
 synced -- like the rest of `.codex/`, it's derived state) so a server restart
 resumes from where it left off instead of re-scanning S3 or replaying the
 whole journal.
 
+A full rebuild only transfers what changed: each materialized object's S3
+fingerprint (ETag, size, version) is kept in a local `.codex/s3_manifest.json`
+together with the local file's size and mtime, and an object whose listing
+still matches both is skipped. Objects that do need fetching are streamed to
+disk by a bounded pool of download threads while the rebuilding thread
+indexes finished downloads in batches.
+
 When `apply_journal_entry` sees a row flagged `conflict` (issue #543, the
 `sync.push-complete` route's compare-and-swap check), it first materializes
 the version that write superseded as a `name (conflict YYYY-MM-DD).md` copy
 alongside the winner, so the loser is recoverable and visible in the block
 tree rather than silently overwritten.
+
+Environment variables:
+    CODEX_S3_INDEXER_CONCURRENCY        – parallel object downloads per rebuild (default 8)
+    CODEX_S3_INDEXER_BATCH_SIZE         – downloaded files indexed per metadata batch (default 200)
+    CODEX_S3_INDEXER_RECONCILE_INTERVAL – seconds between fallback journal polls (default 300)
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import os
+import tempfile
 import threading
+import time
+from collections.abc import Collection
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path, PurePosixPath
 
 from sqlmodel import select
 
-from codex.core.s3_storage import S3_BUCKET, download_binary, get_s3_client, is_s3_configured
+from codex.core.invalidation import invalidation_bus
+from codex.core.s3_storage import S3_BUCKET, download_binary, download_to_file, get_s3_client, is_s3_configured
 from codex.core.sync_credentials import build_workspace_prefix
-from codex.core.watcher import update_file_metadata
+from codex.core.watcher import update_file_metadata, update_files_metadata
 from codex.core.workspace_sharing import is_shared_workspace
 from codex.db.database import get_notebook_session, get_system_session_sync, init_notebook_db
 from codex.db.models import Block, Notebook, SyncJournal, Workspace
 
 logger = logging.getLogger(__name__)
 
-POLL_INTERVAL = 5.0  # seconds; matches watcher.FileOperationQueue.BATCH_INTERVAL
+RETRY_INTERVAL = 5.0  # seconds; matches watcher.FileOperationQueue.BATCH_INTERVAL
+SYNC_JOURNAL_TOPIC = "sync_journal"
 CURSOR_FILENAME = "sync_cursor"
+MANIFEST_FILENAME = "s3_manifest.json"
+
+REBUILD_CONCURRENCY: int = int(os.getenv("CODEX_S3_INDEXER_CONCURRENCY", "8"))
+REBUILD_BATCH_SIZE: int = int(os.getenv("CODEX_S3_INDEXER_BATCH_SIZE", "200"))
+RECONCILE_INTERVAL: float = float(os.getenv("CODEX_S3_INDEXER_RECONCILE_INTERVAL", "300"))
+
+# Seconds `stop` waits for an in-flight pass before cancelling it
+_STOP_TIMEOUT = 10.0
 
 
 def notebook_working_copy_path(workspace: Workspace, notebook: Notebook) -> Path:
@@ -81,6 +118,49 @@ def _write_cursor(notebook_path: Path, cursor: int) -> None:
     cursor_file.write_text(str(cursor))
 
 
+# ---------------------------------------------------------------------------
+# Materialization manifest: relative path -> the S3 fingerprint the local copy
+# was downloaded from, plus the local file's size/mtime at that point. Like the
+# cursor it is derived, never-synced state under `.codex/`.
+# ---------------------------------------------------------------------------
+
+
+def _manifest_file(notebook_path: Path) -> Path:
+    return notebook_path / ".codex" / MANIFEST_FILENAME
+
+
+def _read_manifest(notebook_path: Path) -> dict[str, dict]:
+    try:
+        manifest = json.loads(_manifest_file(notebook_path).read_text())
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _write_manifest(notebook_path: Path, manifest: dict[str, dict]) -> None:
+    manifest_file = _manifest_file(notebook_path)
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=manifest_file.parent, prefix=f".{MANIFEST_FILENAME}.", suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(tmp_path, manifest_file)
+
+
+def _object_fingerprint(obj: dict) -> dict | None:
+    """The listing fields that identify an object's content, or None if the listing has no ETag."""
+    if not obj.get("ETag"):
+        return None
+    return {"etag": obj["ETag"], "size": obj.get("Size"), "version_id": obj.get("VersionId")}
+
+
+def _local_stat(local_file: Path) -> list[int] | None:
+    try:
+        stat = local_file.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
 # ---------------------------------------------------------------------------
 # Concurrency: serialize rebuild/apply per notebook so a poll tick can never
 # race a concurrently triggered rebuild (or another tick) over the same
@@ -100,6 +180,7 @@ class IndexResult:
     """Outcome of a rebuild or incremental apply."""
 
     processed: int = 0
+    skipped: int = 0  # objects whose local copy already matched S3
     deleted: int = 0
     errors: list[str] = field(default_factory=list)
 
@@ -129,15 +210,32 @@ def _local_path(notebook_path: Path, relative_path: str) -> Path:
     return local_path
 
 
-def _materialize_object(notebook_path: Path, relative_path: str, s3_key: str, version_id: str | None) -> Path:
-    """Download an S3 object into the notebook's local working copy. Returns the local path."""
+def _materialize_object(
+    notebook_path: Path, relative_path: str, s3_key: str, version_id: str | None, etag: str | None = None
+) -> Path:
+    """Stream an S3 object into the notebook's local working copy. Returns the local path.
+
+    The file is replaced atomically, so a failed or interrupted download never
+    leaves a truncated working-copy file behind. With `etag`, the download
+    fails if the object has changed since it was listed, so the manifest
+    never records a fingerprint for different content.
+    """
     local_file = _local_path(notebook_path, relative_path)
     local_file.parent.mkdir(parents=True, exist_ok=True)
-    data = download_binary(s3_key, version_id=version_id)
-    local_file.write_bytes(data)
+    download_to_file(s3_key, local_file, version_id=version_id, if_match=etag)
     return local_file
 
 
+def _is_up_to_date(notebook_path: Path, relative_path: str, fingerprint: dict | None, recorded: dict | None) -> bool:
+    """True if the local copy was materialized from this exact object and is unchanged since."""
+    if fingerprint is None or recorded is None or not is_safe_relative_path(relative_path):
+        return False
+    if any(recorded.get(k) != v for k, v in fingerprint.items()):
+        return False
+    # Any local rewrite since (e.g. an applied journal entry) changes size or mtime
+    return _local_stat(notebook_path / relative_path) == recorded.get("local")
+
+
 def rebuild_notebook_index(workspace: Workspace, notebook: Notebook) -> IndexResult:
     """Full rebuild: materialize every object under the notebook's S3 content prefix
     into its local working copy, then reindex via the watcher pipeline.
@@ -145,7 +243,8 @@ def rebuild_notebook_index(workspace: Workspace, notebook: Notebook) -> IndexRes
     Local files (and their `Block` rows) that no longer exist in S3 are removed,
     so a stale or missing working copy converges back to S3 state -- this is the
     "cold start" path (#542 acceptance: server rebuilds a notebook working copy +
-    index from S3 alone).
+    index from S3 alone). Objects whose indexed local copy still matches the
+    manifest are skipped, so a rebuild after a restart only transfers changes.
     """
     result = IndexResult()
     if not is_s3_configured():
@@ -169,25 +268,72 @@ def rebuild_notebook_index(workspace: Workspace, notebook: Notebook) -> IndexRes
             system_session.close()
         baseline_cursor = latest_entry.id if latest_entry else 0
 
+        notebook_session = get_notebook_session(str(notebook_path))
+        try:
+            indexed_paths = set(notebook_session.execute(select(Block.path)).scalars().all())
+        finally:
+            notebook_session.close()
+
         prefix = notebook_content_prefix(workspace, notebook)
         client = get_s3_client()
-
+        manifest = _read_manifest(notebook_path)
+        new_manifest: dict[str, dict] = {}
         seen_relative_paths: set[str] = set()
-        paginator = client.get_paginator("list_objects_v2")
-        for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=prefix):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                relative_path = key[len(prefix) :]
-                if not relative_path or relative_path.endswith("/"):
-                    continue
-                seen_relative_paths.add(relative_path)
+        downloads: dict[Future, tuple[str, str, dict | None]] = {}
+        downloaded: list[tuple[str, Path, dict | None]] = []
+
+        def index_downloaded() -> None:
+            update_files_metadata(str(notebook_path), notebook.id, [str(f) for _, f, _ in downloaded], "scanned")
+            for relative_path, local_file, fingerprint in downloaded:
+                result.processed += 1
+                local_stat = _local_stat(local_file)
+                if fingerprint is not None and local_stat is not None:
+                    new_manifest[relative_path] = {**fingerprint, "local": local_stat}
+            downloaded.clear()
+
+        def collect(done) -> None:
+            for future in done:
+                relative_path, key, fingerprint = downloads.pop(future)
                 try:
-                    local_file = _materialize_object(notebook_path, relative_path, key, version_id=None)
-                    update_file_metadata(str(notebook_path), notebook.id, str(local_file), "scanned")
-                    result.processed += 1
+                    downloaded.append((relative_path, future.result(), fingerprint))
                 except Exception as e:
                     logger.error("Failed to materialize %s for notebook %s: %s", key, notebook.id, e, exc_info=True)
                     result.errors.append(f"{relative_path}: {e}")
+            if len(downloaded) >= REBUILD_BATCH_SIZE:
+                index_downloaded()
+
+        with ThreadPoolExecutor(max_workers=REBUILD_CONCURRENCY, thread_name_prefix="s3-rebuild") as pool:
+            paginator = client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=prefix):
+                for obj in page.get("Contents", []):
+                    key = obj["Key"]
+                    relative_path = key[len(prefix) :]
+                    if not relative_path or relative_path.endswith("/"):
+                        continue
+                    seen_relative_paths.add(relative_path)
+
+                    fingerprint = _object_fingerprint(obj)
+                    recorded = manifest.get(relative_path)
+                    if relative_path in indexed_paths and _is_up_to_date(
+                        notebook_path, relative_path, fingerprint, recorded
+                    ):
+                        new_manifest[relative_path] = recorded
+                        result.skipped += 1
+                        continue
+
+                    # Bound the in-flight downloads (and the memory their bookkeeping takes)
+                    if len(downloads) >= REBUILD_CONCURRENCY * 2:
+                        done, _ = wait(downloads, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    etag = fingerprint["etag"] if fingerprint else None
+                    future = pool.submit(_materialize_object, notebook_path, relative_path, key, None, etag)
+                    downloads[future] = (relative_path, key, fingerprint)
+
+            while downloads:
+                done, _ = wait(downloads, return_when=FIRST_COMPLETED)
+                collect(done)
+        if downloaded:
+            index_downloaded()
 
         notebook_session = get_notebook_session(str(notebook_path))
         try:
@@ -206,6 +352,7 @@ def rebuild_notebook_index(workspace: Workspace, notebook: Notebook) -> IndexRes
             update_file_metadata(str(notebook_path), notebook.id, str(local_file), "deleted")
             result.deleted += 1
 
+        _write_manifest(notebook_path, new_manifest)
         _write_cursor(notebook_path, baseline_cursor)
 
     return result
@@ -293,19 +440,30 @@ def apply_journal_entry(workspace: Workspace, notebook: Notebook, entry: SyncJou
 
 
 class S3IndexerService:
-    """Background poller applying the S3 change feed to shared notebooks' working copies.
+    """Background task applying the S3 change feed to shared notebooks' working copies.
 
     Plays the same role for shared (org) notebooks that `NotebookWatcher` plays
     for personal ones, except the source of change events is the `sync_journal`
     table (issue #541) rather than filesystem events, since S3 -- not the local
-    disk -- is canonical for shared notebooks.
+    disk -- is canonical for shared notebooks. When `sync.push-complete`
+    announces a new journal row (see `wake`), only that row's notebook is
+    caught up; every shared notebook is walked only once per
+    `reconcile_interval`. A notebook that fails to rebuild or to apply a row
+    is retried on its own, `retry_interval` after the failure and doubling on
+    each further failure up to `reconcile_interval`.
     """
 
-    def __init__(self, poll_interval: float = POLL_INTERVAL):
-        self.poll_interval = poll_interval
+    def __init__(self, reconcile_interval: float = RECONCILE_INTERVAL, retry_interval: float = RETRY_INTERVAL):
+        self.reconcile_interval = reconcile_interval
+        self.retry_interval = retry_interval
         self._task: asyncio.Task | None = None
         self._stop_event: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
         self._cursors: dict[int, int] = {}
+        self._pending: set[int] = set()
+        self._failures: dict[int, int] = {}
+        self._retry_at: dict[int, float] = {}
 
     def start(self) -> None:
         if not is_s3_configured():
@@ -314,53 +472,131 @@ class S3IndexerService:
         if self._task is not None:
             return
         self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
         self._task = asyncio.create_task(self._run())
-        logger.info("S3 working-copy indexer started (poll interval=%ss)", self.poll_interval)
+        logger.info("S3 working-copy indexer started (reconcile interval=%ss)", self.reconcile_interval)
 
     async def stop(self) -> None:
         if self._task is None:
             return
-        assert self._stop_event is not None
+        assert self._stop_event is not None and self._wake is not None
         self._stop_event.set()
+        self._wake.set()
         try:
-            await asyncio.wait_for(self._task, timeout=self.poll_interval + 5)
+            await asyncio.wait_for(self._task, timeout=_STOP_TIMEOUT)
         except TimeoutError:
             self._task.cancel()
         self._task = None
         self._stop_event = None
+        self._loop = None
+        self._wake = None
+
+    def wake(self, nb_id: int | None = None) -> None:
+        """Ask the indexer to apply a notebook's new journal rows now (safe to call from any thread).
+
+        Without `nb_id` the next pass walks every shared notebook.
+        """
+        if self._loop is not None and self._wake is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._request, nb_id)
+
+    def _request(self, nb_id: int | None) -> None:
+        assert self._wake is not None
+        self._pending.add(nb_id)
+        self._wake.set()
 
     async def _run(self) -> None:
-        assert self._stop_event is not None
+        assert self._stop_event is not None and self._wake is not None
+        next_reconcile = 0.0
         while not self._stop_event.is_set():
+            self._wake.clear()
+            now = time.monotonic()
+            pending, self._pending = self._pending, set()
             try:
-                await asyncio.to_thread(self.poll_once)
+                if now >= next_reconcile or None in pending:
+                    next_reconcile = now + self.reconcile_interval
+                    await asyncio.to_thread(self.poll_once)
+                else:
+                    due = pending | {nb_id for nb_id, at in self._retry_at.items() if at <= now}
+                    if due:
+                        await asyncio.to_thread(self.poll_notebooks, due)
             except Exception:
                 logger.error("S3 indexer poll failed", exc_info=True)
+            deadline = min([next_reconcile, *self._retry_at.values()])
             try:
-                await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+                await asyncio.wait_for(self._wake.wait(), timeout=max(deadline - time.monotonic(), 0.0))
             except TimeoutError:
                 pass
 
-    def poll_once(self) -> None:
-        """Poll every shared workspace's notebooks once, synchronously.
+    def poll_once(self) -> bool:
+        """Bring every shared notebook's working copy up to date once, synchronously.
 
+        Notebooks with no working copy yet are rebuilt from S3; the rest are
+        caught up from a single journal query across all of them. Notebooks
+        still backing off from a failure are skipped. Returns False if some
+        notebook could not be rebuilt or had a journal row fail to apply.
         Safe to call directly (e.g. from tests or a thread pool) without the
         background loop running.
         """
         session = get_system_session_sync()
         try:
             rows = session.exec(select(Notebook, Workspace).join(Workspace, Notebook.workspace_id == Workspace.id))
-            for notebook, workspace in rows.all():
-                if not is_shared_workspace(workspace):
-                    continue
-                try:
-                    self._poll_notebook(session, notebook, workspace)
-                except Exception:
-                    logger.error("Failed to poll notebook %s for S3 changes", notebook.id, exc_info=True)
+            return self._poll(session, rows.all())
         finally:
             session.close()
 
-    def _poll_notebook(self, session, notebook: Notebook, workspace: Workspace) -> None:
+    def poll_notebooks(self, nb_ids: Collection[int]) -> bool:
+        """Like `poll_once`, but only for the given notebooks (those a wake named)."""
+        session = get_system_session_sync()
+        try:
+            rows = session.exec(
+                select(Notebook, Workspace)
+                .join(Workspace, Notebook.workspace_id == Workspace.id)
+                .where(Notebook.id.in_(nb_ids))
+            )
+            return self._poll(session, rows.all(), nb_ids=nb_ids)
+        finally:
+            session.close()
+
+    def _poll(self, session, rows, nb_ids: Collection[int] | None = None) -> bool:
+        now = time.monotonic()
+        shared: dict[int, tuple[Notebook, Workspace]] = {}
+        caught_up = True
+        for notebook, workspace in rows:
+            if not is_shared_workspace(workspace):
+                continue
+            if self._retry_at.get(notebook.id, now) > now:
+                caught_up = False
+                continue
+            try:
+                self._ensure_working_copy(notebook, workspace)
+            except Exception:
+                logger.error("Failed to rebuild working copy for notebook %s from S3", notebook.id, exc_info=True)
+                self._back_off(notebook.id)
+                caught_up = False
+                continue
+            shared[notebook.id] = (notebook, workspace)
+        if nb_ids is not None:
+            # Deleted or no-longer-shared notebooks have nothing left to retry
+            for nb_id in set(nb_ids) - {notebook.id for notebook, workspace in rows if is_shared_workspace(workspace)}:
+                self._recovered(nb_id)
+        if shared:
+            caught_up = self._apply_journal(session, shared, nb_ids) and caught_up
+        return caught_up
+
+    def _back_off(self, nb_id: int) -> None:
+        """Hold a failing notebook back from later passes until its retry is due."""
+        failures = self._failures.get(nb_id, 0) + 1
+        self._failures[nb_id] = failures
+        delay = min(self.retry_interval * 2 ** (failures - 1), self.reconcile_interval)
+        self._retry_at[nb_id] = time.monotonic() + delay
+
+    def _recovered(self, nb_id: int) -> None:
+        self._failures.pop(nb_id, None)
+        self._retry_at.pop(nb_id, None)
+
+    def _ensure_working_copy(self, notebook: Notebook, workspace: Workspace) -> None:
+        """Cold-start: rebuild a notebook with no working copy (or cursor) and load its cursor."""
         notebook_path = notebook_working_copy_path(workspace, notebook)
         has_working_copy = (notebook_path / ".codex" / "notebook.db").exists()
 
@@ -374,25 +610,55 @@ class S3IndexerService:
 
         self._cursors[notebook.id] = cursor
 
-        entries = session.exec(
-            select(SyncJournal)
-            .where(SyncJournal.nb_id == notebook.id, SyncJournal.id > cursor)
-            .order_by(SyncJournal.id.asc())
-        ).all()
+    def _apply_journal(
+        self, session, shared: dict[int, tuple[Notebook, Workspace]], nb_ids: Collection[int] | None = None
+    ) -> bool:
+        """Apply journal rows past each notebook's cursor, read in one query for all of `shared`.
+
+        Each notebook is bounded by its own cursor (the last row applied to
+        it) rather than by the highest id read for any notebook: journal ids
+        from concurrent pushes can commit out of order, so a lower id may
+        still appear after a higher one has been read. The query only bounds
+        by the lowest cursor -- one term per notebook would overflow SQLite's
+        expression depth with thousands of notebooks -- and each row is
+        checked against its own notebook's cursor here.
+        """
+        stmt = select(SyncJournal).where(SyncJournal.id > min(self._cursors[nb_id] for nb_id in shared))
+        if nb_ids is not None:
+            stmt = stmt.where(SyncJournal.nb_id.in_(shared))
+        entries = session.exec(stmt.order_by(SyncJournal.id.asc())).all()
 
+        failed: set[int] = set()
         for entry in entries:
+            if entry.nb_id not in shared or entry.nb_id in failed or entry.id <= self._cursors[entry.nb_id]:
+                continue
+            notebook, workspace = shared[entry.nb_id]
             try:
                 apply_journal_entry(workspace, notebook, entry, session=session)
             except Exception:
                 logger.error(
-                    "Failed to apply sync journal entry %s for notebook %s; will retry next poll",
+                    "Failed to apply sync journal entry %s for notebook %s; will retry",
                     entry.id,
                     notebook.id,
                     exc_info=True,
                 )
-                break
-            self._cursors[notebook.id] = entry.id
-            _write_cursor(notebook_path, entry.id)
+                failed.add(entry.nb_id)
+                self._back_off(entry.nb_id)
+                continue
+            self._cursors[entry.nb_id] = entry.id
+            _write_cursor(notebook_working_copy_path(workspace, notebook), entry.id)
+
+        for nb_id in shared.keys() - failed:
+            self._recovered(nb_id)
+        return not failed
 
 
 indexer_service = S3IndexerService()
+
+
+def notify_journal_change(entry: SyncJournal) -> None:
+    """Announce a new `sync_journal` row to the indexer in this and every other API process."""
+    invalidation_bus.publish(SYNC_JOURNAL_TOPIC, {"nb_id": entry.nb_id, "id": entry.id})
+
+
+invalidation_bus.register(SYNC_JOURNAL_TOPIC, lambda payload: indexer_service.wake(payload.get("nb_id")))
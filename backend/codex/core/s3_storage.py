@@ -13,9 +13,12 @@ Environment variables:
     AWS_SECRET_ACCESS_KEY – standard AWS credential
 """
 
+import contextlib
 import json
 import logging
 import os
+import tempfile
+from pathlib import Path
 
 import boto3
 from botocore.exceptions import ClientError
@@ -33,6 +36,9 @@ S3_ENDPOINT_URL: str | None = os.getenv("CODEX_S3_ENDPOINT_URL")
 # Presigned URL expiration (seconds)
 PRESIGNED_URL_EXPIRY: int = int(os.getenv("CODEX_S3_PRESIGNED_EXPIRY", "3600"))
 
+# Bytes read per chunk when streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 # Pointer file extension
 POINTER_EXT = ".s3ref"
 
@@ -196,6 +202,46 @@ def download_binary(s3_key: str, version_id: str | None = None, bucket: str | No
     return resp["Body"].read()
 
 
+def download_to_file(
+    s3_key: str,
+    dest_path: str | Path,
+    version_id: str | None = None,
+    bucket: str | None = None,
+    if_match: str | None = None,
+) -> dict:
+    """Stream an S3 object to `dest_path` without holding it in memory.
+
+    The body is written to a temporary file beside `dest_path` and renamed
+    over it, so readers never see a partially written file. With `if_match`,
+    the download fails (leaving `dest_path` untouched) unless the object
+    still has that ETag. Returns the object's etag, size and version id.
+    """
+    bucket = bucket or S3_BUCKET
+    if not bucket:
+        raise RuntimeError("CODEX_S3_BUCKET is not configured")
+
+    client = get_s3_client()
+    kwargs: dict = {"Bucket": bucket, "Key": s3_key}
+    if version_id and version_id != "null":
+        kwargs["VersionId"] = version_id
+    if if_match:
+        kwargs["IfMatch"] = if_match
+
+    resp = client.get_object(**kwargs)
+    dest = Path(dest_path)
+    fd, tmp_path = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in resp["Body"].iter_chunks(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+    return {"etag": resp.get("ETag"), "size": resp.get("ContentLength"), "version_id": resp.get("VersionId")}
+
+
 def generate_presigned_url(s3_key: str, version_id: str | None = None, bucket: str | None = None) -> str:
     """Generate a presigned download URL for an S3 object."""
     bucket = bucket or S3_BUCKET
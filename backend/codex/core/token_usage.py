@@ -0,0 +1,109 @@
+"""Coalesced ``last_used_at`` bookkeeping for personal access tokens.
+
+Bots and CLIs authenticate every request with a PAT. Writing ``last_used_at``
+and committing on each of those requests turned read traffic into a stream
+of write transactions on the system database. Instead:
+
+- A use is only recorded when the stored timestamp is older than
+  ``CODEX_PAT_LAST_USED_INTERVAL`` seconds, so a busy token is written at
+  most once per interval.
+- Recorded uses are buffered in memory and written by a background task in
+  one bulk UPDATE per flush (and once more on shutdown).
+
+``last_used_at`` is therefore accurate to within the interval, which is all
+the token list UI needs.
+
+Environment variables:
+    CODEX_PAT_LAST_USED_INTERVAL – seconds between last_used_at writes for a
+                                   token, and between flushes (default 60)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import bindparam, update
+
+from codex.db.models import PersonalAccessToken
+
+logger = logging.getLogger(__name__)
+
+PAT_LAST_USED_INTERVAL: float = float(os.getenv("CODEX_PAT_LAST_USED_INTERVAL", "60"))
+
+
+class TokenUsageRecorder:
+    """Buffers PAT last-used timestamps and flushes them in bulk."""
+
+    def __init__(self, interval: float = PAT_LAST_USED_INTERVAL):
+        self.interval = interval
+        self._pending: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def record(self, pat: PersonalAccessToken, now: datetime | None = None) -> None:
+        """Note that `pat` was just used. Never touches the database."""
+        now = now or datetime.now(UTC)
+        last_used = pat.last_used_at
+        if last_used is not None:
+            # SQLite drops tzinfo on round-trip
+            if last_used.tzinfo is None:
+                last_used = last_used.replace(tzinfo=UTC)
+            if now - last_used < timedelta(seconds=self.interval):
+                return
+        with self._lock:
+            self._pending[pat.id] = now
+
+    def last_used(self, pat: PersonalAccessToken) -> datetime | None:
+        """Return the token's last use, including uses not yet flushed."""
+        with self._lock:
+            return self._pending.get(pat.id, pat.last_used_at)
+
+    async def flush(self) -> int:
+        """Write buffered timestamps in one bulk UPDATE. Returns the number of tokens written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        from codex.db.database import async_session_maker
+
+        table = PersonalAccessToken.__table__
+        stmt = update(table).where(table.c.id == bindparam("pat_id")).values(last_used_at=bindparam("used_at"))
+        try:
+            async with async_session_maker() as session:
+                await session.execute(stmt, [{"pat_id": k, "used_at": v} for k, v in pending.items()])
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Could not flush token last_used_at updates: {e}")
+            # Keep the uses for the next flush unless newer ones arrived meanwhile
+            with self._lock:
+                for pat_id, used_at in pending.items():
+                    self._pending.setdefault(pat_id, used_at)
+            return 0
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(max(self.interval, 1.0))
+            await self.flush()
+
+    def start(self) -> None:
+        """Start flushing buffered uses every interval."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write out whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+token_usage = TokenUsageRecorder()
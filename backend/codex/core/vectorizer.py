@@ -277,7 +277,7 @@ def generate_embedding(text: str) -> list[float] | None:
     if not text.strip():
         return None
 
-    import httpx
+    from codex.core.http_client import get_sync_http_client
 
     api_key = os.getenv("CODEX_EMBEDDING_API_KEY") or os.getenv("VOYAGE_API_KEY") or os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -287,7 +287,7 @@ def generate_embedding(text: str) -> list[float] | None:
     base_url = os.getenv("CODEX_EMBEDDING_BASE_URL", "https://api.voyageai.com/v1")
 
     try:
-        response = httpx.post(
+        response = get_sync_http_client().post(
             f"{base_url.rstrip('/')}/embeddings",
             headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
             json={"model": EMBEDDING_MODEL, "input": text[:8000]},
@@ -326,6 +326,40 @@ def delete_embedding(engine, block_id: str) -> None:
         conn.close()
 
 
+def remove_page_indexes(engine, block_ids: list[str]) -> None:
+    """Remove FTS and vector index entries for many pages at once."""
+    import sqlite3
+
+    if not block_ids:
+        return
+
+    raw_url = str(engine.url)
+    db_path = raw_url.replace("sqlite:///", "")
+    for table, connect in (
+        ("pages_fts", lambda: sqlite3.connect(db_path)),
+        ("page_embeddings", lambda: _get_raw_connection(engine)),
+    ):
+        try:
+            conn = connect()
+        except Exception as e:
+            logger.warning(f"Could not open {table} to remove page indexes: {e}")
+            continue
+        try:
+            for start in range(0, len(block_ids), 500):
+                chunk = block_ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(f"DELETE FROM {table} WHERE block_id IN ({placeholders})", chunk)
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            # The index table is only created once a page has been indexed
+            if "no such table" not in str(e):
+                logger.warning(f"Failed to remove page indexes from {table}: {e}")
+        except Exception as e:
+            logger.warning(f"Failed to remove page indexes from {table}: {e}")
+        finally:
+            conn.close()
+
+
 def search_by_vector(engine, query_embedding: list[float], limit: int = 20) -> list[tuple[str, float]]:
     """Search for similar pages using vector similarity.
 
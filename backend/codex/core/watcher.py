@@ -434,6 +434,7 @@ def update_file_metadata(
     filepath: str,
     event_type: str,
     callback: Callable | None = None,
+    session=None,
 ) -> None:
     """Update block metadata in database for a file change.
 
@@ -443,6 +444,7 @@ def update_file_metadata(
         filepath: Absolute path to the file
         event_type: Type of event ("created", "modified", "deleted", "scanned")
         callback: Optional callback to invoke after update
+        session: Optional open notebook session to use (left open for the caller)
     """
     if should_ignore_path(filepath):
         return
@@ -451,9 +453,10 @@ def update_file_metadata(
         return
 
     logger.debug(f"Updating metadata for {filepath} due to {event_type} event")
-    session = None
+    owns_session = session is None
     try:
-        session = get_notebook_session(notebook_path)
+        if owns_session:
+            session = get_notebook_session(notebook_path)
 
         rel_path = os.path.relpath(filepath, notebook_path)
         filename = os.path.basename(filepath)
@@ -580,6 +583,8 @@ def update_file_metadata(
 
                     from ulid import ULID
 
+                    from codex.core.blocks import next_sibling_order_key
+
                     block = Block(
                         notebook_id=notebook_id,
                         block_id=str(ULID()),
@@ -587,7 +592,7 @@ def update_file_metadata(
                         path=rel_path,
                         block_type=block_type,
                         content_format=content_format,
-                        order_index=0.0,
+                        order_key=next_sibling_order_key(notebook_id, parent_block_id, session),
                         filename=filename,
                         content_type=content_type,
                         size=file_stats.st_size,
@@ -681,14 +686,34 @@ def update_file_metadata(
             logger.debug(f"Database unavailable for {filepath}, likely during cleanup: {e}")
         else:
             logger.error(f"Error updating metadata for {filepath}: {e}", exc_info=True)
+        if session and not owns_session:
+            # Leave the caller's session usable for its next file
+            try:
+                session.rollback()
+            except Exception:
+                pass
     finally:
-        if session:
+        if session and owns_session:
             try:
                 session.close()
             except Exception:
                 pass
 
 
+def update_files_metadata(notebook_path: str, notebook_id: int, filepaths: list[str], event_type: str) -> None:
+    """Batch form of `update_file_metadata`: updates every file through one notebook session.
+
+    Saves opening a database engine and connection per file when indexing
+    many files at once (e.g. rebuilding a working copy).
+    """
+    session = get_notebook_session(notebook_path)
+    try:
+        for filepath in filepaths:
+            update_file_metadata(notebook_path, notebook_id, filepath, event_type, session=session)
+    finally:
+        session.close()
+
+
 def _sync_blocks_for_file(
     notebook_path: str,
     notebook_id: int,
@@ -705,6 +730,7 @@ def _sync_blocks_for_file(
     """
     from codex.core.blocks import (
         PAGE_METADATA_FILE,
+        _next_order_key,
         is_page_folder,
         read_page_metadata,
         sync_page_from_disk,
@@ -716,6 +742,11 @@ def _sync_blocks_for_file(
 
     # If this is a .codex-page.json file, sync the page
     if filename == PAGE_METADATA_FILE:
+        from codex.core.page_manifest import page_manifests
+
+        if event_type in ("created", "modified") and page_manifests.is_own_write(filepath):
+            # Our own write; the database was updated alongside it
+            return
         if event_type in ("created", "modified", "scanned"):
             page_rel_path = os.path.relpath(parent_dir, notebook_path)
             if page_rel_path == ".":
@@ -768,13 +799,13 @@ def _sync_blocks_for_file(
             else:
                 block_type = "file"
 
-            max_order = max((b.get("order", 0) for b in page_meta.get("blocks", [])), default=0)
+            order_key = _next_order_key(page_meta)
             page_meta.setdefault("blocks", []).append(
                 {
                     "block_id": block_id,
                     "type": block_type,
                     "file": filename,
-                    "order": max_order + 1.0,
+                    "order_key": order_key,
                 }
             )
             write_page_metadata(Path(parent_dir), page_meta)
@@ -1056,6 +1087,28 @@ class NotebookFileHandler(FileSystemEventHandler):
             else:
                 logger.error(f"Error handling deleted directory {dir_path}: {e}", exc_info=True)
 
+    def _is_indexed_page(self, dir_path: str) -> bool:
+        """Check whether a directory is already indexed as a page at this path."""
+        try:
+            session = get_notebook_session(self.notebook_path)
+            try:
+                rel_dir = os.path.relpath(dir_path, self.notebook_path)
+                return (
+                    session.execute(
+                        select(Block.id).where(
+                            Block.notebook_id == self.notebook_id,
+                            Block.path == rel_dir,
+                            Block.block_type == "page",
+                        )
+                    ).first()
+                    is not None
+                )
+            finally:
+                session.close()
+        except Exception as e:
+            logger.debug(f"Could not check index for moved directory {dir_path}: {e}")
+            return False
+
     def on_moved(self, event):
         """Called when a file or directory is moved."""
         if self._stopped:
@@ -1071,6 +1124,9 @@ class NotebookFileHandler(FileSystemEventHandler):
             return
 
         if event.is_directory:
+            if not dest_ignored and self._is_indexed_page(dest_path):
+                # Moved through the API, which already relocated the subtree's rows
+                return
             # Directory move: delete files at old location, scan files at new location
             if not src_ignored:
                 self._delete_directory_files(src_path)
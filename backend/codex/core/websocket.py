@@ -8,15 +8,76 @@ Connections are organized by channel rather than by bare notebook/workspace id:
 A socket can be subscribed to multiple channels at once; subscriptions are only
 granted by callers (see `codex.api.routes.ws`) after checking the connecting
 principal's effective permission level.
+
+Within a workspace channel, messages that name a notebook are routed by topic
+rather than to every subscriber:
+
+- ``notebook:{notebook_id}`` - everything in one notebook.
+- ``block:{block_id}`` - changes to a block (or page) and to its direct children.
+  A ``"bulk"`` summary names no blocks, so it goes to every block subscriber
+  on the channel; clients match it to their block by ``notebook_id``.
+- ``*`` - everything on the channel.
+
+Messages without a ``notebook_id`` (and everything on principal channels) still
+go to all of the channel's subscribers.
+
+Broadcasts go through a pluggable backend so they reach sockets held by other
+processes (API replicas, or none at all in the ARQ worker):
+
+- ``memory`` (default) delivers to this process's sockets only, which is all a
+  single-node install needs.
+- ``redis`` publishes each message once to a Redis pub/sub channel keyed by the
+  WebSocket channel; every API process relays what it receives to its local
+  sockets.
+
+File change events are raised from watcher threads as well as the event loop.
+``queue_event`` buffers them per notebook under a lock and wakes the broadcast
+loop with ``call_soon_threadsafe``. When a notebook produces more events in one
+coalescing window than ``CODEX_WS_COALESCE_THRESHOLD`` (a bulk import or scan),
+they are collapsed into a single ``"bulk"`` event carrying the count, so clients
+refresh once instead of receiving an arbitrary subset.
+
+Every broadcast is stamped with its ``channel`` and a per-channel ``seq`` and
+kept in a bounded replay buffer (in process, or in Redis with the redis
+backend). A reconnecting client passes the ``epoch`` and last ``seq`` per
+channel it saw and receives just the messages it missed, or a
+``resync_required`` message when the buffer no longer reaches back that far.
+
+Each socket has a bounded outbound queue drained by its own writer task, so a
+broadcast only encodes the message once and enqueues it; a slow client can't
+hold up delivery to the others. A socket whose queue overflows is closed with
+1013 (try again later) and reconnects.
+
+Environment variables:
+    CODEX_WS_BACKEND             – "memory" (default) or "redis"
+    CODEX_WS_REDIS_PREFIX        – Redis pub/sub channel prefix (default "codex:ws:")
+    REDIS_URL                    – Redis connection URL, shared with the ARQ worker
+    CODEX_WS_COALESCE_WINDOW     – seconds to gather file events before
+                                   broadcasting them (default 0.05)
+    CODEX_WS_COALESCE_THRESHOLD  – events per notebook per window above which
+                                   they are summarized (default 50)
+    CODEX_WS_SEND_QUEUE_SIZE     – outbound messages buffered per socket before
+                                   it is disconnected as too slow (default 256)
+    CODEX_WS_REPLAY_BUFFER       – messages kept per channel for resuming
+                                   clients (default 1000)
+    CODEX_WS_REPLAY_TTL          – seconds the redis backend keeps an idle
+                                   channel's sequence and buffer (default 86400)
 """
 
 from __future__ import annotations
 
+import abc
 import asyncio
+import json
 import logging
+import os
+import threading
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from fastapi import WebSocket
 
@@ -28,6 +89,31 @@ logger = logging.getLogger(__name__)
 WORKSPACE_CHANNEL_PREFIX = "workspace:"
 PRINCIPAL_CHANNEL_PREFIX = "principal:"
 
+WS_BACKEND: str = os.getenv("CODEX_WS_BACKEND", "memory").lower()
+WS_REDIS_PREFIX: str = os.getenv("CODEX_WS_REDIS_PREFIX", "codex:ws:")
+REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+WS_COALESCE_WINDOW: float = float(os.getenv("CODEX_WS_COALESCE_WINDOW", "0.05"))
+WS_COALESCE_THRESHOLD: int = int(os.getenv("CODEX_WS_COALESCE_THRESHOLD", "50"))
+
+WS_SEND_QUEUE_SIZE: int = int(os.getenv("CODEX_WS_SEND_QUEUE_SIZE", "256"))
+WS_REPLAY_BUFFER: int = int(os.getenv("CODEX_WS_REPLAY_BUFFER", "1000"))
+WS_REPLAY_TTL: int = int(os.getenv("CODEX_WS_REPLAY_TTL", "86400"))
+
+# RFC 6455 "Try Again Later" - sent to clients that can't keep up with their queue
+WS_TRY_AGAIN_LATER = 1013
+
+# Seconds a dropped slow client gets to complete the close handshake
+SLOW_CLOSE_TIMEOUT = 5.0
+
+# Number of example paths included in a "bulk" summary event
+BULK_EVENT_SAMPLE_SIZE = 10
+
+# Seconds to wait before re-subscribing after the Redis connection drops
+REDIS_RECONNECT_DELAY = 1.0
+
+DeliverFn = Callable[[str, dict], Awaitable[None]]
+
 
 def workspace_channel(workspace_id: int) -> str:
     return f"{WORKSPACE_CHANNEL_PREFIX}{workspace_id}"
@@ -37,6 +123,36 @@ def principal_channel(user_id: int) -> str:
     return f"{PRINCIPAL_CHANNEL_PREFIX}{user_id}"
 
 
+ALL_TOPICS = "*"
+
+
+def notebook_topic(notebook_id: int) -> str:
+    return f"notebook:{notebook_id}"
+
+
+def block_topic(block_id: str) -> str:
+    return f"block:{block_id}"
+
+
+# Routes a message to every socket subscribed to any block topic on the channel
+ANY_BLOCK_TOPIC = block_topic("*")
+
+
+def message_topics(message: dict) -> list[str] | None:
+    """Topics a workspace-channel message is routed to, or None for channel-wide messages."""
+    notebook_id = message.get("notebook_id")
+    if notebook_id is None:
+        return None
+    topics = [ALL_TOPICS, notebook_topic(notebook_id)]
+    if message.get("event_type") == "bulk":
+        # A burst may have touched any block in the notebook
+        topics.append(ANY_BLOCK_TOPIC)
+    for key in ("block_id", "parent_block_id"):
+        if message.get(key):
+            topics.append(block_topic(message[key]))
+    return topics
+
+
 @dataclass
 class FileChangeEvent:
     """Represents a file change event to broadcast."""
@@ -52,6 +168,7 @@ class FileChangeEvent:
     properties: dict | None = None
     workspace_id: int | None = None  # Routing target; resolved lazily if not given
     actor_principal_id: int | None = None  # User whose action triggered this event
+    parent_block_id: str | None = None  # Containing page, for block topic routing
 
     def to_dict(self) -> dict:
         result = {
@@ -72,9 +189,84 @@ class FileChangeEvent:
             result["properties"] = self.properties
         if self.actor_principal_id is not None:
             result["actor_principal_id"] = self.actor_principal_id
+        if self.parent_block_id:
+            result["parent_block_id"] = self.parent_block_id
         return result
 
 
+@dataclass
+class _PendingEvents:
+    """File events buffered for one notebook during a coalescing window.
+
+    Only the first ``threshold`` events are kept; beyond that just the count
+    grows, so a bulk scan buffers a bounded amount per notebook.
+    """
+
+    events: list[FileChangeEvent]
+    total: int = 0
+    workspace_id: int | None = None
+
+    def add(self, event: FileChangeEvent, threshold: int) -> None:
+        self.total += 1
+        if self.workspace_id is None:
+            self.workspace_id = event.workspace_id
+        if len(self.events) < threshold:
+            self.events.append(event)
+
+
+def _bulk_event(notebook_id: int, pending: _PendingEvents) -> dict:
+    """Summarize a burst of file events for one notebook as a single message."""
+    return {
+        "type": "file_change",
+        "notebook_id": notebook_id,
+        "event_type": "bulk",
+        "path": "",
+        "old_path": None,
+        "count": pending.total,
+        "paths": [e.path for e in pending.events[:BULK_EVENT_SAMPLE_SIZE]],
+        "timestamp": datetime.now(UTC).isoformat(),
+    }
+
+
+class _SocketSender:
+    """Bounded outbound queue and writer task for one WebSocket."""
+
+    def __init__(self, websocket: WebSocket, max_queue: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self.task: asyncio.Task | None = None
+        # While a resume replays missed messages, live broadcasts wait here as
+        # (channel, seq, text) so they can't overtake the replay.
+        self.held: list[tuple[str, int | None, str]] | None = None
+
+    def offer(self, text: str) -> bool:
+        """Enqueue an encoded message; return False if the queue is full."""
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def offer_broadcast(self, channel: str, seq: int | None, text: str) -> bool:
+        """Enqueue a broadcast message, or hold it while a resume is in progress."""
+        if self.held is None:
+            return self.offer(text)
+        if len(self.held) >= self.queue.maxsize:
+            return False
+        self.held.append((channel, seq, text))
+        return True
+
+    async def run(self, on_error: Callable[[WebSocket], None]) -> None:
+        while True:
+            text = await self.queue.get()
+            try:
+                await self.websocket.send_text(text)
+            except Exception as e:
+                logger.warning(f"Failed to send WebSocket message: {e}")
+                on_error(self.websocket)
+                return
+
+
 def _lookup_workspace_id_sync(notebook_id: int) -> int | None:
     """Blocking lookup of a notebook's workspace id, for use in a worker thread."""
     from codex.db.database import get_system_session_sync
@@ -88,24 +280,305 @@ def _lookup_workspace_id_sync(notebook_id: int) -> int | None:
         session.close()
 
 
+class BroadcastBackend(abc.ABC):
+    """Carries broadcast messages to every process holding WebSocket connections.
+
+    ``publish`` may be called from any process. It stamps the message with its
+    channel and the channel's next sequence number and records it for
+    ``replay``. Processes that hold sockets call ``start`` so messages published
+    anywhere are handed to ``deliver``, the connection manager's local send.
+    """
+
+    def __init__(self):
+        self._deliver: DeliverFn | None = None
+
+    def attach(self, deliver: DeliverFn) -> None:
+        """Set the callback that sends a message to this process's sockets."""
+        self._deliver = deliver
+
+    @abc.abstractmethod
+    async def publish(self, channel: str, message: dict) -> None:
+        """Stamp a message with the channel's next sequence number and fan it out."""
+
+    @abc.abstractmethod
+    async def epoch(self) -> str:
+        """Identifies the sequence space; sequence numbers are only comparable within one epoch."""
+
+    @abc.abstractmethod
+    async def last_seq(self, channel: str) -> int:
+        """The sequence number of the last message published to a channel (0 if none)."""
+
+    @abc.abstractmethod
+    async def replay(self, channel: str, after_seq: int) -> list[dict] | None:
+        """Messages published to a channel after ``after_seq``, oldest first.
+
+        Returns None when they can't all be replayed (the buffer rolled over or
+        the sequence was reset), in which case the client must resync.
+        """
+
+    async def start(self) -> None:
+        """Begin relaying published messages to local sockets."""
+
+    async def stop(self) -> None:
+        """Stop relaying and release any connections."""
+
+
+class InMemoryBroadcastBackend(BroadcastBackend):
+    """Single-process backend: published messages go straight to local sockets.
+
+    Sequence numbers restart with the process, so each instance has a fresh epoch.
+    """
+
+    def __init__(self, replay_size: int = WS_REPLAY_BUFFER):
+        super().__init__()
+        self._epoch = uuid.uuid4().hex
+        self._seqs: dict[str, int] = {}
+        self._buffers: dict[str, deque[dict]] = {}
+        self.replay_size = replay_size
+
+    async def publish(self, channel: str, message: dict) -> None:
+        seq = self._seqs.get(channel, 0) + 1
+        self._seqs[channel] = seq
+        message = {**message, "channel": channel, "seq": seq}
+        buffer = self._buffers.get(channel)
+        if buffer is None:
+            buffer = self._buffers[channel] = deque(maxlen=self.replay_size)
+        buffer.append(message)
+        if self._deliver is not None:
+            await self._deliver(channel, message)
+
+    async def epoch(self) -> str:
+        return self._epoch
+
+    async def last_seq(self, channel: str) -> int:
+        return self._seqs.get(channel, 0)
+
+    async def replay(self, channel: str, after_seq: int) -> list[dict] | None:
+        last = self._seqs.get(channel, 0)
+        if after_seq > last:
+            return None
+        if after_seq == last:
+            return []
+        buffer = self._buffers.get(channel)
+        if not buffer or buffer[0]["seq"] > after_seq + 1:
+            return None
+        return [m for m in buffer if m["seq"] > after_seq]
+
+
+class RedisBroadcastBackend(BroadcastBackend):
+    """Fans messages out across processes over Redis pub/sub.
+
+    Each message is published once to ``{prefix}{channel}``. Processes that
+    called ``start`` pattern-subscribe to ``{prefix}*`` and relay every message
+    to their local sockets, including the ones they published themselves.
+    Publish-only processes (the ARQ worker) never subscribe.
+
+    Sequence numbers come from ``INCR {prefix}seq:{channel}`` so they are shared
+    by every replica, and the replay buffer is a sorted set scored by sequence
+    at ``{prefix}replay:{channel}``.
+    """
+
+    def __init__(
+        self,
+        url: str = REDIS_URL,
+        prefix: str = WS_REDIS_PREFIX,
+        replay_size: int = WS_REPLAY_BUFFER,
+        replay_ttl: int = WS_REPLAY_TTL,
+    ):
+        super().__init__()
+        self.url = url
+        self.prefix = prefix
+        self.replay_size = replay_size
+        self.replay_ttl = replay_ttl
+        self._redis: Any = None
+        self._listener: asyncio.Task | None = None
+        self._epoch: str | None = None
+
+    def _client(self) -> Any:
+        if self._redis is None:
+            from redis.asyncio import Redis
+
+            self._redis = Redis.from_url(self.url)
+        return self._redis
+
+    def _seq_key(self, channel: str) -> str:
+        return f"{self.prefix}seq:{channel}"
+
+    def _replay_key(self, channel: str) -> str:
+        return f"{self.prefix}replay:{channel}"
+
+    async def publish(self, channel: str, message: dict) -> None:
+        redis = self._client()
+        try:
+            seq = await redis.incr(self._seq_key(channel))
+            message = {**message, "channel": channel, "seq": seq}
+            payload = json.dumps(message, default=str)
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zadd(self._replay_key(channel), {payload: seq})
+                pipe.zremrangebyrank(self._replay_key(channel), 0, -self.replay_size - 1)
+                pipe.expire(self._replay_key(channel), self.replay_ttl)
+                pipe.expire(self._seq_key(channel), self.replay_ttl)
+                pipe.publish(f"{self.prefix}{channel}", payload)
+                await pipe.execute()
+        except Exception as e:
+            # Don't lose the message for this process's own sockets just because
+            # Redis is unreachable; other replicas miss it either way.
+            logger.warning(f"Redis publish to {channel} failed, delivering locally only: {e}")
+            if self._deliver is not None:
+                await self._deliver(channel, message)
+
+    async def epoch(self) -> str:
+        if self._epoch is None:
+            key = f"{self.prefix}epoch"
+            redis = self._client()
+            try:
+                await redis.set(key, uuid.uuid4().hex, nx=True)
+                epoch = await redis.get(key)
+            except Exception as e:
+                # Resumes against an unknown epoch just resync
+                logger.warning(f"Could not read WebSocket sequence epoch from Redis: {e}")
+                return ""
+            self._epoch = epoch.decode() if isinstance(epoch, bytes) else epoch
+        return self._epoch
+
+    async def last_seq(self, channel: str) -> int:
+        try:
+            return int(await self._client().get(self._seq_key(channel)) or 0)
+        except Exception as e:
+            logger.warning(f"Could not read WebSocket sequence for {channel} from Redis: {e}")
+            return 0
+
+    async def replay(self, channel: str, after_seq: int) -> list[dict] | None:
+        redis = self._client()
+        try:
+            last = int(await redis.get(self._seq_key(channel)) or 0)
+            if after_seq > last:
+                return None
+            if after_seq == last:
+                return []
+            oldest = await redis.zrange(self._replay_key(channel), 0, 0, withscores=True)
+            if not oldest or oldest[0][1] > after_seq + 1:
+                return None
+            payloads = await redis.zrangebyscore(self._replay_key(channel), after_seq + 1, "+inf")
+        except Exception as e:
+            logger.warning(f"Redis replay for {channel} failed: {e}")
+            return None
+        return [json.loads(p) for p in payloads]
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+            logger.info(f"Relaying WebSocket broadcasts from Redis ({self.prefix}*)")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._client().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(f"{self.prefix}*")
+                async for item in pubsub.listen():
+                    if item.get("type") != "pmessage":
+                        continue
+                    await self._relay(item["channel"], item["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Redis WebSocket relay disconnected, retrying: {e}")
+                await asyncio.sleep(REDIS_RECONNECT_DELAY)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def _relay(self, redis_channel: bytes | str, data: bytes | str) -> None:
+        if self._deliver is None:
+            return
+        if isinstance(redis_channel, bytes):
+            redis_channel = redis_channel.decode()
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed broadcast on {redis_channel}")
+            return
+        try:
+            await self._deliver(redis_channel.removeprefix(self.prefix), message)
+        except Exception as e:
+            logger.error(f"Error delivering relayed broadcast: {e}", exc_info=True)
+
+
+def create_broadcast_backend(name: str = WS_BACKEND) -> BroadcastBackend:
+    """Build the broadcast backend selected by ``CODEX_WS_BACKEND``."""
+    if name == "redis":
+        return RedisBroadcastBackend()
+    if name != "memory":
+        logger.warning(f"Unknown CODEX_WS_BACKEND {name!r}, using in-memory broadcasts")
+    return InMemoryBroadcastBackend()
+
+
 class ConnectionManager:
     """Manages WebSocket connections and their channel subscriptions."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        backend: BroadcastBackend | None = None,
+        coalesce_window: float = WS_COALESCE_WINDOW,
+        coalesce_threshold: int = WS_COALESCE_THRESHOLD,
+        send_queue_size: int = WS_SEND_QUEUE_SIZE,
+    ):
         # Map of channel -> set of connected WebSockets
         self._channels: dict[str, set[WebSocket]] = {}
         # Map of WebSocket -> set of channels it is subscribed to (for cleanup)
         self._socket_channels: dict[WebSocket, set[str]] = {}
-        # Event queue for broadcasting from sync threads
-        self._event_queue: asyncio.Queue[FileChangeEvent] | None = None
+        # Map of WebSocket -> its outbound queue and writer task
+        self.send_queue_size = send_queue_size
+        self._senders: dict[WebSocket, _SocketSender] = {}
+        # Topic index for workspace channels: (channel, topic) -> sockets, and the reverse
+        self._topics: dict[tuple[str, str], set[WebSocket]] = {}
+        self._socket_topics: dict[WebSocket, set[tuple[str, str]]] = {}
+        # File events buffered per notebook, filled from any thread under _pending_lock
+        self.coalesce_window = coalesce_window
+        self.coalesce_threshold = coalesce_threshold
+        self._pending: dict[int, _PendingEvents] = {}
+        self._pending_lock = threading.Lock()
+        self._wakeup_scheduled = False
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
         self._broadcast_task: asyncio.Task | None = None
+        # Close handshakes with dropped slow clients, kept referenced until done
+        self._closing: set[asyncio.Task] = set()
+        # Counters for the file event bridge (see stats())
+        self._stats = {
+            "queued": 0,
+            "broadcast": 0,
+            "coalesced": 0,
+            "bulk_events": 0,
+            "dropped": 0,
+            "slow_disconnects": 0,
+        }
         # Cache of notebook_id -> workspace_id for events that don't carry it
         self._notebook_workspace_cache: dict[int, int] = {}
+        self.backend = backend or create_broadcast_backend()
+        self.backend.attach(self._deliver)
 
     async def connect(self, websocket: WebSocket) -> None:
         """Accept a new WebSocket connection. Subscribe it to channels separately."""
         await websocket.accept()
         self._socket_channels[websocket] = set()
+        sender = _SocketSender(websocket, self.send_queue_size)
+        sender.task = asyncio.create_task(sender.run(self.disconnect))
+        self._senders[websocket] = sender
 
     def subscribe(self, websocket: WebSocket, channel: str) -> None:
         """Subscribe an already-connected socket to a channel.
@@ -116,8 +589,43 @@ class ConnectionManager:
         self._channels.setdefault(channel, set()).add(websocket)
         self._socket_channels.setdefault(websocket, set()).add(channel)
 
+    def subscribe_topic(self, websocket: WebSocket, channel: str, topic: str) -> None:
+        """Route a channel's messages for `topic` to a socket.
+
+        The socket must already be subscribed to `channel`; the topic only
+        narrows what it receives from there.
+        """
+        if channel not in self._socket_channels.get(websocket, ()):
+            raise ValueError(f"Socket is not subscribed to {channel}")
+        key = (channel, topic)
+        self._topics.setdefault(key, set()).add(websocket)
+        self._socket_topics.setdefault(websocket, set()).add(key)
+
+    def unsubscribe_topic(self, websocket: WebSocket, channel: str, topic: str) -> None:
+        """Stop routing a channel's messages for `topic` to a socket."""
+        key = (channel, topic)
+        self._socket_topics.get(websocket, set()).discard(key)
+        sockets = self._topics.get(key)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self._topics[key]
+
+    def topics(self, websocket: WebSocket, channel: str) -> set[str]:
+        """Topics a socket is subscribed to on a channel."""
+        return {topic for ch, topic in self._socket_topics.get(websocket, ()) if ch == channel}
+
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection from all channels it was subscribed to."""
+        sender = self._senders.pop(websocket, None)
+        if sender is not None and sender.task is not None and sender.task is not asyncio.current_task():
+            sender.task.cancel()
+        for channel, topic in list(self._socket_topics.pop(websocket, ())):
+            sockets = self._topics.get((channel, topic))
+            if sockets is not None:
+                sockets.discard(websocket)
+                if not sockets:
+                    del self._topics[(channel, topic)]
         channels = self._socket_channels.pop(websocket, set())
         for channel in channels:
             connections = self._channels.get(channel)
@@ -129,49 +637,197 @@ class ConnectionManager:
             logger.info(f"WebSocket disconnected from channels: {sorted(channels)}")
 
     async def broadcast(self, channel: str, message: dict) -> None:
-        """Broadcast a message to all connections subscribed to a channel."""
-        connections = self._channels.get(channel)
+        """Broadcast a message to every connection subscribed to a channel, in any process."""
+        await self.backend.publish(channel, message)
+
+    async def send(self, websocket: WebSocket, message: dict | str) -> None:
+        """Send a message to one connected socket through its outbound queue."""
+        sender = self._senders.get(websocket)
+        if sender is None:
+            return  # Not connected, or already dropped
+        text = message if isinstance(message, str) else json.dumps(message, default=str)
+        if not sender.offer(text):
+            self._drop_slow(sender)
+
+    async def _deliver(self, channel: str, message: dict) -> None:
+        """Send a message to this process's connections subscribed to a channel.
+
+        The message is encoded once and queued for each socket's writer task,
+        so this never waits on a client. Notebook-scoped messages on workspace
+        channels only go to sockets subscribed to one of their topics.
+        """
+        connections = self._recipients(channel, message)
         if not connections:
             return
 
-        dead_connections = []
-        # Snapshot the set before awaiting: disconnect() can mutate `connections`
-        # concurrently (e.g. a client dropping mid-broadcast), and iterating the
-        # live set while awaiting send_json() would raise "Set changed size
-        # during iteration".
-        for websocket in list(connections):
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send WebSocket message: {e}")
-                dead_connections.append(websocket)
+        text = json.dumps(message, default=str)
+        seq = message.get("seq")
+        slow = []
+        for websocket in connections:
+            sender = self._senders.get(websocket)
+            if sender is not None and not sender.offer_broadcast(channel, seq, text):
+                slow.append(sender)
+
+        for sender in slow:
+            self._drop_slow(sender)
+
+    def _recipients(self, channel: str, message: dict) -> set[WebSocket]:
+        topics = message_topics(message) if channel.startswith(WORKSPACE_CHANNEL_PREFIX) else None
+        if topics is None:
+            return self._channels.get(channel, set())
+        recipients: set[WebSocket] = set()
+        for topic in topics:
+            if topic == ANY_BLOCK_TOPIC:
+                for (ch, subscribed), sockets in self._topics.items():
+                    if ch == channel and subscribed.startswith("block:"):
+                        recipients |= sockets
+            else:
+                recipients |= self._topics.get((channel, topic), set())
+        return recipients
+
+    def hold(self, websocket: WebSocket) -> None:
+        """Hold live broadcasts for a socket until ``resume`` has replayed what it missed.
+
+        Call before subscribing the socket so no live message can overtake the replay.
+        """
+        sender = self._senders.get(websocket)
+        if sender is not None:
+            sender.held = []
+
+    async def channel_seqs(self, websocket: WebSocket) -> dict[str, int]:
+        """The current sequence number of each channel a socket is subscribed to."""
+        return {
+            channel: await self.backend.last_seq(channel)
+            for channel in sorted(self._socket_channels.get(websocket, ()))
+        }
+
+    async def resume(self, websocket: WebSocket, epoch: str | None, last_seqs: dict[str, int]) -> dict:
+        """Replay the messages a reconnecting socket missed, then release held broadcasts.
 
-        for websocket in dead_connections:
-            connections.discard(websocket)
+        ``last_seqs`` maps channel to the last sequence number the client saw;
+        channels the socket isn't subscribed to are ignored. Channels that can't
+        be replayed (different epoch, or the buffer rolled over) get a
+        ``resync_required`` message instead.
+        """
+        sender = self._senders.get(websocket)
+        subscribed = self._socket_channels.get(websocket, set())
+        replayed: dict[str, int] = {}
+        resync: list[str] = []
+        count = 0
+        try:
+            same_epoch = epoch is not None and epoch == await self.backend.epoch()
+            for channel, after_seq in last_seqs.items():
+                if channel not in subscribed:
+                    continue
+                messages = await self.backend.replay(channel, after_seq) if same_epoch else None
+                if messages is None:
+                    resync.append(channel)
+                    continue
+                for message in messages:
+                    if websocket in self._recipients(channel, message):
+                        await self.send(websocket, message)
+                        count += 1
+                replayed[channel] = messages[-1]["seq"] if messages else after_seq
+            for channel in resync:
+                await self.send(websocket, {"type": "resync_required", "channel": channel})
+            summary = {"type": "resumed", "replayed": count, "resync": resync}
+            await self.send(websocket, summary)
+        finally:
+            if sender is not None and sender.held is not None:
+                held, sender.held = sender.held, None
+                for channel, seq, text in held:
+                    if seq is not None and seq <= replayed.get(channel, 0):
+                        continue  # Already sent by the replay
+                    if not sender.offer(text):
+                        self._drop_slow(sender)
+                        break
+        return summary
+
+    def _drop_slow(self, sender: _SocketSender) -> None:
+        """Disconnect a client whose outbound queue overflowed.
+
+        The close handshake runs in the background: a client too slow to
+        drain its queue may be just as slow to close, and the broadcast path
+        must not wait on it.
+        """
+        logger.warning(f"WebSocket send queue full ({self.send_queue_size} messages), disconnecting slow client")
+        with self._pending_lock:
+            self._stats["slow_disconnects"] += 1
+        self.disconnect(sender.websocket)
+        task = asyncio.create_task(self._close_slow(sender.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_slow(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=WS_TRY_AGAIN_LATER, reason="Too slow"), timeout=SLOW_CLOSE_TIMEOUT
+            )
+        except Exception:
+            pass
 
     def queue_event(self, event: FileChangeEvent):
-        """Queue an event for async broadcasting (thread-safe)."""
-        if self._event_queue is not None:
+        """Buffer an event for broadcasting. Safe to call from any thread.
+
+        Events are dropped (and counted) when the broadcast loop isn't running.
+        """
+        loop = self._loop
+        with self._pending_lock:
+            if loop is None or self._wakeup is None:
+                self._stats["dropped"] += 1
+                return
+            pending = self._pending.get(event.notebook_id)
+            if pending is None:
+                pending = self._pending[event.notebook_id] = _PendingEvents(events=[])
+            pending.add(event, self.coalesce_threshold)
+            self._stats["queued"] += 1
+            wake = not self._wakeup_scheduled
+            self._wakeup_scheduled = True
+
+        if wake:
             try:
-                self._event_queue.put_nowait(event)
-            except asyncio.QueueFull:
-                logger.warning("Event queue full, dropping file change event")
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # The loop has been closed (shutdown in progress)
+                with self._pending_lock:
+                    self._stats["dropped"] += pending.total
+                    self._pending.pop(event.notebook_id, None)
+
+    def stats(self) -> dict[str, int]:
+        """Counters for the file event bridge.
+
+        ``queued`` events were accepted, ``broadcast`` were sent individually,
+        ``coalesced`` were folded into ``bulk_events`` summaries, and ``dropped``
+        were discarded because no broadcast loop was running or their workspace
+        could not be resolved.
+        """
+        with self._pending_lock:
+            return dict(self._stats)
 
     async def start_broadcast_loop(self):
-        """Start the async broadcast loop."""
-        self._event_queue = asyncio.Queue(maxsize=1000)
+        """Start the async broadcast loop and begin relaying backend broadcasts."""
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
         self._broadcast_task = asyncio.create_task(self._broadcast_loop())
+        await self.backend.start()
         logger.info("WebSocket broadcast loop started")
 
     async def stop_broadcast_loop(self):
-        """Stop the broadcast loop."""
+        """Stop the broadcast loop and close the broadcast backend."""
+        with self._pending_lock:
+            self._loop = None
         if self._broadcast_task:
             self._broadcast_task.cancel()
             try:
                 await self._broadcast_task
             except asyncio.CancelledError:
                 pass
-        self._event_queue = None
+            self._broadcast_task = None
+        with self._pending_lock:
+            self._wakeup = None
+            self._wakeup_scheduled = False
+            self._pending.clear()
+        await self.backend.stop()
         logger.info("WebSocket broadcast loop stopped")
 
     async def _resolve_workspace_id(self, notebook_id: int) -> int | None:
@@ -183,23 +839,52 @@ class ConnectionManager:
             self._notebook_workspace_cache[notebook_id] = workspace_id
         return workspace_id
 
+    def _take_pending(self) -> dict[int, _PendingEvents]:
+        with self._pending_lock:
+            self._wakeup.clear()
+            self._wakeup_scheduled = False
+            pending, self._pending = self._pending, {}
+        return pending
+
     async def _broadcast_loop(self):
-        """Process events from the queue and broadcast them."""
+        """Broadcast buffered file events, one coalescing window at a time."""
         while True:
             try:
-                event = await self._event_queue.get()
-                workspace_id = event.workspace_id
-                if workspace_id is None:
-                    workspace_id = await self._resolve_workspace_id(event.notebook_id)
-                if workspace_id is None:
-                    logger.warning(f"Could not resolve workspace for notebook {event.notebook_id}, dropping event")
-                    continue
-                await self.broadcast(workspace_channel(workspace_id), event.to_dict())
+                await self._wakeup.wait()
+                if self.coalesce_window > 0:
+                    # Let a burst accumulate so it can be summarized
+                    await asyncio.sleep(self.coalesce_window)
+                for notebook_id, pending in self._take_pending().items():
+                    await self._broadcast_pending(notebook_id, pending)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in broadcast loop: {e}", exc_info=True)
 
+    async def _broadcast_pending(self, notebook_id: int, pending: _PendingEvents) -> None:
+        workspace_id = pending.workspace_id
+        if workspace_id is None:
+            workspace_id = await self._resolve_workspace_id(notebook_id)
+        if workspace_id is None:
+            logger.warning(f"Could not resolve workspace for notebook {notebook_id}, dropping {pending.total} events")
+            with self._pending_lock:
+                self._stats["dropped"] += pending.total
+            return
+
+        channel = workspace_channel(workspace_id)
+        if pending.total > self.coalesce_threshold:
+            logger.info(f"Coalesced {pending.total} file events for notebook {notebook_id} into one bulk event")
+            with self._pending_lock:
+                self._stats["coalesced"] += pending.total
+                self._stats["bulk_events"] += 1
+            await self.broadcast(channel, _bulk_event(notebook_id, pending))
+            return
+
+        with self._pending_lock:
+            self._stats["broadcast"] += pending.total
+        for event in pending.events:
+            await self.broadcast(channel, event.to_dict())
+
 
 # Global connection manager instance
 connection_manager = ConnectionManager()
@@ -216,6 +901,7 @@ def notify_file_change(
     properties: dict | None = None,
     workspace_id: int | None = None,
     actor_principal_id: int | None = None,
+    parent_block_id: str | None = None,
 ):
     """Notify connected clients about a file change.
 
@@ -235,5 +921,6 @@ def notify_file_change(
         properties=properties,
         workspace_id=workspace_id,
         actor_principal_id=actor_principal_id,
+        parent_block_id=parent_block_id,
     )
     connection_manager.queue_event(event)
@@ -63,6 +63,19 @@ def get_system_session_sync() -> Session:
     return Session(system_engine_sync)
 
 
+def dialect_insert(session: AsyncSession | Session):
+    """Return the `insert` construct for the session's backend (SQLite or Postgres).
+
+    Both dialects' inserts support ON CONFLICT and RETURNING, which the
+    generic `sqlalchemy.insert` does not expose.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
 def run_alembic_migrations():
     """Run Alembic migrations for system database.
 
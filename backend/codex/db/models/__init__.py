@@ -38,10 +38,12 @@ from .system import (
     Notebook,
     NotebookPluginConfig,
     Notification,
+    NotificationCounter,
     OAuthConnection,
     Organization,
     OrgMembership,
     OrgRole,
+    OutboxJob,
     PasswordResetToken,
     PersonalAccessToken,
     Plugin,
@@ -81,6 +83,8 @@ __all__ = [
     "CommentMention",
     "Event",
     "Notification",
+    "NotificationCounter",
+    "OutboxJob",
     "WorkspaceWatch",
     "SyncJournal",
     # Token models
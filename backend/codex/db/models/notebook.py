@@ -12,7 +12,7 @@ to the system database (not a foreign key, since it's in a different database).
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, UniqueConstraint
+from sqlalchemy import DateTime, Index, String, UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 from .base import utc_now
@@ -55,6 +55,7 @@ class Block(SQLModel, table=True):
     __table_args__ = (
         UniqueConstraint("notebook_id", "block_id", name="uq_blocks_notebook_block_id"),
         UniqueConstraint("notebook_id", "path", name="uq_blocks_notebook_path"),
+        Index("ix_blocks_parent_order_key", "notebook_id", "parent_block_id", "order_key"),
         {"sqlite_autoincrement": True},
     )
 
@@ -65,7 +66,10 @@ class Block(SQLModel, table=True):
     path: str = Field(index=True, sa_type=String(collation="BINARY"))  # Filesystem path relative to notebook root
     block_type: str  # "page", "text", "heading", "code", "image", "list", "quote", "divider", "embed", "file"
     content_format: str = Field(default="markdown")  # "markdown", "json", "binary"
-    order_index: float = Field(default=0.0)  # Fractional indexing for ordering
+    order_index: float = Field(default=0.0)  # Legacy float ordering, superseded by order_key
+    order_key: str | None = Field(
+        default=None, sa_type=String(collation="BINARY")
+    )  # Lexicographic sibling order (see core.order_keys)
     title: str | None = None
 
     # File metadata (formerly on FileMetadata)
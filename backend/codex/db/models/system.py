@@ -12,6 +12,8 @@ These models are stored in the system database (codex_system.db):
 - CommentMention: @handle mentions parsed from a comment at post time
 - Event: Append-only event outbox for notification fanout
 - Notification: Per-recipient delivery record for an Event
+- NotificationCounter: Materialized per-user unread notification count
+- OutboxJob: Background job written transactionally, relayed to ARQ
 - WorkspaceWatch: Per-user opt-in/mute notification preference for a workspace
 - SyncJournal: Append-only journal of S3-synced file changes (change feed cursor)
 - Plugin: Plugin registry
@@ -199,6 +201,13 @@ class Task(SQLModel, table=True):
     """Tasks for agent work."""
 
     __tablename__ = "tasks"  # type: ignore[assignment]
+    __table_args__ = (
+        # Keyset pagination of a workspace's task list (see codex.api.pagination)
+        Index("ix_tasks_workspace_created", "workspace_id", "created_at", "id"),
+        # One bot-mention task per (comment, mentioned bot); the dedup target of
+        # `_enqueue_bot_mention_tasks`. Rows without a source comment are exempt.
+        Index("uq_tasks_source_comment_principal", "source_comment_id", "mention_principal_id", unique=True),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     workspace_id: int = Field(foreign_key="workspaces.id")
@@ -210,6 +219,8 @@ class Task(SQLModel, table=True):
     job_id: str | None = None  # ARQ job identifier for background execution
     job_type: str = Field(default="agent")  # Job type for generic dispatch
     task_metadata: str | None = None  # JSON-encoded task-specific context
+    source_comment_id: int | None = None  # Comment that spawned a bot_mention task
+    mention_principal_id: int | None = None  # Bot principal mentioned in that comment
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_column=Column(DateTime(timezone=True)))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_column=Column(DateTime(timezone=True)))
     completed_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
@@ -604,6 +615,8 @@ class Comment(SQLModel, table=True):
     """
 
     __tablename__ = "comments"  # type: ignore[assignment]
+    # Keyset pagination of a block's comments (see codex.api.pagination)
+    __table_args__ = (Index("ix_comments_block_created", "notebook_id", "block_id", "created_at", "id"),)
 
     id: int | None = Field(default=None, primary_key=True)
     workspace_id: int = Field(foreign_key="workspaces.id", index=True)
@@ -673,19 +686,86 @@ class Notification(SQLModel, table=True):
 
     One row per (event, recipient) — enforced by a unique constraint so the async
     fanout job can be retried freely without creating duplicate notifications.
+    A row may also be a digest of a burst of related events (see
+    `codex.core.notification_digests`): `event_id` then points at the latest of
+    the `event_count` events it stands for.
     """
 
     __tablename__ = "notifications"  # type: ignore[assignment]
-    __table_args__ = (UniqueConstraint("event_id", "recipient_id", name="uq_notifications_event_recipient"),)
+    __table_args__ = (
+        UniqueConstraint("event_id", "recipient_id", name="uq_notifications_event_recipient"),
+        # Keyset pagination of a user's notifications (see codex.api.pagination)
+        Index("ix_notifications_recipient_created", "recipient_id", "created_at", "id"),
+        # Lookup of a recipient's open (unread) digest for a group
+        Index(
+            "ix_notifications_open_digest",
+            "recipient_id",
+            "group_key",
+            "created_at",
+            sqlite_where=text("read_at IS NULL AND group_key IS NOT NULL"),
+            postgresql_where=text("read_at IS NULL AND group_key IS NOT NULL"),
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     event_id: int = Field(foreign_key="events.id", index=True)
     recipient_id: int = Field(foreign_key="users.id", index=True)
+    group_key: str | None = None  # Digest group (kind + target); None if the kind is never coalesced
+    event_count: int = Field(default=1)  # Events this row stands for
     read_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
     delivered_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_column=Column(DateTime(timezone=True)))
 
 
+class NotificationCounter(SQLModel, table=True):
+    """A user's materialized unread notification count.
+
+    Adjusted in the same transaction that creates notifications or marks them
+    read, so the unread badge is a primary-key lookup instead of a COUNT over
+    `notifications`. The periodic `reconcile_unread_counts` job recomputes it
+    from the notification rows to correct any drift.
+    """
+
+    __tablename__ = "notification_counters"  # type: ignore[assignment]
+
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    unread_count: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_column=Column(DateTime(timezone=True)))
+
+
+class OutboxJob(SQLModel, table=True):
+    """A background job recorded in the same transaction as the change that needs it.
+
+    Routes add a row instead of enqueueing to ARQ directly, so the job can't
+    be lost between commit and enqueue and a request never waits on Redis.
+    The relay (`codex.core.outbox`) drains pending rows to ARQ in batches,
+    using `job_key` as the ARQ job id so a row sent twice runs once. A row
+    whose enqueue fails waits until `next_attempt_at` before it is retried,
+    and is given up on (left undispatched) once `attempts` reaches the
+    relay's limit.
+    """
+
+    __tablename__ = "job_outbox"  # type: ignore[assignment]
+    __table_args__ = (
+        Index(
+            "ix_job_outbox_pending",
+            "id",
+            sqlite_where=text("dispatched_at IS NULL"),
+            postgresql_where=text("dispatched_at IS NULL"),
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    function: str  # ARQ job function name, e.g. "fanout_event"
+    args: list = Field(default=[], sa_column=Column(JSON))
+    job_key: str = Field(unique=True)  # idempotency key, used as the ARQ job id
+    attempts: int = Field(default=0)
+    last_error: str | None = None
+    next_attempt_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_column=Column(DateTime(timezone=True)))
+    dispatched_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
+
+
 class WorkspaceWatch(SQLModel, table=True):
     """A user's opt-in/mute notification preference for a workspace (issue #530).
 
@@ -16,6 +16,7 @@ from sqlmodel import select
 from ulid import ULID
 
 from codex.api.auth import assert_secret_key_is_safe
+from codex.api.pagination import NEXT_CURSOR_HEADER
 from codex.api.routes import (
     agents,
     blocks,
@@ -42,6 +43,10 @@ from codex.api.routes import (
 from codex.api.routes import (
     auth as auth_routes,
 )
+from codex.core.http_client import http_clients
+from codex.core.invalidation import invalidation_bus
+from codex.core.outbox import outbox_relay
+from codex.core.token_usage import token_usage
 from codex.core.watcher import NotebookWatcher, register_watcher, stop_all_watchers
 from codex.core.websocket import connection_manager
 from codex.core.workspace_sharing import is_shared_workspace
@@ -65,6 +70,15 @@ async def lifespan(app: FastAPI):
     # Start WebSocket broadcast loop
     await connection_manager.start_broadcast_loop()
 
+    # Relay cache invalidations (permissions, ...) between API processes
+    await invalidation_bus.start()
+
+    # Write buffered personal access token last_used_at values periodically
+    token_usage.start()
+
+    # Pooled keep-alive HTTP client for integrations, agents and embeddings
+    await http_clients.start()
+
     # Initialize ARQ Redis connection pool for enqueueing background jobs
     try:
         from arq.connections import create_pool
@@ -77,6 +91,9 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Could not connect to Redis for task queue: {e}")
         app.state.arq_pool = None
 
+    # Relay background jobs that routes recorded in the outbox to the task queue
+    outbox_relay.start(lambda: app.state.arq_pool)
+
     # Plugins directory for serving theme/block assets
     default_plugins_dir = Path(__file__).parent.parent.parent / "backend" / "plugins"
     plugins_dir = Path(os.getenv("CODEX_PLUGINS_DIR", default_plugins_dir))
@@ -105,7 +122,8 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Close ARQ Redis pool
+    # Enqueue what's left in the outbox, then close the ARQ Redis pool
+    await outbox_relay.stop()
     if getattr(app.state, "arq_pool", None) is not None:
         await app.state.arq_pool.close()
 
@@ -115,9 +133,20 @@ async def lifespan(app: FastAPI):
     # Stop all watchers on shutdown
     stop_all_watchers()
 
+    # Write out any coalesced page manifest changes
+    from codex.core.page_manifest import page_manifests
+
+    page_manifests.flush()
+
+    await token_usage.stop()
+
+    await http_clients.aclose()
+
     # Stop WebSocket broadcast loop
     await connection_manager.stop_broadcast_loop()
 
+    await invalidation_bus.stop()
+
 
 def _start_notebook_watchers_sync():
     """Start notebook watchers synchronously (runs in thread pool)."""
@@ -216,6 +245,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
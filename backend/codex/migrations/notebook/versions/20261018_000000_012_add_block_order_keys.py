@@ -0,0 +1,55 @@
+"""Add fractional order keys to blocks
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18
+
+Replaces the float order_index scheme with lexicographic order keys
+(see codex.core.order_keys) so moving a block rewrites only that block's
+row. Existing siblings are backfilled in their current order_index order;
+order_index itself is kept for older clients but is no longer maintained.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from codex.core.order_keys import keys_between
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: str | None = "011"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    existing_cols = {row[1] for row in conn.execute(sa.text("PRAGMA table_info(blocks)")).fetchall()}
+    if "order_key" not in existing_cols:
+        conn.execute(sa.text("ALTER TABLE blocks ADD COLUMN order_key TEXT COLLATE BINARY"))
+
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, notebook_id, parent_block_id FROM blocks "
+            "WHERE order_key IS NULL ORDER BY notebook_id, parent_block_id, order_index, id"
+        )
+    ).fetchall()
+
+    groups: dict[tuple, list[int]] = {}
+    for row_id, notebook_id, parent_block_id in rows:
+        groups.setdefault((notebook_id, parent_block_id), []).append(row_id)
+
+    for ids in groups.values():
+        for row_id, key in zip(ids, keys_between(None, None, len(ids)), strict=True):
+            conn.execute(sa.text("UPDATE blocks SET order_key = :key WHERE id = :id"), {"key": key, "id": row_id})
+
+    op.create_index("ix_blocks_parent_order_key", "blocks", ["notebook_id", "parent_block_id", "order_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_blocks_parent_order_key", table_name="blocks")
+    with op.batch_alter_table("blocks", schema=None) as batch_op:
+        batch_op.drop_column("order_key")
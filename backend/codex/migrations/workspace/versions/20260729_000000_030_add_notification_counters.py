@@ -0,0 +1,38 @@
+"""Add notification_counters table
+
+Revision ID: 030
+Revises: 029
+Create Date: 2026-07-29
+
+Adds the materialized per-user unread notification count served by the
+unread badge endpoint, backfilled from the existing unread notifications.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers
+revision: str = "030"
+down_revision: str | None = "029"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_counters",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("unread_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO notification_counters (user_id, unread_count, updated_at) "
+        "SELECT recipient_id, COUNT(*), CURRENT_TIMESTAMP FROM notifications "
+        "WHERE read_at IS NULL GROUP BY recipient_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_counters")
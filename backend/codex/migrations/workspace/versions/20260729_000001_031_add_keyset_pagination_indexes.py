@@ -0,0 +1,32 @@
+"""Add (created_at, id) composite indexes for keyset pagination
+
+Revision ID: 031
+Revises: 030
+Create Date: 2026-07-29
+
+The notification, comment and task list routes page by `(created_at, id)`
+after their filter columns (see codex.api.pagination); these indexes let
+each page be a single index range scan.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers
+revision: str = "031"
+down_revision: str | None = "030"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_notifications_recipient_created", "notifications", ["recipient_id", "created_at", "id"])
+    op.create_index("ix_comments_block_created", "comments", ["notebook_id", "block_id", "created_at", "id"])
+    op.create_index("ix_tasks_workspace_created", "tasks", ["workspace_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_workspace_created", table_name="tasks")
+    op.drop_index("ix_comments_block_created", table_name="comments")
+    op.drop_index("ix_notifications_recipient_created", table_name="notifications")
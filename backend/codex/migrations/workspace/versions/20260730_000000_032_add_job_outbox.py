@@ -0,0 +1,46 @@
+"""Add job_outbox table
+
+Revision ID: 032
+Revises: 031
+Create Date: 2026-07-30
+
+Adds the transactional outbox for background jobs: routes write a row in the
+same transaction as their change, and a relay drains pending rows to ARQ.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers
+revision: str = "032"
+down_revision: str | None = "031"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("function", sa.String(), nullable=False),
+        sa.Column("args", sa.JSON(), nullable=False, server_default="[]"),
+        sa.Column("job_key", sa.String(), nullable=False, unique=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("dispatched_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_job_outbox_pending",
+        "job_outbox",
+        ["id"],
+        sqlite_where=sa.text("dispatched_at IS NULL"),
+        postgresql_where=sa.text("dispatched_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_outbox_pending", table_name="job_outbox")
+    op.drop_table("job_outbox")
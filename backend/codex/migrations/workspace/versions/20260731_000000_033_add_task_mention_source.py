@@ -0,0 +1,64 @@
+"""Add source_comment_id/mention_principal_id to tasks
+
+Revision ID: 033
+Revises: 032
+Create Date: 2026-07-31
+
+Bot-mention tasks used to be deduplicated by JSON-parsing every bot_mention
+task's `task_metadata` for the comment id. These columns, under a unique
+index, make that a single indexed INSERT ... ON CONFLICT DO NOTHING. Existing
+bot_mention tasks are backfilled from their metadata; if an earlier race left
+duplicates, only the oldest task for a (comment, bot) pair is keyed.
+"""
+
+import json
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers
+revision: str = "033"
+down_revision: str | None = "032"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("source_comment_id", sa.Integer(), nullable=True))
+    op.add_column("tasks", sa.Column("mention_principal_id", sa.Integer(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, task_metadata FROM tasks WHERE task_type = 'bot_mention' ORDER BY id")
+    ).all()
+    seen: set[tuple[int, int]] = set()
+    keys = []
+    for task_id, raw in rows:
+        try:
+            metadata = json.loads(raw or "{}")
+        except ValueError:
+            continue
+        comment_id, principal_id = metadata.get("comment_id"), metadata.get("mentioned_principal_id")
+        if comment_id is None or principal_id is None or (comment_id, principal_id) in seen:
+            continue
+        seen.add((comment_id, principal_id))
+        keys.append({"task_id": task_id, "comment_id": comment_id, "principal_id": principal_id})
+    if keys:
+        conn.execute(
+            sa.text(
+                "UPDATE tasks SET source_comment_id = :comment_id, mention_principal_id = :principal_id "
+                "WHERE id = :task_id"
+            ),
+            keys,
+        )
+
+    op.create_index(
+        "uq_tasks_source_comment_principal", "tasks", ["source_comment_id", "mention_principal_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_tasks_source_comment_principal", table_name="tasks")
+    op.drop_column("tasks", "mention_principal_id")
+    op.drop_column("tasks", "source_comment_id")
@@ -0,0 +1,39 @@
+"""Add group_key/event_count to notifications
+
+Revision ID: 034
+Revises: 033
+Create Date: 2026-08-01
+
+Lets a notification row stand for a burst of related events (a digest, see
+codex.core.notification_digests). Existing rows keep a NULL group_key, so
+they are never coalesced into.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers
+revision: str = "034"
+down_revision: str | None = "033"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("notifications", sa.Column("group_key", sa.String(), nullable=True))
+    op.add_column("notifications", sa.Column("event_count", sa.Integer(), nullable=False, server_default="1"))
+    op.create_index(
+        "ix_notifications_open_digest",
+        "notifications",
+        ["recipient_id", "group_key", "created_at"],
+        sqlite_where=sa.text("read_at IS NULL AND group_key IS NOT NULL"),
+        postgresql_where=sa.text("read_at IS NULL AND group_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_open_digest", table_name="notifications")
+    op.drop_column("notifications", "event_count")
+    op.drop_column("notifications", "group_key")
@@ -0,0 +1,29 @@
+"""Add next_attempt_at to job_outbox
+
+Revision ID: 035
+Revises: 034
+Create Date: 2026-08-02
+
+Lets the outbox relay back off a row whose enqueue failed instead of
+retrying it at the head of every batch, where a permanently failing row
+blocked every newer one.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers
+revision: str = "035"
+down_revision: str | None = "034"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("job_outbox", sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("job_outbox", "next_attempt_at")
@@ -8,6 +8,7 @@ from urllib.parse import urljoin
 
 import httpx
 
+from codex.core.http_client import get_http_client
 from codex.plugins.opengraph_scraper import OpenGraphScraper
 
 logger = logging.getLogger(__name__)
@@ -106,20 +107,20 @@ class IntegrationExecutor:
         # Make request
         method = endpoint.get("method", "GET").upper()
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            if method == "GET":
-                response = await client.get(url, headers=headers, params=request_params)
-            elif method == "POST":
-                response = await client.post(url, headers=headers, json=request_params)
-            elif method == "PUT":
-                response = await client.put(url, headers=headers, json=request_params)
-            elif method == "DELETE":
-                response = await client.delete(url, headers=headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-
-            response.raise_for_status()
-            return self._parse_response(response)
+        client = get_http_client()
+        if method == "GET":
+            response = await client.get(url, headers=headers, params=request_params, timeout=self.timeout)
+        elif method == "POST":
+            response = await client.post(url, headers=headers, json=request_params, timeout=self.timeout)
+        elif method == "PUT":
+            response = await client.put(url, headers=headers, json=request_params, timeout=self.timeout)
+        elif method == "DELETE":
+            response = await client.delete(url, headers=headers, timeout=self.timeout)
+        else:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        response.raise_for_status()
+        return self._parse_response(response)
 
     async def _execute_opengraph(
         self,
@@ -213,20 +214,19 @@ class IntegrationExecutor:
 
         logger.info(f"API fetch: {method} {url}")
 
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            if method == "GET":
-                response = await client.get(url, headers=headers)
-            elif method == "POST":
-                response = await client.post(url, headers=headers, content=body)
-            elif method == "PUT":
-                response = await client.put(url, headers=headers, content=body)
-            elif method == "DELETE":
-                response = await client.delete(url, headers=headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-
-            response.raise_for_status()
-            return self._parse_response(response)
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        response = await get_http_client().request(
+            method,
+            url,
+            headers=headers,
+            content=body if method in ("POST", "PUT") else None,
+            timeout=timeout,
+            follow_redirects=True,
+        )
+
+        response.raise_for_status()
+        return self._parse_response(response)
 
     async def test_connection(
         self,
@@ -0,0 +1,74 @@
+"""Run ARQ workers for several queues in one process.
+
+    python -m codex.worker                    # every queue
+    python -m codex.worker notifications      # just the named queue(s)
+
+Each queue gets its own arq `Worker` with its own concurrency cap (see
+`codex.worker.settings`); they share one event loop and one set of startup
+resources. To scale a queue independently, run it as its own process
+instead, e.g. `arq codex.worker.settings.AgentWorkerSettings`.
+"""
+
+import argparse
+import asyncio
+import logging
+import logging.config
+import os
+import signal
+
+from arq.worker import create_worker
+
+from codex.worker.context import shutdown, startup
+from codex.worker.settings import WORKER_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+
+async def run(queues: list[str]) -> None:
+    """Run workers for `queues` until SIGINT/SIGTERM or until one of them exits."""
+    ctx: dict = {}
+    await startup(ctx)
+    workers = [
+        create_worker(WORKER_SETTINGS[queue], ctx=dict(ctx), on_startup=None, on_shutdown=None, handle_signals=False)
+        for queue in queues
+    ]
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    runs = [asyncio.create_task(worker.async_run()) for worker in workers]
+    stopped = asyncio.create_task(stop.wait())
+    logger.info("Running workers for queues: %s", ", ".join(queues))
+    try:
+        await asyncio.wait([stopped, *runs], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stopped.cancel()
+        # close() cancels in-flight jobs (arq retries them) and the worker's main loop
+        for worker in workers:
+            await worker.close()
+        await asyncio.gather(*runs, return_exceptions=True)
+        await shutdown(ctx)
+
+
+def main() -> None:
+    from codex.core.logging import get_logging_config
+
+    parser = argparse.ArgumentParser(prog="python -m codex.worker", description="Run Codex ARQ workers.")
+    parser.add_argument("queues", nargs="*", help=f"queues to run: {', '.join(WORKER_SETTINGS)} (default: all)")
+    args = parser.parse_args()
+    unknown = [queue for queue in args.queues if queue not in WORKER_SETTINGS]
+    if unknown:
+        parser.error(f"unknown queue(s): {', '.join(unknown)}")
+
+    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    log_format = os.getenv("LOG_FORMAT", "plain").lower()
+    logging.config.dictConfig(
+        get_logging_config(log_level, log_format, os.getenv("LOG_SQL", "false").lower() == "true")
+    )
+    asyncio.run(run(args.queues or list(WORKER_SETTINGS)))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,24 @@ logger = logging.getLogger(__name__)
 
 async def startup(ctx: dict) -> None:
     """Initialize database connections when the worker starts."""
+    from codex.core.http_client import http_clients
     from codex.db.database import async_session_maker, init_system_db
 
     logger.info("Worker starting up — initializing system database")
     await init_system_db()
     ctx["session_maker"] = async_session_maker
+    # Webhook deliveries and agent LLM calls reuse pooled keep-alive connections
+    await http_clients.start()
     logger.info("Worker startup complete")
 
 
 async def shutdown(ctx: dict) -> None:
     """Cleanup when the worker stops."""
+    from codex.core.http_client import http_clients
+    from codex.core.websocket import connection_manager
+
     logger.info("Worker shutting down")
+    await http_clients.aclose()
+    # The worker only publishes broadcasts (e.g. notifications from fanout_event);
+    # close the backend's publisher connection.
+    await connection_manager.backend.stop()
@@ -0,0 +1,56 @@
+"""ARQ queue names and job routing.
+
+Background jobs run on separate queues so slow or retry-heavy work can't
+starve latency-sensitive work:
+
+- notifications – `fanout_event`, `flush_notification_digest` (and the
+                  unread-counter reconciliation cron): short jobs on the path
+                  from a user action to a live badge
+- agents        – `run_job` / `execute_agent_task`: long-running agent tasks
+- webhooks      – `deliver_webhook`: outbound calls with up to 20 retries
+
+Each queue is consumed by its own worker (see `codex.worker.settings`) with
+its own concurrency cap, so a burst of agent tasks or failing webhooks only
+ever occupies that queue's slots. Enqueue through `enqueue_job`, which routes
+a job to its function's queue; the queue modules stay importable from the
+API without pulling in the task implementations.
+
+Environment variables:
+    CODEX_WORKER_NOTIFICATION_JOBS – concurrent jobs per notifications worker (default 20)
+    CODEX_WORKER_AGENT_JOBS        – concurrent jobs per agents worker (default 4)
+    CODEX_WORKER_WEBHOOK_JOBS      – concurrent jobs per webhooks worker (default 10)
+"""
+
+import os
+from typing import Any
+
+NOTIFICATIONS_QUEUE = "codex:queue:notifications"
+AGENTS_QUEUE = "codex:queue:agents"
+WEBHOOKS_QUEUE = "codex:queue:webhooks"
+
+NOTIFICATION_MAX_JOBS: int = int(os.getenv("CODEX_WORKER_NOTIFICATION_JOBS", "20"))
+AGENT_MAX_JOBS: int = int(os.getenv("CODEX_WORKER_AGENT_JOBS", "4"))
+WEBHOOK_MAX_JOBS: int = int(os.getenv("CODEX_WORKER_WEBHOOK_JOBS", "10"))
+
+# Function name -> queue it runs on
+JOB_QUEUES: dict[str, str] = {
+    "fanout_event": NOTIFICATIONS_QUEUE,
+    "flush_notification_digest": NOTIFICATIONS_QUEUE,
+    "reconcile_unread_counts": NOTIFICATIONS_QUEUE,
+    "run_job": AGENTS_QUEUE,
+    "execute_agent_task": AGENTS_QUEUE,
+    "deliver_webhook": WEBHOOKS_QUEUE,
+}
+
+
+def queue_for(function: str) -> str:
+    """Return the queue a job function runs on."""
+    try:
+        return JOB_QUEUES[function]
+    except KeyError:
+        raise ValueError(f"No queue registered for job function {function!r}") from None
+
+
+async def enqueue_job(arq_pool: Any, function: str, *args: Any, **kwargs: Any):
+    """Enqueue `function` on its queue. Returns the ARQ `Job` (or None if a duplicate job id exists)."""
+    return await arq_pool.enqueue_job(function, *args, _queue_name=queue_for(function), **kwargs)
@@ -1,11 +1,27 @@
-"""ARQ worker settings and Redis configuration."""
+"""ARQ worker settings and Redis configuration.
+
+One settings class per queue (see `codex.worker.queues`), each with its own
+concurrency cap and job timeout. Run every queue in one process with
+`python -m codex.worker`, or scale queues independently by running them as
+separate processes, e.g. `arq codex.worker.settings.AgentWorkerSettings`.
+"""
 
 import os
 from urllib.parse import urlparse
 
+from arq import cron
 from arq.connections import RedisSettings
 from arq.worker import func
 
+from codex.worker.queues import (
+    AGENT_MAX_JOBS,
+    AGENTS_QUEUE,
+    NOTIFICATION_MAX_JOBS,
+    NOTIFICATIONS_QUEUE,
+    WEBHOOK_MAX_JOBS,
+    WEBHOOKS_QUEUE,
+)
+
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
 
@@ -34,21 +50,69 @@ async def _on_shutdown(ctx):
     await shutdown(ctx)
 
 
-class WorkerSettings:
-    """ARQ worker configuration.
+class NotificationWorkerSettings:
+    """Notification fanout: many short jobs, kept clear of long agent work.
+
+    Start the worker with: arq codex.worker.settings.NotificationWorkerSettings
+    """
+
+    from codex.worker.tasks import fanout_event, flush_notification_digest, reconcile_unread_counts
+
+    functions = [fanout_event, flush_notification_digest]
+    # Counters are kept exact transactionally; this only repairs drift (e.g. rows
+    # edited by hand), so a quarter-hourly sweep is plenty.
+    cron_jobs = [cron(reconcile_unread_counts, minute={0, 15, 30, 45})]
+    queue_name = NOTIFICATIONS_QUEUE
+    redis_settings = get_redis_settings()
+    max_jobs = NOTIFICATION_MAX_JOBS
+    job_timeout = 60
+
+    on_startup = _on_startup
+    on_shutdown = _on_shutdown
+
+
+class AgentWorkerSettings:
+    """Agent tasks: few slots, long timeout.
+
+    Start the worker with: arq codex.worker.settings.AgentWorkerSettings
+    """
+
+    from codex.worker.tasks import execute_agent_task, run_job
 
-    Start the worker with: arq codex.worker.settings.WorkerSettings
+    functions = [execute_agent_task, run_job]
+    queue_name = AGENTS_QUEUE
+    redis_settings = get_redis_settings()
+    max_jobs = AGENT_MAX_JOBS
+    job_timeout = 600  # 10 minutes
+
+    on_startup = _on_startup
+    on_shutdown = _on_shutdown
+
+
+class WebhookWorkerSettings:
+    """Outbound webhook deliveries and their retries.
+
+    Start the worker with: arq codex.worker.settings.WebhookWorkerSettings
     """
 
-    from codex.worker.tasks import deliver_webhook, execute_agent_task, fanout_event, run_job
+    from codex.worker.tasks import deliver_webhook
 
     # deliver_webhook's own per-agent Agent.webhook_max_retries (<= 20, see
     # schemas_agent.py) governs when it stops retrying by returning instead of
     # raising Retry; this ceiling just guards against a runaway retry loop.
-    functions = [execute_agent_task, run_job, fanout_event, func(deliver_webhook, max_tries=20)]
+    functions = [func(deliver_webhook, max_tries=20)]
+    queue_name = WEBHOOKS_QUEUE
     redis_settings = get_redis_settings()
-    max_jobs = 10
-    job_timeout = 600  # 10 minutes
+    max_jobs = WEBHOOK_MAX_JOBS
+    job_timeout = 60
 
     on_startup = _on_startup
     on_shutdown = _on_shutdown
+
+
+# Queue short name -> settings, for `python -m codex.worker [queue ...]`
+WORKER_SETTINGS = {
+    "notifications": NotificationWorkerSettings,
+    "agents": AgentWorkerSettings,
+    "webhooks": WebhookWorkerSettings,
+}
@@ -2,20 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
 import json
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Collection
 from datetime import UTC, datetime
 from typing import Any
 
 import httpx
 from arq.worker import Retry
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from codex.worker.queues import enqueue_job
+
 logger = logging.getLogger(__name__)
 
 # Webhook delivery tuning (issue #536) — exponential backoff between retries,
@@ -24,6 +26,9 @@ WEBHOOK_TIMEOUT_SECONDS = 10
 WEBHOOK_BACKOFF_BASE_SECONDS = 5
 WEBHOOK_BACKOFF_CAP_SECONDS = 300
 
+# Notification broadcasts published concurrently after a fanout commits
+FANOUT_BROADCAST_BATCH_SIZE = 50
+
 # Registry of job type handlers — extend this dict to add new job types.
 JOB_TYPE_HANDLERS: dict[str, str] = {
     "agent": "_handle_agent_job",
@@ -345,23 +350,70 @@ async def _build_comment_context(session: AsyncSession, comment: Any) -> dict[st
     }
 
 
-async def _enqueue_bot_mention_tasks(ctx: dict, session: AsyncSession, event: Any) -> int:
+async def _insert_bot_mention_task(session: AsyncSession, task: Any) -> int | None:
+    """Insert a bot-mention `Task` unless one exists for its (comment, bot) pair.
+
+    A single INSERT ... ON CONFLICT DO NOTHING against the unique
+    `(source_comment_id, mention_principal_id)` index, so concurrent or retried
+    fanouts can't create a second task. Returns the new task id, or None if the
+    task already existed.
+    """
+    from codex.db.database import dialect_insert
+
+    insert = dialect_insert(session)
+    table = task.__table__
+    stmt = (
+        insert(table)
+        .values(**task.model_dump(exclude={"id"}))
+        .on_conflict_do_nothing(index_elements=["source_comment_id", "mention_principal_id"])
+        .returning(table.c.id)
+    )
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+def _mention_webhook_payload(event: Any, comment: Any, comment_context: dict, bot: Any, author: Any) -> dict[str, Any]:
+    """The webhook body that wakes an external bot mentioned in `comment`."""
+    return {
+        "event": event.kind,
+        "event_id": event.id,
+        "workspace_id": event.workspace_id,
+        "comment": comment_context,
+        "mention": {
+            "mentioned_principal_id": bot.id,
+            "mentioned_username": bot.username,
+            "comment_author_id": comment.author_id,
+            "comment_author_username": author.username if author else None,
+        },
+    }
+
+
+async def _enqueue_bot_mention_tasks(
+    ctx: dict, session: AsyncSession, event: Any, digested_ids: Collection[int] = ()
+) -> int:
     """Wake bot principals mentioned in a comment.
 
     `Agent.kind == "hosted"` bots run inside Codex: this creates a `Task` row
-    and enqueues the existing ARQ agent-execution pipeline, same as a manually
-    created agent task. `Agent.kind == "external"` bots (e.g. a Claude Code
+    and, in the same transaction, stages the existing ARQ agent-execution
+    pipeline (`run_job`) in the outbox, so a task can't be committed without
+    its job. `Agent.kind == "external"` bots (e.g. a Claude Code
     session woken from outside) instead get a signed webhook delivery — Codex
     never runs their brain, it just wakes them over HTTP.
 
     Idempotent on retry: a hosted bot already carrying a Task for this comment
-    (matched via `task_metadata.comment_id`) is skipped, and an external bot
-    that already has an `AgentWebhookDelivery` row for this event is skipped
-    too, so a retried `fanout_event` doesn't double-wake a bot.
+    (keyed by the unique `Task.source_comment_id`/`Task.mention_principal_id`
+    pair) is skipped, and an external bot that already has an
+    `AgentWebhookDelivery` row for this event is skipped too, so a retried
+    `fanout_event` doesn't double-wake a bot.
+
+    An external bot in `digested_ids` already has an open notification digest
+    for these mentions (see `codex.core.notification_digests`); it is not
+    woken per mention but gets one digest webhook when the digest closes.
 
     Returns the number of hosted Tasks enqueued (external webhook deliveries
     aren't counted here — see `deliver_webhook`'s own audit trail for those).
     """
+    from codex.core.outbox import add_job
     from codex.db.models import Agent, AgentWebhookDelivery, Comment, Task, User, UserKind
 
     subject = event.subject or {}
@@ -395,6 +447,8 @@ async def _enqueue_bot_mention_tasks(ctx: dict, session: AsyncSession, event: An
 
     for bot, agent in bot_agents:
         if agent.kind == "external":
+            if bot.id in digested_ids:
+                continue
             existing_delivery = await session.execute(
                 select(AgentWebhookDelivery.id).where(
                     AgentWebhookDelivery.agent_id == agent.id,
@@ -407,33 +461,11 @@ async def _enqueue_bot_mention_tasks(ctx: dict, session: AsyncSession, event: An
             if arq_pool is None:
                 logger.warning("Skipping webhook delivery for agent %s — task queue unavailable", agent.id)
                 continue
-            payload = {
-                "event": event.kind,
-                "event_id": event.id,
-                "workspace_id": event.workspace_id,
-                "comment": comment_context,
-                "mention": {
-                    "mentioned_principal_id": bot.id,
-                    "mentioned_username": bot.username,
-                    "comment_author_id": comment.author_id,
-                    "comment_author_username": author.username if author else None,
-                },
-            }
-            await arq_pool.enqueue_job("deliver_webhook", agent.id, event.id, payload)
+            payload = _mention_webhook_payload(event, comment, comment_context, bot, author)
+            await enqueue_job(arq_pool, "deliver_webhook", agent.id, event.id, payload)
         else:
-            existing_result = await session.execute(
-                select(Task).where(
-                    Task.workspace_id == event.workspace_id,
-                    Task.task_type == "bot_mention",
-                    Task.assigned_to == str(agent.id),
-                )
-            )
-            if any(
-                json.loads(t.task_metadata or "{}").get("comment_id") == comment.id
-                for t in existing_result.scalars().all()
-            ):
-                continue
-
+            # The outbox passes its key to ARQ as the job id, so the task can name its job up front
+            job_key = f"run_job:bot_mention:{comment.id}:{bot.id}"
             task = Task(
                 workspace_id=event.workspace_id,
                 title=f"Mentioned in a comment on block {comment.block_id}",
@@ -441,22 +473,18 @@ async def _enqueue_bot_mention_tasks(ctx: dict, session: AsyncSession, event: An
                 task_type="bot_mention",
                 assigned_to=str(agent.id),
                 job_type="agent",
+                job_id=job_key,
                 task_metadata=json.dumps({**comment_context, "mentioned_principal_id": bot.id}),
+                source_comment_id=comment.id,
+                mention_principal_id=bot.id,
             )
-            session.add(task)
+            task_id = await _insert_bot_mention_task(session, task)
+            if task_id is None:
+                continue
+            add_job(session, "run_job", task_id, key=job_key)
             await session.commit()
-            await session.refresh(task)
             hosted_enqueued += 1
 
-            if arq_pool is not None:
-                job = await arq_pool.enqueue_job("run_job", task.id)
-                if job is not None:
-                    task.job_id = job.job_id
-                    session.add(task)
-                    await session.commit()
-            else:
-                logger.warning("Task %s created but not enqueued — task queue unavailable", task.id)
-
     return hosted_enqueued
 
 
@@ -474,6 +502,7 @@ async def deliver_webhook(ctx: dict, agent_id: int, event_id: int, payload: dict
     number across those retries.
     """
     from codex.agents.crypto import decrypt_value
+    from codex.core.http_client import get_http_client
     from codex.db.models import Agent, AgentWebhookDelivery
 
     attempt = ctx.get("job_try", 1)
@@ -515,8 +544,9 @@ async def deliver_webhook(ctx: dict, agent_id: int, event_id: int, payload: dict
         await session.refresh(delivery)
 
         try:
-            async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT_SECONDS) as client:
-                response = await client.post(agent.webhook_url, content=body_bytes, headers=headers)
+            response = await get_http_client().post(
+                agent.webhook_url, content=body_bytes, headers=headers, timeout=WEBHOOK_TIMEOUT_SECONDS
+            )
             delivery.response_status_code = response.status_code
             if 200 <= response.status_code < 300:
                 delivery.status = "delivered"
@@ -543,22 +573,76 @@ async def deliver_webhook(ctx: dict, agent_id: int, event_id: int, payload: dict
     return {"status": "failed", "agent_id": agent_id, "attempt": attempt}
 
 
+async def _insert_notifications(
+    session: AsyncSession, event_id: int, recipient_ids: set[int], group_keys: dict[int, str]
+) -> list:
+    """Insert one `Notification` per recipient in a single statement, skipping existing rows.
+
+    Returns the rows actually inserted (as transient `Notification` objects
+    carrying their new ids), so callers only broadcast genuinely new
+    notifications. Uses INSERT ... ON CONFLICT DO NOTHING RETURNING, which both
+    supported backends (SQLite and Postgres) provide.
+    """
+    from codex.db.database import dialect_insert
+    from codex.db.models import Notification
+
+    if not recipient_ids:
+        return []
+
+    insert = dialect_insert(session)
+    now = datetime.now(UTC)
+    table = Notification.__table__
+    stmt = (
+        insert(table)
+        .values(
+            [
+                {"event_id": event_id, "recipient_id": rid, "group_key": group_keys.get(rid), "created_at": now}
+                for rid in sorted(recipient_ids)
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["event_id", "recipient_id"])
+        .returning(table.c.id, table.c.recipient_id)
+    )
+    result = await session.execute(stmt)
+    return [
+        Notification(
+            id=notification_id,
+            event_id=event_id,
+            recipient_id=recipient_id,
+            group_key=group_keys.get(recipient_id),
+            created_at=now,
+        )
+        for notification_id, recipient_id in sorted(result.all(), key=lambda row: row[1])
+    ]
+
+
 async def fanout_event(ctx: dict, event_id: int) -> dict[str, Any]:
     """Fan an `Event` out into `Notification` rows for its resolved recipients.
 
-    Idempotent on retry: recipients already notified for this event are loaded
-    first and skipped, and each insert is individually committed so a unique-
-    constraint violation from a concurrent retry only rolls back that one row
-    rather than the whole batch.
-
-    For `comment.mention` events, also wakes each mentioned bot principal —
-    a hosted Agent (issue #535) gets a Task enqueued, an external Agent
-    (issue #536) gets a signed webhook delivery — see
-    `_enqueue_bot_mention_tasks`.
+    All notification rows are written by one bulk INSERT in one transaction,
+    which also bumps each recipient's materialized unread counter by the rows
+    actually inserted. Idempotent on retry: the insert skips (event, recipient)
+    pairs that already exist, so rows written by an earlier or concurrent
+    attempt are neither duplicated, re-counted nor re-broadcast. The new
+    notifications (with each recipient's new unread count) are broadcast
+    together once the transaction has committed.
+
+    Recipients with an open digest for the event's group (see
+    `codex.core.notification_digests`) get no new row: the event is folded
+    into the digest, which is neither counted nor broadcast again until
+    `flush_notification_digest` runs when its window closes. That flush is
+    staged in the outbox in the same transaction as the fold.
+
+    For `comment.mention` events, once that transaction has committed, also
+    wakes each mentioned bot principal — a hosted Agent (issue #535) gets a
+    Task enqueued, an external Agent (issue #536) gets a signed webhook
+    delivery — see `_enqueue_bot_mention_tasks`.
     """
     from codex.core.events import serialize_notification
+    from codex.core.notification_counters import adjust_unread_counts
+    from codex.core.notification_digests import coalesce_notifications, digest_keys
     from codex.core.websocket import connection_manager, principal_channel
-    from codex.db.models import Event, Notification
+    from codex.db.models import Event
 
     session_maker = ctx["session_maker"]
     async with session_maker() as session:
@@ -572,45 +656,138 @@ async def fanout_event(ctx: dict, event_id: int) -> dict[str, Any]:
             return {"status": "error", "detail": f"Unknown event kind: {event.kind}"}
 
         recipients = await resolver(session, event)
+        group_keys = digest_keys(event, recipients)
+        digests, digested_ids = await coalesce_notifications(session, event, group_keys)
+        notifications = await _insert_notifications(session, event.id, recipients - digested_ids, group_keys)
+        unread_counts = await adjust_unread_counts(session, {n.recipient_id: 1 for n in notifications})
+        messages = [
+            (
+                principal_channel(notification.recipient_id),
+                {
+                    "type": "notification",
+                    "notification": serialize_notification(notification, event),
+                    "unread_count": unread_counts.get(notification.recipient_id),
+                },
+            )
+            for notification in notifications
+        ]
+        await _stage_digest_flushes(session, digests)
+        await session.commit()
 
+        for i in range(0, len(messages), FANOUT_BROADCAST_BATCH_SIZE):
+            batch = messages[i : i + FANOUT_BROADCAST_BATCH_SIZE]
+            await asyncio.gather(*(connection_manager.broadcast(channel, message) for channel, message in batch))
+
+        # Only once the fold and its flushes are committed: waking bots commits as it goes
         bot_tasks_enqueued = 0
         if event.kind == "comment.mention":
-            bot_tasks_enqueued = await _enqueue_bot_mention_tasks(ctx, session, event)
-
-        if not recipients:
-            return {
-                "status": "completed",
-                "event_id": event.id,
-                "notifications_created": 0,
-                "bot_tasks_enqueued": bot_tasks_enqueued,
-            }
-
-        existing_result = await session.execute(
-            select(Notification.recipient_id).where(Notification.event_id == event.id)
-        )
-        existing_recipient_ids = {row[0] for row in existing_result.all()}
-
-        created = 0
-        for recipient_id in sorted(recipients - existing_recipient_ids):
-            notification = Notification(event_id=event.id, recipient_id=recipient_id)
-            session.add(notification)
-            try:
-                await session.commit()
-                created += 1
-            except IntegrityError:
-                # A concurrent retry already inserted this notification — safe to skip.
-                await session.rollback()
-                continue
-
-            await session.refresh(notification)
-            await connection_manager.broadcast(
-                principal_channel(recipient_id),
-                {"type": "notification", "notification": serialize_notification(notification, event)},
-            )
+            bot_tasks_enqueued = await _enqueue_bot_mention_tasks(ctx, session, event, digested_ids)
 
         return {
             "status": "completed",
-            "event_id": event.id,
-            "notifications_created": created,
+            "event_id": event_id,
+            "notifications_created": len(notifications),
+            "notifications_coalesced": len(digests),
             "bot_tasks_enqueued": bot_tasks_enqueued,
         }
+
+
+async def _stage_digest_flushes(session: AsyncSession, digests: list) -> None:
+    """Record `flush_notification_digest` for each digest folded into, held until its window closes.
+
+    Staged in the fold's own transaction, so a fanout that dies after
+    committing can't leave a digest without its flush. The outbox keeps one
+    job per digest, so later folds in the same window add nothing.
+    """
+    from codex.core.notification_digests import closes_at
+    from codex.core.outbox import add_deferred_job
+
+    for digest in digests:
+        await add_deferred_job(session, closes_at(digest), "flush_notification_digest", digest.id)
+
+
+async def flush_notification_digest(ctx: dict, notification_id: int) -> dict[str, Any]:
+    """Deliver a notification digest once its window has closed.
+
+    Pushes the digest (its event count and latest event) to the recipient's
+    WebSocket channel. If the recipient is an external bot whose mentions
+    were folded into the digest, sends it one webhook for all of them
+    instead of one per mention.
+    """
+    from codex.core.events import serialize_notification
+    from codex.core.notification_counters import get_unread_count
+    from codex.core.websocket import connection_manager, principal_channel
+    from codex.db.models import Agent, Comment, Event, Notification, User, UserKind
+
+    session_maker = ctx["session_maker"]
+    arq_pool = ctx.get("redis")
+    webhook = None
+    async with session_maker() as session:
+        notification = await session.get(Notification, notification_id)
+        if notification is None:
+            return {"status": "skipped", "detail": f"Notification {notification_id} not found"}
+        event = await session.get(Event, notification.event_id)
+        message = {
+            "type": "notification",
+            "notification": serialize_notification(notification, event),
+            "unread_count": await get_unread_count(session, notification.recipient_id),
+        }
+
+        subject = event.subject or {}
+        mentioned_ids = {int(uid) for uid in subject.get("mentioned_user_ids") or []}
+        if event.kind == "comment.mention" and notification.recipient_id in mentioned_ids:
+            result = await session.execute(
+                select(User, Agent)
+                .join(Agent, Agent.principal_id == User.id)
+                .where(
+                    User.id == notification.recipient_id,
+                    User.kind == UserKind.BOT.value,
+                    User.is_active.is_(True),
+                    Agent.is_active.is_(True),
+                    Agent.kind == "external",
+                )
+            )
+            bot_agent = result.first()
+            comment = await session.get(Comment, subject.get("comment_id")) if bot_agent else None
+            if comment is not None:
+                bot, agent = bot_agent
+                author = await session.get(User, comment.author_id)
+                payload = _mention_webhook_payload(
+                    event, comment, await _build_comment_context(session, comment), bot, author
+                )
+                payload["digest"] = {
+                    "event_count": notification.event_count,
+                    "since": notification.created_at.isoformat(),
+                }
+                webhook = (agent.id, event.id, payload)
+
+    await connection_manager.broadcast(principal_channel(notification.recipient_id), message)
+    if webhook is not None:
+        if arq_pool is not None:
+            await enqueue_job(arq_pool, "deliver_webhook", *webhook)
+        else:
+            logger.warning("Skipping digest webhook for agent %s — task queue unavailable", webhook[0])
+
+    return {
+        "status": "completed",
+        "notification_id": notification_id,
+        "event_count": notification.event_count,
+        "webhook_enqueued": webhook is not None and arq_pool is not None,
+    }
+
+
+async def reconcile_unread_counts(ctx: dict) -> dict[str, Any]:
+    """Periodic (ARQ cron) repair of drifted unread notification counters.
+
+    Recomputes counters from the notification rows (see
+    `codex.core.notification_counters`) and pushes corrected counts to any
+    connected clients.
+    """
+    from codex.core import notification_counters
+
+    session_maker = ctx["session_maker"]
+    async with session_maker() as session:
+        corrected = await notification_counters.reconcile_unread_counts(session)
+    if corrected:
+        await notification_counters.push_unread_counts(corrected)
+    return {"status": "completed", "counters_corrected": len(corrected)}
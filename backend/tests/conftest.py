@@ -375,6 +375,15 @@ def ensure_valid_cwd():
         pass
 
 
+@pytest.fixture(autouse=True)
+def reset_login_rate_limits():
+    """Every test client logs in from the same address; don't let tests share a login budget."""
+    from codex.api.auth import login_failure_limiter, login_ip_limiter
+
+    login_ip_limiter.reset()
+    login_failure_limiter.reset()
+
+
 # Initialize the database once before all tests
 @pytest.fixture(scope="session", autouse=True)
 def initialize_database():
@@ -0,0 +1,89 @@
+"""Tests for the batch block operations endpoint."""
+
+
+def _base(workspace, notebook):
+    return f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}/blocks"
+
+
+def _children(test_client, headers, base, page_id):
+    resp = test_client.get(f"{base}/{page_id}/children", headers=headers)
+    assert resp.status_code == 200
+    return resp.json()["children"]
+
+
+def test_batch_create_move_update_delete(test_client, auth_headers, workspace_and_notebook):
+    headers = auth_headers[0]
+    base = _base(*workspace_and_notebook)
+    page = test_client.post(f"{base}/pages", json={"title": "Batch Page"}, headers=headers).json()
+    initial = _children(test_client, headers, base, page["block_id"])[0]["block_id"]
+
+    operations = [
+        {"op": "create", "ref": f"b{i}", "parent_block_id": page["block_id"], "content": f"pasted {i}"}
+        for i in range(20)
+    ]
+    operations += [
+        {"op": "create", "ref": "sub", "parent_block_id": page["block_id"], "block_type": "page", "title": "Sub"},
+        {"op": "move", "block_id": "b3", "new_parent_block_id": "sub"},
+        {"op": "update", "block_id": "b0", "content": "edited"},
+        {"op": "delete", "block_id": initial},
+        {"op": "reorder", "block_id": page["block_id"], "block_ids": ["b1", "b0"]},
+    ]
+    resp = test_client.post(f"{base}/batch", json={"operations": operations}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert len(data["results"]) == len(operations)
+    assert page["path"] in data["pages"]
+
+    ids = {r["ref"]: r["block_id"] for r in data["results"] if r.get("ref")}
+    children = _children(test_client, headers, base, page["block_id"])
+    child_ids = [c["block_id"] for c in children]
+    assert child_ids[:2] == [ids["b1"], ids["b0"]]
+    assert initial not in child_ids
+    assert ids["b3"] not in child_ids
+    assert children[1]["content"] == "edited"
+    assert len(children) == 20  # 19 remaining pasted blocks + the sub-page
+
+    sub_children = _children(test_client, headers, base, ids["sub"])
+    assert ids["b3"] in [c["block_id"] for c in sub_children]
+
+
+def test_batch_failure_rolls_back(test_client, auth_headers, workspace_and_notebook):
+    headers = auth_headers[0]
+    base = _base(*workspace_and_notebook)
+    page = test_client.post(f"{base}/pages", json={"title": "Rollback Page"}, headers=headers).json()
+    before = _children(test_client, headers, base, page["block_id"])
+
+    resp = test_client.post(
+        f"{base}/batch",
+        json={
+            "operations": [
+                {"op": "delete", "block_id": before[0]["block_id"]},
+                {"op": "update", "block_id": "does-not-exist", "content": "x"},
+            ]
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 404
+    assert resp.json()["detail"].startswith("Operation 1:")
+
+    # The unknown block ID is caught before the delete touches the page
+    after = _children(test_client, headers, base, page["block_id"])
+    assert [c["block_id"] for c in after] == [c["block_id"] for c in before]
+
+
+def test_batch_update_without_content_is_rejected(test_client, auth_headers, workspace_and_notebook):
+    headers = auth_headers[0]
+    base = _base(*workspace_and_notebook)
+    page = test_client.post(f"{base}/pages", json={"title": "Keep Content"}, headers=headers).json()
+    block = _children(test_client, headers, base, page["block_id"])[0]
+
+    resp = test_client.post(
+        f"{base}/batch",
+        json={"operations": [{"op": "update", "block_id": block["block_id"], "block_type": "code"}]},
+        headers=headers,
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Operation 0: update requires content"
+
+    after = _children(test_client, headers, base, page["block_id"])[0]
+    assert after["content"] == block["content"]
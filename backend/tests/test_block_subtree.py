@@ -0,0 +1,90 @@
+"""Tests for subtree-aware page move and delete."""
+
+import logging
+import sqlite3
+
+import pytest
+from sqlmodel import select
+
+from codex.core import vectorizer
+from codex.core.blocks import create_block, create_page, delete_block, move_block
+from codex.db.database import get_notebook_session, init_notebook_db
+from codex.db.models import Block, BlockTag, SearchIndex, Tag
+
+NOTEBOOK_ID = 1
+
+
+@pytest.fixture
+def nb(tmp_path):
+    init_notebook_db(str(tmp_path))
+    session = get_notebook_session(str(tmp_path))
+    yield tmp_path, session
+    session.close()
+
+
+def _nested_pages(notebook_path, session):
+    outer = create_page(notebook_path, NOTEBOOK_ID, None, "Outer", nb_session=session)
+    inner = create_page(notebook_path, NOTEBOOK_ID, outer["path"], "Inner", nb_session=session)
+    leaf = create_block(notebook_path, NOTEBOOK_ID, inner["path"], "text", "deep content", nb_session=session)
+    target = create_page(notebook_path, NOTEBOOK_ID, None, "Target", nb_session=session)
+    return outer, inner, leaf, target
+
+
+def test_move_page_rewrites_descendant_paths(nb):
+    notebook_path, session = nb
+    outer, inner, leaf, target = _nested_pages(notebook_path, session)
+
+    move_block(notebook_path, NOTEBOOK_ID, outer["block_id"], target["block_id"], None, session)
+
+    session.expire_all()
+    paths = {b.block_id: b.path for b in session.exec(select(Block)).all()}
+    assert paths[outer["block_id"]] == "Target/Outer"
+    assert paths[inner["block_id"]] == "Target/Outer/Inner"
+    assert paths[leaf["block_id"]] == f"Target/Outer/Inner/{leaf['file']}"
+    assert (notebook_path / paths[leaf["block_id"]]).read_text() == "deep content"
+    assert not any(p.startswith("Outer/") for p in paths.values())
+
+
+def test_move_page_into_own_subtree_is_rejected(nb):
+    notebook_path, session = nb
+    outer, inner, _, _ = _nested_pages(notebook_path, session)
+
+    with pytest.raises(ValueError):
+        move_block(notebook_path, NOTEBOOK_ID, outer["block_id"], inner["block_id"], None, session)
+
+
+def test_delete_page_removes_whole_subtree(nb):
+    notebook_path, session = nb
+    outer, inner, leaf, target = _nested_pages(notebook_path, session)
+
+    leaf_row = session.exec(select(Block).where(Block.block_id == leaf["block_id"])).one()
+    tag = Tag(notebook_id=NOTEBOOK_ID, name="deep")
+    session.add(tag)
+    session.flush()
+    session.add(BlockTag(block_id=leaf_row.id, tag_id=tag.id))
+    session.add(SearchIndex(block_id=leaf_row.id, content="deep content"))
+    session.commit()
+
+    delete_block(notebook_path, NOTEBOOK_ID, outer["block_id"], session)
+
+    session.expire_all()
+    remaining = {b.path for b in session.exec(select(Block)).all()}
+    assert not any(p == "Outer" or p.startswith("Outer/") for p in remaining)
+    assert any(p.startswith("Target") for p in remaining)
+    assert session.exec(select(BlockTag)).all() == []
+    assert session.exec(select(SearchIndex)).all() == []
+    assert not (notebook_path / "Outer").exists()
+
+
+def test_delete_page_without_search_indexes_logs_nothing(nb, caplog, monkeypatch):
+    notebook_path, session = nb
+    outer, inner, leaf, target = _nested_pages(notebook_path, session)
+    # Open the vector table without sqlite-vec; only its absence matters here
+    monkeypatch.setattr(
+        vectorizer, "_get_raw_connection", lambda engine: sqlite3.connect(str(engine.url).replace("sqlite:///", ""))
+    )
+
+    with caplog.at_level(logging.WARNING, logger="codex.core.vectorizer"):
+        delete_block(notebook_path, NOTEBOOK_ID, outer["block_id"], session)
+
+    assert [r for r in caplog.records if r.name == "codex.core.vectorizer"] == []
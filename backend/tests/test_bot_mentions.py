@@ -10,10 +10,12 @@ Bots with no Agent at all are just a plain mention/notification.
 import json
 from unittest.mock import AsyncMock
 
+import pytest
 from sqlmodel import select
 
 from codex.db.database import async_session_maker
-from codex.db.models import Event, Task
+from codex.db.models import Event, Notification, OutboxJob, Task
+from codex.worker.queues import WEBHOOKS_QUEUE
 from codex.worker.tasks import fanout_event
 
 
@@ -90,10 +92,6 @@ async def test_hosted_bot_mention_enqueues_task(test_client, auth_headers, works
     assert event is not None
 
     mock_redis = AsyncMock()
-    mock_job = AsyncMock()
-    mock_job.job_id = "job-123"
-    mock_redis.enqueue_job.return_value = mock_job
-
     ctx = {"session_maker": async_session_maker, "redis": mock_redis}
     result = await fanout_event(ctx, event.id)
     assert result["status"] == "completed"
@@ -107,7 +105,11 @@ async def test_hosted_bot_mention_enqueues_task(test_client, auth_headers, works
         assert len(tasks) == 1
         task = tasks[0]
         assert task.workspace_id == workspace["id"]
-        assert task.job_id == "job-123"
+        # run_job is staged in the outbox with the task; its key becomes the ARQ job id
+        assert task.job_id == f"run_job:bot_mention:{comment['id']}:{bot['id']}"
+        job_result = await session.execute(select(OutboxJob).where(OutboxJob.job_key == task.job_id))
+        outbox_job = job_result.scalar_one()
+        assert (outbox_job.function, outbox_job.args) == ("run_job", [task.id])
 
         metadata = json.loads(task.task_metadata)
         assert metadata["comment_id"] == comment["id"]
@@ -115,7 +117,74 @@ async def test_hosted_bot_mention_enqueues_task(test_client, auth_headers, works
         assert metadata["mentioned_principal_id"] == bot["id"]
         assert metadata["parent_chain"] == []
 
-    mock_redis.enqueue_job.assert_called_once_with("run_job", task.id)
+    mock_redis.enqueue_job.assert_not_called()
+
+
+async def test_retried_bot_mention_fanout_does_not_duplicate_task(test_client, auth_headers, workspace_and_notebook):
+    """A second fanout of the same mention hits the (comment, bot) unique key and enqueues nothing."""
+    headers = auth_headers[0]
+    workspace, notebook = workspace_and_notebook
+
+    bot = _create_bot(test_client, headers, workspace["slug"], display_name="Retry Bot")
+    agent = _create_agent(test_client, headers, workspace["id"], principal_id=bot["id"], kind="hosted")
+    block_id = _create_block(test_client, headers, workspace["slug"], notebook["slug"])
+
+    comment = _post_comment(
+        test_client, headers, workspace["slug"], notebook["slug"], block_id, f"@{bot['username']} once only"
+    )
+    event = await _latest_mention_event(comment["id"])
+
+    ctx = {"session_maker": async_session_maker, "redis": AsyncMock()}
+    assert (await fanout_event(ctx, event.id))["bot_tasks_enqueued"] == 1
+    assert (await fanout_event(ctx, event.id))["bot_tasks_enqueued"] == 0
+
+    async with async_session_maker() as session:
+        task_result = await session.execute(
+            select(Task).where(Task.task_type == "bot_mention", Task.assigned_to == str(agent["id"]))
+        )
+        task = task_result.scalars().one()
+        assert task.source_comment_id == comment["id"]
+        assert task.mention_principal_id == bot["id"]
+        job_result = await session.execute(select(OutboxJob).where(OutboxJob.job_key == task.job_id))
+        assert len(job_result.scalars().all()) == 1
+
+
+async def test_bot_mention_task_and_its_job_commit_together(
+    test_client, auth_headers, workspace_and_notebook, monkeypatch
+):
+    """A fanout that dies before staging run_job leaves no task behind, so the retry still runs the bot."""
+    from codex.core import outbox
+
+    headers = auth_headers[0]
+    workspace, notebook = workspace_and_notebook
+
+    bot = _create_bot(test_client, headers, workspace["slug"], display_name="Crash Bot")
+    agent = _create_agent(test_client, headers, workspace["id"], principal_id=bot["id"], kind="hosted")
+    block_id = _create_block(test_client, headers, workspace["slug"], notebook["slug"])
+    comment = _post_comment(
+        test_client, headers, workspace["slug"], notebook["slug"], block_id, f"@{bot['username']} after a crash"
+    )
+    event = await _latest_mention_event(comment["id"])
+    ctx = {"session_maker": async_session_maker, "redis": AsyncMock()}
+
+    add_job = outbox.add_job
+
+    def _crash(*args, **kwargs):
+        raise RuntimeError("worker died")
+
+    monkeypatch.setattr(outbox, "add_job", _crash)
+    with pytest.raises(RuntimeError):
+        await fanout_event(ctx, event.id)
+    monkeypatch.setattr(outbox, "add_job", add_job)
+
+    assert (await fanout_event(ctx, event.id))["bot_tasks_enqueued"] == 1
+    async with async_session_maker() as session:
+        task_result = await session.execute(
+            select(Task).where(Task.task_type == "bot_mention", Task.assigned_to == str(agent["id"]))
+        )
+        task = task_result.scalars().one()
+        job_result = await session.execute(select(OutboxJob).where(OutboxJob.job_key == task.job_id))
+        assert job_result.scalar_one().args == [task.id]
 
 
 async def test_external_bot_mention_triggers_webhook_not_task(test_client, auth_headers, workspace_and_notebook):
@@ -144,6 +213,7 @@ async def test_external_bot_mention_triggers_webhook_not_task(test_client, auth_
     assert call_args[0] == "deliver_webhook"
     assert call_args[1] == agent["id"]
     assert call_args[2] == event.id
+    assert mock_redis.enqueue_job.call_args.kwargs["_queue_name"] == WEBHOOKS_QUEUE
 
     async with async_session_maker() as session:
         task_result = await session.execute(
@@ -152,6 +222,94 @@ async def test_external_bot_mention_triggers_webhook_not_task(test_client, auth_
         assert task_result.scalars().all() == []
 
 
+async def test_external_bot_mention_burst_gets_one_digest_webhook(test_client, auth_headers, workspace_and_notebook):
+    """Repeated mentions of an external bot in one thread wake it once, then once more with a digest."""
+    from codex.worker.tasks import flush_notification_digest
+
+    headers = auth_headers[0]
+    workspace, notebook = workspace_and_notebook
+
+    bot = _create_bot(test_client, headers, workspace["slug"], display_name="Digest Bot")
+    agent = _create_agent(test_client, headers, workspace["id"], principal_id=bot["id"], kind="external")
+    block_id = _create_block(test_client, headers, workspace["slug"], notebook["slug"])
+    url = f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}/blocks/{block_id}/comments/"
+
+    root = _post_comment(test_client, headers, workspace["slug"], notebook["slug"], block_id, f"@{bot['username']} 1")
+    replies = [
+        test_client.post(url, json={"body": f"@{bot['username']} {n}", "thread_id": root["id"]}, headers=headers)
+        for n in (2, 3)
+    ]
+    events = [await _latest_mention_event(c["id"]) for c in [root, *(r.json() for r in replies)]]
+
+    mock_redis = AsyncMock()
+    ctx = {"session_maker": async_session_maker, "redis": mock_redis}
+    for event in events:
+        await fanout_event(ctx, event.id)
+    functions = [call.args[0] for call in mock_redis.enqueue_job.call_args_list]
+    assert functions == ["deliver_webhook"]
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Notification.id).where(Notification.recipient_id == bot["id"]).order_by(Notification.id.desc())
+        )
+        notification_id = result.scalars().first()
+        result = await session.execute(
+            select(OutboxJob).where(OutboxJob.job_key == f"flush_notification_digest:{notification_id}")
+        )
+        assert result.scalar_one().dispatched_at is None
+
+    mock_redis.enqueue_job.reset_mock()
+    result = await flush_notification_digest(ctx, notification_id)
+    assert result["webhook_enqueued"] is True
+    mock_redis.enqueue_job.assert_called_once()
+    function, agent_id, event_id, payload = mock_redis.enqueue_job.call_args.args
+    assert (function, agent_id, event_id) == ("deliver_webhook", agent["id"], events[-1].id)
+    assert payload["digest"]["event_count"] == 3
+    assert payload["comment"]["comment_id"] == replies[-1].json()["id"]
+
+
+async def test_digest_flush_survives_a_crash_while_waking_bots(
+    test_client, auth_headers, workspace_and_notebook, monkeypatch
+):
+    """The fold and its flush commit before any bot is woken, so a crash there can't orphan the digest."""
+    from codex.worker import tasks
+
+    headers = auth_headers[0]
+    workspace, notebook = workspace_and_notebook
+
+    bot = _create_bot(test_client, headers, workspace["slug"], display_name="Crash Digest Bot")
+    _create_agent(test_client, headers, workspace["id"], principal_id=bot["id"], kind="external")
+    block_id = _create_block(test_client, headers, workspace["slug"], notebook["slug"])
+    url = f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}/blocks/{block_id}/comments/"
+    root = _post_comment(test_client, headers, workspace["slug"], notebook["slug"], block_id, f"@{bot['username']} 1")
+    reply = test_client.post(url, json={"body": f"@{bot['username']} 2", "thread_id": root["id"]}, headers=headers)
+    first, second = [await _latest_mention_event(c["id"]) for c in (root, reply.json())]
+
+    ctx = {"session_maker": async_session_maker, "redis": AsyncMock()}
+    await fanout_event(ctx, first.id)
+
+    wake_bots = tasks._enqueue_bot_mention_tasks
+
+    async def _crash(ctx, session, event, digested_ids=()):
+        # Waking bots commits as it goes; die right after such a commit
+        await session.commit()
+        raise RuntimeError("worker died")
+
+    monkeypatch.setattr(tasks, "_enqueue_bot_mention_tasks", _crash)
+    with pytest.raises(RuntimeError):
+        await fanout_event(ctx, second.id)
+    monkeypatch.setattr(tasks, "_enqueue_bot_mention_tasks", wake_bots)
+    await fanout_event(ctx, second.id)
+
+    async with async_session_maker() as session:
+        result = await session.execute(select(Notification).where(Notification.recipient_id == bot["id"]))
+        digest = result.scalar_one()
+        assert (digest.event_id, digest.event_count) == (second.id, 2)
+        result = await session.execute(
+            select(OutboxJob).where(OutboxJob.job_key == f"flush_notification_digest:{digest.id}")
+        )
+        assert result.scalar_one().args == [digest.id]
+
+
 async def test_bot_mention_without_agent_does_not_enqueue_task(test_client, auth_headers, workspace_and_notebook):
     """A bot principal with no Agent config at all is just a plain mention/notification."""
     headers = auth_headers[0]
@@ -1,6 +1,12 @@
 """Tests for block content serving and file upload via block API."""
 
 import io
+import os
+from datetime import datetime
+
+from starlette.requests import Request
+
+from codex.core.file_serving import serve_local_file
 
 
 def test_get_block_content(test_client, auth_headers, workspace_and_notebook):
@@ -110,6 +116,68 @@ def test_upload_block_with_parent(test_client, auth_headers, workspace_and_noteb
     assert data["parent_block_id"] == page["block_id"]
 
 
+def _upload_binary_block(test_client, headers, workspace, notebook, content: bytes) -> dict:
+    response = test_client.post(
+        f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}/blocks/upload",
+        files={"file": ("clip.bin", io.BytesIO(content), "application/octet-stream")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_block_content_etag_and_conditional(test_client, auth_headers, workspace_and_notebook):
+    """Block content uses the content hash as a strong ETag and honours If-None-Match."""
+    import hashlib
+
+    headers = auth_headers[0]
+    workspace, notebook = workspace_and_notebook
+    content = b"0123456789" * 100
+    block = _upload_binary_block(test_client, headers, workspace, notebook, content)
+    url = f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}/blocks/{block['block_id']}/content"
+
+    response = test_client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.content == content
+    etag = response.headers["etag"]
+    assert etag == f'"{hashlib.sha256(content).hexdigest()}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "must-revalidate" in response.headers["cache-control"]
+
+    not_modified = test_client.get(url, headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    last_modified = response.headers["last-modified"]
+    not_modified = test_client.get(url, headers={**headers, "If-Modified-Since": last_modified})
+    assert not_modified.status_code == 304
+
+    changed = test_client.get(url, headers={**headers, "If-None-Match": '"stale"'})
+    assert changed.status_code == 200
+
+    pinned = test_client.get(f"{url}?v={hashlib.sha256(content).hexdigest()}", headers=headers)
+    assert "immutable" in pinned.headers["cache-control"]
+
+
+def test_block_content_range(test_client, auth_headers, workspace_and_notebook):
+    """Byte ranges return 206 with only the requested slice."""
+    headers = auth_headers[0]
+    workspace, notebook = workspace_and_notebook
+    content = bytes(range(256)) * 8
+    block = _upload_binary_block(test_client, headers, workspace, notebook, content)
+    url = f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}/blocks/{block['block_id']}/content"
+
+    response = test_client.get(url, headers={**headers, "Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == content[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(content)}"
+
+    # If-Range with a stale validator falls back to the full body
+    response = test_client.get(url, headers={**headers, "Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == content
+
+
 def test_upload_requires_auth(test_client):
     """Test that upload requires authentication."""
     response = test_client.post(
@@ -171,3 +239,31 @@ def test_upload_folder_rejects_length_mismatch(test_client, auth_headers, worksp
         headers=headers,
     )
     assert response.status_code == 400
+
+
+def test_same_size_edit_falls_back_to_weak_etag(tmp_path):
+    """An edit that keeps the file size must not be served under the old hash."""
+    path = tmp_path / "clip.bin"
+    path.write_bytes(b"a" * 10)
+    indexed_mtime = datetime.fromtimestamp(path.stat().st_mtime)
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b"v=abc"})
+
+    def serve():
+        return serve_local_file(
+            request,
+            path,
+            "application/octet-stream",
+            content_hash="abc",
+            expected_size=10,
+            expected_mtime=indexed_mtime,
+        )
+
+    assert serve().headers["etag"] == '"abc"'
+    assert "immutable" in serve().headers["cache-control"]
+
+    path.write_bytes(b"b" * 10)
+    edited = path.stat().st_mtime + 5
+    os.utime(path, (edited, edited))
+    response = serve()
+    assert response.headers["etag"].startswith('W/"')
+    assert "immutable" not in response.headers["cache-control"]
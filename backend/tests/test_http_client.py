@@ -0,0 +1,58 @@
+"""Tests for the shared outbound HTTP client pool."""
+
+import asyncio
+
+import httpx
+
+from codex.core.http_client import HTTPClientPool
+
+
+async def test_async_client_is_reused_within_a_loop():
+    pool = HTTPClientPool()
+    client = pool.get()
+    assert pool.get() is client
+
+    await pool.aclose()
+    assert client.is_closed
+    assert pool.get() is not client
+    await pool.aclose()
+
+
+def test_each_event_loop_gets_its_own_client():
+    pool = HTTPClientPool()
+
+    async def _get():
+        return pool.get()
+
+    first = asyncio.run(_get())
+    second = asyncio.run(_get())
+    assert first is not second
+
+
+def test_sync_client_is_shared_and_recreated_after_close():
+    pool = HTTPClientPool(http2=False)
+    client = pool.get_sync()
+    assert pool.get_sync() is client
+
+    asyncio.run(pool.aclose())
+    assert client.is_closed
+    assert pool.get_sync() is not client
+
+
+def test_response_cookies_are_not_sent_on_later_requests():
+    """A Set-Cookie from one endpoint must not leak into calls made for someone else."""
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "session=abc; Path=/"})
+
+    pool = HTTPClientPool(http2=False)
+    client = pool.get_sync()
+    client._transport = httpx.MockTransport(handler)
+    client.get("https://hooks.example.com/a")
+    client.get("https://hooks.example.com/b")
+
+    assert seen == [None, None]
+    assert not client.cookies
+    asyncio.run(pool.aclose())
@@ -0,0 +1,160 @@
+"""Tests for fractional order keys and bulk block reordering."""
+
+import pytest
+from sqlmodel import select
+
+from codex.core.blocks import create_page, next_sibling_order_key, sync_page_from_disk, write_page_metadata
+from codex.core.order_keys import (
+    MAX_KEY_LENGTH,
+    key_between,
+    keys_between,
+    needs_rebalance,
+    rekey_for_order,
+    validate_order_key,
+)
+from codex.db.database import get_notebook_session, init_notebook_db
+from codex.db.models import Block
+
+
+def test_key_between_orders_strictly():
+    first = key_between(None, None)
+    after = key_between(first, None)
+    before = key_between(None, first)
+    middle = key_between(first, after)
+
+    assert before < first < middle < after
+
+
+def test_key_between_rejects_bad_bounds():
+    with pytest.raises(ValueError):
+        key_between("a1", "a0")
+    with pytest.raises(ValueError):
+        validate_order_key("a10")  # trailing zero fraction
+
+
+def test_appending_keeps_keys_short():
+    keys = keys_between(None, None, 1000)
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 1000
+    assert max(len(k) for k in keys) <= 3
+
+
+def test_repeated_inserts_eventually_need_rebalance():
+    low, high = key_between(None, None), None
+    high = key_between(low, None)
+    for _ in range(300):
+        high = key_between(low, high)
+    assert low < high
+    assert needs_rebalance(high)
+    assert len(high) > MAX_KEY_LENGTH
+
+
+def test_rekey_for_order_rewrites_only_moved_key():
+    keys = keys_between(None, None, 10)
+    desired = keys[:2] + keys[3:7] + [keys[2]] + keys[7:]
+
+    result = rekey_for_order(desired)
+
+    assert result == sorted(result)
+    assert sum(1 for old, new in zip(desired, result, strict=True) if old != new) == 1
+
+
+def _base(workspace, notebook):
+    return f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}/blocks"
+
+
+def _page_with_blocks(test_client, headers, base, count):
+    page = test_client.post(f"{base}/pages", json={"title": "Ordering"}, headers=headers).json()
+    for i in range(count):
+        resp = test_client.post(
+            f"{base}/",
+            json={"parent_block_id": page["block_id"], "content": f"block {i}"},
+            headers=headers,
+        )
+        assert resp.status_code == 200
+    children = test_client.get(f"{base}/{page['block_id']}/children", headers=headers).json()["children"]
+    return page, [c["block_id"] for c in children]
+
+
+def test_bulk_move_children(test_client, auth_headers, workspace_and_notebook):
+    headers = auth_headers[0]
+    base = _base(*workspace_and_notebook)
+    page, ids = _page_with_blocks(test_client, headers, base, 4)
+    # ids[0] is the page's initial empty block
+    assert len(ids) == 5
+
+    resp = test_client.patch(
+        f"{base}/{page['block_id']}/children/order",
+        json={
+            "moves": [
+                {"block_id": ids[4], "before_block_id": ids[0]},
+                {"block_id": ids[1], "after_block_id": ids[3]},
+            ]
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["parent_block_id"] == page["block_id"]
+    assert {b["block_id"] for b in data["blocks"]} == {ids[4], ids[1]}
+
+    children = test_client.get(f"{base}/{page['block_id']}/children", headers=headers).json()["children"]
+    assert [c["block_id"] for c in children] == [ids[4], ids[0], ids[2], ids[3], ids[1]]
+    keys = [c["order_key"] for c in children]
+    assert keys == sorted(keys)
+
+
+def test_bulk_move_rejects_unknown_block(test_client, auth_headers, workspace_and_notebook):
+    headers = auth_headers[0]
+    base = _base(*workspace_and_notebook)
+    page, ids = _page_with_blocks(test_client, headers, base, 1)
+
+    resp = test_client.patch(
+        f"{base}/{page['block_id']}/children/order",
+        json={"moves": [{"block_id": ids[0], "after_block_id": "missing"}]},
+        headers=headers,
+    )
+    assert resp.status_code == 404
+
+
+def test_reorder_and_move_within_same_page(test_client, auth_headers, workspace_and_notebook):
+    headers = auth_headers[0]
+    base = _base(*workspace_and_notebook)
+    page, ids = _page_with_blocks(test_client, headers, base, 2)
+
+    resp = test_client.patch(
+        f"{base}/{page['block_id']}/reorder",
+        json={"block_ids": [ids[2], ids[0], ids[1]]},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert [b["block_id"] for b in resp.json()["blocks"]] == [ids[2], ids[0], ids[1]]
+
+    resp = test_client.patch(
+        f"{base}/{ids[2]}/move",
+        json={"new_parent_block_id": page["block_id"], "position": 2},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+
+    children = test_client.get(f"{base}/{page['block_id']}/children", headers=headers).json()["children"]
+    assert [c["block_id"] for c in children] == [ids[0], ids[1], ids[2]]
+
+
+def test_blocks_created_outside_page_metadata_sort_after_siblings(tmp_path):
+    init_notebook_db(str(tmp_path))
+    session = get_notebook_session(str(tmp_path))
+    try:
+        first = create_page(tmp_path, 1, None, "First", nb_session=session)
+        (tmp_path / "Synced").mkdir()
+        write_page_metadata(
+            tmp_path / "Synced", {"version": 1, "block_id": "synced-page", "title": "Synced", "blocks": []}
+        )
+        sync_page_from_disk(tmp_path, "Synced", 1, session)
+
+        keys = dict(session.exec(select(Block.block_id, Block.order_key).where(Block.parent_block_id == None)).all())  # noqa: E711
+        assert keys["synced-page"] is not None
+        assert keys["synced-page"] > keys[first["block_id"]]
+        assert next_sibling_order_key(1, None, session) > keys["synced-page"]
+    finally:
+        session.close()
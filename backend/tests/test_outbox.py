@@ -0,0 +1,123 @@
+"""Tests for the transactional job outbox and its relay."""
+
+from unittest.mock import AsyncMock
+
+from sqlmodel import select
+
+from codex.core.outbox import OutboxRelay
+from codex.db.database import async_session_maker
+from codex.db.models import Event, OutboxJob
+from codex.worker.queues import NOTIFICATIONS_QUEUE
+
+
+def _post_comment(test_client, headers, workspace, notebook):
+    page = test_client.post(
+        f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}/blocks/pages",
+        json={"title": "Outbox Page"},
+        headers=headers,
+    )
+    assert page.status_code == 200, page.text
+    resp = test_client.post(
+        f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}/blocks/{page.json()['block_id']}/comments/",
+        json={"body": "hello"},
+        headers=headers,
+    )
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+async def _fanout_job_for(comment_id):
+    async with async_session_maker() as session:
+        result = await session.execute(select(Event).where(Event.kind == "comment.created").order_by(Event.id.desc()))
+        event = next(e for e in result.scalars().all() if e.subject.get("comment_id") == comment_id)
+        result = await session.execute(select(OutboxJob).where(OutboxJob.job_key == f"fanout_event:{event.id}"))
+        return event, result.scalar_one()
+
+
+async def test_comment_records_fanout_in_outbox_and_relay_enqueues_once(
+    test_client, auth_headers, workspace_and_notebook
+):
+    """The route writes its fanout job with the event; the relay enqueues it once, keyed for dedup."""
+    workspace, notebook = workspace_and_notebook
+    comment = _post_comment(test_client, auth_headers[0], workspace, notebook)
+
+    event, job = await _fanout_job_for(comment["id"])
+    assert job.function == "fanout_event"
+    assert job.args == [event.id]
+    assert job.dispatched_at is None
+
+    pool = AsyncMock()
+    relay = OutboxRelay(batch_size=1000)
+    assert await relay.drain(pool) >= 1
+    pool.enqueue_job.assert_any_call(
+        "fanout_event", event.id, _queue_name=NOTIFICATIONS_QUEUE, _job_id=f"fanout_event:{event.id}"
+    )
+
+    _, job = await _fanout_job_for(comment["id"])
+    assert job.dispatched_at is not None
+
+    pool.enqueue_job.reset_mock()
+    await relay.drain(pool)
+    assert all(call.args[1] != event.id for call in pool.enqueue_job.call_args_list)
+
+
+async def test_failed_enqueue_stays_pending_for_the_next_drain(test_client, auth_headers, workspace_and_notebook):
+    """An unavailable queue leaves the job in the outbox instead of failing the request."""
+    workspace, notebook = workspace_and_notebook
+    comment = _post_comment(test_client, auth_headers[0], workspace, notebook)
+
+    relay = OutboxRelay(batch_size=1000, retry_backoff=0)
+    down = AsyncMock()
+    down.enqueue_job.side_effect = ConnectionError("redis unavailable")
+    assert await relay.drain(down) == 0
+
+    _, job = await _fanout_job_for(comment["id"])
+    assert job.dispatched_at is None
+    assert job.attempts == 1
+    assert "redis unavailable" in job.last_error
+
+    assert await relay.drain(AsyncMock()) >= 1
+    _, job = await _fanout_job_for(comment["id"])
+    assert job.dispatched_at is not None
+
+
+async def test_failing_job_backs_off_instead_of_blocking_newer_rows(test_client, auth_headers, workspace_and_notebook):
+    """A row that can never be enqueued is retried later and given up on; rows behind it still go out."""
+    async with async_session_maker() as session:
+        stuck = OutboxJob(function="no_such_job", args=[], job_key="no_such_job:outbox-test")
+        session.add(stuck)
+        await session.commit()
+        stuck_id = stuck.id
+
+    workspace, notebook = workspace_and_notebook
+    comment = _post_comment(test_client, auth_headers[0], workspace, notebook)
+
+    relay = OutboxRelay(batch_size=1, max_attempts=2)
+    for _ in range(100):
+        await relay.drain(AsyncMock())
+        _, job = await _fanout_job_for(comment["id"])
+        if job.dispatched_at is not None:
+            break
+    assert job.dispatched_at is not None
+    async with async_session_maker() as session:
+        stuck = await session.get(OutboxJob, stuck_id)
+    assert stuck.dispatched_at is None
+    assert stuck.attempts == 1
+    assert stuck.next_attempt_at is not None
+    assert "No queue registered" in stuck.last_error
+
+    # Once due again it fails for the last time and is never selected after that
+    relay.batch_size = 1000
+    async with async_session_maker() as session:
+        stuck = await session.get(OutboxJob, stuck_id)
+        stuck.next_attempt_at = None
+        await session.commit()
+    await relay.drain(AsyncMock())
+    async with async_session_maker() as session:
+        stuck = await session.get(OutboxJob, stuck_id)
+        assert stuck.attempts == 2
+        stuck.next_attempt_at = None
+        await session.commit()
+    await relay.drain(AsyncMock())
+    async with async_session_maker() as session:
+        assert (await session.get(OutboxJob, stuck_id)).attempts == 2
@@ -0,0 +1,116 @@
+"""Tests for the cached, atomic page manifest writer."""
+
+import json
+import os
+import time
+
+from codex.core.page_manifest import PAGE_METADATA_FILE, PageManifestManager
+
+
+def _manifest(title="Page", blocks=None):
+    return {"version": 1, "block_id": "page-1", "title": title, "blocks": blocks or []}
+
+
+def test_write_then_read_roundtrip(tmp_path):
+    manager = PageManifestManager(flush_delay=0)
+    manager.write(tmp_path, _manifest(blocks=[{"block_id": "a", "file": "a.md"}]))
+
+    on_disk = json.loads((tmp_path / PAGE_METADATA_FILE).read_text())
+    assert on_disk["blocks"][0]["block_id"] == "a"
+    assert manager.read(tmp_path) == on_disk
+    # No temp files left behind
+    assert [p.name for p in tmp_path.iterdir()] == [PAGE_METADATA_FILE]
+
+
+def test_read_returns_copies(tmp_path):
+    manager = PageManifestManager(flush_delay=0)
+    manager.write(tmp_path, _manifest())
+
+    meta = manager.read(tmp_path)
+    meta["blocks"].append({"block_id": "oops"})
+    meta["title"] = "Changed"
+
+    assert manager.read(tmp_path) == _manifest()
+
+
+def test_external_edit_invalidates_cache(tmp_path):
+    manager = PageManifestManager(flush_delay=0)
+    manager.write(tmp_path, _manifest())
+    assert manager.read(tmp_path)["title"] == "Page"
+
+    path = tmp_path / PAGE_METADATA_FILE
+    path.write_text(json.dumps(_manifest(title="Edited elsewhere")))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert manager.read(tmp_path)["title"] == "Edited elsewhere"
+    assert not manager.is_own_write(path)
+
+
+def test_batch_coalesces_writes(tmp_path):
+    manager = PageManifestManager(flush_delay=0)
+    path = tmp_path / PAGE_METADATA_FILE
+
+    with manager.batch():
+        for i in range(5):
+            manager.write(tmp_path, _manifest(title=f"v{i}"))
+            assert not path.exists()
+            assert manager.read(tmp_path)["title"] == f"v{i}"
+            assert manager.exists(tmp_path)
+
+    assert json.loads(path.read_text())["title"] == "v4"
+    assert manager.is_own_write(path)
+
+
+def test_delayed_writes_flush_on_demand(tmp_path):
+    manager = PageManifestManager(flush_delay=60)
+    manager.write(tmp_path, _manifest(title="pending"))
+    assert not (tmp_path / PAGE_METADATA_FILE).exists()
+
+    manager.flush()
+    assert json.loads((tmp_path / PAGE_METADATA_FILE).read_text())["title"] == "pending"
+
+
+def test_discard_drops_pending_writes(tmp_path):
+    manager = PageManifestManager(flush_delay=60)
+    page = tmp_path / "child"
+    page.mkdir()
+    manager.write(page, _manifest())
+
+    manager.discard(page)
+    manager.flush()
+
+    assert not (page / PAGE_METADATA_FILE).exists()
+    assert manager.read(page) is None
+
+
+def test_writes_within_the_flush_delay_are_coalesced(tmp_path, monkeypatch):
+    manager = PageManifestManager(flush_delay=0.05)
+    writes = []
+    write_atomic = manager._write_atomic
+    monkeypatch.setattr(manager, "_write_atomic", lambda path, data: (writes.append(data), write_atomic(path, data)))
+
+    for i in range(5):
+        manager.write(tmp_path, _manifest(title=f"v{i}"))
+    deadline = time.monotonic() + 5
+    while not (tmp_path / PAGE_METADATA_FILE).exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert [w["title"] for w in writes] == ["v4"]
+
+
+def test_failed_delayed_flush_keeps_the_manifest_pending(tmp_path, monkeypatch):
+    manager = PageManifestManager(flush_delay=60)
+    manager.write(tmp_path, _manifest(title="pending"))
+
+    def fail(path, data):
+        raise OSError(28, "No space left on device")
+
+    write_atomic = manager._write_atomic
+    monkeypatch.setattr(manager, "_write_atomic", fail)
+    manager._flush_due()
+    assert manager.read(tmp_path)["title"] == "pending"
+
+    monkeypatch.setattr(manager, "_write_atomic", write_atomic)
+    manager.flush()
+    assert json.loads((tmp_path / PAGE_METADATA_FILE).read_text())["title"] == "pending"
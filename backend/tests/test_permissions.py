@@ -1,16 +1,20 @@
 """Unit tests for the workspace permission level resolver (codex.core.permissions)."""
 
+import json
 from uuid import uuid4
 
 import pytest
 from sqlmodel import select
 
 from codex.api.auth import get_password_hash
+from codex.core.invalidation import InvalidationBus
 from codex.core.permissions import (
     PermissionLevel,
     check_permission,
     effective_level,
+    effective_levels,
     has_permission,
+    permission_cache,
 )
 from codex.db.database import async_session_maker
 from codex.db.models import User, Workspace, WorkspacePermission
@@ -198,3 +202,66 @@ class TestCheckPermission:
 
             for required in PermissionLevel:
                 assert not await check_permission(stranger, workspace, required, session)
+
+
+class TestPermissionCache:
+    """Resolved levels are cached, batched, and invalidated when grants change."""
+
+    async def test_grant_changes_invalidate_cached_level(self):
+        async with async_session_maker() as session:
+            owner = await _create_user(session)
+            workspace = await _create_workspace(session, owner=owner)
+            collaborator = await _create_user(session)
+            assert await effective_level(collaborator, workspace, session) is None
+
+            grant = await _grant(session, workspace=workspace, user=collaborator, level="read")
+            assert await effective_level(collaborator, workspace, session) is PermissionLevel.READ
+
+            grant.permission_level = "write"
+            await session.commit()
+            assert await effective_level(collaborator, workspace, session) is PermissionLevel.WRITE
+
+            await session.delete(grant)
+            await session.commit()
+            assert await effective_level(collaborator, workspace, session) is None
+
+    async def test_cached_level_is_reused(self):
+        async with async_session_maker() as session:
+            owner = await _create_user(session)
+            workspace = await _create_workspace(session, owner=owner)
+            collaborator = await _create_user(session)
+            await _grant(session, workspace=workspace, user=collaborator, level="comment")
+            await effective_level(collaborator, workspace, session)
+
+            hit, level = permission_cache.get(permission_cache.key(collaborator.id, workspace))
+            assert hit
+            assert level is PermissionLevel.COMMENT
+
+    async def test_effective_levels_resolves_many_workspaces(self):
+        async with async_session_maker() as session:
+            owner = await _create_user(session)
+            collaborator = await _create_user(session)
+            workspaces = [await _create_workspace(session, owner=owner) for _ in range(3)]
+            await _grant(session, workspace=workspaces[0], user=collaborator, level="write")
+            await _grant(session, workspace=workspaces[2], user=collaborator, level="read")
+
+            levels = await effective_levels(collaborator, workspaces, session)
+
+            assert levels == {
+                workspaces[0].id: PermissionLevel.WRITE,
+                workspaces[1].id: None,
+                workspaces[2].id: PermissionLevel.READ,
+            }
+
+    def test_invalidations_from_other_processes_are_applied(self):
+        received = []
+        sender, receiver = InvalidationBus(backend="redis"), InvalidationBus(backend="redis")
+        receiver.register("permissions", received.append)
+
+        # What the sender would publish to Redis, as seen by the receiver
+        message = {"origin": sender._origin, "topic": "permissions", "payload": {"user_id": 7}}
+        receiver._receive(json.dumps(message))
+        # Our own messages echoed back by Redis are ignored
+        receiver._receive(json.dumps({**message, "origin": receiver._origin}))
+
+        assert received == [{"user_id": 7}]
@@ -169,3 +169,44 @@ def test_principals_requires_comment_level(test_client, auth_headers, create_wor
 
     response = test_client.get(f"/api/v1/workspaces/{workspace['slug']}/principals", headers=reader_headers)
     assert response.status_code == 403
+
+
+def test_notebook_routes_resolve_in_one_query(test_client, auth_headers, create_workspace):
+    """Workspace, notebook and a grantee's permission resolve in a single routing query."""
+    from sqlalchemy import event
+
+    from codex.core.permissions import permission_cache
+    from codex.db.database import system_engine
+
+    owner_headers, _ = auth_headers
+    workspace = create_workspace()
+    notebook = test_client.post(
+        f"/api/v1/workspaces/{workspace['slug']}/notebooks/", json={"name": "Routed"}, headers=owner_headers
+    ).json()
+    reader_headers, reader_username = _register_and_login(test_client)
+    _grant(workspace_id=workspace["id"], username=reader_username, level="read")
+    base = f"/api/v1/workspaces/{workspace['slug']}/notebooks/{notebook['slug']}"
+
+    test_client.get("/api/v1/users/me", headers=reader_headers)  # warm the principal cache
+    permission_cache.invalidate()
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(system_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        response = test_client.get(base, headers=reader_headers)
+    finally:
+        event.remove(system_engine.sync_engine, "before_cursor_execute", _record)
+    assert response.status_code == 200
+    assert response.json()["id"] == notebook["id"]
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+    # Below the required level is still a 403; a missing notebook is still a 404
+    response = test_client.delete(base, headers=reader_headers)
+    assert response.status_code == 403
+    response = test_client.get(f"/api/v1/workspaces/{workspace['slug']}/notebooks/nope", headers=reader_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Notebook not found"
@@ -1,5 +1,7 @@
 """Tests for the server working-copy indexer for shared notebooks (issue #542)."""
 
+import asyncio
+import hashlib
 import threading
 import time
 from pathlib import Path
@@ -20,6 +22,10 @@ class _FakeS3:
     def __init__(self):
         self.objects: dict[str, bytes] = {}
         self.versions: dict[tuple[str, str], bytes] = {}
+        self.downloads: list[str] = []
+
+    def etag(self, key: str) -> str:
+        return f'"{hashlib.md5(self.objects[key]).hexdigest()}"'
 
     def put(self, key: str, data: bytes, version_id: str = "v1") -> None:
         self.objects[key] = data
@@ -34,7 +40,15 @@ class _FakeS3:
 
         class _Paginator:
             def paginate(self, Bucket, Prefix):  # noqa: N803 (matches boto3's signature)
-                return [{"Contents": [{"Key": k} for k in store.objects if k.startswith(Prefix)]}]
+                return [
+                    {
+                        "Contents": [
+                            {"Key": k, "ETag": store.etag(k), "Size": len(v)}
+                            for k, v in store.objects.items()
+                            if k.startswith(Prefix)
+                        ]
+                    }
+                ]
 
         return _Paginator()
 
@@ -51,7 +65,15 @@ def fake_s3(monkeypatch):
             return fake.versions[(s3_key, version_id)]
         return fake.objects[s3_key]
 
+    def _fake_download_to_file(s3_key, dest_path, version_id=None, bucket=None, if_match=None):
+        if if_match and if_match != fake.etag(s3_key):
+            raise RuntimeError("PreconditionFailed")
+        fake.downloads.append(s3_key)
+        Path(dest_path).write_bytes(_fake_download(s3_key, version_id))
+        return {"etag": fake.etag(s3_key), "size": len(fake.objects[s3_key]), "version_id": version_id}
+
     monkeypatch.setattr(s3_indexer, "download_binary", _fake_download)
+    monkeypatch.setattr(s3_indexer, "download_to_file", _fake_download_to_file)
     return fake
 
 
@@ -229,6 +251,56 @@ def test_rebuild_notebook_index_skips_unsafe_stale_block_path(shared_workspace,
     assert result.deleted == 0
 
 
+def test_rebuild_notebook_index_only_transfers_changed_objects(shared_workspace, fake_s3):
+    """A second rebuild skips objects whose local copy still matches S3 and refetches the rest."""
+    workspace, notebook = shared_workspace
+    prefix = _prefix(workspace, notebook)
+    fake_s3.put(f"{prefix}same.md", b"unchanged", version_id="v1")
+    fake_s3.put(f"{prefix}edited.md", b"old", version_id="v1")
+    fake_s3.put(f"{prefix}touched.md", b"remote", version_id="v1")
+
+    first = s3_indexer.rebuild_notebook_index(workspace, notebook)
+    assert (first.processed, first.skipped) == (3, 0)
+
+    notebook_path = s3_indexer.notebook_working_copy_path(workspace, notebook)
+    fake_s3.put(f"{prefix}edited.md", b"new upstream", version_id="v2")
+    (notebook_path / "touched.md").write_bytes(b"local drift")
+    fake_s3.downloads.clear()
+
+    second = s3_indexer.rebuild_notebook_index(workspace, notebook)
+
+    assert (second.processed, second.skipped, second.errors) == (2, 1, [])
+    assert sorted(fake_s3.downloads) == [f"{prefix}edited.md", f"{prefix}touched.md"]
+    assert (notebook_path / "edited.md").read_bytes() == b"new upstream"
+    assert (notebook_path / "touched.md").read_bytes() == b"remote"
+
+
+def test_rebuild_notebook_index_refetches_files_missing_from_the_index(shared_workspace, fake_s3):
+    """Files that are on disk but have no Block row (e.g. a recreated notebook DB) are reindexed."""
+    workspace, notebook = shared_workspace
+    prefix = _prefix(workspace, notebook)
+    fake_s3.put(f"{prefix}a.md", b"a", version_id="v1")
+    s3_indexer.rebuild_notebook_index(workspace, notebook)
+
+    notebook_path = s3_indexer.notebook_working_copy_path(workspace, notebook)
+    session = get_notebook_session(str(notebook_path))
+    try:
+        for block in session.execute(select(Block)).scalars().all():
+            session.delete(block)
+        session.commit()
+    finally:
+        session.close()
+
+    result = s3_indexer.rebuild_notebook_index(workspace, notebook)
+
+    assert (result.processed, result.skipped) == (1, 0)
+    session = get_notebook_session(str(notebook_path))
+    try:
+        assert [b.path for b in session.execute(select(Block)).scalars().all()] == ["a.md"]
+    finally:
+        session.close()
+
+
 def test_rebuild_notebook_index_writes_cursor_file(shared_workspace, fake_s3):
     workspace, notebook = shared_workspace
     s3_indexer.rebuild_notebook_index(workspace, notebook)
@@ -310,16 +382,25 @@ def test_concurrent_rebuilds_of_same_notebook_are_serialized(shared_workspace, f
     fake_s3.put(f"{prefix}b.md", b"b", version_id="v1")
 
     events: list[str] = []
-    original = s3_indexer._materialize_object
+    original_init = s3_indexer.init_notebook_db
+    original_materialize = s3_indexer._materialize_object
+    original_write_cursor = s3_indexer._write_cursor
 
-    def slow_materialize(*args, **kwargs):
+    def tracked_init(*args, **kwargs):
         events.append("start")
+        return original_init(*args, **kwargs)
+
+    def slow_materialize(*args, **kwargs):
         time.sleep(0.05)
-        result = original(*args, **kwargs)
+        return original_materialize(*args, **kwargs)
+
+    def tracked_write_cursor(*args, **kwargs):
+        original_write_cursor(*args, **kwargs)
         events.append("end")
-        return result
 
+    monkeypatch.setattr(s3_indexer, "init_notebook_db", tracked_init)
     monkeypatch.setattr(s3_indexer, "_materialize_object", slow_materialize)
+    monkeypatch.setattr(s3_indexer, "_write_cursor", tracked_write_cursor)
 
     threads = [threading.Thread(target=s3_indexer.rebuild_notebook_index, args=(workspace, notebook)) for _ in range(2)]
     for t in threads:
@@ -327,11 +408,10 @@ def test_concurrent_rebuilds_of_same_notebook_are_serialized(shared_workspace, f
     for t in threads:
         t.join(timeout=5)
 
-    # Each rebuild processes 2 files; if the two concurrent rebuilds interleaved instead of
-    # being serialized by the per-notebook lock, a "start" from thread B could land between
-    # thread A's "start" and its matching "end" pair.
-    for i in range(0, len(events), 2):
-        assert events[i : i + 2] == ["start", "end"], events
+    # A rebuild's downloads run in parallel, but whole rebuilds of one notebook must not
+    # overlap: if the per-notebook lock didn't serialize them, thread B's "start" would
+    # land between thread A's "start" and "end".
+    assert events == ["start", "end", "start", "end"], events
 
 
 # ── S3IndexerService integration (real system DB + push-complete API) ──
@@ -387,6 +467,223 @@ def test_service_poll_once_indexes_shared_workspace_from_journal(test_client, au
     assert block is not None
 
 
+def _shared_notebooks(test_client, headers, create_workspace, *names):
+    """Create notebooks in a new workspace, then mark the workspace org-owned (shared)."""
+    workspace = create_workspace()
+    notebooks = []
+    for name in names:
+        nb_response = test_client.post(
+            f"/api/v1/workspaces/{workspace['slug']}/notebooks/", json={"name": name}, headers=headers
+        )
+        assert nb_response.status_code == 200
+        notebooks.append(nb_response.json())
+
+    session = get_system_session_sync()
+    try:
+        ws_row = session.get(Workspace, workspace["id"])
+        ws_row.org_id = 12345
+        session.add(ws_row)
+        session.commit()
+    finally:
+        session.close()
+    return workspace, notebooks
+
+
+def test_push_complete_wakes_indexer_which_applies_journal_across_notebooks(
+    test_client, auth_headers, create_workspace, fake_s3, monkeypatch
+):
+    """A push wakes the indexer; one pass then catches every shared notebook up from the journal."""
+    headers = auth_headers[0]
+    workspace, notebooks = _shared_notebooks(test_client, headers, create_workspace, "Push One", "Push Two")
+
+    service = s3_indexer.S3IndexerService()
+    assert service.poll_once()
+
+    # Working copies exist now, so the pushes must be applied incrementally
+    def _no_rebuild(*args, **kwargs):
+        raise AssertionError("unexpected full rebuild")
+
+    monkeypatch.setattr(s3_indexer, "rebuild_notebook_index", _no_rebuild)
+    wakes = []
+    monkeypatch.setattr(s3_indexer.indexer_service, "wake", lambda nb_id=None: wakes.append(nb_id))
+
+    journal_ids = {}
+    for notebook in notebooks:
+        prefix = f"orgs/12345/workspaces/{workspace['id']}/notebooks/{notebook['id']}/content/"
+        fake_s3.put(f"{prefix}pushed.md", notebook["name"].encode(), version_id="v1")
+        push_response = test_client.post(
+            f"/api/v1/workspaces/{workspace['slug']}/sync/push-complete",
+            json={"notebook_slug": notebook["slug"], "path": "pushed.md", "s3_version_id": "v1", "op": "created"},
+            headers=headers,
+        )
+        assert push_response.status_code == 200
+        journal_ids[notebook["id"]] = push_response.json()["id"]
+    assert wakes == [notebook["id"] for notebook in notebooks]
+
+    assert service.poll_once()
+    for notebook in notebooks:
+        notebook_path = (Path(workspace["path"]) / notebook["path"]).resolve()
+        assert (notebook_path / "pushed.md").read_bytes() == notebook["name"].encode()
+        assert s3_indexer._read_cursor(notebook_path) == journal_ids[notebook["id"]]
+
+
+def test_service_applies_journal_rows_that_commit_out_of_order(
+    test_client, auth_headers, create_workspace, fake_s3, monkeypatch
+):
+    """A lower journal id committed after a higher one was read, for another notebook, is still applied."""
+    workspace, (first, second) = _shared_notebooks(
+        test_client, auth_headers[0], create_workspace, "Order One", "Order Two"
+    )
+    service = s3_indexer.S3IndexerService()
+    assert service.poll_once()
+
+    applied = []
+    monkeypatch.setattr(
+        s3_indexer, "apply_journal_entry", lambda ws, nb, entry, session=None: applied.append((nb.id, entry.id))
+    )
+
+    def _commit_row(row_id, notebook):
+        session = get_system_session_sync()
+        try:
+            session.add(
+                SyncJournal(
+                    id=row_id,
+                    ws_id=workspace["id"],
+                    nb_id=notebook["id"],
+                    path=f"row-{row_id}.md",
+                    s3_version_id="v1",
+                    op="created",
+                )
+            )
+            session.commit()
+        finally:
+            session.close()
+
+    _commit_row(900_001, first)
+    assert service.poll_once()
+    _commit_row(900_000, second)
+    assert service.poll_once()
+
+    assert applied == [(first["id"], 900_001), (second["id"], 900_000)]
+
+
+def _journal_row(workspace, notebook, path, row_id=None):
+    session = get_system_session_sync()
+    try:
+        session.add(
+            SyncJournal(
+                id=row_id,
+                ws_id=workspace["id"],
+                nb_id=notebook["id"],
+                path=path,
+                s3_version_id="v1",
+                op="created",
+            )
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_service_applies_journal_across_thousands_of_notebooks(
+    test_client, auth_headers, create_workspace, fake_s3, monkeypatch
+):
+    """The journal query stays flat however many shared notebooks there are."""
+    workspace, (notebook,) = _shared_notebooks(test_client, auth_headers[0], create_workspace, "Many")
+    service = s3_indexer.S3IndexerService()
+    assert service.poll_once()
+
+    applied = []
+    monkeypatch.setattr(
+        s3_indexer, "apply_journal_entry", lambda ws, nb, entry, session=None: applied.append(entry.path)
+    )
+    _journal_row(workspace, notebook, "many.md")
+
+    session = get_system_session_sync()
+    try:
+        nb_row = session.get(NotebookModel, notebook["id"])
+        ws_row = session.get(Workspace, workspace["id"])
+        shared = {nb_row.id: (nb_row, ws_row)}
+        # Notebooks that have nothing new still take part in the query
+        for nb_id in range(10_000_000, 10_001_500):
+            shared[nb_id] = (nb_row, ws_row)
+            service._cursors[nb_id] = 0
+        assert service._apply_journal(session, shared)
+    finally:
+        session.close()
+
+    assert applied == ["many.md"]
+
+
+def test_wake_names_the_notebook_to_catch_up(test_client, auth_headers, create_workspace, fake_s3, monkeypatch):
+    """A wake applies only its own notebook's rows; the others wait for the reconcile walk."""
+    workspace, (first, second) = _shared_notebooks(test_client, auth_headers[0], create_workspace, "Woken", "Not Woken")
+    service = s3_indexer.S3IndexerService()
+    assert service.poll_once()
+
+    applied = []
+    monkeypatch.setattr(
+        s3_indexer, "apply_journal_entry", lambda ws, nb, entry, session=None: applied.append(entry.path)
+    )
+    _journal_row(workspace, first, "first.md")
+    _journal_row(workspace, second, "second.md")
+
+    assert service.poll_notebooks({first["id"]})
+    assert applied == ["first.md"]
+    assert service.poll_once()
+    assert applied == ["first.md", "second.md"]
+
+
+async def test_run_loop_polls_only_the_woken_notebook(fake_s3, monkeypatch):
+    service = s3_indexer.S3IndexerService(reconcile_interval=60, retry_interval=60)
+    calls = []
+    monkeypatch.setattr(service, "poll_once", lambda: calls.append("all") or True)
+    monkeypatch.setattr(service, "poll_notebooks", lambda nb_ids: calls.append(set(nb_ids)) or True)
+
+    service.start()
+    try:
+        await asyncio.sleep(0.05)
+        service.wake(7)
+        await asyncio.sleep(0.05)
+    finally:
+        await service.stop()
+
+    assert calls == ["all", {7}]
+
+
+def test_failing_rebuild_backs_off_only_its_notebook(test_client, auth_headers, create_workspace, fake_s3, monkeypatch):
+    workspace, (broken, healthy) = _shared_notebooks(
+        test_client, auth_headers[0], create_workspace, "Broken", "Healthy"
+    )
+    rebuild = s3_indexer.rebuild_notebook_index
+    attempts = []
+
+    def _rebuild(ws, nb):
+        attempts.append(nb.id)
+        if nb.id == broken["id"]:
+            raise RuntimeError("S3 unavailable")
+        return rebuild(ws, nb)
+
+    monkeypatch.setattr(s3_indexer, "rebuild_notebook_index", _rebuild)
+    service = s3_indexer.S3IndexerService(retry_interval=0.2)
+
+    assert not service.poll_once()
+    assert healthy["id"] in service._cursors
+    assert attempts.count(broken["id"]) == 1
+
+    # Still backing off: neither a wake nor a full pass retries it yet
+    assert not service.poll_notebooks({broken["id"]})
+    assert not service.poll_once()
+    assert attempts.count(broken["id"]) == 1
+    assert service._retry_at[broken["id"]] > time.monotonic()
+
+    time.sleep(0.25)
+    assert not service.poll_notebooks({broken["id"]})
+    assert attempts.count(broken["id"]) == 2
+    # The second failure doubles the delay
+    assert service._retry_at[broken["id"]] > time.monotonic() + 0.2
+
+
 # ── Conflict copy materialization (issue #543) ───────────────────────
 
 
@@ -154,3 +154,27 @@ def test_workspace_by_id(test_client, auth_headers, create_workspace):
     )
     assert response.status_code == 200
     assert response.json()["title"] == "By ID"
+
+
+def test_list_tasks_keyset_pagination(test_client, auth_headers, create_workspace):
+    """Task lists page by cursor, oldest first, without skipping or repeating rows."""
+    headers = auth_headers[0]
+    workspace = create_workspace()
+    url = _tasks_url(workspace)
+    created = [test_client.post(f"{url}/", json={"title": f"Task {i}"}, headers=headers).json()["id"] for i in range(5)]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = test_client.get(f"{url}/", params=params, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen.extend(task["id"] for task in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == created
+
+    response = test_client.get(f"{url}/", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
@@ -137,6 +137,32 @@ class TestPersonalAccessTokens:
         assert resp.status_code == 400
         assert "snippets:write" in resp.json()["detail"]
 
+    def test_pat_last_used_is_buffered_and_flushed(self, test_client, user_and_token):
+        import asyncio
+
+        from codex.core.token_usage import token_usage
+
+        headers, _, _ = user_and_token
+        create_resp = test_client.post("/api/v1/tokens/", json={"name": "usage-test"}, headers=headers)
+        pat = create_resp.json()["token"]
+        token_id = create_resp.json()["id"]
+
+        pat_headers = {"Authorization": f"Bearer {pat}"}
+        for _ in range(3):
+            assert test_client.get("/api/v1/users/me", headers=pat_headers).status_code == 200
+
+        # Pending uses are visible before they are written
+        listed = {t["id"]: t for t in test_client.get("/api/v1/tokens/", headers=headers).json()}
+        assert listed[token_id]["last_used_at"] is not None
+
+        assert asyncio.run(token_usage.flush()) >= 1
+        listed = {t["id"]: t for t in test_client.get("/api/v1/tokens/", headers=headers).json()}
+        assert listed[token_id]["last_used_at"] is not None
+
+        # Within the interval, further use records nothing new
+        test_client.get("/api/v1/users/me", headers=pat_headers)
+        assert asyncio.run(token_usage.flush()) == 0
+
 
 # ── Snippet Posting Tests ────────────────────────────────────────────
 
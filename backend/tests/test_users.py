@@ -144,3 +144,103 @@ def test_multiple_logins_same_user(test_client):
         response = test_client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
         assert response.status_code == 200
         assert response.json()["username"] == username
+
+
+def test_principal_cache_serves_and_invalidates(test_client):
+    """JWT principals are cached and dropped when the user row changes."""
+    from codex.core.principals import principal_cache
+
+    username = f"principal_cache_test_{int(time.time() * 1000)}"
+    password = "testpass123"
+    test_client.post(
+        "/api/v1/users/register",
+        json={"username": username, "email": f"{username}@example.com", "password": password},
+    )
+    token = test_client.post("/api/v1/users/token", data={"username": username, "password": password}).json()[
+        "access_token"
+    ]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert test_client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert principal_cache.get(username) is not None
+
+    # A cached principal can still be modified and committed by a route
+    resp = test_client.patch("/api/v1/users/me/theme", json={"theme": "manila"}, headers=headers)
+    assert resp.status_code == 200
+    assert principal_cache.get(username) is None
+
+    assert test_client.get("/api/v1/users/me", headers=headers).json()["theme_setting"] == "manila"
+
+    resp = test_client.post(
+        "/api/v1/users/me/password",
+        json={"current_password": password, "new_password": "newpass456"},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert principal_cache.get(username) is None
+    login = test_client.post("/api/v1/users/token", data={"username": username, "password": "newpass456"})
+    assert login.status_code == 200
+
+
+def test_login_upgrades_legacy_password_hash(test_client):
+    """Hashes without stored parameters are rewritten in the current format on login."""
+    import asyncio
+    import hashlib
+    import secrets
+
+    from sqlmodel import select
+
+    from codex.api.auth import PASSWORD_HASH_ALGORITHM, verify_password
+    from codex.db.database import async_session_maker
+    from codex.db.models import User
+
+    username = f"legacy_hash_test_{int(time.time() * 1000)}"
+    password = "testpass123"
+    test_client.post(
+        "/api/v1/users/register",
+        json={"username": username, "email": f"{username}@example.com", "password": password},
+    )
+
+    async def _set_legacy_hash():
+        async with async_session_maker() as session:
+            user = (await session.execute(select(User).where(User.username == username))).scalar_one()
+            salt = secrets.token_bytes(32)
+            digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, 100000)
+            user.hashed_password = f"{salt.hex()}${digest.hex()}"
+            await session.commit()
+
+    async def _stored_hash():
+        async with async_session_maker() as session:
+            user = (await session.execute(select(User).where(User.username == username))).scalar_one()
+            return user.hashed_password
+
+    asyncio.run(_set_legacy_hash())
+    assert verify_password(password, asyncio.run(_stored_hash()))
+
+    response = test_client.post("/api/v1/users/token", data={"username": username, "password": password})
+    assert response.status_code == 200
+
+    upgraded = asyncio.run(_stored_hash())
+    assert upgraded.startswith(f"{PASSWORD_HASH_ALGORITHM}$")
+    assert verify_password(password, upgraded)
+    assert not verify_password("wrong", upgraded)
+
+
+def test_repeated_failed_logins_are_rate_limited(test_client):
+    """After too many failures an account gets 429s, even with the right password."""
+    from codex.api.auth import LOGIN_FAILURE_LIMIT
+
+    username = f"rate_limit_test_{int(time.time() * 1000)}"
+    password = "testpass123"
+    test_client.post(
+        "/api/v1/users/register",
+        json={"username": username, "email": f"{username}@example.com", "password": password},
+    )
+
+    for _ in range(LOGIN_FAILURE_LIMIT):
+        response = test_client.post("/api/v1/users/token", data={"username": username, "password": "wrong"})
+        assert response.status_code == 401
+
+    response = test_client.post("/api/v1/users/token", data={"username": username, "password": password})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
@@ -1,16 +1,51 @@
 """Tests for WebSocket file change notifications."""
 
+import asyncio
+import json
+import threading
 import time
 
+import pytest
 from starlette.websockets import WebSocketDisconnect
 
 from codex.core.websocket import (
+    BroadcastBackend,
     ConnectionManager,
     FileChangeEvent,
+    InMemoryBroadcastBackend,
+    RedisBroadcastBackend,
+    connection_manager,
     notify_file_change,
+    principal_channel,
 )
 
 
+class FakeWebSocket:
+    """Records what the connection manager sends to a socket."""
+
+    def __init__(self, delay=0.0, close_delay=0.0):
+        self.sent = []
+        self.delay = delay
+        self.close_delay = close_delay
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000, reason=None):
+        await asyncio.sleep(self.close_delay)
+        self.close_code = code
+
+    @property
+    def payloads(self):
+        """Sent messages without the channel/seq stamped on by the backend."""
+        return [{k: v for k, v in m.items() if k not in ("channel", "seq")} for m in self.sent]
+
+
 class TestFileChangeEvent:
     """Tests for FileChangeEvent dataclass."""
 
@@ -58,8 +93,224 @@ class TestConnectionManager:
             event_type="created",
             path="test.md",
         )
-        # This should be a no-op since _event_queue is None
+        # This should be a no-op since the broadcast loop isn't running
         manager.queue_event(event)
+        assert manager.stats()["dropped"] == 1
+
+    async def test_broadcast_reaches_channel_subscribers(self):
+        manager = ConnectionManager(backend=InMemoryBroadcastBackend())
+        subscribed, other = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(subscribed)
+        await manager.connect(other)
+        manager.subscribe(subscribed, "workspace:1")
+        manager.subscribe(other, "workspace:2")
+
+        await manager.broadcast("workspace:1", {"type": "hello"})
+        await asyncio.sleep(0.01)
+
+        assert subscribed.payloads == [{"type": "hello"}]
+        assert other.sent == []
+        manager.disconnect(subscribed)
+        manager.disconnect(other)
+
+    async def test_notebook_messages_are_routed_by_topic(self):
+        manager = ConnectionManager(backend=InMemoryBroadcastBackend())
+        notebook_1, page, everything = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        for socket, topic in ((notebook_1, "notebook:1"), (page, "block:page-a"), (everything, "*")):
+            await manager.connect(socket)
+            manager.subscribe(socket, "workspace:1")
+            manager.subscribe_topic(socket, "workspace:1", topic)
+
+        await manager.broadcast("workspace:1", {"notebook_id": 1, "path": "a.md"})
+        await manager.broadcast("workspace:1", {"notebook_id": 2, "block_id": "b", "parent_block_id": "page-a"})
+        await manager.broadcast("workspace:1", {"type": "sync.change"})
+        await asyncio.sleep(0.01)
+
+        assert notebook_1.payloads == [{"notebook_id": 1, "path": "a.md"}, {"type": "sync.change"}]
+        assert [m.get("block_id") for m in page.sent] == ["b", None]
+        assert len(everything.sent) == 3
+
+        manager.unsubscribe_topic(notebook_1, "workspace:1", "notebook:1")
+        await manager.broadcast("workspace:1", {"notebook_id": 1, "path": "b.md"})
+        await asyncio.sleep(0.01)
+        assert len(notebook_1.sent) == 2
+        for socket in (notebook_1, page, everything):
+            manager.disconnect(socket)
+        assert manager._topics == {}
+
+    async def test_slow_consumer_does_not_delay_others(self):
+        manager = ConnectionManager(backend=InMemoryBroadcastBackend(), send_queue_size=3)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=10)
+        for socket in (fast, slow):
+            await manager.connect(socket)
+            manager.subscribe(socket, "workspace:1")
+
+        for i in range(5):
+            await manager.broadcast("workspace:1", {"n": i})
+            await asyncio.sleep(0.01)
+
+        assert [m["n"] for m in fast.sent] == [0, 1, 2, 3, 4]
+        # The slow socket overflowed its queue and was dropped
+        assert slow.close_code == 1013
+        assert manager.stats()["slow_disconnects"] == 1
+        await manager.broadcast("workspace:1", {"n": 5})
+        await asyncio.sleep(0.01)
+        assert fast.payloads[-1] == {"n": 5}
+        manager.disconnect(fast)
+
+    async def test_stalled_close_does_not_block_broadcast(self):
+        """Dropping a slow client doesn't wait for its close handshake."""
+        manager = ConnectionManager(backend=InMemoryBroadcastBackend(), send_queue_size=1)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=10, close_delay=10)
+        for socket in (fast, slow):
+            await manager.connect(socket)
+            manager.subscribe(socket, "workspace:1")
+
+        started = time.monotonic()
+        for i in range(3):
+            await manager.broadcast("workspace:1", {"n": i})
+            await asyncio.sleep(0.01)
+        assert time.monotonic() - started < 1
+
+        assert [m["n"] for m in fast.sent] == [0, 1, 2]
+        assert manager.stats()["slow_disconnects"] == 1
+        assert slow.close_code is None  # Still closing in the background
+        for task in manager._closing:
+            task.cancel()
+        manager.disconnect(fast)
+
+    async def _queue_from_thread(self, manager, count, notebook_id=1):
+        def produce():
+            for i in range(count):
+                manager.queue_event(
+                    FileChangeEvent(notebook_id=notebook_id, event_type="created", path=f"f{i}.md", workspace_id=1)
+                )
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.2)
+
+    async def test_events_from_threads_are_broadcast(self):
+        manager = ConnectionManager(backend=InMemoryBroadcastBackend(), coalesce_window=0.01, coalesce_threshold=5)
+        socket = FakeWebSocket()
+        await manager.connect(socket)
+        manager.subscribe(socket, "workspace:1")
+        manager.subscribe_topic(socket, "workspace:1", "notebook:1")
+        await manager.start_broadcast_loop()
+        try:
+            await self._queue_from_thread(manager, 3)
+        finally:
+            await manager.stop_broadcast_loop()
+            manager.disconnect(socket)
+
+        assert [m["path"] for m in socket.sent] == ["f0.md", "f1.md", "f2.md"]
+        assert manager.stats()["broadcast"] == 3
+
+    async def test_bursts_are_coalesced_into_bulk_event(self):
+        manager = ConnectionManager(backend=InMemoryBroadcastBackend(), coalesce_window=0.05, coalesce_threshold=5)
+        socket = FakeWebSocket()
+        await manager.connect(socket)
+        manager.subscribe(socket, "workspace:1")
+        manager.subscribe_topic(socket, "workspace:1", "notebook:1")
+        await manager.start_broadcast_loop()
+        try:
+            await self._queue_from_thread(manager, 500)
+        finally:
+            await manager.stop_broadcast_loop()
+            manager.disconnect(socket)
+
+        assert len(socket.sent) == 1
+        bulk = socket.sent[0]
+        assert bulk["event_type"] == "bulk"
+        assert bulk["notebook_id"] == 1
+        assert bulk["count"] == 500
+        stats = manager.stats()
+        assert stats["coalesced"] == 500
+        assert stats["bulk_events"] == 1
+        assert stats["dropped"] == 0
+
+    async def test_bulk_event_reaches_block_subscribers(self):
+        manager = ConnectionManager(backend=InMemoryBroadcastBackend(), coalesce_window=0.05, coalesce_threshold=5)
+        page, other_workspace = FakeWebSocket(), FakeWebSocket()
+        for socket, channel in ((page, "workspace:1"), (other_workspace, "workspace:2")):
+            await manager.connect(socket)
+            manager.subscribe(socket, channel)
+            manager.subscribe_topic(socket, channel, "block:page-a")
+        await manager.start_broadcast_loop()
+        try:
+            await self._queue_from_thread(manager, 20)
+        finally:
+            await manager.stop_broadcast_loop()
+            manager.disconnect(page)
+            manager.disconnect(other_workspace)
+
+        # The summary names no blocks, so a socket watching only a page still hears about it
+        assert [(m["event_type"], m["notebook_id"], m["count"]) for m in page.sent] == [("bulk", 1, 20)]
+        assert other_workspace.sent == []
+
+
+class TestReplayBuffer:
+    """Tests for per-channel sequence numbers and replay."""
+
+    async def test_replay_after_sequence(self):
+        backend = InMemoryBroadcastBackend(replay_size=3)
+        for i in range(5):
+            await backend.publish("principal:1", {"n": i})
+
+        assert await backend.last_seq("principal:1") == 5
+        assert [m["seq"] for m in await backend.replay("principal:1", 3)] == [4, 5]
+        assert await backend.replay("principal:1", 5) == []
+        # Seq 2 has rolled out of the buffer, and seq 9 was never issued
+        assert await backend.replay("principal:1", 1) is None
+        assert await backend.replay("principal:1", 9) is None
+        assert await backend.replay("principal:2", 0) == []
+
+    async def test_held_broadcasts_follow_replay(self):
+        manager = ConnectionManager(backend=InMemoryBroadcastBackend())
+        await manager.broadcast("principal:1", {"n": 0})
+        await manager.broadcast("principal:1", {"n": 1})
+
+        socket = FakeWebSocket()
+        await manager.connect(socket)
+        manager.hold(socket)
+        manager.subscribe(socket, "principal:1")
+        await manager.broadcast("principal:1", {"n": 2})  # live, held until the resume
+
+        epoch = await manager.backend.epoch()
+        await manager.resume(socket, epoch, {"principal:1": 1})
+        await asyncio.sleep(0.01)
+
+        # The live message was already in the buffer, so it is replayed once and not repeated
+        assert [m["n"] if "n" in m else m["type"] for m in socket.sent] == [1, 2, "resumed"]
+        assert [m["seq"] for m in socket.sent if "n" in m] == [2, 3]
+        manager.disconnect(socket)
+
+    def test_backend_must_implement_sequence_methods(self):
+        class PublishOnly(BroadcastBackend):
+            async def publish(self, channel, message):
+                pass
+
+        with pytest.raises(TypeError, match="epoch"):
+            PublishOnly()
+
+
+class TestRedisBroadcastBackend:
+    """Tests for relaying Redis pub/sub messages to local sockets."""
+
+    async def test_relay_strips_prefix_and_delivers(self):
+        delivered = []
+
+        async def deliver(channel, message):
+            delivered.append((channel, message))
+
+        backend = RedisBroadcastBackend(prefix="test:ws:")
+        backend.attach(deliver)
+
+        await backend._relay(b"test:ws:principal:7", json.dumps({"type": "notification"}).encode())
+        await backend._relay("test:ws:workspace:1", "not json")
+
+        assert delivered == [("principal:7", {"type": "notification"})]
 
 
 class TestWebSocketEndpoint:
@@ -92,6 +343,36 @@ class TestWebSocketEndpoint:
             response = websocket.receive_text()
             assert response == "pong"
 
+    def test_websocket_subscribe_and_unsubscribe(
+        self, test_client, auth_headers, workspace_and_notebook, create_workspace
+    ):
+        """Clients can add page topics but not notebooks from other workspaces."""
+        _, notebook = workspace_and_notebook
+        other_workspace = create_workspace(name="Other Workspace")
+        other_notebook = test_client.post(
+            f"/api/v1/workspaces/{other_workspace['slug']}/notebooks/",
+            json={"name": "Elsewhere"},
+            headers=auth_headers[0],
+        ).json()
+        token = auth_headers[0]["Authorization"].removeprefix("Bearer ")
+
+        with test_client.websocket_connect(f"/api/v1/ws/notebooks/{notebook['id']}?token={token}") as websocket:
+            websocket.receive_json()
+
+            websocket.send_json(
+                {"type": "subscribe", "topics": ["page:abc", f"notebook:{other_notebook['id']}", "bogus"]}
+            )
+            reply = websocket.receive_json()
+            assert reply["type"] == "subscribed"
+            assert reply["topics"] == ["block:abc"]
+            assert reply["rejected"] == ["bogus", f"notebook:{other_notebook['id']}"]
+            assert reply["subscriptions"] == ["block:abc", f"notebook:{notebook['id']}"]
+
+            websocket.send_json({"type": "unsubscribe", "topics": [f"notebook:{notebook['id']}"]})
+            reply = websocket.receive_json()
+            assert reply["type"] == "unsubscribed"
+            assert reply["subscriptions"] == ["block:abc"]
+
     def test_websocket_connection_via_first_message_auth(self, test_client, auth_headers, workspace_and_notebook):
         """Test authenticating via a first `{"type": "auth", ...}` message instead of a query param."""
         _, notebook = workspace_and_notebook
@@ -127,6 +408,36 @@ class TestWebSocketEndpoint:
             except WebSocketDisconnect as exc:
                 assert exc.code == 1008
 
+    def test_websocket_resume_replays_missed_messages(self, test_client, auth_headers, workspace_and_notebook):
+        """A reconnecting client gets what it missed, or a resync signal for a stale epoch."""
+        _, notebook = workspace_and_notebook
+        headers = auth_headers[0]
+        token = headers["Authorization"].removeprefix("Bearer ")
+        user_id = test_client.get("/api/v1/users/me", headers=headers).json()["id"]
+        channel = principal_channel(user_id)
+        url = f"/api/v1/ws/notebooks/{notebook['id']}?token={token}"
+
+        with test_client.websocket_connect(url) as websocket:
+            connected = websocket.receive_json()
+        assert connected["epoch"]
+        last_seq = connected["channels"][channel]
+
+        # Published while the client was away
+        asyncio.run(connection_manager.broadcast(channel, {"type": "notification", "n": 1}))
+
+        resume = json.dumps({"epoch": connected["epoch"], "last_seq": {channel: last_seq}})
+        with test_client.websocket_connect(f"{url}&resume={resume}") as websocket:
+            assert websocket.receive_json()["type"] == "connected"
+            missed = websocket.receive_json()
+            assert missed["n"] == 1
+            assert missed["seq"] == last_seq + 1
+            assert websocket.receive_json() == {"type": "resumed", "replayed": 1, "resync": []}
+
+        resume = json.dumps({"epoch": "stale", "last_seq": {channel: last_seq}})
+        with test_client.websocket_connect(f"{url}&resume={resume}") as websocket:
+            websocket.receive_json()
+            assert websocket.receive_json() == {"type": "resync_required", "channel": channel}
+
     def test_websocket_rejects_user_without_access(self, test_client, workspace_and_notebook):
         """A user with no permission on the workspace cannot subscribe to its events."""
         _, notebook = workspace_and_notebook
@@ -154,6 +154,7 @@ def test_enqueue_task_with_mock_redis(test_client, auth_headers, create_workspac
     mock_pool.enqueue_job = AsyncMock(return_value=mock_job)
 
     from codex.main import app
+    from codex.worker.queues import AGENTS_QUEUE
 
     app.state.arq_pool = mock_pool
     try:
@@ -161,7 +162,7 @@ def test_enqueue_task_with_mock_redis(test_client, auth_headers, create_workspac
         assert resp.status_code == 200
         task = resp.json()
         assert task["job_id"] == "test-job-123"
-        mock_pool.enqueue_job.assert_called_once_with("run_job", task_id)
+        mock_pool.enqueue_job.assert_called_once_with("run_job", task_id, _queue_name=AGENTS_QUEUE)
     finally:
         app.state.arq_pool = None
 
@@ -266,3 +267,243 @@ async def test_run_job_unknown_job_type(mock_load):
     result = await run_job(ctx, task_id=1)
     assert result["status"] == "error"
     assert "Unknown job_type" in result["detail"]
+
+
+def test_every_job_runs_on_its_routed_queue():
+    """Each worker consumes exactly the functions (and crons) that enqueue_job routes to its queue."""
+    from arq.worker import Function
+
+    from codex.worker.queues import JOB_QUEUES
+    from codex.worker.settings import WORKER_SETTINGS
+
+    served: dict[str, str] = {}
+    for settings in WORKER_SETTINGS.values():
+        names = [f.name if isinstance(f, Function) else f.__name__ for f in settings.functions]
+        names += [cron.name.removeprefix("cron:") for cron in getattr(settings, "cron_jobs", [])]
+        for name in names:
+            assert name not in served, f"{name} is served by two queues"
+            served[name] = settings.queue_name
+    assert served == JOB_QUEUES
+
+
+async def test_fanout_event_bulk_inserts_and_is_idempotent(monkeypatch, create_workspace):
+    """A large fanout writes every notification in one go, and a retry adds nothing."""
+    from sqlmodel import func, select
+
+    from codex.core.websocket import connection_manager
+    from codex.db.database import async_session_maker
+    from codex.db.models import Event, Notification, User
+    from codex.worker import tasks
+
+    workspace = create_workspace()
+    async with async_session_maker() as session:
+        users = [
+            User(username=f"fanout_{workspace['id']}_{i}", email=f"fanout_{workspace['id']}_{i}@x.io")
+            for i in range(60)
+        ]
+        session.add_all(users)
+        event = Event(workspace_id=workspace["id"], kind="test.bulk", subject={})
+        session.add(event)
+        await session.commit()
+        recipient_ids = {u.id for u in users}
+        event_id = event.id
+
+    async def _resolver(session, event):
+        return recipient_ids
+
+    monkeypatch.setitem(tasks.RECIPIENT_RESOLVERS, "test.bulk", _resolver)
+    broadcasts = []
+
+    async def _broadcast(channel, message):
+        broadcasts.append((channel, message["notification"]["id"]))
+
+    monkeypatch.setattr(connection_manager, "broadcast", _broadcast)
+
+    ctx = {"session_maker": async_session_maker}
+    result = await tasks.fanout_event(ctx, event_id)
+    assert result["notifications_created"] == 60
+    assert len(broadcasts) == 60
+    assert len({notification_id for _, notification_id in broadcasts}) == 60
+
+    result = await tasks.fanout_event(ctx, event_id)
+    assert result["notifications_created"] == 0
+    assert len(broadcasts) == 60
+
+    async with async_session_maker() as session:
+        count = await session.execute(
+            select(func.count()).select_from(Notification).where(Notification.event_id == event_id)
+        )
+        assert count.scalar_one() == 60
+
+
+async def test_unread_counter_tracks_fanout_and_reads(monkeypatch, test_client, auth_headers, create_workspace):
+    """The badge count is maintained by fanout and mark-read, pushed over the socket, and reconciled on drift."""
+    from sqlmodel import select
+
+    from codex.core.websocket import connection_manager
+    from codex.db.database import async_session_maker
+    from codex.db.models import Event, Notification, NotificationCounter
+    from codex.worker import tasks
+
+    headers = auth_headers[0]
+    me = test_client.get("/api/v1/users/me", headers=headers).json()
+    workspace = create_workspace()
+    async with async_session_maker() as session:
+        events = [Event(workspace_id=workspace["id"], kind="test.counter", subject={}) for _ in range(3)]
+        session.add_all(events)
+        await session.commit()
+        event_ids = [e.id for e in events]
+
+    async def _resolver(session, event):
+        return {me["id"]}
+
+    monkeypatch.setitem(tasks.RECIPIENT_RESOLVERS, "test.counter", _resolver)
+    pushed = []
+
+    async def _broadcast(channel, message):
+        pushed.append(message.get("unread_count"))
+
+    monkeypatch.setattr(connection_manager, "broadcast", _broadcast)
+
+    ctx = {"session_maker": async_session_maker}
+    for event_id in event_ids:
+        await tasks.fanout_event(ctx, event_id)
+    await tasks.fanout_event(ctx, event_ids[0])  # retry doesn't double count
+    assert pushed == [1, 2, 3]
+    assert test_client.get("/api/v1/notifications/unread-count", headers=headers).json() == {"unread_count": 3}
+
+    notification_id = test_client.get("/api/v1/notifications/", headers=headers).json()[0]["id"]
+    test_client.post(f"/api/v1/notifications/{notification_id}/read", headers=headers)
+    test_client.post(f"/api/v1/notifications/{notification_id}/read", headers=headers)
+    assert test_client.get("/api/v1/notifications/unread-count", headers=headers).json() == {"unread_count": 2}
+    assert pushed[-1] == 2
+
+    # Drift (e.g. a hand-edited row) is repaired by the reconciliation job
+    async with async_session_maker() as session:
+        counter = await session.get(NotificationCounter, me["id"])
+        counter.unread_count = 40
+        await session.commit()
+    result = await tasks.reconcile_unread_counts(ctx)
+    assert result["counters_corrected"] >= 1
+    assert test_client.get("/api/v1/notifications/unread-count", headers=headers).json() == {"unread_count": 2}
+
+    response = test_client.post("/api/v1/notifications/mark-all-read", headers=headers)
+    assert response.json()["message"] == "Marked 2 notification(s) as read"
+    assert test_client.get("/api/v1/notifications/unread-count", headers=headers).json() == {"unread_count": 0}
+    assert pushed[-1] == 0
+    async with async_session_maker() as session:
+        unread = await session.execute(
+            select(Notification).where(Notification.recipient_id == me["id"], Notification.read_at.is_(None))
+        )
+        assert unread.all() == []
+
+
+async def test_notifications_keyset_pagination_breaks_ties_by_id(test_client, auth_headers, create_workspace):
+    """Notifications written in the same instant still page newest-first without gaps or repeats."""
+    from datetime import UTC, datetime
+
+    from codex.db.database import async_session_maker
+    from codex.db.models import Event, Notification
+
+    headers = auth_headers[0]
+    me = test_client.get("/api/v1/users/me", headers=headers).json()
+    workspace = create_workspace()
+    now = datetime.now(UTC)
+    async with async_session_maker() as session:
+        events = [Event(workspace_id=workspace["id"], kind="test.page", subject={}) for _ in range(5)]
+        session.add_all(events)
+        await session.flush()
+        notifications = [Notification(event_id=e.id, recipient_id=me["id"], created_at=now) for e in events]
+        session.add_all(notifications)
+        await session.commit()
+        expected = sorted((n.id for n in notifications), reverse=True)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = test_client.get("/api/v1/notifications/", params=params, headers=headers)
+        seen.extend(n["id"] for n in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+async def test_fanout_coalesces_bursts_into_a_digest(monkeypatch, test_client, auth_headers, create_workspace):
+    """Events in one thread fold into the recipient's open digest: one row, one push, one unread."""
+    from sqlmodel import select
+
+    from codex.core.outbox import OutboxRelay
+    from codex.core.websocket import connection_manager
+    from codex.db.database import async_session_maker
+    from codex.db.models import Event, OutboxJob
+    from codex.worker import tasks
+
+    headers = auth_headers[0]
+    me = test_client.get("/api/v1/users/me", headers=headers).json()
+    workspace = create_workspace()
+    async with async_session_maker() as session:
+        events = [
+            Event(workspace_id=workspace["id"], kind="comment.created", subject={"thread_id": 10_000 + workspace["id"]})
+            for _ in range(5)
+        ]
+        other_thread = Event(workspace_id=workspace["id"], kind="comment.created", subject={"thread_id": -1})
+        session.add_all([*events, other_thread])
+        await session.commit()
+        event_ids = [e.id for e in events]
+        other_thread_id = other_thread.id
+
+    async def _resolver(session, event):
+        return {me["id"]}
+
+    monkeypatch.setitem(tasks.RECIPIENT_RESOLVERS, "comment.created", _resolver)
+    pushed = []
+
+    async def _broadcast(channel, message):
+        pushed.append(message)
+
+    monkeypatch.setattr(connection_manager, "broadcast", _broadcast)
+
+    redis = AsyncMock()
+    ctx = {"session_maker": async_session_maker, "redis": redis}
+    results = [await tasks.fanout_event(ctx, event_id) for event_id in event_ids]
+    assert [r["notifications_created"] for r in results] == [1, 0, 0, 0, 0]
+    assert [r["notifications_coalesced"] for r in results] == [0, 1, 1, 1, 1]
+    assert len(pushed) == 1
+    retry = await tasks.fanout_event(ctx, event_ids[2])
+    assert (retry["notifications_created"], retry["notifications_coalesced"]) == (0, 0)
+
+    digest = test_client.get("/api/v1/notifications/", headers=headers).json()[0]
+    assert digest["event_id"] == event_ids[-1]
+    assert digest["event_count"] == 5
+    assert test_client.get("/api/v1/notifications/unread-count", headers=headers).json() == {"unread_count": 1}
+
+    # Every fold staged the flush in the outbox; it is kept once and held until the window closes
+    redis.enqueue_job.assert_not_called()
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(OutboxJob).where(OutboxJob.job_key == f"flush_notification_digest:{digest['id']}")
+        )
+        flush_job = result.scalar_one()
+    assert flush_job.args == [digest["id"]]
+    assert flush_job.dispatched_at is None
+    assert flush_job.next_attempt_at is not None
+    pool = AsyncMock()
+    await OutboxRelay(batch_size=1000).drain(pool)
+    assert all(call.args[0] != "flush_notification_digest" for call in pool.enqueue_job.call_args_list)
+
+    result = await tasks.flush_notification_digest(ctx, digest["id"])
+    assert result["event_count"] == 5
+    assert pushed[-1]["notification"]["event_count"] == 5
+    assert pushed[-1]["unread_count"] == 1
+
+    # Another thread, or the same one once the digest is read, starts a new notification
+    assert (await tasks.fanout_event(ctx, other_thread_id))["notifications_created"] == 1
+    test_client.post(f"/api/v1/notifications/{digest['id']}/read", headers=headers)
+    async with async_session_maker() as session:
+        event = Event(workspace_id=workspace["id"], kind="comment.created", subject=events[0].subject)
+        session.add(event)
+        await session.commit()
+        late_id = event.id
+    assert (await tasks.fanout_event(ctx, late_id))["notifications_created"] == 1
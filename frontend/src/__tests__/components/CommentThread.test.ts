@@ -52,6 +52,10 @@ function makeComment(overrides: Partial<Comment> = {}): Comment {
   }
 }
 
+function page(items: Comment[], nextCursor: string | null = null) {
+  return { items, nextCursor }
+}
+
 let wrapper: any
 
 afterEach(() => {
@@ -81,10 +85,10 @@ describe("CommentThread", () => {
   })
 
   it("loads and groups root comments with their replies", async () => {
-    mockList.mockResolvedValue([
+    mockList.mockResolvedValue(page([
       makeComment({ id: 1, body: "root comment" }),
       makeComment({ id: 2, thread_id: 1, body: "a reply", author_username: "bob", author_id: 20 }),
-    ])
+    ]))
     await mountThread()
 
     expect(mockList).toHaveBeenCalledWith("ws", "nb", "blk_1")
@@ -94,13 +98,13 @@ describe("CommentThread", () => {
   })
 
   it("shows an empty state when there are no comments", async () => {
-    mockList.mockResolvedValue([])
+    mockList.mockResolvedValue(page([]))
     await mountThread()
     expect(wrapper.text()).toContain("No comments yet")
   })
 
   it("hides the composer and shows a readonly note for read-only users", async () => {
-    mockList.mockResolvedValue([makeComment()])
+    mockList.mockResolvedValue(page([makeComment()]))
     await mountThread("read")
 
     expect(wrapper.find(".comment-thread-new").exists()).toBe(false)
@@ -108,7 +112,7 @@ describe("CommentThread", () => {
   })
 
   it("posts a new top-level comment for users with comment permission", async () => {
-    mockList.mockResolvedValue([])
+    mockList.mockResolvedValue(page([]))
     mockCreate.mockResolvedValue(makeComment({ id: 5, body: "new one" }))
     await mountThread("comment")
 
@@ -123,7 +127,7 @@ describe("CommentThread", () => {
 
   it("resolves a thread and shows the resolved banner", async () => {
     const root = makeComment({ id: 1 })
-    mockList.mockResolvedValue([root])
+    mockList.mockResolvedValue(page([root]))
     mockResolve.mockResolvedValue({ ...root, resolved_at: "2024-01-02T00:00:00Z", resolved_by_id: 99 })
     await mountThread("comment")
 
@@ -135,10 +139,10 @@ describe("CommentThread", () => {
   })
 
   it("only shows edit/delete to the comment's author", async () => {
-    mockList.mockResolvedValue([
+    mockList.mockResolvedValue(page([
       makeComment({ id: 1, author_id: 10, author_username: "alice" }), // not the current user
       makeComment({ id: 2, thread_id: 1, author_id: 99, author_username: "me" }), // current user
-    ])
+    ]))
     await mountThread("comment", 99)
 
     const items = wrapper.findAll(".comment-item")
@@ -148,7 +152,7 @@ describe("CommentThread", () => {
   })
 
   it("lets a workspace admin delete a comment they don't own", async () => {
-    mockList.mockResolvedValue([makeComment({ id: 1, author_id: 10 })])
+    mockList.mockResolvedValue(page([makeComment({ id: 1, author_id: 10 })]))
     mockDelete.mockResolvedValue(undefined)
     await mountThread("admin", 99)
 
@@ -162,7 +166,7 @@ describe("CommentThread", () => {
   })
 
   it("reloads comments when workspaceId or notebookId change while blockId stays the same", async () => {
-    mockList.mockResolvedValue([])
+    mockList.mockResolvedValue(page([]))
     await mountThread()
     expect(mockList).toHaveBeenCalledWith("ws", "nb", "blk_1")
     mockList.mockClear()
@@ -178,7 +182,7 @@ describe("CommentThread", () => {
   })
 
   it("edits a comment's body inline", async () => {
-    mockList.mockResolvedValue([makeComment({ id: 1, author_id: 99, body: "before" })])
+    mockList.mockResolvedValue(page([makeComment({ id: 1, author_id: 99, body: "before" })]))
     mockUpdate.mockResolvedValue(makeComment({ id: 1, author_id: 99, body: "after" }))
     await mountThread("comment", 99)
 
@@ -195,4 +199,20 @@ describe("CommentThread", () => {
     expect(wrapper.text()).toContain("after")
     expect(wrapper.text()).not.toContain("before")
   })
+
+  it("loads the next page of comments on demand", async () => {
+    mockList
+      .mockResolvedValueOnce(page([makeComment({ id: 1, body: "first page" })], "cursor-1"))
+      .mockResolvedValueOnce(page([makeComment({ id: 2, body: "second page" })]))
+    await mountThread()
+
+    expect(wrapper.text()).not.toContain("second page")
+    await wrapper.find(".comment-load-more").trigger("click")
+    await new Promise((resolve) => setTimeout(resolve, 0))
+    await wrapper.vm.$nextTick()
+
+    expect(mockList).toHaveBeenLastCalledWith("ws", "nb", "blk_1", "cursor-1")
+    expect(wrapper.text()).toContain("second page")
+    expect(wrapper.find(".comment-load-more").exists()).toBe(false)
+  })
 })
@@ -15,7 +15,10 @@ vi.mock("../../services/notifications", () => ({
 }))
 
 vi.mock("../../services/websocket", () => ({
-  websocketService: { onNotification: vi.fn(() => vi.fn()) },
+  websocketService: {
+    onNotification: vi.fn(() => vi.fn()),
+    onUnreadCount: vi.fn(() => vi.fn()),
+  },
 }))
 
 const mockOnNotification = websocketService.onNotification as Mock
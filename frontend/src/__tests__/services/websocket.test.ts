@@ -312,4 +312,50 @@ describe("WebSocket Service", () => {
 
     errorSpy.mockRestore()
   })
+
+  it("resumes from the last sequence seen after an unexpected close", () => {
+    websocketService.connect(1)
+    const ws = MockWebSocket.instances[0]
+    ws.simulateOpen()
+    ws.simulateMessage({
+      type: "connected",
+      notebook_id: 1,
+      message: "connected",
+      epoch: "e1",
+      channels: { "workspace:1": 10, "principal:2": 4 },
+    })
+    ws.simulateMessage({
+      type: "file_change",
+      notebook_id: 1,
+      event_type: "modified",
+      path: "/test.md",
+      timestamp: "2024-01-01T00:00:00Z",
+      channel: "workspace:1",
+      seq: 11,
+    })
+
+    ws.readyState = MockWebSocket.CLOSED
+    ws.onclose?.(new CloseEvent("close"))
+    vi.advanceTimersByTime(5000)
+
+    const url = new URL(MockWebSocket.instances[1].url)
+    expect(JSON.parse(url.searchParams.get("resume")!)).toEqual({
+      epoch: "e1",
+      last_seq: { "workspace:1": 11, "principal:2": 4 },
+    })
+  })
+
+  it("refreshes the notebook when the server asks for a resync", () => {
+    const handler = vi.fn()
+    websocketService.onFileChange(handler)
+
+    websocketService.connect(1)
+    const ws = MockWebSocket.instances[0]
+    ws.simulateOpen()
+    ws.simulateMessage({ type: "resync_required", channel: "workspace:1" })
+
+    expect(handler).toHaveBeenCalledWith(
+      expect.objectContaining({ notebook_id: 1, event_type: "bulk" }),
+    )
+  })
 })
@@ -69,9 +69,10 @@ describe("Comments Store", () => {
 
   it("fetchComments loads comments for a block, and clears on failure", async () => {
     const store = useCommentsStore()
-    ;(commentService.list as Mock).mockResolvedValue([makeComment()])
+    ;(commentService.list as Mock).mockResolvedValue({ items: [makeComment()], nextCursor: null })
     await store.fetchComments("ws", "nb", "blk_1")
     expect(store.comments).toHaveLength(1)
+    expect(store.hasMoreComments).toBe(false)
     expect(store.loading).toBe(false)
     expect(store.error).toBeNull()
 
@@ -81,6 +82,25 @@ describe("Comments Store", () => {
     expect(store.error).toBe("nope")
   })
 
+  it("fetchMoreComments appends the next page without duplicating comments posted meanwhile", async () => {
+    const store = useCommentsStore()
+    ;(commentService.list as Mock).mockResolvedValueOnce({ items: [makeComment({ id: 1 })], nextCursor: "c1" })
+    await store.fetchComments("ws", "nb", "blk_1")
+    expect(store.hasMoreComments).toBe(true)
+
+    ;(commentService.create as Mock).mockResolvedValue(makeComment({ id: 3, body: "mine" }))
+    await store.createComment("ws", "nb", "blk_1", "mine")
+    ;(commentService.list as Mock).mockResolvedValueOnce({
+      items: [makeComment({ id: 2 }), makeComment({ id: 3, body: "mine" })],
+      nextCursor: null,
+    })
+    await store.fetchMoreComments("ws", "nb", "blk_1")
+
+    expect(commentService.list).toHaveBeenLastCalledWith("ws", "nb", "blk_1", "c1")
+    expect(store.comments.map((c) => c.id)).toEqual([1, 3, 2])
+    expect(store.hasMoreComments).toBe(false)
+  })
+
   it("createComment appends the new comment and increments the block's count", async () => {
     const store = useCommentsStore()
     ;(commentService.create as Mock).mockResolvedValue(makeComment({ id: 2, body: "new" }))
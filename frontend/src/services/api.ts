@@ -78,4 +78,25 @@ apiClient.interceptors.response.use(
   },
 )
 
+/** One page of a keyset-paginated list route; `nextCursor` is null on the last page. */
+export interface Page<T> {
+  items: T[]
+  nextCursor: string | null
+}
+
+/**
+ * GET one page of a keyset-paginated list route. Pass the previous page's
+ * `nextCursor` as `cursor` to fetch the page after it.
+ */
+export async function getPage<T>(
+  url: string,
+  params: Record<string, unknown> = {},
+  cursor?: string,
+): Promise<Page<T>> {
+  const response = await apiClient.get<T[]>(url, {
+    params: cursor ? { ...params, cursor } : params,
+  })
+  return { items: response.data, nextCursor: response.headers?.["x-next-cursor"] ?? null }
+}
+
 export default apiClient
@@ -45,6 +45,7 @@ export interface Block {
     | "api"
   content_format: "markdown" | "json" | "binary"
   order_index: number
+  order_key?: string | null
   title?: string
   filename?: string
   content?: string
@@ -1,4 +1,4 @@
-import apiClient from "./api"
+import apiClient, { getPage, type Page } from "./api"
 import type { PermissionLevel } from "./collaborators"
 
 export interface CommentMention {
@@ -34,11 +34,18 @@ export interface Principal {
 }
 
 export const commentService = {
-  async list(workspaceIdentifier: string, notebookIdentifier: string, blockId: string): Promise<Comment[]> {
-    const response = await apiClient.get<Comment[]>(
+  /** One page of a block's comments, oldest first. Pass `cursor` (the previous page's `nextCursor`) for newer ones. */
+  async list(
+    workspaceIdentifier: string,
+    notebookIdentifier: string,
+    blockId: string,
+    cursor?: string,
+  ): Promise<Page<Comment>> {
+    return getPage<Comment>(
       `/api/v1/workspaces/${workspaceIdentifier}/notebooks/${notebookIdentifier}/blocks/${blockId}/comments/`,
+      {},
+      cursor,
     )
-    return response.data
   },
 
   async create(
@@ -7,14 +7,17 @@ export interface Notification {
   workspace_id: number
   actor_id: number | null
   subject: Record<string, any>
+  /** Events this notification stands for (> 1 for a digest of a burst) */
+  event_count: number
   read_at: string | null
   created_at: string
 }
 
 export const notificationService = {
-  async list(unreadOnly = false, limit = 50, offset = 0): Promise<Notification[]> {
+  /** One page, newest first. Pass `cursor` (the previous page's `X-Next-Cursor`) for older ones. */
+  async list(unreadOnly = false, limit = 50, cursor?: string): Promise<Notification[]> {
     const response = await apiClient.get<Notification[]>("/api/v1/notifications/", {
-      params: { unread_only: unreadOnly, limit, offset },
+      params: { unread_only: unreadOnly, limit, ...(cursor ? { cursor } : {}) },
     })
     return response.data
   },
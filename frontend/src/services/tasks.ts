@@ -1,4 +1,4 @@
-import apiClient from "./api"
+import apiClient, { getPage, type Page } from "./api"
 
 export interface Task {
   id: number
@@ -43,11 +43,9 @@ function tasksUrl(workspaceIdentifier: string): string {
 }
 
 export const taskService = {
-  async list(workspaceIdentifier: string, params?: TaskListParams): Promise<Task[]> {
-    const response = await apiClient.get<Task[]>(`${tasksUrl(workspaceIdentifier)}/`, {
-      params,
-    })
-    return response.data
+  /** One page of tasks, oldest first. Pass `cursor` (the previous page's `nextCursor`) for newer ones. */
+  async list(workspaceIdentifier: string, params?: TaskListParams, cursor?: string): Promise<Page<Task>> {
+    return getPage<Task>(`${tasksUrl(workspaceIdentifier)}/`, { ...params }, cursor)
   },
 
   async get(workspaceIdentifier: string, taskId: number): Promise<Task> {
@@ -2,10 +2,16 @@
  * WebSocket service for real-time file change notifications.
  */
 
-export interface FileChangeEvent {
+/** Every broadcast is stamped with its channel and a per-channel sequence number. */
+interface Sequenced {
+  channel?: string
+  seq?: number
+}
+
+export interface FileChangeEvent extends Sequenced {
   type: "file_change"
   notebook_id: number
-  event_type: "created" | "modified" | "deleted" | "moved" | "scanned"
+  event_type: "created" | "modified" | "deleted" | "moved" | "scanned" | "bulk"
   path: string
   old_path?: string
   timestamp: string
@@ -14,12 +20,26 @@ export interface FileChangeEvent {
   block_type?: string
   properties?: Record<string, any>
   actor_principal_id?: number
+  /** For "bulk" events: how many file events were summarized */
+  count?: number
+  /** For "bulk" events: a sample of the changed paths */
+  paths?: string[]
 }
 
 export interface ConnectionEvent {
   type: "connected"
   notebook_id: number
   message: string
+  /** Sequence space of the server's broadcasts; sequence numbers only compare within one epoch */
+  epoch?: string
+  /** Current sequence number of each channel the socket is subscribed to */
+  channels?: Record<string, number>
+}
+
+/** The server could not replay what this client missed on a channel; refetch instead. */
+export interface ResyncRequiredEvent {
+  type: "resync_required"
+  channel: string
 }
 
 /**
@@ -27,7 +47,7 @@ export interface ConnectionEvent {
  * subscription (see codex.worker.tasks.fanout_event). `notification` matches the
  * REST NotificationResponse shape.
  */
-export interface NotificationEvent {
+export interface NotificationEvent extends Sequenced {
   type: "notification"
   notification: {
     id: number
@@ -36,35 +56,73 @@ export interface NotificationEvent {
     workspace_id: number
     actor_id: number | null
     subject: Record<string, any>
+    /** Events this notification stands for (> 1 for a digest of a burst) */
+    event_count: number
     read_at: string | null
     created_at: string
   }
+  /** The recipient's unread count once this notification was added */
+  unread_count?: number
 }
 
-export type WebSocketMessage = FileChangeEvent | ConnectionEvent | NotificationEvent
+/**
+ * The current user's unread notification count, pushed on the `principal:{user_id}`
+ * channel whenever it changes (see codex.core.notification_counters).
+ */
+export interface UnreadCountEvent extends Sequenced {
+  type: "unread_count"
+  unread_count: number
+}
+
+export type WebSocketMessage =
+  | FileChangeEvent
+  | ConnectionEvent
+  | NotificationEvent
+  | UnreadCountEvent
+  | ResyncRequiredEvent
+
+interface ResumeState {
+  epoch: string
+  lastSeq: Record<string, number>
+  /** Channel sequence numbers reported by the latest `connected` message */
+  connectedSeq: Record<string, number>
+}
 
 type MessageHandler = (event: FileChangeEvent) => void
 type NotificationHandler = (event: NotificationEvent["notification"]) => void
+type UnreadCountHandler = (unreadCount: number) => void
 type ConnectionHandler = (connected: boolean, notebookId: number) => void
 
 class WebSocketService {
   private connections: Map<number, WebSocket> = new Map()
   private messageHandlers: Set<MessageHandler> = new Set()
   private notificationHandlers: Set<NotificationHandler> = new Set()
+  private unreadCountHandlers: Set<UnreadCountHandler> = new Set()
   private connectionHandlers: Set<ConnectionHandler> = new Set()
   private reconnectTimers: Map<number, number> = new Map()
   private pingIntervals: Map<number, number> = new Map()
   private intentionallyDisconnected: Set<number> = new Set()
+  private resumeStates: Map<number, ResumeState> = new Map()
 
   /**
    * Get the WebSocket URL for a notebook, including the session token so the
-   * server can authenticate the connection at handshake time.
+   * server can authenticate the connection at handshake time, and, when
+   * reconnecting, the last sequence seen per channel so the server can replay
+   * what was missed.
    */
   private getWebSocketUrl(notebookId: number): string {
     const protocol = window.location.protocol === "https:" ? "wss:" : "ws:"
     const host = window.location.host
+    const params = new URLSearchParams()
     const token = localStorage.getItem("access_token")
-    const query = token ? `?token=${encodeURIComponent(token)}` : ""
+    if (token) {
+      params.set("token", token)
+    }
+    const resume = this.resumeStates.get(notebookId)
+    if (resume) {
+      params.set("resume", JSON.stringify({ epoch: resume.epoch, last_seq: resume.lastSeq }))
+    }
+    const query = params.toString() ? `?${params.toString()}` : ""
     return `${protocol}//${host}/api/v1/ws/notebooks/${notebookId}${query}`
   }
 
@@ -100,10 +158,25 @@ class WebSocketService {
       try {
         const data = JSON.parse(event.data) as WebSocketMessage
 
+        this.trackSequence(notebookId, data)
         if (data.type === "file_change") {
           this.notifyMessageHandlers(data)
         } else if (data.type === "notification") {
           this.notifyNotificationHandlers(data.notification)
+          if (typeof data.unread_count === "number") {
+            this.notifyUnreadCountHandlers(data.unread_count)
+          }
+        } else if (data.type === "unread_count") {
+          this.notifyUnreadCountHandlers(data.unread_count)
+        } else if (data.type === "resync_required" && data.channel.startsWith("workspace:")) {
+          // Missed file changes can't be replayed: have the tree refetched
+          this.notifyMessageHandlers({
+            type: "file_change",
+            notebook_id: notebookId,
+            event_type: "bulk",
+            path: "",
+            timestamp: new Date().toISOString(),
+          })
         }
       } catch (e) {
         // Ignore non-JSON messages (like "pong")
@@ -136,6 +209,9 @@ class WebSocketService {
     // Mark as intentionally disconnected to prevent auto-reconnect
     this.intentionallyDisconnected.add(notebookId)
 
+    // Nothing to resume when reconnecting later; the tree is refetched on expand
+    this.resumeStates.delete(notebookId)
+
     // Cancel any pending reconnect
     const timer = this.reconnectTimers.get(notebookId)
     if (timer) {
@@ -183,6 +259,16 @@ class WebSocketService {
     }
   }
 
+  /**
+   * Register a handler for pushed unread notification counts.
+   */
+  onUnreadCount(handler: UnreadCountHandler): () => void {
+    this.unreadCountHandlers.add(handler)
+    return () => {
+      this.unreadCountHandlers.delete(handler)
+    }
+  }
+
   /**
    * Register a handler for connection state changes.
    */
@@ -201,6 +287,35 @@ class WebSocketService {
     return ws?.readyState === WebSocket.OPEN
   }
 
+  /**
+   * Remember the sequence epoch and the last sequence number seen per channel
+   * so a reconnect can resume from there.
+   */
+  private trackSequence(notebookId: number, data: WebSocketMessage): void {
+    let state = this.resumeStates.get(notebookId)
+    if (data.type === "connected") {
+      if (!data.epoch) return
+      const channels = data.channels ?? {}
+      if (!state || state.epoch !== data.epoch) {
+        state = { epoch: data.epoch, lastSeq: { ...channels }, connectedSeq: channels }
+        this.resumeStates.set(notebookId, state)
+      } else {
+        state.connectedSeq = channels
+        for (const [channel, seq] of Object.entries(channels)) {
+          if (!(channel in state.lastSeq)) state.lastSeq[channel] = seq
+        }
+      }
+      return
+    }
+    if (!state) return
+    if (data.type === "resync_required") {
+      // Start over from where the server was when we connected
+      state.lastSeq[data.channel] = state.connectedSeq[data.channel] ?? 0
+    } else if ("seq" in data && data.channel && typeof data.seq === "number") {
+      state.lastSeq[data.channel] = Math.max(state.lastSeq[data.channel] ?? 0, data.seq)
+    }
+  }
+
   private cleanup(notebookId: number): void {
     this.connections.delete(notebookId)
 
@@ -250,6 +365,16 @@ class WebSocketService {
     }
   }
 
+  private notifyUnreadCountHandlers(unreadCount: number): void {
+    for (const handler of this.unreadCountHandlers) {
+      try {
+        handler(unreadCount)
+      } catch (e) {
+        console.error("Error in WebSocket unread count handler:", e)
+      }
+    }
+  }
+
   private notifyConnectionHandlers(connected: boolean, notebookId: number): void {
     for (const handler of this.connectionHandlers) {
       try {
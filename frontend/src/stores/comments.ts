@@ -16,7 +16,10 @@ export const useCommentsStore = defineStore("comments", () => {
   const myPermissionLevel = ref<PermissionLevel | null>(null)
   // Comments for the currently open thread panel (flat list: roots + replies)
   const comments = ref<Comment[]>([])
+  // Cursor for the thread panel's next page of comments (null once all are loaded)
+  const commentsCursor = ref<string | null>(null)
   const loading = ref(false)
+  const loadingMore = ref(false)
   const error = ref<string | null>(null)
 
   let wsUnsubscribe: (() => void) | null = null
@@ -27,6 +30,8 @@ export const useCommentsStore = defineStore("comments", () => {
     return level === "comment" || level === "write" || level === "admin"
   })
 
+  const hasMoreComments = computed(() => commentsCursor.value !== null)
+
   function getCount(blockId: string): number {
     return commentCounts.value.get(blockId) ?? 0
   }
@@ -66,20 +71,41 @@ export const useCommentsStore = defineStore("comments", () => {
     }
   }
 
-  /** Load the comments (threads + replies) for a single block's thread panel. */
+  /** Load the first page of comments (threads + replies) for a single block's thread panel. */
   async function fetchComments(workspaceIdentifier: string, notebookIdentifier: string, blockId: string) {
     loading.value = true
     error.value = null
     try {
-      comments.value = await commentService.list(workspaceIdentifier, notebookIdentifier, blockId)
+      const page = await commentService.list(workspaceIdentifier, notebookIdentifier, blockId)
+      comments.value = page.items
+      commentsCursor.value = page.nextCursor
     } catch (e: any) {
       error.value = e.response?.data?.detail || "Failed to load comments"
       comments.value = []
+      commentsCursor.value = null
     } finally {
       loading.value = false
     }
   }
 
+  /** Append the thread panel's next page of comments, if there is one. */
+  async function fetchMoreComments(workspaceIdentifier: string, notebookIdentifier: string, blockId: string) {
+    const cursor = commentsCursor.value
+    if (cursor === null || loadingMore.value) return
+    loadingMore.value = true
+    try {
+      const page = await commentService.list(workspaceIdentifier, notebookIdentifier, blockId, cursor)
+      // Comments posted from this panel are already listed; don't add them twice
+      const known = new Set(comments.value.map((c) => c.id))
+      comments.value = [...comments.value, ...page.items.filter((c) => !known.has(c.id))]
+      commentsCursor.value = page.nextCursor
+    } catch (e: any) {
+      error.value = e.response?.data?.detail || "Failed to load comments"
+    } finally {
+      loadingMore.value = false
+    }
+  }
+
   async function createComment(
     workspaceIdentifier: string,
     notebookIdentifier: string,
@@ -138,7 +164,9 @@ export const useCommentsStore = defineStore("comments", () => {
     principals.value = []
     myPermissionLevel.value = null
     comments.value = []
+    commentsCursor.value = null
     loading.value = false
+    loadingMore.value = false
     error.value = null
   }
 
@@ -147,9 +175,12 @@ export const useCommentsStore = defineStore("comments", () => {
     principals,
     myPermissionLevel,
     comments,
+    commentsCursor,
     loading,
+    loadingMore,
     error,
     canComment,
+    hasMoreComments,
     getCount,
     setCount,
     incrementCount,
@@ -157,6 +188,7 @@ export const useCommentsStore = defineStore("comments", () => {
     fetchPrincipals,
     fetchMyPermission,
     fetchComments,
+    fetchMoreComments,
     createComment,
     updateComment,
     deleteComment,
@@ -7,6 +7,7 @@ export const useNotificationStore = defineStore("notifications", () => {
   const notifications = ref<Notification[]>([])
   const unreadCount = ref(0)
   let unsubscribe: (() => void) | null = null
+  let unsubscribeCount: (() => void) | null = null
 
   async function fetchUnreadCount() {
     try {
@@ -51,21 +52,35 @@ export const useNotificationStore = defineStore("notifications", () => {
   }
 
   function handleIncoming(notification: Notification) {
+    // A digest that absorbed more events arrives again under the same id — update it in place.
+    const idx = notifications.value.findIndex((n) => n.id === notification.id)
+    if (idx !== -1) {
+      notifications.value[idx] = notification
+      return
+    }
     notifications.value = [notification, ...notifications.value]
     if (!notification.read_at) {
       unreadCount.value += 1
     }
   }
 
-  /** Wire up the live WebSocket listener. Idempotent — safe to call on every mount. */
+  /** The server pushes the authoritative count whenever it changes. */
+  function handleUnreadCount(count: number) {
+    unreadCount.value = Math.max(0, count)
+  }
+
+  /** Wire up the live WebSocket listeners. Idempotent — safe to call on every mount. */
   function init() {
     if (unsubscribe) return
     unsubscribe = websocketService.onNotification(handleIncoming)
+    unsubscribeCount = websocketService.onUnreadCount(handleUnreadCount)
   }
 
   function teardown() {
     unsubscribe?.()
+    unsubscribeCount?.()
     unsubscribe = null
+    unsubscribeCount = null
   }
 
   return {
@@ -76,6 +91,7 @@ export const useNotificationStore = defineStore("notifications", () => {
     markRead,
     markAllRead,
     handleIncoming,
+    handleUnreadCount,
     init,
     teardown,
   }
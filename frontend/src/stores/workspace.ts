@@ -472,6 +472,7 @@ export const useWorkspaceStore = defineStore("workspace", () => {
 
       case "created":
       case "scanned":
+      case "bulk":
         if (currentWorkspace.value) {
           try {
             await fetchBlockTree(event.notebook_id)